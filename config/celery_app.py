@@ -29,4 +29,14 @@ CELERYBEAT_SCHEDULE = {
         "task": "deactivate_expired_cluster_invitation",
         "schedule": crontab(hour="*/24"),
     },
+    # Archive raw payloads of old email tracking records runs daily
+    "archive_email_tracking_payloads": {
+        "task": "archive_email_tracking_payloads",
+        "schedule": crontab(minute=0, hour=2),
+    },
+    # Write buffered user last_login and app_version values runs every minute
+    "flush_user_activity": {
+        "task": "flush_user_activity",
+        "schedule": crontab(minute="*"),
+    },
 }
@@ -94,8 +94,10 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
-    "guardian.backends.ObjectPermissionBackend",
+    "uia_backend.cluster.backends.ClusterMembershipPermissionBackend",
 ]
+# cluster permissions are stored on memberships instead of guardian rows
+SILENCED_SYSTEM_CHECKS = ["guardian.W001"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "accounts.CustomUser"
 
@@ -104,11 +106,15 @@ AUTH_USER_MODEL = "accounts.CustomUser"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "uia_backend.accounts.hashers.AdaptiveArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
+# argon2 parameters for this machine, written by `manage.py calibrate_password_hasher`
+ARGON2_CALIBRATION_FILE = env(
+    "ARGON2_CALIBRATION_FILE", default=str(BASE_DIR / "argon2_calibration.json")
+)
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -123,6 +129,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "uia_backend.libs.io_monitor.OutboundIOMonitorMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -155,6 +162,9 @@ STATICFILES_FINDERS = [
 MEDIA_ROOT = str(APPS_DIR / "media")
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "/media/"
+# uploads that must never be publicly readable e.g user import files
+PRIVATE_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+PRIVATE_FILE_STORAGE_OPTIONS = {"location": str(APPS_DIR / "private_media")}
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -300,7 +310,7 @@ CELERY_TASK_SEND_SENT_EVENT = True
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "uia_backend.accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -334,11 +344,24 @@ DRF_STANDARDIZED_ERRORS = {
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
-    "UPDATE_LAST_LOGIN": True,
+    # last_login is buffered by uia_backend.accounts.activity instead
+    "UPDATE_LAST_LOGIN": False,
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# buffered last_login/app_version writes (see uia_backend.accounts.activity)
+USER_ACTIVITY_BUFFER_TTL = 24 * 60 * 60  # 24 hours
+USER_ACTIVITY_FLUSH_BATCH_SIZE = 1000
+
+# seconds users resolved by uia_backend.accounts.authentication.CachedJWTAuthentication
+# stay cached, entries are also invalidated whenever the user changes
+AUTH_USER_CACHE_TTL = 60
+
+# seconds between checks for changed experiments by
+# uia_backend.experiments.engine.experiment_engine
+EXPERIMENT_ENGINE_VERSION_CHECK_INTERVAL = 5
+
 NOTIFICATIONS_NOTIFICATION_MODEL = "notification.NotificationModel"
 DJANGO_NOTIFICATIONS_CONFIG = {"USE_JSONFIELD": True}
 
@@ -346,6 +369,18 @@ DJANGO_NOTIFICATIONS_CONFIG = {"USE_JSONFIELD": True}
 # ------------------------------------------------------------------------------
 IP_API_CO_URL = "https://ipapi.co"  # https://ipapi.co/api/
 
+# geoip
+# local ip range database (see uia_backend.libs.geoip.build_ip_range_database)
+GEOIP_RESOLVER = "uia_backend.libs.geoip.MMapIPRangeResolver"
+GEOIP_DATABASE_PATH = env(
+    "GEOIP_DATABASE_PATH", default=str(BASE_DIR / "geoip" / "ip_ranges.db")
+)
+GEOIP_CACHE_SIZE = 4096
+# resolve ips missing from the local database with a remote api in a celery task
+GEOIP_REMOTE_FALLBACK = env.bool("GEOIP_REMOTE_FALLBACK", default=True)
+GEOIP_REMOTE_RESOLVER = "uia_backend.libs.geoip.IPApiCoResolver"
+GEOIP_REMOTE_TIMEOUT = 2  # In seconds
+
 DEFUALT_CLUSTER_NAMES = {
     0: "global",
     1: "faculty of {faculty_name}",
@@ -353,6 +388,15 @@ DEFUALT_CLUSTER_NAMES = {
     4: "{year_of_graduation} set",
 }
 
+USER_AUTOCOMPLETE_LIMIT = 10  # max users returned by the autocomplete endpoint
+
+# invitations expired per update by uia_backend.cluster.tasks
+CLUSTER_INVITATION_EXPIRY_BATCH_SIZE = 1000
+# max users invited to a cluster by a single bulk invitation request
+CLUSTER_INVITATION_BULK_CREATE_LIMIT = 500
+# max users added to or removed from a cluster by a single bulk request
+CLUSTER_MEMBERS_BULK_LIMIT = 500
+
 USER_NAMESPACE = "users"
 PUBLIC_CLUSTER_NAMESPACE = "publicchannel"
 PRIVATE_CLUSTER_NAMESPACE = "privatechannel"
@@ -360,6 +404,13 @@ POST_NAMESPACE = "posts"
 
 MAX_MEDIA_UPLOAD_SIZE = 10485760  # In bytes
 
+# email tracking archive
+EMAIL_TRACKING_ARCHIVE_LOCATION = "archives/email_tracking"
+EMAIL_TRACKING_ARCHIVE_AFTER_DAYS = env.int(
+    "EMAIL_TRACKING_ARCHIVE_AFTER_DAYS", default=30
+)
+EMAIL_TRACKING_ARCHIVE_BATCH_SIZE = 5000  # records per archive segment
+
 # centrifugo
 CENTRIFUGO_HMAC_KEY = env("CENTRIFUGO_TOKEN_HMAC_SECRET_KEY", default="")
 CENTRIFUGO_HOST = env("CENTRIFUGO_HOST", default="")
@@ -368,6 +419,24 @@ CENTRIFUGO_API_KEY = env("CENTRIFUGO_API_KEY", default="")
 CENTRIFUGO_TOKEN_TTL = 24 * 60 * 60  # 24 hours
 
 # encrypted_model_fields
-FIELD_ENCRYPTION_KEY = env(
-    "FIELD_ENCRYPTION_KEY", default="OZqvNHjw2V4J58N8CqYk9KoPcRfG5jVYLdqbQJnu7pI="
+# comma separated, the first key encrypts and every key is tried in order to decrypt.
+# NOTE: to rotate, prepend the new key, run the rotate_dm_encryption_key command
+# and only then drop the old keys
+FIELD_ENCRYPTION_KEY = env.list(
+    "FIELD_ENCRYPTION_KEY", default=["OZqvNHjw2V4J58N8CqYk9KoPcRfG5jVYLdqbQJnu7pI="]
 )
+DM_KEY_ROTATION_BATCH_SIZE = 500  # DMs re-encrypted per transaction
+DM_KEY_ROTATION_THROTTLE = 0.1  # seconds slept between batches
+
+# blind keyword index of DM content (see uia_backend.messaging.search), the
+# DM_SEARCH_INDEX_KEY is set per environment like SECRET_KEY
+# NOTE: changing the key requires running the backfill_dm_keywords command again
+DM_SEARCH_INDEX_BATCH_SIZE = 1000  # DMs indexed per transaction by the backfill
+
+# per-process cache of decrypted DM content (see uia_backend.messaging.encryption)
+DM_CONTENT_CACHE_SIZE = env.int("DM_CONTENT_CACHE_SIZE", default=10_000)  # 0 disables
+DM_CONTENT_CACHE_TTL = 60  # seconds
+
+# outbound io monitor (see uia_backend.libs.io_monitor.OutboundIOMonitorMiddleware)
+# raise on outbound network calls made while handling a request instead of logging them
+OUTBOUND_IO_MONITOR_STRICT = env.bool("OUTBOUND_IO_MONITOR_STRICT", default=False)
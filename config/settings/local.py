@@ -12,6 +12,10 @@ SECRET_KEY = env(
     "DJANGO_SECRET_KEY",
     default="GGNxoQNyy3ve5v4OcC0TNEZm0xTFRSnCx1BiInv3QfSiiDu8uTtEAfmvwBp0rgFw",
 )
+# HMAC key of the blind keyword index of DM content
+DM_SEARCH_INDEX_KEY = env(
+    "DM_SEARCH_INDEX_KEY", default="t4Bq8WmX0sJvKd2LrP7yNc5ZgHf3Ue9A"
+)
 # https://docs.djangoproject.com/en/dev/ref/settings/#allowed-hosts
 ALLOWED_HOSTS = ["localhost", "0.0.0.0", "127.0.0.1"]
 
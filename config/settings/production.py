@@ -13,6 +13,8 @@ from .base import env
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secret-key
 SECRET_KEY = env("DJANGO_SECRET_KEY")
+# HMAC key of the blind keyword index of DM content
+DM_SEARCH_INDEX_KEY = env("DM_SEARCH_INDEX_KEY")
 # https://docs.djangoproject.com/en/dev/ref/settings/#allowed-hosts
 ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
@@ -106,6 +108,8 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 # ------------------------------------------------------------------------------
 DEFAULT_FILE_STORAGE = "uia_backend.utils.storages.MediaRootS3Boto3Storage"
 MEDIA_URL = f"https://{aws_s3_domain}/media/"
+PRIVATE_FILE_STORAGE = "uia_backend.utils.storages.PrivateMediaRootS3Boto3Storage"
+PRIVATE_FILE_STORAGE_OPTIONS: dict[str, str] = {}
 
 # EMAIL
 # ------------------------------------------------------------------------------
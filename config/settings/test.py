@@ -12,6 +12,8 @@ SECRET_KEY = env(
     "DJANGO_SECRET_KEY",
     default="JYzReOYHklp7HdtW1ryLceFOLOva7WuWuHDkXnuOJEVuErvRLd0q95S3AKapP5oH",
 )
+# HMAC key of the blind keyword index of DM content
+DM_SEARCH_INDEX_KEY = env("DM_SEARCH_INDEX_KEY", default="test-dm-search-index-key")
 # https://docs.djangoproject.com/en/dev/ref/settings/#test-runner
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
@@ -39,3 +41,9 @@ DATABASES = {
         "NAME": "db.sqlite3",
     }
 }
+
+# fail tests that make outbound network calls on the request path
+OUTBOUND_IO_MONITOR_STRICT = True
+
+# pick up experiment changes made by a test immediately
+EXPERIMENT_ENGINE_VERSION_CHECK_INTERVAL = 0
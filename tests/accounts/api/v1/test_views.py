@@ -3,10 +3,13 @@ from unittest import mock
 from unittest.mock import MagicMock, patch
 from urllib.parse import urlencode
 
-import responses
 from django.conf import settings
+from django.contrib.auth.models import Permission
 from django.core import signing
 from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import serializers
@@ -39,8 +42,14 @@ from uia_backend.accounts.models import (
     FriendShipInvitation,
     PasswordResetAttempt,
     UserFriendShipSettings,
+    UserImportJob,
 )
 from uia_backend.cluster.models import Cluster, ClusterMembership, InternalCluster
+from uia_backend.experiments.constants import (
+    ER_001_PRE_ALPHA_USER_TESTING_TAG,
+    EXPERIMENT_SELECTION_TYPE_FFS,
+)
+from uia_backend.experiments.models import ExperimentConfig
 from uia_backend.libs.testutils import get_test_image_file
 from uia_backend.notification.constants import (
     FOLLOW_USER_NOTIFICATION,
@@ -52,10 +61,9 @@ class UserRegistrationAPIViewTests(APITestCase):
     def setUp(self) -> None:
         self.url = reverse("accounts_api_v1:user_registration")
 
-    @mock.patch("uia_backend.accounts.tasks.setup_user_profile_task.delay")
-    @mock.patch("uia_backend.notification.tasks.send_template_email_task.delay")
+    @mock.patch("uia_backend.accounts.tasks.process_user_registration_task.delay")
     def test_user_registration_valid_data_successful(
-        self, mock_send_email_task, mock_setup_profile_task
+        self, mock_process_registration_task
     ):
         """
         Test that user registration with valid data is successful.
@@ -72,7 +80,8 @@ class UserRegistrationAPIViewTests(APITestCase):
             "year_of_graduation": "2022",
         }
 
-        response = self.client.post(path=self.url, data=user_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(path=self.url, data=user_data)
         self.assertEqual(response.status_code, 201)
 
         expected_response_data = {
@@ -97,8 +106,34 @@ class UserRegistrationAPIViewTests(APITestCase):
 
         self.assertNotEqual(user.password, user_data["password"])
         self.assertTrue(user.check_password(user_data["password"]))
-        mock_send_email_task.assert_called_once()
-        mock_setup_profile_task.assert_called_once_with(user_id=user.id)
+        mock_process_registration_task.assert_called_once_with(
+            user_id=str(user.id), base_url="http://testserver/"
+        )
+
+    def test_user_registration_experiment_reached_capacity(self):
+        """Test that registration is rejected once ER001 is full."""
+
+        ExperimentConfig.objects.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            required_user_population=1,
+            enrolled_user_population=1,
+            selection_type=EXPERIMENT_SELECTION_TYPE_FFS,
+        )
+
+        user_data = {
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "johndoe@example.com",
+            "password": "f_g68Ata7jPqqmm",
+            "faculty": "Engineering",
+            "department": "Computer Science",
+            "year_of_graduation": "2022",
+        }
+
+        response = self.client.post(path=self.url, data=user_data)
+
+        self.assertEqual(response.status_code, 406)
+        self.assertFalse(CustomUser.objects.filter(email=user_data["email"]).exists())
 
     def test_user_registration_email_already_exists(self):
         """Test user registration fails with code 400 if user data already exits."""
@@ -373,18 +408,15 @@ class ChangePasswordAPIViewTests(APITestCase):
         self.url = reverse("accounts_api_v1:change_password")
         self.auth_headers = f"Bearer {AccessToken.for_user(self.user)}"
 
-    @responses.activate
+    @mock.patch(
+        "uia_backend.accounts.utils.get_location_from_ip", return_value="Region"
+    )
     @mock.patch("uia_backend.notification.tasks.send_template_email_task.delay")
-    def test_change_password_authenticated_user_successful(self, mock_send_email_task):
+    def test_change_password_authenticated_user_successful(
+        self, mock_send_email_task, mock_get_location_from_ip
+    ):
         """Test change password successful for authenticated user."""
 
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/127.0.0.1/region/",
-            body="Region",
-            status=200,
-        )
-
         valid_data = {"password": "f_g68Ata7jPqqmm"}
 
         self.client.credentials(
@@ -465,11 +497,21 @@ class LoginAPIViewTests(APITestCase):
                 "uia_backend.accounts.api.v1.serializers.generate_centrifugo_connection_token",
                 side_effect=["ws_token"],
             ) as mock_generate_cent_token,
+            mock.patch(
+                "uia_backend.accounts.api.v1.serializers.record_user_activity"
+            ) as mock_record_user_activity,
         ):
-            response = self.client.post(data=valid_data, path=self.url)
+            response = self.client.post(
+                data=valid_data, path=self.url, HTTP_X_APP_VERSION="1.2.0"
+            )
         self.maxDiff = None
         mock_generate_cent_token.assert_called_once()
         jwt_token_mock.assert_called_once()
+        mock_record_user_activity.assert_called_once_with(
+            user=self.user,
+            last_login=mock.ANY,
+            app_version="1.2.0",
+        )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
             response.json(),
@@ -487,6 +529,29 @@ class LoginAPIViewTests(APITestCase):
             },
         )
 
+    def test_long_app_version_is_truncated(self):
+        """Test that the client controlled app version header fits its column."""
+
+        with (
+            mock.patch(
+                "uia_backend.accounts.api.v1.serializers.generate_centrifugo_connection_token",
+                return_value="ws_token",
+            ),
+            mock.patch(
+                "uia_backend.accounts.api.v1.serializers.record_user_activity"
+            ) as mock_record_user_activity,
+        ):
+            response = self.client.post(
+                data={"email": "user@example.com", "password": "string"},
+                path=self.url,
+                HTTP_X_APP_VERSION="1" * 500,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        mock_record_user_activity.assert_called_once_with(
+            user=self.user, last_login=mock.ANY, app_version="1" * 100
+        )
+
     def test_invalid_credentials_email(self):
         """Test login with invalid email fails."""
         valid_data = {"email": "invalid@example.com", "password": "string"}
@@ -560,7 +625,7 @@ class ResetPasswordRequestAPIViewTests(APITestCase):
         "uia_backend.accounts.api.v1.views.PasswordRestThrottle.allow_request",
         side_effect=[True],
     )
-    @mock.patch("uia_backend.accounts.utils.send_template_email_task")
+    @mock.patch("uia_backend.notification.tasks.send_template_email_task.delay")
     def test_valid_email_provided(self, mock_send_email_task, mock_throttle):
         """Test that a valid email address is provided and OTP is successfully sent."""
 
@@ -1460,6 +1525,26 @@ class UserProfileListAPIViewTests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(response.json(), expected_data)
 
+    def test_list_follow_counts_cost_no_extra_queries(self):
+        """Test that follow counts are rendered without a query per profile."""
+        FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+
+        with CaptureQueriesContext(connection) as small_page_queries:
+            response = self.client.get(self.url)
+
+        profiles = {profile["id"]: profile for profile in response.json()["data"]}
+        self.assertEqual(profiles[str(self.user.id)]["following_count"], 1)
+        self.assertEqual(profiles[str(self.user_2.id)]["follower_count"], 1)
+
+        for index in range(5):
+            UserModelFactory.create(is_active=True, email=f"user{index}@uia.com")
+
+        with CaptureQueriesContext(connection) as large_page_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 7)
+        self.assertEqual(len(large_page_queries), len(small_page_queries))
+
     def test_search_with_matching_results(self):
         """Test search with matching result results."""
         query_params = {
@@ -1500,6 +1585,73 @@ class UserProfileListAPIViewTests(APITestCase):
         self.assertDictEqual(response.json(), expected_data)
 
 
+class UserAutocompleteAPIViewTests(APITestCase):
+    def setUp(self):
+        self.user = UserModelFactory.create(
+            email="user@example.com", display_name="johndoe", is_active=True
+        )
+        self.user_2 = UserModelFactory.create(
+            email="user2@example.com",
+            first_name="Joan",
+            last_name="Pike",
+            display_name="pikey",
+            is_active=True,
+        )
+        self.user_3 = UserModelFactory.create(
+            email="user3@example.com",
+            first_name="Jonah",
+            last_name="Ade",
+            display_name="jade",
+            is_active=False,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("accounts_api_v1:accounts_autocomplete")
+
+    def test_unauthenticated_user_cannot_autocomplete(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url, {"q": "jo"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_autocomplete(self):
+        """Test that active users whose names start with the term are returned."""
+
+        FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+
+        response = self.client.get(self.url, {"q": "Jo"})
+
+        self.assertEqual(response.status_code, 200)
+        # users with more followers are returned first
+        self.assertEqual(
+            response.json()["data"],
+            [
+                dict(ProfileSerializer().to_representation(instance=self.user_2)),
+                dict(ProfileSerializer().to_representation(instance=self.user)),
+            ],
+        )
+
+    def test_autocomplete_display_name_mention(self):
+        response = self.client.get(self.url, {"q": "@pik"})
+
+        self.assertEqual(
+            [user["id"] for user in response.json()["data"]], [str(self.user_2.id)]
+        )
+
+    def test_autocomplete_matches_prefix_only(self):
+        response = self.client.get(self.url, {"q": "ike"})
+        self.assertEqual(response.json()["data"], [])
+
+    def test_autocomplete_empty_term(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], [])
+
+    def test_autocomplete_limit(self):
+        with self.settings(USER_AUTOCOMPLETE_LIMIT=1):
+            response = self.client.get(self.url, {"q": "jo"})
+
+        self.assertEqual(len(response.json()["data"]), 1)
+
+
 class UserFollowerListAPIViewTests(APITestCase):
     def setUp(self) -> None:
         self.authenticated_user = UserModelFactory.create(is_active=True)
@@ -2084,3 +2236,104 @@ class UserGenericSettingsAPIViewTesTs(APITestCase):
 
         generic_settings.refresh_from_db()
         self.assertEqual(generic_settings.notification, data["notification"])
+
+
+class UserImportAPIViewTests(APITestCase):
+    def setUp(self):
+        self.user = UserModelFactory.create(email="admin@example.com")
+        self.url = reverse("accounts_api_v1:user_import")
+
+    def get_file(self, content: str) -> SimpleUploadedFile:
+        return SimpleUploadedFile(
+            "users.csv", content.encode(), content_type="text/csv"
+        )
+
+    def test_user_without_permission_cannot_import(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            self.url, {"file": self.get_file("first_name\n")}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_import(self):
+        """Test that the import is queued and the upload answered right away."""
+
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="add_customuser")
+        )
+        self.client.force_authenticate(user=self.user)
+
+        with (
+            mock.patch(
+                "uia_backend.accounts.api.v1.views.import_users_task.delay"
+            ) as mock_delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                self.url,
+                {
+                    "file": self.get_file(
+                        "first_name,last_name,email,faculty,department,"
+                        "year_of_graduation\n"
+                        "Ada,Obi,ada@example.com,Science,Physics,2020\n"
+                    )
+                },
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = UserImportJob.objects.get()
+        self.addCleanup(job.file.delete, save=False)
+        self.assertEqual(job.created_by, self.user)
+        self.assertEqual(job.status, UserImportJob.STATUS_PENDING)
+        self.assertEqual(
+            response.json()["data"],
+            {
+                "id": str(job.id),
+                "status": UserImportJob.STATUS_PENDING,
+                "report": None,
+                "error": "",
+                "created_datetime": serializers.DateTimeField().to_representation(
+                    job.created_datetime
+                ),
+                "updated_datetime": serializers.DateTimeField().to_representation(
+                    job.updated_datetime
+                ),
+            },
+        )
+        mock_delay.assert_called_once_with(job_id=str(job.id))
+        # nothing is imported on the request path
+        self.assertFalse(CustomUser.objects.filter(email="ada@example.com").exists())
+
+    def test_import_without_file(self):
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="add_customuser")
+        )
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {}, format="multipart")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_retrieve_import(self):
+        job = UserImportJob.objects.create(
+            created_by=self.user,
+            status=UserImportJob.STATUS_COMPLETED,
+            report={"rows_processed": 1, "rows_imported": 1},
+        )
+        url = reverse("accounts_api_v1:user_import_detail", args=[job.id])
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["status"], job.status)
+        self.assertEqual(response.json()["data"]["report"], job.report)
+
+        # only the user who queued the import can see its report
+        self.client.force_authenticate(
+            user=UserModelFactory.create(email="other@example.com")
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DataError
+from django.test import TestCase
+from django.utils import timezone
+
+from tests.accounts.test_models import UserModelFactory
+from uia_backend.accounts.activity import (
+    FLUSH_LOCK_CACHE_KEY,
+    SEQUENCE_CACHE_KEY,
+    flush_user_activity,
+    record_user_activity,
+)
+from uia_backend.accounts.models import CustomUser
+from uia_backend.accounts.tasks import flush_user_activity_task
+
+
+class UserActivityBufferTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.user_2 = UserModelFactory.create(email="user2@example.com")
+
+    def tearDown(self) -> None:
+        cache.clear()
+
+    def test_record_user_activity(self):
+        """Test that recorded values are only written by a flush."""
+
+        login_datetime = timezone.now()
+        record_user_activity(
+            user=self.user, last_login=login_datetime, app_version="1.0.0"
+        )
+
+        # nothing is written to the database
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+        self.assertIsNone(self.user.app_version)
+
+        self.assertEqual(flush_user_activity(), 1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, login_datetime)
+        self.assertEqual(self.user.app_version, "1.0.0")
+
+    def test_concurrent_records_keep_both_values(self):
+        """Test that a record made while another is being written is not lost."""
+
+        login_datetime = timezone.now()
+        recorded_values = []
+
+        def set_many(values, **kwargs):
+            recorded_values.append(values)
+            if len(recorded_values) == 1:
+                # another login of the same user buffers its value first
+                record_user_activity(user=self.user, app_version="2.0")
+            return cache.set_many(values, **kwargs)
+
+        with mock.patch(
+            "uia_backend.accounts.activity.cache", wraps=cache
+        ) as mock_cache:
+            mock_cache.set_many.side_effect = set_many
+            record_user_activity(user=self.user, last_login=login_datetime)
+
+        flush_user_activity()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, login_datetime)
+        self.assertEqual(self.user.app_version, "2.0")
+
+    def test_flush_after_the_sequence_is_evicted(self):
+        record_user_activity(user=self.user, app_version="1.0")
+        record_user_activity(user=self.user, app_version="1.1")
+        self.assertEqual(flush_user_activity(), 1)
+
+        # the sequence restarts below the flushed cursor
+        cache.delete(SEQUENCE_CACHE_KEY)
+        record_user_activity(user=self.user_2, app_version="2.0")
+
+        self.assertEqual(flush_user_activity(), 1)
+        self.user_2.refresh_from_db()
+        self.assertEqual(self.user_2.app_version, "2.0")
+
+    def test_flush_user_activity(self):
+        first_login = timezone.now() - timedelta(minutes=5)
+        second_login = timezone.now()
+
+        record_user_activity(user=self.user, last_login=first_login, app_version="1.0")
+        record_user_activity(user=self.user, last_login=second_login)
+        record_user_activity(user=self.user_2, app_version="2.0")
+
+        # select, update and the savepoint around the update
+        with self.assertNumQueries(4):
+            self.assertEqual(flush_user_activity(batch_size=10), 2)
+
+        self.user.refresh_from_db()
+        self.user_2.refresh_from_db()
+
+        self.assertEqual(self.user.last_login, second_login)
+        self.assertEqual(self.user.app_version, "1.0")
+        self.assertIsNone(self.user_2.last_login)
+        self.assertEqual(self.user_2.app_version, "2.0")
+
+    def test_flush_only_writes_new_records(self):
+        record_user_activity(user=self.user, last_login=timezone.now())
+        self.assertEqual(flush_user_activity(), 1)
+        self.assertEqual(flush_user_activity(), 0)
+
+        record_user_activity(user=self.user_2, app_version="2.0")
+        self.assertEqual(flush_user_activity(), 1)
+
+    def test_flush_in_batches(self):
+        for user in [self.user, self.user_2, self.user]:
+            record_user_activity(user=user, last_login=timezone.now())
+
+        with self.assertNumQueries(12):
+            self.assertEqual(flush_user_activity(batch_size=1), 3)
+
+    def test_flush_skips_users_that_can_not_be_written(self):
+        """Test that a value the database rejects does not block later flushes."""
+
+        record_user_activity(user=self.user, app_version="1.0")
+        record_user_activity(user=self.user_2, app_version="2.0")
+        save = CustomUser.save
+
+        def failing_save(user, *args, **kwargs):
+            if user.id == self.user.id:
+                raise DataError("value too long for type character varying(100)")
+            return save(user, *args, **kwargs)
+
+        with mock.patch.object(
+            CustomUser.objects, "bulk_update", side_effect=DataError
+        ), mock.patch.object(CustomUser, "save", autospec=True) as mock_save:
+            mock_save.side_effect = failing_save
+            with self.assertLogs(level="ERROR") as logs:
+                self.assertEqual(flush_user_activity(), 1)
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::activity::_write_user_activity:: "
+            "Failed to write user activity.",
+        )
+        self.user.refresh_from_db()
+        self.user_2.refresh_from_db()
+        self.assertIsNone(self.user.app_version)
+        self.assertEqual(self.user_2.app_version, "2.0")
+
+        # the failed batch is not retried
+        self.assertEqual(flush_user_activity(), 0)
+
+    def test_flush_is_skipped_while_another_flush_runs(self):
+        record_user_activity(user=self.user, last_login=timezone.now())
+        cache.set(FLUSH_LOCK_CACHE_KEY, True)
+
+        self.assertEqual(flush_user_activity(), 0)
+
+        cache.delete(FLUSH_LOCK_CACHE_KEY)
+        self.assertEqual(flush_user_activity(), 1)
+
+    def test_flush_user_activity_task(self):
+        record_user_activity(user=self.user, app_version="3.0")
+
+        with self.assertLogs(level="INFO") as logs:
+            self.assertEqual(flush_user_activity_task(), 1)
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::activity::flush_user_activity:: "
+            "Flushed buffered user activity.",
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.app_version, "3.0")
@@ -0,0 +1,164 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.accounts.test_models import FollowsFactory, UserModelFactory
+from uia_backend.accounts.activity import flush_user_activity, record_user_activity
+from uia_backend.accounts.authentication import (
+    CachedJWTAuthentication,
+    cache_user,
+    get_cached_user,
+    get_user_cache_version,
+)
+from uia_backend.accounts.models import CustomUser
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com", is_active=True)
+        self.authentication = CachedJWTAuthentication()
+
+    def tearDown(self) -> None:
+        cache.clear()
+
+    def authenticate(self, token=None):
+        token = token or AccessToken.for_user(self.user)
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.authentication.authenticate(request)
+
+    def test_user_is_cached(self):
+        user, _ = self.authenticate()
+        self.assertEqual(user, self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            user, _ = self.authenticate()
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(len(queries), 0)
+
+    def test_cached_user_is_read_in_one_cache_call(self):
+        """Test that an authenticated request with a cached user makes no writes."""
+
+        self.authenticate()
+
+        with mock.patch(
+            "uia_backend.accounts.authentication.cache", wraps=cache
+        ) as mock_cache:
+            user, _ = self.authenticate()
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(mock_cache.mock_calls, [mock.call.get_many(mock.ANY)])
+
+    def test_missing_version_is_started_once(self):
+        cache.clear()
+
+        with mock.patch(
+            "uia_backend.accounts.authentication.cache", wraps=cache
+        ) as mock_cache:
+            self.authenticate()
+
+        self.assertEqual(
+            [name for name, _, _ in mock_cache.mock_calls],
+            ["get_many", "get", "add", "get", "set"],
+        )
+
+    def test_profile_change_invalidates_cache(self):
+        self.authenticate()
+
+        self.user.first_name = "Jane"
+        self.user.save()
+        self.assertIsNone(get_cached_user(self.user.id))
+
+        user, _ = self.authenticate()
+        self.assertEqual(user.first_name, "Jane")
+
+    def test_password_change_invalidates_cache(self):
+        self.authenticate()
+
+        self.user.set_password("new_password")
+        self.user.save()
+
+        user, _ = self.authenticate()
+        self.assertTrue(user.check_password("new_password"))
+
+    def test_inactive_user(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+        self.assertIsNone(get_cached_user(self.user.id))
+
+    def test_inactive_cached_user(self):
+        """Test that inactive users are rejected even if they are in the cache."""
+
+        self.user.is_active = False
+        cache_user(self.user, get_user_cache_version(self.user.id))
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user(self):
+        token = AccessToken.for_user(self.user)
+        self.authenticate(token)
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_follow_invalidates_cache(self):
+        """Test that stored follow counters are not served stale from the cache."""
+
+        user_2 = UserModelFactory.create(email="user2@example.com")
+        self.authenticate()
+
+        FollowsFactory.create(user_from=user_2, user_to=self.user)
+
+        user, _ = self.authenticate()
+        self.assertEqual(user.follower_count, 1)
+
+    def test_stale_user_is_not_restored(self):
+        """
+        Test that a user loaded before a change is not served once it is cached.
+
+        e.g a request loads the user, the user is deactivated and only then does
+        the request cache its copy.
+        """
+
+        version = get_user_cache_version(self.user.id)
+        stale_user = CustomUser.objects.get(id=self.user.id)
+
+        self.user.is_active = False
+        self.user.save()
+        cache_user(stale_user, version)
+
+        self.assertIsNone(get_cached_user(self.user.id))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_evicted_version_does_not_restore_stale_user(self):
+        version = get_user_cache_version(self.user.id)
+        cache_user(self.user, version)
+
+        cache.delete(f"auth_user_version:{self.user.id}")
+
+        self.assertNotEqual(get_user_cache_version(self.user.id), version)
+        self.assertIsNone(get_cached_user(self.user.id))
+
+    def test_activity_flush_invalidates_cache(self):
+        self.authenticate()
+        record_user_activity(self.user, app_version="2.0.0")
+
+        flush_user_activity()
+
+        user, _ = self.authenticate()
+        self.assertEqual(user.app_version, "2.0.0")
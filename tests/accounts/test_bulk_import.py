@@ -0,0 +1,167 @@
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.db import IntegrityError, connection
+from django.test import TestCase
+
+from tests.accounts.test_models import UserModelFactory
+from uia_backend.accounts.bulk_import import (
+    UserImportError,
+    _copy_users,
+    import_users_from_csv,
+)
+from uia_backend.accounts.models import CustomUser, UserGenericSettings
+from uia_backend.cluster.models import ClusterMembership
+
+CSV_HEADER = (
+    "first_name,last_name,email,faculty,department,year_of_graduation,password\n"
+)
+
+
+class ImportUsersFromCSVTests(TestCase):
+    def test_method(self):
+        UserModelFactory.create(email="existing@example.com")
+        file = StringIO(
+            CSV_HEADER
+            + "Ada,Obi,ada@example.com,Science,Physics,2020,f_g68Ata7jPqqmm\n"
+            + "Bola,Ade,bola@example.com,Science,Physics,2020,\n"
+            + "Chi,Eze,ada@example.com,Science,Physics,2020,\n"
+            + "Dayo,Ojo,existing@example.com,Science,Physics,2020,\n"
+            + "Efe,Ali,not-an-email,Science,Physics,2020,\n"
+            + "Funmi,Bello,funmi@example.com,Science,Physics,1900,\n"
+        )
+
+        report = import_users_from_csv(file, batch_size=2)
+
+        self.assertEqual(report.rows_processed, 6)
+        self.assertEqual(report.rows_imported, 2)
+        self.assertEqual(report.error_count, 4)
+        self.assertEqual(
+            [(error["line"], error["email"]) for error in report.errors],
+            [
+                (4, "ada@example.com"),
+                (5, "existing@example.com"),
+                (6, "not-an-email"),
+                (7, "funmi@example.com"),
+            ],
+        )
+
+        ada = CustomUser.objects.get(email="ada@example.com")
+        self.assertTrue(ada.is_active)
+        self.assertTrue(ada.check_password("f_g68Ata7jPqqmm"))
+        bola = CustomUser.objects.get(email="bola@example.com")
+        self.assertFalse(bola.has_usable_password())
+
+        for user in [ada, bola]:
+            self.assertEqual(ClusterMembership.objects.filter(user=user).count(), 4)
+            self.assertTrue(UserGenericSettings.objects.filter(user=user).exists())
+
+    def test_max_errors(self):
+        file = StringIO(CSV_HEADER + "Efe,Ali,not-an-email,Science,Physics,2020,\n" * 3)
+
+        report = import_users_from_csv(file, max_errors=1)
+
+        self.assertEqual(report.error_count, 3)
+        self.assertEqual(len(report.errors), 1)
+
+    def test_missing_columns(self):
+        with self.assertRaisesMessage(
+            UserImportError,
+            "Missing columns: department, faculty, year_of_graduation.",
+        ):
+            import_users_from_csv(StringIO("first_name,last_name,email\n"))
+
+    def test_password_hashing_in_process_pool(self):
+        file = StringIO(
+            CSV_HEADER
+            + "Ada,Obi,ada@example.com,Science,Physics,2020,f_g68Ata7jPqqmm\n"
+            + "Bola,Ade,bola@example.com,Science,Physics,2020,\n"
+        )
+
+        report = import_users_from_csv(file, workers=2)
+
+        self.assertEqual(report.rows_imported, 2)
+        self.assertTrue(
+            CustomUser.objects.get(email="ada@example.com").check_password(
+                "f_g68Ata7jPqqmm"
+            )
+        )
+        self.assertFalse(
+            CustomUser.objects.get(email="bola@example.com").has_usable_password()
+        )
+
+    def test_batch_insert_fails(self):
+        file = StringIO(CSV_HEADER + "Ada,Obi,ada@example.com,Science,Physics,2020,\n")
+
+        with (
+            mock.patch(
+                "uia_backend.accounts.bulk_import._insert_users",
+                side_effect=IntegrityError("duplicate key"),
+            ),
+            self.assertLogs(level="ERROR") as logs,
+        ):
+            report = import_users_from_csv(file)
+
+        self.assertEqual(report.rows_imported, 0)
+        self.assertEqual(report.errors[0]["line"], 2)
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::bulk_import::_import_batch:: "
+            "Failed to import batch.",
+        )
+        self.assertFalse(CustomUser.objects.filter(email="ada@example.com").exists())
+
+
+class CopyUsersTests(TestCase):
+    def test_method(self):
+        user = CustomUser(
+            email="ada@example.com",
+            first_name="Ada",
+            last_name="Obi",
+            faculty="Science",
+            department="Physics",
+            year_of_graduation="2020",
+            password="!",
+        )
+
+        with mock.patch.object(connection, "cursor") as mock_cursor:
+            _copy_users([user])
+
+        copy_expert = mock_cursor.return_value.__enter__.return_value.copy_expert
+        copy_expert.assert_called_once()
+        sql, buffer = copy_expert.call_args.args
+
+        self.assertTrue(sql.startswith('COPY "accounts_customuser" ('))
+        self.assertIn('"email"', sql)
+        self.assertTrue(sql.endswith("FROM STDIN WITH (FORMAT csv, NULL '\\N')"))
+        row = buffer.getvalue()
+        self.assertIn("Ada,Obi,,ada@example.com,!", row)
+        # null columns e.g phone_number
+        self.assertIn(r"\N", row)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY is PostgreSQL only")
+    def test_copy_into_postgresql(self):
+        users = [
+            CustomUser(
+                email=f"user{index}@example.com",
+                first_name="Ada",
+                last_name="Obi",
+                faculty="Science",
+                department="Physics",
+                year_of_graduation="2020",
+                password="!",
+                is_active=True,
+            )
+            for index in range(3)
+        ]
+
+        _copy_users(users)
+
+        self.assertEqual(
+            set(
+                CustomUser.objects.filter(
+                    id__in=[user.id for user in users]
+                ).values_list("email", "is_active", "phone_number")
+            ),
+            {(user.email, True, None) for user in users},
+        )
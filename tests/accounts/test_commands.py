@@ -0,0 +1,216 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from uia_backend.accounts.hashers import Argon2Measurement
+from uia_backend.accounts.models import CustomUser
+from uia_backend.libs.geoip import MMapIPRangeResolver
+
+
+class BuildGeoIPDatabaseCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = Path(self.temp_dir.name) / "ip_ranges.csv"
+        self.output_path = Path(self.temp_dir.name) / "ip_ranges.db"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_method(self):
+        self.csv_path.write_text(
+            "start_ip,end_ip,region\n"
+            "8.8.8.0,8.8.8.255,California\n"
+            "41.58.0.0,41.58.127.255,Oyo\n"
+        )
+        stdout = StringIO()
+
+        call_command(
+            "build_geoip_database",
+            str(self.csv_path),
+            output=str(self.output_path),
+            stdout=stdout,
+        )
+
+        self.assertIn("Wrote 2 ip ranges", stdout.getvalue())
+        resolver = MMapIPRangeResolver(database_path=self.output_path)
+        self.assertEqual(resolver.resolve("41.58.0.10"), "Oyo")
+
+    def test_invalid_csv(self):
+        self.csv_path.write_text("start,end\n8.8.8.0,8.8.8.255\n")
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "build_geoip_database",
+                str(self.csv_path),
+                output=str(self.output_path),
+            )
+
+
+class BenchmarkUserSearchCommandTests(TestCase):
+    def test_method(self):
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_user_search",
+            "--users",
+            "30",
+            "--runs",
+            "1",
+            "--batch-size",
+            "10",
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        self.assertIn("30 users | search (icontains):", output)
+        self.assertIn("30 users | autocomplete (prefix):", output)
+        self.assertIn("Benchmark complete.", output)
+
+        # generated users are rolled back
+        self.assertFalse(
+            CustomUser.objects.filter(email__startswith="benchmark-").exists()
+        )
+
+
+class CalibratePasswordHasherCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = Path(self.temp_dir.name) / "argon2_calibration.json"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def fake_measurement(time_cost, memory_cost, parallelism, samples):
+        # 50ms per iteration per 64 MiB
+        seconds = 0.05 * time_cost * memory_cost / 65536
+        return Argon2Measurement(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            p99_seconds=seconds,
+            cpu_seconds=seconds,
+        )
+
+    def call_command(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch(
+            "uia_backend.accounts.management.commands.calibrate_password_hasher."
+            "measure_argon2_cost",
+            side_effect=self.fake_measurement,
+        ):
+            call_command(
+                "calibrate_password_hasher",
+                "--output",
+                str(self.output_path),
+                *args,
+                stdout=stdout,
+                stderr=stderr,
+            )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_method(self):
+        stdout, _ = self.call_command(
+            "--logins-per-second", "10", "--cpus", "4", "--max-latency-ms", "200"
+        )
+
+        calibration = json.loads(self.output_path.read_text())
+
+        # 65536 KiB with 4 iterations is the strongest fit for 200ms and 0.2 cpu seconds
+        self.assertEqual(calibration["time_cost"], 4)
+        self.assertEqual(calibration["memory_cost"], 65536)
+        self.assertEqual(calibration["parallelism"], 1)
+        self.assertEqual(calibration["logins_per_second"], 10)
+        self.assertIn(
+            {
+                "time_cost": 4,
+                "memory_cost": 65536,
+                "parallelism": 1,
+                "p99_ms": 200.0,
+                "cpu_ms": 200.0,
+            },
+            calibration["measurements"],
+        )
+        self.assertIn("Wrote time_cost=4 memory_cost=65536 parallelism=1", stdout)
+
+    def test_cpu_budget(self):
+        """Test that a higher login rate picks cheaper parameters."""
+
+        self.call_command(
+            "--logins-per-second", "40", "--cpus", "4", "--max-latency-ms", "200"
+        )
+
+        calibration = json.loads(self.output_path.read_text())
+        # 0.05 cpu seconds per hash
+        self.assertEqual(calibration["time_cost"], 3)
+        self.assertEqual(calibration["memory_cost"], 19456)
+
+    def test_no_parameters_fit_budget(self):
+        _, stderr = self.call_command("--logins-per-second", "1000", "--cpus", "1")
+
+        calibration = json.loads(self.output_path.read_text())
+        self.assertEqual(calibration["time_cost"], 2)
+        self.assertEqual(calibration["memory_cost"], 19456)
+        self.assertIn("No parameters fit the budget", stderr)
+
+
+class ImportUsersCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = Path(self.temp_dir.name) / "users.csv"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_method(self):
+        self.csv_path.write_text(
+            "first_name,last_name,email,faculty,department,year_of_graduation\n"
+            "Ada,Obi,ada@example.com,Science,Physics,2020\n"
+            "Efe,Ali,not-an-email,Science,Physics,2020\n"
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "import_users",
+            str(self.csv_path),
+            "--workers",
+            "1",
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        self.assertIn("Imported 1 of 2 rows", stdout.getvalue())
+        self.assertIn("line 3 (not-an-email):", stderr.getvalue())
+        self.assertTrue(CustomUser.objects.filter(email="ada@example.com").exists())
+
+    def test_more_errors_than_reported(self):
+        self.csv_path.write_text(
+            "first_name,last_name,email,faculty,department,year_of_graduation\n"
+            + "Efe,Ali,not-an-email,Science,Physics,2020\n" * 3
+        )
+        stderr = StringIO()
+
+        call_command(
+            "import_users",
+            str(self.csv_path),
+            "--workers",
+            "1",
+            "--max-errors",
+            "1",
+            stdout=StringIO(),
+            stderr=stderr,
+        )
+
+        self.assertIn("2 more errors not shown.", stderr.getvalue())
+
+    def test_invalid_csv(self):
+        self.csv_path.write_text("first_name,email\nAda,ada@example.com\n")
+
+        with self.assertRaises(CommandError):
+            call_command("import_users", str(self.csv_path))
@@ -0,0 +1,119 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase, override_settings
+
+from tests.accounts.test_models import UserModelFactory
+from uia_backend.accounts.hashers import (
+    AdaptiveArgon2PasswordHasher,
+    load_argon2_parameters,
+    measure_argon2_cost,
+)
+
+
+class Argon2CalibrationTestCase(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.calibration_file = Path(self.temp_dir.name) / "argon2_calibration.json"
+        load_argon2_parameters.cache_clear()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        load_argon2_parameters.cache_clear()
+
+    def write_calibration(self, **parameters) -> None:
+        self.calibration_file.write_text(json.dumps(parameters))
+        load_argon2_parameters.cache_clear()
+
+
+class LoadArgon2ParametersTests(Argon2CalibrationTestCase):
+    def test_method(self):
+        self.write_calibration(
+            time_cost=3, memory_cost=19456, parallelism=1, calibrated_datetime="x"
+        )
+
+        self.assertEqual(
+            load_argon2_parameters(str(self.calibration_file)),
+            {"time_cost": 3, "memory_cost": 19456, "parallelism": 1},
+        )
+
+    def test_missing_file(self):
+        self.assertEqual(load_argon2_parameters(str(self.calibration_file)), {})
+
+    def test_invalid_file(self):
+        self.calibration_file.write_text("{invalid")
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.assertEqual(load_argon2_parameters(str(self.calibration_file)), {})
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::hashers::load_argon2_parameters:: "
+            "Invalid argon2 calibration file.",
+        )
+
+
+class AdaptiveArgon2PasswordHasherTests(Argon2CalibrationTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.settings_override = override_settings(
+            ARGON2_CALIBRATION_FILE=str(self.calibration_file),
+            PASSWORD_HASHERS=[
+                "uia_backend.accounts.hashers.AdaptiveArgon2PasswordHasher"
+            ],
+        )
+        self.settings_override.enable()
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        super().tearDown()
+
+    def test_default_parameters(self):
+        hasher = AdaptiveArgon2PasswordHasher()
+
+        self.assertEqual(hasher.time_cost, 2)
+        self.assertEqual(hasher.memory_cost, 102400)
+        self.assertEqual(hasher.parallelism, 8)
+
+    def test_calibrated_parameters(self):
+        self.write_calibration(time_cost=1, memory_cost=1024, parallelism=1)
+
+        encoded = AdaptiveArgon2PasswordHasher().encode("password", "saltsaltsalt")
+        decoded = AdaptiveArgon2PasswordHasher().decode(encoded)
+
+        self.assertTrue(encoded.startswith("argon2$argon2id$"))
+        self.assertEqual(decoded["time_cost"], 1)
+        self.assertEqual(decoded["memory_cost"], 1024)
+        self.assertEqual(decoded["parallelism"], 1)
+
+    def test_password_is_rehashed_when_parameters_change(self):
+        self.write_calibration(time_cost=1, memory_cost=1024, parallelism=1)
+        user = UserModelFactory.create(email="user@example.com")
+        user.set_password("password")
+        user.save()
+
+        self.write_calibration(time_cost=2, memory_cost=2048, parallelism=1)
+        self.assertTrue(user.check_password("password"))
+
+        user.refresh_from_db()
+        hasher = identify_hasher(user.password)
+        decoded = hasher.decode(user.password)
+
+        self.assertIsInstance(hasher, AdaptiveArgon2PasswordHasher)
+        self.assertEqual(decoded["time_cost"], 2)
+        self.assertEqual(decoded["memory_cost"], 2048)
+        self.assertFalse(hasher.must_update(user.password))
+
+
+class MeasureArgon2CostTests(TestCase):
+    def test_method(self):
+        measurement = measure_argon2_cost(
+            time_cost=1, memory_cost=1024, parallelism=1, samples=3
+        )
+
+        self.assertEqual(measurement.time_cost, 1)
+        self.assertEqual(measurement.memory_cost, 1024)
+        self.assertGreater(measurement.p99_seconds, 0)
+        self.assertGreaterEqual(measurement.cpu_seconds, 0)
@@ -0,0 +1,53 @@
+from django.test import TestCase
+
+from tests.accounts.test_models import FollowsFactory, UserModelFactory
+from uia_backend.accounts.models import CustomUser
+
+
+class FollowCountersSignalTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.user_2 = UserModelFactory.create(email="user2@example.com")
+        self.user_3 = UserModelFactory.create(email="user3@example.com")
+
+    def test_follow_increments_counters(self):
+        FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+        FollowsFactory.create(user_from=self.user_3, user_to=self.user_2)
+
+        self.user.refresh_from_db()
+        self.user_2.refresh_from_db()
+        self.user_3.refresh_from_db()
+
+        self.assertEqual(self.user.following_count, 1)
+        self.assertEqual(self.user.follower_count, 0)
+        self.assertEqual(self.user_2.follower_count, 2)
+        self.assertEqual(self.user_2.following_count, 0)
+        self.assertEqual(self.user_3.following_count, 1)
+
+    def test_updating_follow_does_not_change_counters(self):
+        follow = FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+        follow.save()
+
+        self.user_2.refresh_from_db()
+        self.assertEqual(self.user_2.follower_count, 1)
+
+    def test_unfollow_decrements_counters(self):
+        follow = FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+        follow.delete()
+
+        self.user.refresh_from_db()
+        self.user_2.refresh_from_db()
+
+        self.assertEqual(self.user.following_count, 0)
+        self.assertEqual(self.user_2.follower_count, 0)
+
+    def test_deleting_user_decrements_counters(self):
+        FollowsFactory.create(user_from=self.user, user_to=self.user_2)
+        FollowsFactory.create(user_from=self.user_2, user_to=self.user)
+
+        self.user.delete()
+
+        self.user_2.refresh_from_db()
+        self.assertEqual(self.user_2.follower_count, 0)
+        self.assertEqual(self.user_2.following_count, 0)
+        self.assertFalse(CustomUser.objects.filter(id=self.user.id).exists())
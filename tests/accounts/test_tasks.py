@@ -1,7 +1,9 @@
 import random
 from datetime import timedelta
+from unittest import mock
 
 from dateutil.relativedelta import relativedelta
+from django.core.files.base import ContentFile
 from django.test import TestCase
 from django.utils import timezone
 
@@ -10,11 +12,22 @@ from tests.accounts.test_models import (
     PasswordResetAttemptFactory,
     UserModelFactory,
 )
-from uia_backend.accounts.models import PasswordResetAttempt
+from uia_backend.accounts import constants as account_constants
+from uia_backend.accounts.models import (
+    CustomUser,
+    EmailVerification,
+    PasswordResetAttempt,
+    UserGenericSettings,
+    UserImportJob,
+)
 from uia_backend.accounts.tasks import (
     change_status_of_expired_password_reset_records,
     deactivate_expired_email_verification_records,
+    import_users_task,
+    process_user_registration_task,
+    send_password_change_email_with_remote_region_task,
 )
+from uia_backend.experiments.models import PreAlphaUserTestingExperiment
 
 
 class DeactivateExpiredEmailVerificationRecords(TestCase):
@@ -115,3 +128,146 @@ class ChangeStatusOfExpiredPasswordResetRecords(TestCase):
         for record in active_records:
             record.refresh_from_db()
             self.assertNotEqual(record.status, PasswordResetAttempt.STATUS_EXPIRED)
+
+
+class SendPasswordChangeEmailWithRemoteRegionTask(TestCase):
+    def test_method(self):
+        with (
+            mock.patch(
+                "uia_backend.libs.geoip.IPApiCoResolver.resolve",
+                return_value="Oyo",
+            ) as mock_resolve,
+            mock.patch(
+                "uia_backend.accounts.tasks.send_template_email_task"
+            ) as mock_send_email_task,
+        ):
+            send_password_change_email_with_remote_region_task(
+                email="user@example.com",
+                internal_tracker_id="tracker_id",
+                ip_address="41.58.0.1",
+                user_agent="Mozilla/5.0",
+            )
+
+        mock_resolve.assert_called_once_with("41.58.0.1")
+        mock_send_email_task.assert_called_once_with(
+            recipients=["user@example.com"],
+            internal_tracker_ids=["tracker_id"],
+            template_id=account_constants.PASSWORD_CHANGE_TEMPLATE_ID,
+            template_merge_data={
+                "user@example.com": {
+                    "ip_address": "41.58.0.1",
+                    "user_agent": "Mozilla/5.0",
+                    "region": "Oyo",
+                },
+            },
+        )
+
+
+class ProcessUserRegistrationTaskTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(is_active=False)
+
+    def test_method(self):
+        """Test that the registration pipeline can run more than once safely."""
+
+        with mock.patch(
+            "uia_backend.notification.tasks.send_template_email_task.delay"
+        ) as mock_send_email_task:
+            process_user_registration_task(
+                user_id=str(self.user.id), base_url="http://testserver/"
+            )
+            process_user_registration_task(
+                user_id=str(self.user.id), base_url="http://testserver/"
+            )
+
+        mock_send_email_task.assert_called_once()
+        link = mock_send_email_task.call_args.kwargs["template_merge_data"][
+            self.user.email
+        ]["link"]
+        self.assertTrue(link.startswith("http://testserver/"))
+
+        self.assertEqual(EmailVerification.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(
+            PreAlphaUserTestingExperiment.objects.filter(user=self.user).count(), 1
+        )
+        self.assertEqual(UserGenericSettings.objects.filter(user=self.user).count(), 1)
+
+    def test_user_does_not_exist(self):
+        user_id = "a9a4fa2a-8e09-4c2b-8cd1-55d6a1d1c5f5"
+
+        with (
+            mock.patch(
+                "uia_backend.notification.tasks.send_template_email_task.delay"
+            ) as mock_send_email_task,
+            self.assertLogs(level="WARNING") as logs,
+        ):
+            process_user_registration_task(
+                user_id=user_id, base_url="http://testserver/"
+            )
+
+        mock_send_email_task.assert_not_called()
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::tasks::process_user_registration_task:: "
+            "User not found.",
+        )
+
+
+class ImportUsersTaskTests(TestCase):
+    def create_job(self, content: str) -> UserImportJob:
+        job = UserImportJob.objects.create(
+            created_by=UserModelFactory.create(email="admin@example.com"),
+            file=ContentFile(content.encode(), name="users.csv"),
+        )
+        self.addCleanup(job.file.storage.delete, job.file.name)
+        return job
+
+    def test_method(self):
+        job = self.create_job(
+            "\ufefffirst_name,last_name,email,faculty,department,year_of_graduation\n"
+            "Ada,Obi,ada@example.com,Science,Physics,2020\n"
+            "Efe,Ali,not-an-email,Science,Physics,2020\n"
+        )
+        file_name = job.file.name
+
+        import_users_task(job_id=str(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, UserImportJob.STATUS_COMPLETED)
+        self.assertEqual(job.report["rows_processed"], 2)
+        self.assertEqual(job.report["rows_imported"], 1)
+        self.assertEqual(job.report["errors"][0]["line"], 3)
+        self.assertTrue(CustomUser.objects.filter(email="ada@example.com").exists())
+        # the uploaded personal data is not kept
+        self.assertFalse(job.file)
+        self.assertFalse(job.file.storage.exists(file_name))
+
+    def test_invalid_file(self):
+        job = self.create_job("first_name\n")
+
+        import_users_task(job_id=str(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, UserImportJob.STATUS_FAILED)
+        self.assertEqual(
+            job.error,
+            "Missing columns: department, email, faculty, last_name, "
+            "year_of_graduation.",
+        )
+        self.assertIsNone(job.report)
+        self.assertFalse(job.file)
+
+    def test_job_is_only_run_once(self):
+        job = self.create_job("first_name\n")
+        UserImportJob.objects.filter(id=job.id).update(
+            status=UserImportJob.STATUS_RUNNING
+        )
+
+        with self.assertLogs(level="WARNING") as logs:
+            import_users_task(job_id=str(job.id))
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::accounts::tasks::import_users_task:: "
+            "Pending user import job not found.",
+        )
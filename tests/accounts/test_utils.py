@@ -1,8 +1,5 @@
 from unittest import mock
 
-import requests
-import responses
-from django.conf import settings
 from django.core import signing
 from django.http import HttpRequest
 from django.test import TestCase, override_settings
@@ -43,7 +40,7 @@ class SendUserRegistrationEmailVerificationMailTests(TestCase):
             ) as mock_send_email_task,
         ):
             send_user_registration_email_verification_mail(
-                user=self.user, request=self.request
+                user=self.user, base_url=self.request.build_absolute_uri("/")
             )
 
         verification_record = EmailVerification.objects.filter(
@@ -69,92 +66,19 @@ class SendUserRegistrationEmailVerificationMailTests(TestCase):
 
 
 class GetLocationFromIpTests(TestCase):
-    @responses.activate
-    def test_happy_path_valid_ip(self):
-        ip = "8.8.8.8"
-        expected_region = "California"
-
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/{ip}/region/",
-            body=expected_region,
-            status=200,
-        )
-        result = get_location_from_ip(ip)
-        self.assertEqual(result, expected_region)
-
-    @responses.activate
-    def test_edge_case_http_error(self):
-        ip = "8.8.8.8"
-
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/{ip}/region/",
-            body=requests.exceptions.HTTPError(),
-        )
-
-        with self.assertLogs(level="ERROR") as log:
-            result = get_location_from_ip(ip)
-
-        self.assertIsNone(result)
-        self.assertEqual(
-            log.output[0],
-            "ERROR:root:"
-            "uia_backend::accounts::utils::get_location_from_ip:: HTTPError occured",
-        )
-
-    @responses.activate
-    def test_edge_case_invalid_ip(self):
-        ip = "invalid_ip"
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/{ip}/region/",
-            body="Undefined",
-            status=200,
-        )
-
-        result = get_location_from_ip(ip)
-        self.assertIsNone(result)
-
-    @responses.activate
-    def test_edge_case_api_error(self):
-        ip = "8.8.8.8"
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/{ip}/region/",
-            json={"error": "Internal Server Error"},
-            status=500,
-        )
-
-        with self.assertLogs(level="ERROR") as log:
-            result = get_location_from_ip(ip)
-
-        self.assertIsNone(result)
-        self.assertEqual(
-            log.output[0],
-            "ERROR:root:"
-            "uia_backend::accounts::utils::get_location_from_ip:: API error occured",
-        )
+    def test_method(self):
+        with mock.patch(
+            "uia_backend.accounts.utils.get_geoip_resolver"
+        ) as mock_get_geoip_resolver:
+            mock_get_geoip_resolver.return_value.resolve.return_value = "California"
+            result = get_location_from_ip("8.8.8.8")
 
-    @responses.activate
-    def test_edge_case_api_quota_exceeded(self):
-        ip = "127.0.0.1"
-        responses.add(
-            responses.GET,
-            f"{settings.IP_API_CO_URL}/{ip}/region/",
-            json={"error": "API quota exceeded"},
-            status=429,
-        )
+        self.assertEqual(result, "California")
+        mock_get_geoip_resolver.return_value.resolve.assert_called_once_with("8.8.8.8")
 
-        with self.assertLogs(level="ERROR") as log:
-            result = get_location_from_ip(ip)
-
-        self.assertIsNone(result)
-        self.assertEqual(
-            log.output[0],
-            "ERROR:root:"
-            "uia_backend::accounts::utils::get_location_from_ip:: API free quota has been exceeded",
-        )
+    def test_ip_not_resolved(self):
+        # no local database is configured in tests
+        self.assertIsNone(get_location_from_ip("invalid_ip"))
 
 
 class SendUserPasswordChangeEmailNotificationTests(TestCase):
@@ -164,21 +88,18 @@ class SendUserPasswordChangeEmailNotificationTests(TestCase):
         self.request.META["REMOTE_ADDR"] = "127.0.0.1"
         self.request.META["HTTP_USER_AGENT"] = "Mozilla/5.0"
 
-    @responses.activate
     def test_send_user_password_change_email_notification(self):
-        responses.add(
-            responses.GET,
-            f'{settings.IP_API_CO_URL}/{self.request.META["REMOTE_ADDR"]}/region/',
-            body="Region",
-            status=200,
-        )
-
-        with mock.patch(
-            "uia_backend.notification.tasks.send_template_email_task.delay"
-        ) as mock_send_email_task:
+        with (
+            mock.patch(
+                "uia_backend.accounts.utils.get_location_from_ip",
+                return_value="Region",
+            ),
+            mock.patch(
+                "uia_backend.notification.tasks.send_template_email_task.delay"
+            ) as mock_send_email_task,
+        ):
             send_user_password_change_email_notification(self.user, self.request)
 
-        mock_send_email_task.assert_called_once
         mock_send_email_task.assert_called_once_with(
             recipients=[self.user.email],
             internal_tracker_ids=[str(self.user.id)],
@@ -192,26 +113,42 @@ class SendUserPasswordChangeEmailNotificationTests(TestCase):
             },
         )
 
-    @responses.activate
-    def test_send_user_password_change_email_notification_edge_case(self):
-        responses.add(
-            responses.GET,
-            f'{settings.IP_API_CO_URL}/{self.request.META["REMOTE_ADDR"]}/region/',
-            json={"error": "API quota exceeded"},
-            status=429,
-        )
+    def test_send_user_password_change_email_notification_remote_fallback(self):
+        """Test that region is resolved off the request path when local lookup fails."""
 
-        with mock.patch(
-            "uia_backend.notification.tasks.send_template_email_task.delay"
-        ) as mock_send_email_task:
-            with self.assertLogs(level="ERROR") as log:
-                send_user_password_change_email_notification(self.user, self.request)
-
-        self.assertEqual(
-            log.output[0],
-            "ERROR:root:"
-            "uia_backend::accounts::utils::get_location_from_ip:: API free quota has been exceeded",
+        with (
+            mock.patch(
+                "uia_backend.accounts.utils.get_location_from_ip", return_value=None
+            ),
+            mock.patch(
+                "uia_backend.notification.tasks.send_template_email_task.delay"
+            ) as mock_send_email_task,
+            mock.patch(
+                "uia_backend.accounts.tasks.send_password_change_email_with_remote_region_task.delay"
+            ) as mock_remote_region_task,
+        ):
+            send_user_password_change_email_notification(self.user, self.request)
+
+        mock_send_email_task.assert_not_called()
+        mock_remote_region_task.assert_called_once_with(
+            email=self.user.email,
+            internal_tracker_id=str(self.user.id),
+            ip_address=self.request.META["REMOTE_ADDR"],
+            user_agent=self.request.META["HTTP_USER_AGENT"],
         )
+
+    @override_settings(GEOIP_REMOTE_FALLBACK=False)
+    def test_send_user_password_change_email_notification_edge_case(self):
+        with (
+            mock.patch(
+                "uia_backend.accounts.utils.get_location_from_ip", return_value=None
+            ),
+            mock.patch(
+                "uia_backend.notification.tasks.send_template_email_task.delay"
+            ) as mock_send_email_task,
+        ):
+            send_user_password_change_email_notification(self.user, self.request)
+
         mock_send_email_task.assert_called_once_with(
             recipients=[self.user.email],
             internal_tracker_ids=[str(self.user.id)],
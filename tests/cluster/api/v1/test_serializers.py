@@ -14,7 +14,15 @@ class ClusterSerializerTests(CustomSerializerTests):
     serializer_class = ClusterSerializer
 
     REQUIRED_FIELDS = ["title"]
-    NON_REQUIRED_FIELDS = ["id", "created_by", "is_default", "description", "icon"]
+    NON_REQUIRED_FIELDS = [
+        "id",
+        "created_by",
+        "is_default",
+        "description",
+        "icon",
+        "member_count",
+        "post_count",
+    ]
 
     VALID_DATA = [
         {
@@ -1,5 +1,6 @@
 import uuid
 from datetime import timedelta
+from unittest import mock
 from urllib.parse import urlencode
 
 from django.test import override_settings
@@ -17,17 +18,19 @@ from tests.cluster.test_models import (
 from uia_backend.accounts.api.v1.serializers import ProfileSerializer
 from uia_backend.cluster.constants import (
     ADD_CLUSTER_MEMBER_PERMISSION,
+    CLUSTER_CREATOR_PERMISSION_MASK,
     REMOVE_CLUSTER_MEMBER_PERMISSION,
     UPDATE_CLUSTER_PERMISSION,
     VIEW_CLUSTER_PERMISSION,
 )
-from uia_backend.cluster.models import Cluster, ClusterInvitation
-from uia_backend.libs.permissions import (
-    assign_object_permissions,
-    check_object_permissions,
-    unassign_object_permissions,
+from uia_backend.cluster.models import Cluster, ClusterInvitation, ClusterMembership
+from uia_backend.cluster.utils import (
+    assign_cluster_permissions,
+    unassign_cluster_permissions,
 )
+from uia_backend.libs.permissions import check_object_permissions
 from uia_backend.libs.testutils import get_test_image_file
+from uia_backend.notification.constants import CLUSTER_INVITATION_NOTIFICATION
 
 
 class ClusterListCreateAPIViewTests(APITestCase):
@@ -66,6 +69,8 @@ class ClusterListCreateAPIViewTests(APITestCase):
                     "description": internal_cluster.description,
                     "icon": internal_cluster.icon,
                     "created_by": None,
+                    "member_count": 1,
+                    "post_count": 0,
                     "is_default": True,
                 },
                 {
@@ -74,6 +79,8 @@ class ClusterListCreateAPIViewTests(APITestCase):
                     "description": user_cluster.description,
                     "icon": user_cluster.icon,
                     "created_by": None,
+                    "member_count": 1,
+                    "post_count": 0,
                     "is_default": False,
                 },
             ],
@@ -136,6 +143,8 @@ class ClusterListCreateAPIViewTests(APITestCase):
                     "description": user_cluster.description,
                     "icon": user_cluster.icon,
                     "created_by": None,
+                    "member_count": 1,
+                    "post_count": 0,
                     "is_default": False,
                 },
             ],
@@ -190,6 +199,8 @@ class ClusterListCreateAPIViewTests(APITestCase):
                 "description": "string",
                 "icon": f"http://testserver/media/clusters/{cluster.id}/icon/icon.png",
                 "created_by": str(self.user.id),
+                "member_count": 1,
+                "post_count": 0,
                 "is_default": False,
             },
         }
@@ -216,10 +227,10 @@ class ClusterDetailAPIViewTests(APITestCase):
         self.client.force_authenticate(user=self.user)
         self.cluster = ClusterFactory.create(title="A cluster I joined")
         ClusterMembershipFactory.create(cluster=self.cluster, user=self.user)
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_retrieve_cluster__case_1(self):
@@ -237,6 +248,8 @@ class ClusterDetailAPIViewTests(APITestCase):
                 "description": self.cluster.description,
                 "icon": self.cluster.icon,
                 "created_by": None,
+                "member_count": 1,
+                "post_count": 0,
                 "is_default": False,
             },
         }
@@ -293,6 +306,8 @@ class ClusterDetailAPIViewTests(APITestCase):
                 "description": "Everything Goes.",
                 "icon": f"http://testserver/media/clusters/{self.cluster.id}/icon/my-Icon.png",
                 "created_by": None,
+                "member_count": 1,
+                "post_count": 0,
                 "is_default": False,
             },
         }
@@ -316,10 +331,10 @@ class ClusterDetailAPIViewTests(APITestCase):
         """Test that member without update permission is unable to update cluster perimission."""
 
         # remove user's update permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         url = reverse(
@@ -385,14 +400,14 @@ class ClusterMembershipListAPIViewTests(APITestCase):
         self.membership = ClusterMembershipFactory.create(
             cluster=self.cluster, user=self.user
         )
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[
                 VIEW_CLUSTER_PERMISSION,
                 ADD_CLUSTER_MEMBER_PERMISSION,
                 REMOVE_CLUSTER_MEMBER_PERMISSION,
             ],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_list_cluster_members__case_1(self):
@@ -436,14 +451,122 @@ class ClusterMembershipListAPIViewTests(APITestCase):
             expected_data,
         )
 
+    def test_list_cluster_members__pagination(self):
+        """Test that cluster members are paged through with a cursor."""
+
+        memberships = [self.membership] + [
+            ClusterMembershipFactory.create(
+                cluster=self.cluster,
+                user=UserModelFactory.create(email=f"member_{index}@example.com"),
+            )
+            for index in range(4)
+        ]
+        # someone else's cluster
+        ClusterMembershipFactory.create(
+            cluster=ClusterFactory.create(), user=memberships[1].user
+        )
+
+        url = reverse(
+            "cluster_api_v1:list_cluster_members", args=[str(self.cluster.id)]
+        )
+
+        # cluster lookup, permission check and the page, no count query
+        with self.assertNumQueries(3):
+            response = self.client.get(path=url, data={"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        # the stored member count
+        self.assertEqual(response.json()["count"], 5)
+        self.assertIsNone(response.json()["previous"])
+
+        member_ids = [member["id"] for member in response.json()["data"]]
+        while response.json()["next"]:
+            response = self.client.get(path=response.json()["next"])
+            self.assertEqual(response.status_code, 200)
+            member_ids += [member["id"] for member in response.json()["data"]]
+
+        self.assertEqual(
+            member_ids,
+            [str(membership.id) for membership in reversed(memberships)],
+        )
+
+    def test_list_cluster_members__ordered_by_name(self):
+        """Test that pages ordered by a name shared by many members are stable."""
+
+        users = [self.user] + [
+            UserModelFactory.create(
+                email=f"member_{index}@example.com",
+                first_name="Ada" if index < 4 else "Bola",
+            )
+            for index in range(6)
+        ]
+        memberships = [self.membership] + [
+            ClusterMembershipFactory.create(cluster=self.cluster, user=user)
+            for user in users[1:]
+        ]
+        expected_ids = [
+            str(membership.id)
+            for membership in sorted(
+                memberships,
+                key=lambda membership: (membership.user.first_name, membership.id),
+            )
+        ]
+
+        url = reverse(
+            "cluster_api_v1:list_cluster_members", args=[str(self.cluster.id)]
+        )
+
+        response = self.client.get(
+            path=url, data={"limit": 2, "ordering": "user__first_name"}
+        )
+        member_ids = [member["id"] for member in response.json()["data"]]
+        while response.json()["next"]:
+            response = self.client.get(path=response.json()["next"])
+            self.assertEqual(response.status_code, 200)
+            member_ids += [member["id"] for member in response.json()["data"]]
+
+        self.assertEqual(member_ids, expected_ids)
+
+        # and back again
+        previous_ids = [member["id"] for member in response.json()["data"]]
+        while response.json()["previous"]:
+            response = self.client.get(path=response.json()["previous"])
+            self.assertEqual(response.status_code, 200)
+            previous_ids = [
+                member["id"] for member in response.json()["data"]
+            ] + previous_ids
+
+        self.assertEqual(previous_ids, expected_ids)
+
+    def test_list_cluster_members__search_count(self):
+        """Test that the count of a search is the number of matching members."""
+
+        ClusterMembershipFactory.create(
+            cluster=self.cluster,
+            user=UserModelFactory.create(email="ada@example.com", first_name="Ada"),
+        )
+        ClusterMembershipFactory.create(
+            cluster=self.cluster,
+            user=UserModelFactory.create(email="bola@example.com", first_name="Bola"),
+        )
+
+        url = reverse(
+            "cluster_api_v1:list_cluster_members", args=[str(self.cluster.id)]
+        )
+        response = self.client.get(path=url, data={"search": "Ada"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(len(response.json()["data"]), 1)
+
     def test_list_cluster_members__case_2(self):
         """Test Retrieving cluster members when user does not have view permission."""
 
         # remove user's view permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         expected_data = {
@@ -488,14 +611,14 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
         self.membership = ClusterMembershipFactory.create(
             cluster=self.cluster, user=self.user
         )
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[
                 VIEW_CLUSTER_PERMISSION,
                 ADD_CLUSTER_MEMBER_PERMISSION,
                 REMOVE_CLUSTER_MEMBER_PERMISSION,
             ],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_retrieve_cluster_member__case_1(self):
@@ -537,10 +660,10 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
         )
 
         # remove user's view permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         response = self.client.get(path=url)
@@ -612,8 +735,8 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
             REMOVE_CLUSTER_MEMBER_PERMISSION,
         ]
 
-        assign_object_permissions(
-            permissions=permissions_to_check, assignee=user, obj=self.cluster
+        assign_cluster_permissions(
+            permissions=permissions_to_check, user=user, cluster=self.cluster
         )
 
         url = reverse(
@@ -645,10 +768,10 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
         )
 
         # remove user's remove cluster member permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[REMOVE_CLUSTER_MEMBER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         expected_data = {
@@ -692,10 +815,10 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
         )
 
         # remove user's remove cluster member permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[REMOVE_CLUSTER_MEMBER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         response = self.client.delete(path=url)
@@ -751,6 +874,113 @@ class ClusterMembersDetailAPIViewTests(APITestCase):
         )
 
 
+@mock.patch("uia_backend.cluster.utils.CentrifugoConnector")
+class ClusterMembersBulkAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com", is_active=True)
+        self.client.force_authenticate(user=self.user)
+        self.cluster = ClusterFactory.create(title="A cluster I joined")
+        ClusterMembershipFactory.create(
+            cluster=self.cluster,
+            user=self.user,
+            permission_mask=CLUSTER_CREATOR_PERMISSION_MASK,
+        )
+        self.users = [
+            UserModelFactory.create(email=f"student{index}@example.com", is_active=True)
+            for index in range(3)
+        ]
+        self.url = reverse(
+            "cluster_api_v1:bulk_add_remove_cluster_members",
+            args=[str(self.cluster.id)],
+        )
+
+    def test_add_cluster_members(self, mock_connector):
+        user_ids = [str(user.id) for user in self.users]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(path=self.url, data={"users": user_ids})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [membership["user"]["id"] for membership in response.json()["data"]],
+            user_ids,
+        )
+        self.assertEqual(
+            ClusterMembership.objects.filter(cluster=self.cluster).count(), 4
+        )
+        mock_connector.return_value.broadcast_event.assert_called_once()
+
+    def test_add_cluster_members__inactive_user(self, mock_connector):
+        self.users[0].is_active = False
+        self.users[0].save()
+
+        response = self.client.post(
+            path=self.url, data={"users": [str(user.id) for user in self.users]}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertDictEqual(
+            response.json()["data"]["users"],
+            {str(self.users[0].id): ["User not found."]},
+        )
+        self.assertEqual(
+            ClusterMembership.objects.filter(cluster=self.cluster).count(), 1
+        )
+        mock_connector.return_value.broadcast_event.assert_not_called()
+
+    def test_remove_cluster_members(self, mock_connector):
+        for user in self.users:
+            ClusterMembershipFactory.create(cluster=self.cluster, user=user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                path=self.url,
+                data={"users": [str(self.users[0].id), str(self.users[1].id)]},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            response.json()["data"]["users"],
+            [str(self.users[0].id), str(self.users[1].id)],
+        )
+        self.assertEqual(
+            set(
+                ClusterMembership.objects.filter(cluster=self.cluster).values_list(
+                    "user_id", flat=True
+                )
+            ),
+            {self.user.id, self.users[2].id},
+        )
+        mock_connector.return_value.broadcast_event.assert_called_once()
+
+    def test_bulk_members__no_permission(self, mock_connector):
+        unassign_cluster_permissions(
+            permissions=[
+                ADD_CLUSTER_MEMBER_PERMISSION,
+                REMOVE_CLUSTER_MEMBER_PERMISSION,
+            ],
+            user=self.user,
+            cluster=self.cluster,
+        )
+        data = {"users": [str(self.users[0].id)]}
+
+        self.assertEqual(self.client.post(path=self.url, data=data).status_code, 403)
+        self.assertEqual(self.client.delete(path=self.url, data=data).status_code, 403)
+
+    def test_bulk_members__default_cluster(self, mock_connector):
+        self.cluster.internal_cluster = InternalClusterFactory.create(name="global")
+        self.cluster.save()
+
+        response = self.client.post(
+            path=self.url, data={"users": [str(self.users[0].id)]}
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            ClusterMembership.objects.filter(cluster=self.cluster).count(), 1
+        )
+
+
 class ClusterInvitationListAPIViewTests(APITestCase):
     def setUp(self) -> None:
         self.user = UserModelFactory.create(email="user@example.com", is_active=True)
@@ -759,14 +989,14 @@ class ClusterInvitationListAPIViewTests(APITestCase):
         self.membership = ClusterMembershipFactory.create(
             cluster=self.cluster, user=self.user
         )
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[
                 VIEW_CLUSTER_PERMISSION,
                 ADD_CLUSTER_MEMBER_PERMISSION,
                 REMOVE_CLUSTER_MEMBER_PERMISSION,
             ],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_list_cluster_invitation__case_1(self):
@@ -822,10 +1052,10 @@ class ClusterInvitationListAPIViewTests(APITestCase):
         )
 
         # remove user's view permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         response = self.client.get(path=url)
@@ -886,10 +1116,10 @@ class ClusterInvitationListAPIViewTests(APITestCase):
         )
 
         # remove user's view permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[ADD_CLUSTER_MEMBER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         request_data = {"status": 0, "duration": 5, "user": str(user_to_invite.id)}
@@ -926,6 +1156,176 @@ class ClusterInvitationListAPIViewTests(APITestCase):
         self.assertDictEqual(response.json(), expected_response)
 
 
+class ClusterInvitationBulkCreateAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com", is_active=True)
+        self.client.force_authenticate(user=self.user)
+        self.cluster = ClusterFactory.create(title="A cluster I joined")
+        ClusterMembershipFactory.create(
+            cluster=self.cluster,
+            user=self.user,
+            permission_mask=CLUSTER_CREATOR_PERMISSION_MASK,
+        )
+        self.users_to_invite = [
+            UserModelFactory.create(email=f"student{index}@example.com", is_active=True)
+            for index in range(3)
+        ]
+        self.url = reverse(
+            "cluster_api_v1:bulk_create_cluster_invitation",
+            args=[str(self.cluster.id)],
+        )
+
+    @mock.patch(
+        "uia_backend.notification.utils.notification_senders."
+        "send_in_app_notification_task.delay"
+    )
+    def test_bulk_create_cluster_invitation(self, mock_send_in_app_notification):
+        """Test that all users are invited with a fixed number of queries."""
+
+        user_ids = [str(user.id) for user in self.users_to_invite]
+
+        # cluster lookup, permission check, 3 validation queries and the insert
+        with self.assertNumQueries(6), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                path=self.url,
+                # duplicates are only invited once
+                data={"users": user_ids + user_ids[:1], "duration": 2},
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [invitation["user"] for invitation in response.json()["data"]], user_ids
+        )
+
+        invitations = ClusterInvitation.objects.filter(cluster=self.cluster)
+        self.assertEqual(invitations.count(), 3)
+        for invitation in invitations:
+            self.assertEqual(invitation.created_by, self.user)
+            self.assertEqual(invitation.duration, timedelta(days=2))
+            self.assertEqual(
+                invitation.status, ClusterInvitation.INVITATION_STATUS_PENDING
+            )
+            self.assertEqual(
+                invitation.expires_at.replace(microsecond=0),
+                (invitation.created_datetime + timedelta(days=2)).replace(
+                    microsecond=0
+                ),
+            )
+
+        # a single notification task for the whole batch
+        mock_send_in_app_notification.assert_called_once()
+        self.assertCountEqual(
+            mock_send_in_app_notification.call_args.kwargs["recipients"],
+            [user.id for user in self.users_to_invite],
+        )
+        self.assertEqual(
+            mock_send_in_app_notification.call_args.kwargs["notification_type"],
+            CLUSTER_INVITATION_NOTIFICATION,
+        )
+
+    @mock.patch(
+        "uia_backend.notification.utils.notification_senders."
+        "send_in_app_notification_task.delay"
+    )
+    def test_bulk_create_cluster_invitation__invalid_users(
+        self, mock_send_in_app_notification
+    ):
+        """Test that no invitation is created when any user can not be invited."""
+
+        member, invited, inactive = self.users_to_invite
+        ClusterMembershipFactory.create(cluster=self.cluster, user=member)
+        ClusterInvitationFactory.create(
+            user=invited,
+            created_by=self.user,
+            cluster=self.cluster,
+            duration=timedelta(days=2),
+        )
+        inactive.is_active = False
+        inactive.save()
+        unknown_user_id = uuid.uuid4()
+        valid_user = UserModelFactory.create(
+            email="student@example.com", is_active=True
+        )
+
+        response = self.client.post(
+            path=self.url,
+            data={
+                "users": [
+                    str(self.user.id),
+                    str(member.id),
+                    str(invited.id),
+                    str(inactive.id),
+                    str(unknown_user_id),
+                    str(valid_user.id),
+                ],
+                "duration": 2,
+            },
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertDictEqual(
+            response.json()["data"]["users"],
+            {
+                str(self.user.id): [
+                    "Invalid user. Can not send inivitation to this user."
+                ],
+                str(member.id): ["User is already a member of this cluster."],
+                str(invited.id): [
+                    "User already has a pending invitation to this cluster."
+                ],
+                str(inactive.id): ["User not found."],
+                str(unknown_user_id): ["User not found."],
+            },
+        )
+        self.assertEqual(
+            ClusterInvitation.objects.filter(cluster=self.cluster).count(), 1
+        )
+        mock_send_in_app_notification.assert_not_called()
+
+    def test_bulk_create_cluster_invitation__expired_invitation(self):
+        """Test that users whose last invitation expired can be invited again."""
+
+        invitation = ClusterInvitationFactory.create(
+            user=self.users_to_invite[0],
+            created_by=self.user,
+            cluster=self.cluster,
+            duration=timedelta(days=1),
+        )
+        invitation.created_datetime -= timedelta(days=2)
+        invitation.save()
+
+        response = self.client.post(
+            path=self.url,
+            data={"users": [str(self.users_to_invite[0].id)], "duration": 1},
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_bulk_create_cluster_invitation__no_permission(self):
+        """Test that members without add member permission can not invite users."""
+
+        unassign_cluster_permissions(
+            permissions=[ADD_CLUSTER_MEMBER_PERMISSION],
+            user=self.user,
+            cluster=self.cluster,
+        )
+
+        response = self.client.post(
+            path=self.url,
+            data={"users": [str(self.users_to_invite[0].id)], "duration": 1},
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ClusterInvitation.objects.exists())
+
+    def test_bulk_create_cluster_invitation__validation(self):
+        response = self.client.post(path=self.url, data={"users": [], "duration": 11})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("users", response.json()["data"])
+        self.assertIn("duration", response.json()["data"])
+
+
 class ClusterInvitationDetailAPIViewTests(APITestCase):
     def setUp(self) -> None:
         self.user = UserModelFactory.create(email="user@example.com", is_active=True)
@@ -934,14 +1334,14 @@ class ClusterInvitationDetailAPIViewTests(APITestCase):
         self.membership = ClusterMembershipFactory.create(
             cluster=self.cluster, user=self.user
         )
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[
                 VIEW_CLUSTER_PERMISSION,
                 ADD_CLUSTER_MEMBER_PERMISSION,
                 REMOVE_CLUSTER_MEMBER_PERMISSION,
             ],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_retrieve_cluster_invitation__case_1(self):
@@ -995,10 +1395,10 @@ class ClusterInvitationDetailAPIViewTests(APITestCase):
         )
 
         # remove user's view permission
-        unassign_object_permissions(
+        unassign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         response = self.client.get(path=url)
@@ -1264,3 +1664,31 @@ class UserClusterInvitationDetailAPIView(APITestCase):
         self.assertEqual(
             self.invitation_record.status, ClusterInvitation.INVITATION_STATUS_REJECTED
         )
+
+    def test_update_user_cluster_invitation__expired(self):
+        """Test that invitations past expires_at read as expired and can not be accepted."""
+
+        self.invitation_record.created_datetime -= timedelta(days=11)
+        self.invitation_record.save()
+
+        response = self.client.get(path=self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"]["status"],
+            ClusterInvitation.INVITATION_STATUS_EXPIRED,
+        )
+
+        response = self.client.patch(
+            path=self.url,
+            data={"status": ClusterInvitation.INVITATION_STATUS_ACCEPTED},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"]["status"],
+            ClusterInvitation.INVITATION_STATUS_EXPIRED,
+        )
+
+        self.invitation_record.refresh_from_db()
+        self.assertEqual(
+            self.invitation_record.status, ClusterInvitation.INVITATION_STATUS_PENDING
+        )
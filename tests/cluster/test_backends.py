@@ -0,0 +1,104 @@
+from django.test import TestCase
+
+from tests.accounts.test_models import UserModelFactory
+from tests.cluster.test_models import ClusterFactory, ClusterMembershipFactory
+from uia_backend.cluster.backends import ClusterMembershipPermissionBackend
+from uia_backend.cluster.constants import (
+    ADD_CLUSTER_MEMBER_PERMISSION,
+    CLUSTER_CREATOR_PERMISSION_MASK,
+    UPDATE_CLUSTER_PERMISSION,
+    VIEW_CLUSTER_PERMISSION,
+)
+
+
+class ClusterMembershipPermissionBackendTests(TestCase):
+    def setUp(self) -> None:
+        self.backend = ClusterMembershipPermissionBackend()
+        self.user = UserModelFactory.create(is_active=True)
+        self.cluster = ClusterFactory.create()
+
+    def test_get_all_permissions(self):
+        ClusterMembershipFactory.create(
+            user=self.user,
+            cluster=self.cluster,
+            permission_mask=CLUSTER_CREATOR_PERMISSION_MASK,
+        )
+
+        with self.assertNumQueries(1):
+            permissions = self.backend.get_all_permissions(self.user, self.cluster)
+
+        self.assertEqual(
+            permissions,
+            {
+                "view_cluster_permission",
+                "change_cluster_permission",
+                "add_cluster_member_permission",
+                "remove_cluster_member_permission",
+            },
+        )
+
+    def test_get_all_permissions__member(self):
+        ClusterMembershipFactory.create(user=self.user, cluster=self.cluster)
+
+        self.assertEqual(
+            self.backend.get_all_permissions(self.user, self.cluster),
+            {VIEW_CLUSTER_PERMISSION},
+        )
+
+    def test_get_all_permissions__no_permissions(self):
+        # not a member
+        self.assertEqual(
+            self.backend.get_all_permissions(self.user, self.cluster), set()
+        )
+
+        # member without permissions
+        ClusterMembershipFactory.create(
+            user=self.user, cluster=self.cluster, permission_mask=0
+        )
+        self.assertEqual(
+            self.backend.get_all_permissions(self.user, self.cluster), set()
+        )
+
+        # not a cluster
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_all_permissions(self.user, None), set())
+            self.assertEqual(
+                self.backend.get_all_permissions(self.user, self.user), set()
+            )
+
+    def test_get_all_permissions__inactive_user(self):
+        ClusterMembershipFactory.create(user=self.user, cluster=self.cluster)
+        self.user.is_active = False
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.backend.get_all_permissions(self.user, self.cluster), set()
+            )
+
+    def test_has_perm(self):
+        ClusterMembershipFactory.create(user=self.user, cluster=self.cluster)
+
+        self.assertTrue(
+            self.backend.has_perm(self.user, VIEW_CLUSTER_PERMISSION, self.cluster)
+        )
+        self.assertTrue(
+            self.backend.has_perm(
+                self.user, f"cluster.{VIEW_CLUSTER_PERMISSION}", self.cluster
+            )
+        )
+        self.assertFalse(
+            self.backend.has_perm(self.user, UPDATE_CLUSTER_PERMISSION, self.cluster)
+        )
+        self.assertFalse(
+            self.backend.has_perm(
+                self.user, f"messaging.{VIEW_CLUSTER_PERMISSION}", self.cluster
+            )
+        )
+
+        # through the auth backends
+        self.assertTrue(
+            self.user.has_perm(f"cluster.{VIEW_CLUSTER_PERMISSION}", self.cluster)
+        )
+        self.assertFalse(
+            self.user.has_perm(f"cluster.{ADD_CLUSTER_MEMBER_PERMISSION}", self.cluster)
+        )
@@ -0,0 +1,38 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from uia_backend.accounts.models import CustomUser
+from uia_backend.cluster.models import Cluster
+
+
+class BenchmarkClusterPermissionsCommandTests(TestCase):
+    def test_method(self):
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_cluster_permissions",
+            "--users",
+            "20",
+            "--clusters",
+            "5",
+            "--clusters-per-user",
+            "2",
+            "--posts-per-cluster",
+            "2",
+            "--runs",
+            "3",
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        self.assertIn("20 users | permission check (guardian):", output)
+        self.assertIn("20 users | permission check (membership mask):", output)
+        self.assertIn("Benchmark complete.", output)
+
+        # generated data is rolled back
+        self.assertFalse(
+            CustomUser.objects.filter(email__startswith="benchmark-").exists()
+        )
+        self.assertFalse(Cluster.objects.exists())
@@ -0,0 +1,79 @@
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from guardian.models import UserObjectPermission
+
+from tests.accounts.test_models import UserModelFactory
+from tests.cluster.test_models import ClusterFactory, ClusterMembershipFactory
+from uia_backend.cluster.constants import (
+    ADD_CLUSTER_MEMBER_PERMISSION,
+    VIEW_CLUSTER_PERMISSION,
+)
+from uia_backend.cluster.models import Cluster
+
+migration = import_module(
+    "uia_backend.cluster.migrations.0006_clustermembership_permission_mask"
+)
+
+
+class ClusterMembershipPermissionMaskMigrationTests(TestCase):
+    def setUp(self) -> None:
+        self.schema_editor = mock.Mock(connection=connection)
+        self.content_type = ContentType.objects.get_for_model(Cluster)
+        self.cluster = ClusterFactory.create()
+        self.creator = UserModelFactory.create(email="creator@example.com")
+        self.member = UserModelFactory.create(email="member@example.com")
+        self.creator_membership = ClusterMembershipFactory.create(
+            user=self.creator, cluster=self.cluster, permission_mask=0
+        )
+        self.member_membership = ClusterMembershipFactory.create(
+            user=self.member, cluster=self.cluster, permission_mask=0
+        )
+
+    def assign(self, user, codename):
+        UserObjectPermission.objects.create(
+            user=user,
+            permission=Permission.objects.get(
+                content_type=self.content_type, codename=codename
+            ),
+            content_type=self.content_type,
+            object_pk=str(self.cluster.id),
+        )
+
+    def test_move_guardian_permissions_to_memberships(self):
+        self.assign(self.creator, VIEW_CLUSTER_PERMISSION)
+        self.assign(self.creator, ADD_CLUSTER_MEMBER_PERMISSION)
+        self.member_membership.permission_mask = 1
+        self.member_membership.save()
+
+        migration.move_guardian_permissions_to_memberships(apps, self.schema_editor)
+
+        self.creator_membership.refresh_from_db()
+        self.member_membership.refresh_from_db()
+        self.assertEqual(self.creator_membership.permission_mask, 1 | 4)
+        # members without guardian rows had no permissions
+        self.assertEqual(self.member_membership.permission_mask, 0)
+        self.assertFalse(UserObjectPermission.objects.exists())
+
+    def test_move_membership_permissions_to_guardian(self):
+        self.creator_membership.permission_mask = 1 | 4
+        self.creator_membership.save()
+
+        migration.move_membership_permissions_to_guardian(apps, self.schema_editor)
+
+        self.assertEqual(
+            set(
+                UserObjectPermission.objects.values_list(
+                    "user_id", "object_pk", "permission__codename"
+                )
+            ),
+            {
+                (self.creator.id, str(self.cluster.id), VIEW_CLUSTER_PERMISSION),
+                (self.creator.id, str(self.cluster.id), ADD_CLUSTER_MEMBER_PERMISSION),
+            },
+        )
@@ -1,5 +1,10 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
 from factory.django import DjangoModelFactory
+from freezegun import freeze_time
 
+from tests.accounts.test_models import UserModelFactory
 from uia_backend.cluster.models import (
     Cluster,
     ClusterInvitation,
@@ -33,3 +38,46 @@ class ClusterInvitationFactory(DjangoModelFactory):
 class ClusterMembershipFactory(DjangoModelFactory):
     class Meta:
         model = ClusterMembership
+
+
+class ClusterInvitationTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create()
+        self.cluster = ClusterFactory.create()
+
+    def test_expires_at(self):
+        with freeze_time(lambda: datetime(2023, 6, 25, tzinfo=timezone.utc)):
+            invitation = ClusterInvitationFactory.create(
+                user=self.user,
+                cluster=self.cluster,
+                created_by=self.user,
+                duration=timedelta(days=2),
+            )
+            self.assertEqual(
+                invitation.expires_at, datetime(2023, 6, 27, tzinfo=timezone.utc)
+            )
+            self.assertFalse(invitation.is_expired)
+            self.assertEqual(
+                invitation.effective_status,
+                ClusterInvitation.INVITATION_STATUS_PENDING,
+            )
+
+            invitation.duration = timedelta(days=5)
+            invitation.save(update_fields=["duration"])
+
+        invitation.refresh_from_db()
+        self.assertEqual(
+            invitation.expires_at, datetime(2023, 6, 30, tzinfo=timezone.utc)
+        )
+
+        # read as expired before the expiry sweep runs
+        self.assertTrue(invitation.is_expired)
+        self.assertEqual(
+            invitation.effective_status, ClusterInvitation.INVITATION_STATUS_EXPIRED
+        )
+
+        invitation.status = ClusterInvitation.INVITATION_STATUS_ACCEPTED
+        self.assertFalse(invitation.is_expired)
+        self.assertEqual(
+            invitation.effective_status, ClusterInvitation.INVITATION_STATUS_ACCEPTED
+        )
@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from tests.accounts.test_models import UserModelFactory
+from tests.cluster.test_models import ClusterFactory, ClusterMembershipFactory
+
+
+class ClusterMemberCountSignalTests(TestCase):
+    def setUp(self) -> None:
+        self.cluster = ClusterFactory.create()
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.user_2 = UserModelFactory.create(email="user2@example.com")
+
+    def test_joining_increments_member_count(self):
+        ClusterMembershipFactory.create(cluster=self.cluster, user=self.user)
+        membership = ClusterMembershipFactory.create(
+            cluster=self.cluster, user=self.user_2
+        )
+        membership.save()
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 2)
+
+    def test_leaving_decrements_member_count(self):
+        membership = ClusterMembershipFactory.create(
+            cluster=self.cluster, user=self.user
+        )
+        ClusterMembershipFactory.create(cluster=self.cluster, user=self.user_2)
+
+        membership.delete()
+        self.user_2.delete()
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 0)
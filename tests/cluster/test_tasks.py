@@ -50,3 +50,39 @@ class DeactivateExpiredClusterInvitation(TestCase):
         for record in expired_record:
             record.refresh_from_db()
             self.assertEqual(record.status, ClusterInvitation.INVITATION_STATUS_EXPIRED)
+
+    def test_batches(self):
+        """Test that expired invitations are deactivated in batches, oldest first."""
+
+        with freeze_time(lambda: datetime(2023, 6, 25)):
+            expired_records = ClusterInvitationFactory.create_batch(
+                user=self.user,
+                cluster=self.cluster,
+                created_by=self.user,
+                duration=timedelta(days=1),
+                size=5,
+            )
+            already_accepted = ClusterInvitationFactory.create(
+                user=self.user,
+                cluster=self.cluster,
+                created_by=self.user,
+                status=ClusterInvitation.INVITATION_STATUS_ACCEPTED,
+            )
+
+        # 3 batches of 2 rows, each batch selects then updates
+        with self.assertNumQueries(6):
+            expired_count = deactivate_expired_cluster_invitation(batch_size=2)
+
+        self.assertEqual(expired_count, 5)
+        for record in expired_records:
+            record.refresh_from_db()
+            self.assertEqual(record.status, ClusterInvitation.INVITATION_STATUS_EXPIRED)
+
+        already_accepted.refresh_from_db()
+        self.assertEqual(
+            already_accepted.status, ClusterInvitation.INVITATION_STATUS_ACCEPTED
+        )
+
+        # nothing left to do
+        with self.assertNumQueries(1):
+            self.assertEqual(deactivate_expired_cluster_invitation(batch_size=2), 0)
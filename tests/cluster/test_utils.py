@@ -1,3 +1,6 @@
+from unittest import mock
+
+from django.db.models.signals import post_delete
 from django.test import TestCase
 
 from tests.accounts.test_models import UserModelFactory
@@ -6,332 +9,250 @@ from tests.cluster.test_models import (
     ClusterMembershipFactory,
     InternalClusterFactory,
 )
+from uia_backend.cluster.constants import (
+    CENT_EVENT_CLUSTER_MEMBERS_ADDED,
+    CENT_EVENT_CLUSTER_MEMBERS_REMOVED,
+    CLUSTER_CREATOR_PERMISSION_MASK,
+    CLUSTER_MEMBER_PERMISSION_MASK,
+    REMOVE_CLUSTER_MEMBER_PERMISSION,
+    UPDATE_CLUSTER_PERMISSION,
+    VIEW_CLUSTER_PERMISSION,
+)
 from uia_backend.cluster.models import Cluster, ClusterMembership, InternalCluster
-from uia_backend.cluster.utils import ClusterManager
+from uia_backend.cluster.utils import (
+    ClusterManager,
+    add_cluster_members,
+    assign_cluster_permissions,
+    get_cluster_permission_mask,
+    get_inserted_memberships,
+    remove_cluster_members,
+    unassign_cluster_permissions,
+)
 
 
-class ClusterManagerTests(TestCase):
+class ClusterPermissionTests(TestCase):
     def setUp(self) -> None:
         self.user = UserModelFactory.create()
-        self.cluster_manager = ClusterManager(user=self.user)
-
-    def test__create_default_cluster__cluster_already_exits__case_1(self):
-        """
-        Test behaviour of ClusterManager.__create_default_cluster when InternalCluster aleady exits and has Cluster.
-        """
-
-        # SETUP
-        cluster_name = "Some Default Cluster"
-        internal_cluster = InternalClusterFactory.create(name="Some Default Cluster")
-        ClusterFactory.create(internal_cluster=internal_cluster, title=cluster_name)
-
-        # TEST
-        self.cluster_manager._create_default_cluster(name=cluster_name, description="")
-
-        # check that a new cluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-    def test__create_default_cluster__cluster_already_exits__case_2(self):
-        """
-        Test behaviour of ClusterManager.__create_default_cluster
-        when InternalCluster aleady exits but has no Cluster.
-        """
-
-        # SETUP
-        cluster_name = "Some Default Cluster"
-        internal_cluster = InternalClusterFactory.create(name="Some Default Cluster")
-
-        # TEST
-        self.cluster_manager._create_default_cluster(name=cluster_name, description="")
-
-        # check that a new InternalCluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-
-        # check that Cluster was created
-        internal_cluster.refresh_from_db()
-        self.assertEqual(Cluster.objects.all().count(), 1)
-        self.assertIsNotNone(internal_cluster.cluster)
-        self.assertEqual(internal_cluster.cluster.title, cluster_name.capitalize())
-
-    def test__create_default_cluster__does_not_exits(self):
-        """Test behaviour of ClusterManager.__create_default_cluster when InternalCluster does not exits."""
-
-        # SETUP
-        cluster_name = "SomeDefaultCluster"
-        # TEST
-        self.cluster_manager._create_default_cluster(name=cluster_name, description="")
-
-        # check that a new InternalCluster was created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        internal_cluster = InternalCluster.objects.first()
-        cluster = Cluster.objects.first()
-
-        self.assertEqual(internal_cluster.cluster, cluster)
-        self.assertEqual(internal_cluster.name, cluster_name)
-        self.assertEqual(cluster.title, cluster_name.capitalize())
-
-    def test__create_membership__case_1(self):
-        """Test behaviour of ClusterManager._create_membership when user is not a member."""
-
-        # SETUP
-        internal_cluster = InternalClusterFactory.create(name="Some Default Cluster")
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title=internal_cluster.name,
+        self.cluster = ClusterFactory.create()
+        self.membership = ClusterMembershipFactory.create(
+            user=self.user, cluster=self.cluster
         )
 
-        # TEST
-        self.cluster_manager._create_membership(cluster=cluster)
-
-        cluster.refresh_from_db()
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-    def test__create_membership__case_2(self):
-        """Test behaviour of ClusterManager._create_membership when user is already a member."""
-
-        # SETUP
-        internal_cluster = InternalClusterFactory.create(name="Some Default Cluster")
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title=internal_cluster.name,
+    def test_get_cluster_permission_mask(self):
+        self.assertEqual(get_cluster_permission_mask([]), 0)
+        self.assertEqual(
+            get_cluster_permission_mask([VIEW_CLUSTER_PERMISSION]),
+            CLUSTER_MEMBER_PERMISSION_MASK,
         )
-        membership = ClusterMembershipFactory.create(cluster=cluster, user=self.user)
+        self.assertEqual(get_cluster_permission_mask([UPDATE_CLUSTER_PERMISSION]), 2)
 
-        # TEST
-        self.cluster_manager._create_membership(cluster=cluster)
-        self.assertEqual(ClusterMembership.objects.all().count(), 1)
-        self.assertIn(self.user, cluster.members.all())
-
-        membership = ClusterMembership.objects.filter(
-            cluster=cluster, user=self.user
-        ).first()
-        self.assertIsNotNone(membership)
-        self.assertIsNone(membership.invitation)
-
-    def test__add_user_to_global_cluster__case_1(self):
-        """Test the behaviour of ClusterManager._add_user_to_global_cluster when global cluster already exists."""
-
-        # SETUP
-        global_cluster_name = "global"
-        internal_cluster = InternalClusterFactory.create(name=global_cluster_name)
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title="Global",
+    def test_assign_and_unassign_cluster_permissions(self):
+        self.assertEqual(
+            self.membership.permission_mask, CLUSTER_MEMBER_PERMISSION_MASK
         )
 
-        # TEST
-        self.cluster_manager._add_user_to_global_cluster()
-
-        # check that a new cluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
-
-        self.assertEqual(membership_object.cluster, cluster)
-        self.assertEqual(membership_object.user, self.user)
-
-    def test__add_user_to_global_cluster__case_2(self):
-        """Test the behaviour of ClusterManager._add_user_to_global_cluster when global cluster does not exists."""
-
-        # TEST
-        self.cluster_manager._add_user_to_global_cluster()
-
-        # check that a new cluster was created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        global_cluster = InternalCluster.objects.filter(
-            name="global", description=""
-        ).first()
-        self.assertIsNotNone(global_cluster)
-        self.assertIsNotNone(global_cluster.cluster)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
-
-        self.assertEqual(membership_object.cluster, global_cluster.cluster)
-        self.assertEqual(membership_object.user, self.user)
-
-    def test__add_user_to_faculty_cluster__case_1(self):
-        """Test the behaviour of ClusterManager._add_user_to_faculty_cluster when faculty cluster already exists."""
-
-        # SETUP
-        faculty_cluster_name = f"faculty of {self.user.faculty}"
-        internal_cluster = InternalClusterFactory.create(name=faculty_cluster_name)
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title=faculty_cluster_name.capitalize(),
+        assign_cluster_permissions(
+            permissions=[UPDATE_CLUSTER_PERMISSION, REMOVE_CLUSTER_MEMBER_PERMISSION],
+            user=self.user,
+            cluster=self.cluster,
         )
-
-        # TEST
-        self.cluster_manager._add_user_to_faculty_cluster()
-
-        # check that a new cluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
-
-        self.assertEqual(membership_object.cluster, cluster)
-        self.assertEqual(membership_object.user, self.user)
-
-    def test__add_user_to_faculty_cluster__case_2(self):
-        """Test the behaviour of ClusterManager._add_user_to_faculty_cluster when faculty cluster does not exist."""
-
-        # TEST
-        self.cluster_manager._add_user_to_faculty_cluster()
-
-        # check that a new cluster was created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        faculty_cluster = InternalCluster.objects.filter(
-            name=f"faculty of {self.user.faculty}", description=""
-        ).first()
-        self.assertIsNotNone(faculty_cluster)
-        self.assertIsNotNone(faculty_cluster.cluster)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
-
-        self.assertEqual(membership_object.cluster, faculty_cluster.cluster)
-        self.assertEqual(membership_object.user, self.user)
-
-    def test__add_user_to_department_cluster__case_1(self):
-        """
-        Test the behaviour of ClusterManager._add_user_to_department_cluster
-        when department cluster already exists.
-        """
-
-        # SETUP
-        department_cluster_name = f"{self.user.department} department"
-        internal_cluster = InternalClusterFactory.create(name=department_cluster_name)
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title=department_cluster_name.capitalize(),
+        self.membership.refresh_from_db()
+        self.assertEqual(self.membership.permission_mask, 1 | 2 | 8)
+
+        # assigning a permission twice keeps a single bit
+        assign_cluster_permissions(
+            permissions=[UPDATE_CLUSTER_PERMISSION],
+            user=self.user,
+            cluster=self.cluster,
         )
+        self.membership.refresh_from_db()
+        self.assertEqual(self.membership.permission_mask, 1 | 2 | 8)
 
-        # TEST
-        self.cluster_manager._add_user_to_department_cluster()
-
-        # check that a new cluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
-
-        self.assertEqual(membership_object.cluster, cluster)
-        self.assertEqual(membership_object.user, self.user)
-
-    def test__add_user_to_department_cluster__case_2(self):
-        """
-        Test the behaviour of ClusterManager._add_user_to_department_cluster
-        when department cluster does not exist.
-        """
+        unassign_cluster_permissions(
+            permissions=[VIEW_CLUSTER_PERMISSION, REMOVE_CLUSTER_MEMBER_PERMISSION],
+            user=self.user,
+            cluster=self.cluster,
+        )
+        self.membership.refresh_from_db()
+        self.assertEqual(self.membership.permission_mask, 2)
 
-        # TEST
-        self.cluster_manager._add_user_to_department_cluster()
+    def test_creator_mask_has_all_permissions(self):
+        self.assertEqual(CLUSTER_CREATOR_PERMISSION_MASK, 15)
 
-        # check that a new cluster was created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
 
-        department_cluster = InternalCluster.objects.filter(
-            name=f"{self.user.department} department", description=""
-        ).first()
-        self.assertIsNotNone(department_cluster)
-        self.assertIsNotNone(department_cluster.cluster)
+@mock.patch("uia_backend.cluster.utils.CentrifugoConnector")
+class BulkClusterMembershipTests(TestCase):
+    def setUp(self) -> None:
+        self.cluster = ClusterFactory.create()
+        self.member = UserModelFactory.create(email="member@example.com")
+        ClusterMembershipFactory.create(
+            cluster=self.cluster,
+            user=self.member,
+            permission_mask=CLUSTER_CREATOR_PERMISSION_MASK,
+        )
+        self.users = [
+            UserModelFactory.create(email=f"user{index}@example.com")
+            for index in range(3)
+        ]
+
+    def test_add_cluster_members(self, mock_connector):
+        with self.assertNumQueries(6), self.captureOnCommitCallbacks(
+            execute=True
+        ) as callbacks:
+            memberships = add_cluster_members(
+                cluster=self.cluster, users=[self.member, *self.users, self.users[0]]
+            )
+
+        self.assertEqual([membership.user for membership in memberships], self.users)
+        self.assertEqual(
+            ClusterMembership.objects.filter(cluster=self.cluster).count(), 4
+        )
+        for user in self.users:
+            self.assertTrue(
+                user.has_perm(f"cluster.{VIEW_CLUSTER_PERMISSION}", self.cluster)
+            )
+            self.assertFalse(
+                user.has_perm(f"cluster.{UPDATE_CLUSTER_PERMISSION}", self.cluster)
+            )
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 4)
+
+        # a single event for all members
+        self.assertEqual(len(callbacks), 1)
+        mock_connector.return_value.broadcast_event.assert_called_once_with(
+            event_name=CENT_EVENT_CLUSTER_MEMBERS_ADDED,
+            channels=[
+                self.cluster.channel_name,
+                *[user.channel_name for user in self.users],
+            ],
+            event_data={
+                "cluster": str(self.cluster.id),
+                "users": [str(user.id) for user in self.users],
+            },
+        )
 
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
+        # adding members again does nothing
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertEqual(add_cluster_members(self.cluster, self.users), [])
+        self.assertEqual(callbacks, [])
 
-        membership_object = self.cluster_manager.memberships_to_create[0]
+    def test_add_cluster_members_counts_inserted_members(self, mock_connector):
+        """Test that members who joined concurrently are not counted twice."""
 
-        self.assertEqual(membership_object.cluster, department_cluster.cluster)
-        self.assertEqual(membership_object.user, self.user)
+        def join_before_insert(*args, **kwargs):
+            # e.g the user joined between the member check and the insert
+            ClusterMembershipFactory.create(cluster=self.cluster, user=self.users[0])
+            return bulk_create(*args, **kwargs)
 
-    def test__add_user_to_graduation_set_cluster__case_1(self):
-        """
-        Test the behaviour of ClusterManager._add_user_to_graduation_set_cluster
-        when graduation set cluster already exists.
-        """
+        bulk_create = ClusterMembership.objects.bulk_create
+        with mock.patch.object(
+            ClusterMembership.objects, "bulk_create", side_effect=join_before_insert
+        ):
+            memberships = add_cluster_members(cluster=self.cluster, users=self.users)
 
-        # SETUP
-        yog_cluster_name = f"{self.user.year_of_graduation} set"
-        internal_cluster = InternalClusterFactory.create(name=yog_cluster_name)
-        cluster = ClusterFactory.create(
-            internal_cluster=internal_cluster,
-            title=yog_cluster_name.capitalize(),
+        self.assertEqual(
+            [membership.user for membership in memberships], self.users[1:]
+        )
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 4)
+
+    def test_get_inserted_memberships(self, mock_connector):
+        """Test that memberships skipped by a conflict are not counted."""
+
+        memberships = [
+            # e.g the member joined between the member check and the insert
+            ClusterMembership(cluster=self.cluster, user=self.member),
+            *[
+                ClusterMembership(cluster=self.cluster, user=user)
+                for user in self.users
+            ],
+        ]
+        ClusterMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+
+        self.assertEqual(
+            get_inserted_memberships(memberships, batch_size=2), memberships[1:]
         )
 
-        # TEST
-        self.cluster_manager._add_user_to_graduation_set_cluster()
-
-        # check that a new cluster was not created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
-
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
-
-        membership_object = self.cluster_manager.memberships_to_create[0]
+    def test_remove_cluster_members(self, mock_connector):
+        add_cluster_members(cluster=self.cluster, users=self.users)
+        other_cluster = ClusterFactory.create()
+        ClusterMembershipFactory.create(cluster=other_cluster, user=self.users[0])
+
+        with self.assertNumQueries(6), self.captureOnCommitCallbacks(
+            execute=True
+        ) as callbacks:
+            removed_users = remove_cluster_members(
+                cluster=self.cluster,
+                user_ids=[
+                    self.users[0].id,
+                    self.users[1].id,
+                    UserModelFactory.build().id,
+                ],
+            )
+
+        self.assertEqual(
+            {user.id for user in removed_users}, {self.users[0].id, self.users[1].id}
+        )
+        self.assertEqual(
+            set(
+                ClusterMembership.objects.filter(cluster=self.cluster).values_list(
+                    "user_id", flat=True
+                )
+            ),
+            {self.member.id, self.users[2].id},
+        )
+        self.assertTrue(
+            ClusterMembership.objects.filter(
+                cluster=other_cluster, user=self.users[0]
+            ).exists()
+        )
+        self.assertFalse(
+            self.users[0].has_perm(f"cluster.{VIEW_CLUSTER_PERMISSION}", self.cluster)
+        )
 
-        self.assertEqual(membership_object.cluster, cluster)
-        self.assertEqual(membership_object.user, self.user)
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 2)
 
-    def test__add_user_to_graduation_set_cluster__case_2(self):
-        """
-        Test the behaviour of ClusterManager._add_user_to_graduation_set_cluster
-        when graduation set cluster does not exist.
-        """
+        self.assertEqual(len(callbacks), 1)
+        broadcast_kwargs = mock_connector.return_value.broadcast_event.call_args.kwargs
+        self.assertEqual(
+            broadcast_kwargs["event_name"], CENT_EVENT_CLUSTER_MEMBERS_REMOVED
+        )
+        self.assertCountEqual(
+            broadcast_kwargs["event_data"]["users"],
+            [str(self.users[0].id), str(self.users[1].id)],
+        )
 
-        # TEST
-        self.cluster_manager._add_user_to_graduation_set_cluster()
+        # removing non members does nothing
+        with self.assertNumQueries(3):
+            self.assertEqual(
+                remove_cluster_members(self.cluster, [self.users[0].id]), []
+            )
 
-        # check that a new cluster was created
-        self.assertEqual(InternalCluster.objects.all().count(), 1)
-        self.assertEqual(Cluster.objects.all().count(), 1)
+    def test_remove_cluster_members_sends_delete_signals(self, mock_connector):
+        add_cluster_members(cluster=self.cluster, users=self.users)
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=ClusterMembership)
+        self.addCleanup(post_delete.disconnect, receiver, sender=ClusterMembership)
 
-        yog_cluster = InternalCluster.objects.filter(
-            name=f"{self.user.year_of_graduation} set", description=""
-        ).first()
-        self.assertIsNotNone(yog_cluster)
-        self.assertIsNotNone(yog_cluster.cluster)
+        remove_cluster_members(
+            cluster=self.cluster, user_ids=[self.users[0].id, self.users[1].id]
+        )
 
-        # TEST to ensure we dont save membership yet
-        self.assertEqual(ClusterMembership.objects.all().count(), 0)
-        self.assertEqual(len(self.cluster_manager.memberships_to_create), 1)
+        self.assertCountEqual(
+            [call.kwargs["instance"].user_id for call in receiver.call_args_list],
+            [self.users[0].id, self.users[1].id],
+        )
+        # the member count is only updated once
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.member_count, 2)
 
-        membership_object = self.cluster_manager.memberships_to_create[0]
 
-        self.assertEqual(membership_object.cluster, yog_cluster.cluster)
-        self.assertEqual(membership_object.user, self.user)
+class ClusterManagerTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create()
+        self.cluster_manager = ClusterManager(user=self.user)
 
     def test__add_user_to_defualt_clusters(self):
         """Test the behaviour of ClusterManager._add_user_to_defualt_clusters."""
@@ -386,3 +307,63 @@ class ClusterManagerTests(TestCase):
                 user=self.user, cluster=yog_cluster.cluster
             ).exists()
         )
+
+    def test_add_users_to_default_clusters(self):
+        """Test that many users are onboarded with a fixed number of queries."""
+
+        users = [
+            UserModelFactory.create(
+                email=f"user{index}@example.com",
+                department=department,
+                year_of_graduation=year_of_graduation,
+            )
+            for index, (department, year_of_graduation) in enumerate(
+                [
+                    ("Computer Science", "2019"),
+                    ("Physics", "2019"),
+                    ("Physics", "2020"),
+                ]
+            )
+        ]
+
+        # user is already a member of the global cluster
+        global_cluster = ClusterFactory.create(
+            internal_cluster=InternalClusterFactory.create(name="global"),
+            title="Global",
+        )
+        ClusterMembershipFactory.create(user=users[0], cluster=global_cluster)
+
+        with self.assertNumQueries(11):
+            ClusterManager.add_users_to_default_clusters(users)
+
+        self.assertEqual(InternalCluster.objects.count(), 6)
+        self.assertEqual(Cluster.objects.count(), 6)
+        self.assertEqual(ClusterMembership.objects.count(), 12)
+
+        for cluster in Cluster.objects.all():
+            self.assertEqual(
+                cluster.member_count,
+                ClusterMembership.objects.filter(cluster=cluster).count(),
+            )
+
+        for user in users:
+            for cluster in Cluster.objects.filter(
+                internal_cluster__name__in=ClusterManager.get_default_cluster_names(
+                    user
+                )
+            ):
+                self.assertTrue(
+                    ClusterMembership.objects.filter(
+                        user=user, cluster=cluster
+                    ).exists()
+                )
+                self.assertTrue(
+                    user.has_perm(f"cluster.{VIEW_CLUSTER_PERMISSION}", cluster)
+                )
+
+        # onboarding is idempotent
+        with self.assertNumQueries(4):
+            ClusterManager.add_users_to_default_clusters(users)
+        self.assertEqual(ClusterMembership.objects.count(), 12)
+        global_cluster.refresh_from_db()
+        self.assertEqual(global_cluster.member_count, 3)
@@ -0,0 +1,10 @@
+import pytest
+
+from uia_backend.experiments.engine import experiment_engine
+
+
+@pytest.fixture(autouse=True)
+def clear_experiment_engine() -> None:
+    """Drop experiments loaded by a previous test, its rows were rolled back."""
+
+    experiment_engine.clear()
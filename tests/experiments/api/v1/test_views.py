@@ -0,0 +1,42 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.experiments.test_models import ExperimentConfigFactory
+from uia_backend.experiments.constants import ER_001_PRE_ALPHA_USER_TESTING_TAG
+
+
+class PreAplhaTestingPopulationAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.url = reverse("experiments_api_v1:er001_population_details")
+
+    def test_get(self):
+        ExperimentConfigFactory.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            required_user_population=200,
+            enrolled_user_population=12,
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "status": "Success",
+                "code": 200,
+                "data": {
+                    "enrolled_user_population": 12,
+                    "max_allowed_user_population": 200,
+                },
+            },
+        )
+
+    def test_get_no_active_experiment(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json()["data"],
+            {"enrolled_user_population": 0, "max_allowed_user_population": 0},
+        )
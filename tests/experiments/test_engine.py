@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tests.experiments.test_models import ExperimentConfigFactory
+from uia_backend.experiments.constants import EXPERIMENT_SELECTION_TYPE_URD
+from uia_backend.experiments.engine import (
+    EXPERIMENT_BUCKET_COUNT,
+    ExperimentEngine,
+    get_experiment_bucket,
+)
+
+
+class GetExperimentBucketTests(TestCase):
+    def test_method(self):
+        bucket = get_experiment_bucket("a9a4fa2a-8e09-4c2b-8cd1", "ER002")
+
+        self.assertEqual(
+            bucket, get_experiment_bucket("a9a4fa2a-8e09-4c2b-8cd1", "ER002")
+        )
+        self.assertTrue(0 <= bucket < EXPERIMENT_BUCKET_COUNT)
+
+    def test_buckets_are_uniform(self):
+        buckets = [
+            get_experiment_bucket(f"user-{index}", "ER002") for index in range(10_000)
+        ]
+        in_lower_half = sum(bucket < EXPERIMENT_BUCKET_COUNT / 2 for bucket in buckets)
+
+        self.assertAlmostEqual(in_lower_half / len(buckets), 0.5, delta=0.03)
+
+
+class ExperimentEngineTests(TestCase):
+    def setUp(self) -> None:
+        self.engine = ExperimentEngine()
+
+    def test_get_experiment(self):
+        experiment_config = ExperimentConfigFactory.create(
+            experiment_tag="ER002", meta_data={"variant": "b"}
+        )
+        ExperimentConfigFactory.create(experiment_tag="ER003", is_active=False)
+
+        experiment = self.engine.get_experiment("ER002")
+
+        self.assertEqual(experiment.id, experiment_config.id)
+        self.assertEqual(experiment.meta_data, {"variant": "b"})
+        self.assertTrue(self.engine.is_active("ER002"))
+        self.assertFalse(self.engine.is_active("ER003"))
+        self.assertFalse(self.engine.is_active("ER004"))
+
+    def test_evaluation_does_not_query(self):
+        ExperimentConfigFactory.create(experiment_tag="ER002")
+        self.engine.get_experiment("ER002")
+
+        with self.assertNumQueries(0):
+            for index in range(100):
+                self.engine.is_user_in_experiment(f"user-{index}", "ER002")
+
+    def test_config_changes_are_picked_up(self):
+        experiment_config = ExperimentConfigFactory.create(experiment_tag="ER002")
+        self.assertTrue(self.engine.is_active("ER002"))
+
+        experiment_config.is_active = False
+        experiment_config.save()
+
+        self.assertFalse(self.engine.is_active("ER002"))
+
+        experiment_config.delete()
+        ExperimentConfigFactory.create(experiment_tag="ER003")
+
+        self.assertTrue(self.engine.is_active("ER003"))
+
+    @override_settings(EXPERIMENT_ENGINE_VERSION_CHECK_INTERVAL=60)
+    def test_version_is_checked_once_per_interval(self):
+        ExperimentConfigFactory.create(experiment_tag="ER002")
+
+        with mock.patch(
+            "uia_backend.experiments.engine.cache.get", return_value=1
+        ) as mock_cache_get:
+            self.engine.is_active("ER002")
+            self.engine.is_active("ER002")
+
+        mock_cache_get.assert_called_once()
+
+    def test_is_user_in_experiment(self):
+        ExperimentConfigFactory.create(
+            experiment_tag="ER002",
+            selection_type=EXPERIMENT_SELECTION_TYPE_URD,
+            meta_data={"rollout_percentage": 25},
+        )
+        ExperimentConfigFactory.create(experiment_tag="ER003")
+
+        user_ids = [f"user-{index}" for index in range(4000)]
+        in_experiment = [
+            user_id
+            for user_id in user_ids
+            if self.engine.is_user_in_experiment(user_id, "ER002")
+        ]
+
+        self.assertAlmostEqual(len(in_experiment) / len(user_ids), 0.25, delta=0.03)
+        for user_id in in_experiment:
+            self.assertLess(
+                get_experiment_bucket(user_id, "ER002"), EXPERIMENT_BUCKET_COUNT / 4
+            )
+
+        # first-come first-serve experiments apply to every user
+        self.assertTrue(
+            all(
+                self.engine.is_user_in_experiment(user_id, "ER003")
+                for user_id in user_ids
+            )
+        )
+        self.assertFalse(self.engine.is_user_in_experiment("user-1", "ER004"))
@@ -10,7 +10,11 @@ from uia_backend.experiments.models import (
     ExperimentConfig,
     PreAlphaUserTestingExperiment,
 )
-from uia_backend.experiments.utils import enroll_user_to_prealpha_testing_experiment
+from uia_backend.experiments.utils import (
+    enroll_user_to_prealpha_testing_experiment,
+    release_experiment_slot,
+    reserve_experiment_slot,
+)
 
 
 class EnrollUserToPreAlphaTestingExperimentTests(TestCase):
@@ -105,3 +109,83 @@ class EnrollUserToPreAlphaTestingExperimentTests(TestCase):
                 experiment_config__experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
             ).exists()
         )
+
+    def test_enroll_user_to_prealpha_testing_experiment_user_already_enrolled(self):
+        enroll_user_to_prealpha_testing_experiment(self.user)
+        enroll_user_to_prealpha_testing_experiment(self.user)
+
+        experiment_config = ExperimentConfig.objects.get(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG
+        )
+        self.assertEqual(experiment_config.enrolled_user_population, 1)
+        self.assertEqual(
+            PreAlphaUserTestingExperiment.objects.filter(user=self.user).count(), 1
+        )
+
+    def test_enroll_user_to_prealpha_testing_experiment_fills_capacity(self):
+        experiment_config = ExperimentConfigFactory.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            required_user_population=2,
+        )
+        users = [self.user] + [
+            UserModelFactory.create(email=f"user{index}@example.com")
+            for index in range(2)
+        ]
+
+        for user in users:
+            enroll_user_to_prealpha_testing_experiment(user)
+
+        experiment_config.refresh_from_db()
+        self.assertEqual(experiment_config.enrolled_user_population, 2)
+        self.assertEqual(
+            PreAlphaUserTestingExperiment.objects.filter(
+                experiment_config=experiment_config
+            ).count(),
+            2,
+        )
+
+
+class ExperimentSlotTests(TestCase):
+    def test_reserve_experiment_slot(self):
+        experiment_config = ExperimentConfigFactory.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            required_user_population=2,
+        )
+
+        self.assertTrue(reserve_experiment_slot(experiment_config.id))
+        self.assertTrue(reserve_experiment_slot(experiment_config.id))
+        self.assertFalse(reserve_experiment_slot(experiment_config.id))
+
+        experiment_config.refresh_from_db()
+        self.assertEqual(experiment_config.enrolled_user_population, 2)
+
+    def test_reserve_experiment_slot_inactive_experiment(self):
+        experiment_config = ExperimentConfigFactory.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            is_active=False,
+        )
+
+        self.assertFalse(reserve_experiment_slot(experiment_config.id))
+
+    def test_release_experiment_slot(self):
+        experiment_config = ExperimentConfigFactory.create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            enrolled_user_population=1,
+        )
+
+        release_experiment_slot(experiment_config.id)
+        release_experiment_slot(experiment_config.id)
+
+        experiment_config.refresh_from_db()
+        self.assertEqual(experiment_config.enrolled_user_population, 0)
+
+    def test_deleting_enrolled_user_releases_slot(self):
+        user = UserModelFactory.create()
+        enroll_user_to_prealpha_testing_experiment(user)
+
+        user.delete()
+
+        experiment_config = ExperimentConfig.objects.get(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG
+        )
+        self.assertEqual(experiment_config.enrolled_user_population, 0)
@@ -0,0 +1,71 @@
+from django.db.models import F
+from django.test import TestCase
+
+from tests.accounts.test_models import UserModelFactory
+from tests.cluster.test_models import ClusterFactory
+from tests.experiments.test_models import ExperimentConfigFactory
+from uia_backend.accounts.models import CustomUser
+from uia_backend.cluster.models import Cluster
+from uia_backend.experiments.models import ExperimentConfig
+
+
+class CounterFieldsMixinTests(TestCase):
+    def test_save_keeps_concurrent_counter_updates(self):
+        cluster = ClusterFactory.create(title="Old title")
+        user = UserModelFactory.create()
+        experiment = ExperimentConfigFactory.create()
+
+        # another request increments the counters after the instances were loaded
+        Cluster.objects.filter(id=cluster.id).update(
+            member_count=F("member_count") + 2, post_count=F("post_count") + 1
+        )
+        CustomUser.objects.filter(id=user.id).update(
+            follower_count=F("follower_count") + 1
+        )
+        ExperimentConfig.objects.filter(id=experiment.id).update(
+            enrolled_user_population=F("enrolled_user_population") + 3
+        )
+
+        cluster.title = "New title"
+        cluster.save()
+        user.bio = "New bio"
+        user.save()
+        experiment.is_active = False
+        experiment.save()
+
+        cluster.refresh_from_db()
+        self.assertEqual(cluster.title, "New title")
+        self.assertEqual((cluster.member_count, cluster.post_count), (2, 1))
+        user.refresh_from_db()
+        self.assertEqual(user.bio, "New bio")
+        self.assertEqual(user.follower_count, 1)
+        experiment.refresh_from_db()
+        self.assertFalse(experiment.is_active)
+        self.assertEqual(experiment.enrolled_user_population, 3)
+
+    def test_counters_are_written_with_update_fields(self):
+        cluster = ClusterFactory.create()
+
+        cluster.member_count = 5
+        cluster.save(update_fields=["member_count"])
+
+        cluster.refresh_from_db()
+        self.assertEqual(cluster.member_count, 5)
+
+    def test_counters_are_written_on_create(self):
+        cluster = Cluster.objects.create(title="New cluster", member_count=3)
+
+        cluster.refresh_from_db()
+        self.assertEqual(cluster.member_count, 3)
+
+    def test_deferred_fields_are_not_loaded_on_save(self):
+        cluster = ClusterFactory.create(description="Old description")
+        cluster = Cluster.objects.only("id", "title").get(id=cluster.id)
+
+        cluster.title = "New title"
+        with self.assertNumQueries(1):
+            cluster.save()
+
+        cluster.refresh_from_db()
+        self.assertEqual(cluster.title, "New title")
+        self.assertEqual(cluster.description, "Old description")
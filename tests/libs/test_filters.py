@@ -0,0 +1,133 @@
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tests.accounts.test_models import UserModelFactory
+from tests.cluster.test_models import ClusterFactory
+from tests.messaging.test_models import PostFactory
+from uia_backend.accounts.models import CustomUser
+from uia_backend.libs.filters import (
+    FullTextSearchFilter,
+    TrigramSearchFilter,
+    full_text_search,
+    is_postgresql,
+    trigram_search,
+)
+from uia_backend.messaging.models import Post
+
+
+class SearchView:
+    search_fields = ["first_name", "^last_name"]
+
+
+def get_postgresql_connection() -> DatabaseWrapper:
+    return DatabaseWrapper(
+        {
+            "NAME": "test",
+            "USER": "",
+            "PASSWORD": "",
+            "HOST": "",
+            "PORT": "",
+            "OPTIONS": {},
+            "TIME_ZONE": None,
+            "CONN_MAX_AGE": 0,
+            "AUTOCOMMIT": True,
+            "ATOMIC_REQUESTS": False,
+            "CONN_HEALTH_CHECKS": False,
+        }
+    )
+
+
+class TrigramSearchFilterTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(
+            email="user@example.com", first_name="Joan", last_name="Pike"
+        )
+        UserModelFactory.create(
+            email="user2@example.com", first_name="Femi", last_name="Ade"
+        )
+
+    def test_falls_back_to_search_filter(self):
+        """Test that databases other than postgresql use SearchFilter lookups."""
+
+        self.assertFalse(is_postgresql(CustomUser.objects.all()))
+
+        request = Request(APIRequestFactory().get("/", {"search": "pik"}))
+        queryset = TrigramSearchFilter().filter_queryset(
+            request=request,
+            queryset=CustomUser.objects.all(),
+            view=SearchView(),
+        )
+
+        self.assertEqual(list(queryset), [self.user])
+
+    def test_trigram_search_query(self):
+        """Test that the postgresql query uses the trigram operator and ranking."""
+
+        connection = get_postgresql_connection()
+        queryset = trigram_search(
+            CustomUser.objects.all(), fields=["first_name", "last_name"], term="pike"
+        )
+
+        sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+
+        self.assertIn('"accounts_customuser"."first_name" %%> (%s)', sql)
+        self.assertIn('"accounts_customuser"."last_name" %%> (%s)', sql)
+        self.assertIn("GREATEST(WORD_SIMILARITY(", sql)
+        self.assertIn('ORDER BY "search_rank" DESC', sql)
+
+
+class PostSearchView:
+    search_fields = ["title", "content"]
+    search_headline_field = "content"
+
+
+class FullTextSearchFilterTests(TestCase):
+    def setUp(self) -> None:
+        cluster = ClusterFactory.create()
+        user = UserModelFactory.create(email="user@example.com")
+        self.post = PostFactory.create(
+            cluster=cluster,
+            created_by=user,
+            title="Hostel",
+            content="No light in the hostel",
+        )
+        PostFactory.create(
+            cluster=cluster,
+            created_by=user,
+            title="Exams",
+            content="Timetable is out",
+        )
+
+    def test_falls_back_to_search_filter(self):
+        """Test that databases other than postgresql use SearchFilter lookups."""
+
+        request = Request(APIRequestFactory().get("/", {"search": "light"}))
+        queryset = FullTextSearchFilter().filter_queryset(
+            request=request,
+            queryset=Post.objects.all(),
+            view=PostSearchView(),
+        )
+
+        self.assertEqual(list(queryset), [self.post])
+
+    def test_full_text_search_query(self):
+        """Test that the postgresql query matches, ranks and highlights posts."""
+
+        connection = get_postgresql_connection()
+        queryset = full_text_search(
+            Post.objects.all(), term="hostel light", headline_field="content"
+        )
+
+        sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+
+        self.assertIn(
+            '("messaging_post"."search_vector") @@ '
+            "(websearch_to_tsquery(%s::regconfig, %s))",
+            sql,
+        )
+        self.assertIn('ts_rank(("messaging_post"."search_vector"', sql)
+        self.assertIn('ts_headline(%s::regconfig, "messaging_post"."content"', sql)
+        self.assertIn('ORDER BY "search_rank" DESC', sql)
+        self.assertIn("hostel light", params)
@@ -0,0 +1,227 @@
+import tempfile
+from pathlib import Path
+
+import requests
+import responses
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from uia_backend.libs.geoip import (
+    DATABASE_MAGIC,
+    HEADER_STRUCT,
+    GeoIPDatabaseError,
+    IPApiCoResolver,
+    MMapIPRangeResolver,
+    build_ip_range_database,
+    get_geoip_resolver,
+)
+
+IP_RANGES = [
+    ("102.88.0.0", "102.88.255.255", "Lagos"),
+    ("8.8.8.0", "8.8.8.255", "California"),
+    ("41.58.0.0", "41.58.127.255", "Oyo"),
+    ("2001:4860::", "2001:4860:ffff:ffff:ffff:ffff:ffff:ffff", "California"),
+]
+
+
+class BuildIPRangeDatabaseTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "ip_ranges.db"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_method(self):
+        self.assertEqual(build_ip_range_database(IP_RANGES, self.path), 4)
+        self.assertTrue(self.path.exists())
+
+    def test_invalid_range(self):
+        with self.assertRaises(GeoIPDatabaseError):
+            build_ip_range_database([("8.8.8.255", "8.8.8.0", "Nowhere")], self.path)
+
+    def test_overlapping_ranges(self):
+        with self.assertRaises(GeoIPDatabaseError):
+            build_ip_range_database(
+                [
+                    ("8.8.8.0", "8.8.8.255", "California"),
+                    ("8.8.8.128", "8.8.9.255", "Nevada"),
+                ],
+                self.path,
+            )
+
+
+class MMapIPRangeResolverTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "ip_ranges.db"
+        build_ip_range_database(IP_RANGES, self.path)
+        self.resolver = MMapIPRangeResolver(database_path=self.path)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_resolve(self):
+        self.assertEqual(self.resolver.resolve("8.8.8.8"), "California")
+        self.assertEqual(self.resolver.resolve("102.88.0.0"), "Lagos")
+        self.assertEqual(self.resolver.resolve("102.88.255.255"), "Lagos")
+        self.assertEqual(self.resolver.resolve("41.58.100.1"), "Oyo")
+        self.assertEqual(self.resolver.resolve("2001:4860:4860::8888"), "California")
+
+    def test_resolve_unknown_ip(self):
+        self.assertIsNone(self.resolver.resolve("127.0.0.1"))
+        self.assertIsNone(self.resolver.resolve("41.58.128.0"))
+        self.assertIsNone(self.resolver.resolve("255.255.255.255"))
+        self.assertIsNone(self.resolver.resolve("invalid_ip"))
+
+    def test_resolve_is_cached(self):
+        self.resolver.resolve("8.8.8.8")
+        self.resolver.resolve("8.8.8.8")
+
+        cache_info = self.resolver.resolve.cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 1)
+
+    def test_missing_database(self):
+        resolver = MMapIPRangeResolver(database_path=Path(self.temp_dir.name) / "x")
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(resolver.resolve("8.8.8.8"))
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::libs::geoip::MMapIPRangeResolver::_load:: "
+            "IP range database could not be opened.",
+        )
+
+    def assert_invalid_database(self, content: bytes) -> None:
+        path = Path(self.temp_dir.name) / "invalid.db"
+        path.write_bytes(content)
+        resolver = MMapIPRangeResolver(database_path=path)
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.assertIsNone(resolver.resolve("8.8.8.8"))
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::libs::geoip::MMapIPRangeResolver::_load:: "
+            "IP range database is invalid.",
+        )
+        self.assertIsNone(resolver._mmap)
+        # the database is only read once
+        self.assertIsNone(resolver.resolve("1.1.1.1"))
+
+    def test_invalid_database(self):
+        self.assert_invalid_database(b"x" * 64)
+
+    def test_truncated_header(self):
+        self.assert_invalid_database(DATABASE_MAGIC[:4])
+
+    def test_truncated_records(self):
+        self.assert_invalid_database(HEADER_STRUCT.pack(DATABASE_MAGIC, 10, 0))
+
+    def test_truncated_regions(self):
+        content = self.path.read_bytes()
+        self.assert_invalid_database(content[:-2])
+
+
+class IPApiCoResolverTests(TestCase):
+    def setUp(self) -> None:
+        self.resolver = IPApiCoResolver()
+
+    @responses.activate
+    def test_happy_path_valid_ip(self):
+        ip = "8.8.8.8"
+        expected_region = "California"
+
+        responses.add(
+            responses.GET,
+            f"{settings.IP_API_CO_URL}/{ip}/region/",
+            body=expected_region,
+            status=200,
+        )
+        result = self.resolver.resolve(ip)
+        self.assertEqual(result, expected_region)
+        self.assertEqual(responses.calls[0].request.req_kwargs["timeout"], 2)
+
+    @responses.activate
+    def test_edge_case_http_error(self):
+        ip = "8.8.8.8"
+
+        responses.add(
+            responses.GET,
+            f"{settings.IP_API_CO_URL}/{ip}/region/",
+            body=requests.exceptions.Timeout(),
+        )
+
+        with self.assertLogs(level="ERROR") as log:
+            result = self.resolver.resolve(ip)
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            log.output[0],
+            "ERROR:root:"
+            "uia_backend::libs::geoip::IPApiCoResolver::resolve:: HTTPError occured",
+        )
+
+    @responses.activate
+    def test_edge_case_invalid_ip(self):
+        ip = "invalid_ip"
+        responses.add(
+            responses.GET,
+            f"{settings.IP_API_CO_URL}/{ip}/region/",
+            body="Undefined",
+            status=200,
+        )
+
+        self.assertIsNone(self.resolver.resolve(ip))
+
+    @responses.activate
+    def test_edge_case_api_error(self):
+        ip = "8.8.8.8"
+        responses.add(
+            responses.GET,
+            f"{settings.IP_API_CO_URL}/{ip}/region/",
+            json={"error": "Internal Server Error"},
+            status=500,
+        )
+
+        with self.assertLogs(level="ERROR") as log:
+            result = self.resolver.resolve(ip)
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            log.output[0],
+            "ERROR:root:"
+            "uia_backend::libs::geoip::IPApiCoResolver::resolve:: API error occured",
+        )
+
+    @responses.activate
+    def test_edge_case_api_quota_exceeded(self):
+        ip = "127.0.0.1"
+        responses.add(
+            responses.GET,
+            f"{settings.IP_API_CO_URL}/{ip}/region/",
+            json={"error": "API quota exceeded"},
+            status=429,
+        )
+
+        with self.assertLogs(level="ERROR") as log:
+            result = self.resolver.resolve(ip)
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            log.output[0],
+            "ERROR:root:"
+            "uia_backend::libs::geoip::IPApiCoResolver::resolve:: API free quota has been exceeded",
+        )
+
+
+class GetGeoIPResolverTests(TestCase):
+    def test_method(self):
+        self.assertIsInstance(get_geoip_resolver(), MMapIPRangeResolver)
+        # resolvers are only created once per process
+        self.assertIs(get_geoip_resolver(), get_geoip_resolver())
+
+        with override_settings(GEOIP_RESOLVER="uia_backend.libs.geoip.IPApiCoResolver"):
+            self.assertIsInstance(get_geoip_resolver(), IPApiCoResolver)
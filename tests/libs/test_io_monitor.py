@@ -0,0 +1,174 @@
+import requests
+import responses
+from cent import Client as CentClient
+from django.core.mail import EmailMessage, get_connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from uia_backend.libs.io_monitor import (
+    OutboundIOMonitorMiddleware,
+    OutboundIOOnRequestPathError,
+    OutboundIORegistry,
+    allow_outbound_io,
+    install_outbound_io_hooks,
+    registry,
+    request_path,
+)
+
+
+class OutboundIORegistryTests(TestCase):
+    def test_method(self):
+        outbound_registry = OutboundIORegistry()
+
+        outbound_registry.record("GET /a/", "requests", "ipapi.co", 0.2)
+        outbound_registry.record("GET /a/", "requests", "ipapi.co", 0.4)
+        outbound_registry.record("GET /b/", "cent", "centrifugo:8000", 0.1)
+
+        self.assertEqual(
+            outbound_registry.snapshot(),
+            {
+                "GET /a/": {
+                    "requests:ipapi.co": {
+                        "count": 2,
+                        "total_duration": 0.6000000000000001,
+                        "max_duration": 0.4,
+                    }
+                },
+                "GET /b/": {
+                    "cent:centrifugo:8000": {
+                        "count": 1,
+                        "total_duration": 0.1,
+                        "max_duration": 0.1,
+                    }
+                },
+            },
+        )
+
+        outbound_registry.reset()
+        self.assertEqual(outbound_registry.snapshot(), {})
+
+
+@override_settings(OUTBOUND_IO_MONITOR_STRICT=False)
+class OutboundIOHooksTests(TestCase):
+    def setUp(self) -> None:
+        install_outbound_io_hooks()
+        registry.reset()
+
+    def tearDown(self) -> None:
+        registry.reset()
+
+    @responses.activate
+    def test_calls_outside_request_path_are_not_recorded(self):
+        responses.add(responses.GET, "https://ipapi.co/8.8.8.8/region/", body="x")
+
+        requests.get("https://ipapi.co/8.8.8.8/region/")
+
+        self.assertEqual(registry.snapshot(), {})
+
+    @responses.activate
+    def test_requests_calls_are_recorded(self):
+        responses.add(responses.GET, "https://ipapi.co/8.8.8.8/region/", body="x")
+
+        with request_path("POST /api/v1/accounts/"):
+            with self.assertLogs(level="WARNING") as logs:
+                requests.get("https://ipapi.co/8.8.8.8/region/")
+                requests.get("https://ipapi.co/8.8.8.8/region/")
+
+        stats = registry.snapshot()["POST /api/v1/accounts/"]["requests:ipapi.co"]
+        self.assertEqual(stats["count"], 2)
+        self.assertGreaterEqual(stats["max_duration"], 0)
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::libs::io_monitor::outbound_call:: "
+            "Outbound call made on the request path.",
+        )
+        self.assertEqual(logs.records[0].endpoint, "POST /api/v1/accounts/")
+
+    @responses.activate
+    def test_cent_calls_are_recorded_once(self):
+        responses.add(responses.POST, "http://centrifugo:8000/api", json={})
+
+        with request_path("POST /api/v1/messaging/dms/"):
+            CentClient("http://centrifugo:8000/api", api_key="key").publish(
+                channel="users:1", data={}
+            )
+
+        # the requests call made by the cent client is part of the cent call
+        self.assertEqual(
+            list(registry.snapshot()["POST /api/v1/messaging/dms/"].keys()),
+            ["cent:centrifugo:8000"],
+        )
+
+    def test_allow_outbound_io(self):
+        with request_path("GET /api/v1/"), allow_outbound_io():
+            with self.assertRaises(requests.RequestException):
+                requests.get("invalid_url")
+
+        self.assertEqual(registry.snapshot(), {})
+
+
+class OutboundIOHooksStrictModeTests(TestCase):
+    def setUp(self) -> None:
+        install_outbound_io_hooks()
+
+    @responses.activate
+    def test_requests_call_raises(self):
+        responses.add(responses.GET, "https://ipapi.co/8.8.8.8/region/", body="x")
+
+        with request_path("GET /api/v1/"):
+            with self.assertRaises(OutboundIOOnRequestPathError):
+                requests.get("https://ipapi.co/8.8.8.8/region/")
+
+        # no request was sent
+        self.assertEqual(len(responses.calls), 0)
+
+    def test_anymail_call_raises(self):
+        connection = get_connection("anymail.backends.test.EmailBackend")
+
+        with request_path("GET /api/v1/"):
+            with self.assertRaises(OutboundIOOnRequestPathError):
+                EmailMessage(to=["user@example.com"], connection=connection).send()
+
+        # outside the request path mails are sent as usual
+        self.assertEqual(
+            EmailMessage(to=["user@example.com"], connection=connection).send(), 1
+        )
+
+
+@override_settings(OUTBOUND_IO_MONITOR_STRICT=False)
+class OutboundIOMonitorMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        registry.reset()
+
+    def tearDown(self) -> None:
+        registry.reset()
+
+    @responses.activate
+    def test_calls_are_recorded_per_route(self):
+        responses.add(responses.GET, "https://ipapi.co/8.8.8.8/region/", body="x")
+        url = reverse("accounts_api_v1:user_registration")
+        request = RequestFactory().post(url)
+
+        def get_response(request):
+            request.resolver_match = resolve(request.path)
+            middleware.process_view(request, None, (), {})
+            requests.get("https://ipapi.co/8.8.8.8/region/")
+
+        middleware = OutboundIOMonitorMiddleware(get_response)
+
+        with self.assertLogs(level="WARNING"):
+            middleware(request)
+
+        self.assertEqual(
+            list(registry.snapshot().keys()),
+            [f"POST /{resolve(url).route}"],
+        )
+
+        # the endpoint is cleared once the request has been handled
+        requests.get("https://ipapi.co/8.8.8.8/region/")
+        self.assertEqual(
+            registry.snapshot()[f"POST /{resolve(url).route}"]["requests:ipapi.co"][
+                "count"
+            ],
+            1,
+        )
@@ -0,0 +1,91 @@
+import base64
+import json
+from urllib.parse import urlencode
+
+from django.db.models import Q, Value
+from django.test import TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from uia_backend.libs.pagination import KeysetPagination
+from uia_backend.messaging.models import Post
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self) -> None:
+        self.request = Request(APIRequestFactory().get("/"))
+
+    def test_get_ordering(self):
+        self.assertEqual(
+            KeysetPagination().get_ordering(
+                self.request, Post.objects.all(), view=None
+            ),
+            ("-created_datetime", "-id"),
+        )
+
+    def test_get_ordering_from_ordering_filter(self):
+        """Test that a requested ordering is made unique with the id."""
+
+        class View:
+            filter_backends = [OrderingFilter]
+            ordering_fields = ["created_datetime"]
+            ordering = ["-created_datetime", "-id"]
+
+        for ordering, expected_ordering in [
+            (None, ("-created_datetime", "-id")),
+            ("created_datetime", ("created_datetime", "id")),
+            ("-created_datetime", ("-created_datetime", "-id")),
+        ]:
+            with self.subTest(ordering=ordering):
+                request = Request(
+                    APIRequestFactory().get(
+                        "/", {"ordering": ordering} if ordering else {}
+                    )
+                )
+                self.assertEqual(
+                    KeysetPagination().get_ordering(
+                        request, Post.objects.all(), view=View()
+                    ),
+                    expected_ordering,
+                )
+
+    def test_get_ordering_for_ranked_queryset(self):
+        """Test that search results are paged by their rank."""
+
+        self.assertEqual(
+            KeysetPagination().get_ordering(
+                self.request,
+                Post.objects.annotate(search_rank=Value(1.0)),
+                view=None,
+            ),
+            ("-search_rank", "-created_datetime", "-id"),
+        )
+
+    def test_get_seek_condition(self):
+        pagination = KeysetPagination()
+        pagination.cursor = Cursor(
+            offset=0, reverse=False, position=json.dumps(["2026-01-01", "x"])
+        )
+
+        self.assertEqual(
+            pagination.get_seek_condition(("-created_datetime", "id")),
+            Q(created_datetime__lte="2026-01-01")
+            & (
+                Q(created_datetime__lt="2026-01-01")
+                | (Q(created_datetime="2026-01-01") & Q(id__gt="x"))
+            ),
+        )
+
+    def test_invalid_cursor(self):
+        for position in ["not json", json.dumps(["2026-01-01"]), '["x", "y"]']:
+            with self.subTest(position=position):
+                cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+                request = Request(APIRequestFactory().get("/", {"cursor": cursor}))
+
+                with self.assertRaises(NotFound):
+                    KeysetPagination().paginate_queryset(
+                        Post.objects.all(), request, view=None
+                    )
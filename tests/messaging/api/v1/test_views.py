@@ -1,10 +1,14 @@
 import uuid
 from unittest.mock import MagicMock, patch
 
+from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from django.db import connection
 from django.urls import reverse
+from encrypted_model_fields import fields as encrypted_fields
 from rest_framework import serializers
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 
 from tests.accounts.test_models import (
     FriendShipFactory,
@@ -25,14 +29,23 @@ from uia_backend.cluster.constants import (
     UPDATE_CLUSTER_PERMISSION,
     VIEW_CLUSTER_PERMISSION,
 )
-from uia_backend.libs.permissions import assign_object_permissions
+from uia_backend.cluster.utils import assign_cluster_permissions
 from uia_backend.libs.testutils import get_test_image_file
 from uia_backend.messaging.api.v1.serializers import PostSerializer
+from uia_backend.messaging.api.v1.views import ListDMAPIView
 from uia_backend.messaging.constants import (
     CENT_EVENT_POST_LIKE_CREATED,
     CENT_EVENT_POST_LIKE_DELETED,
 )
-from uia_backend.messaging.models import DM, Comment, FileModel, Like, Post
+from uia_backend.messaging.encryption import dm_content_cache
+from uia_backend.messaging.models import (
+    DM,
+    Comment,
+    DMConversation,
+    FileModel,
+    Like,
+    Post,
+)
 
 
 class PostListAPIViewTests(APITestCase):
@@ -50,10 +63,10 @@ class PostListAPIViewTests(APITestCase):
         )
         self.url = reverse("messaging_api_v1:cluster_post_list", args=[self.cluster.id])
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_fails_for_unauthenticated_user(self):
@@ -283,7 +296,6 @@ class PostListAPIViewTests(APITestCase):
         self.assertEqual(
             response.json(),
             {
-                "count": 3,
                 "next": None,
                 "previous": None,
                 "status": "Success",
@@ -310,12 +322,180 @@ class PostListAPIViewTests(APITestCase):
                         "ws_channel_name": f"$posts:{post.id}",
                     }
                     for post in Post.objects.filter(cluster=self.cluster).order_by(
-                        "-created_datetime"
+                        "-created_datetime", "-id"
                     )
                 ],
             },
         )
 
+    def test_search_cluster_posts(self):
+        """Test that searching posts returns matching posts with a headline."""
+
+        self.client.force_authenticate(self.user)
+
+        post = PostFactory.create(
+            cluster=self.cluster,
+            created_by=self.user,
+            title="Hostel",
+            content="No light in block B",
+        )
+        PostFactory.create(
+            cluster=self.cluster,
+            created_by=self.user,
+            title="Exams",
+            content="Timetable is out",
+        )
+
+        response = self.client.get(path=self.url, data={"search": "light"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([result["id"] for result in data], [str(post.id)])
+        # headlines are only generated by postgresql full text search
+        self.assertIsNone(data[0]["headline"])
+
+    def test_list_cluster_posts_by_cursor(self):
+        """Test that cluster posts are paged with a cursor."""
+
+        self.client.force_authenticate(self.user)
+
+        posts = [
+            PostFactory.create(cluster=self.cluster, created_by=self.user)
+            for _ in range(3)
+        ]
+        expected_ids = [
+            str(post.id)
+            for post in sorted(
+                posts,
+                key=lambda post: (post.created_datetime, post.id),
+                reverse=True,
+            )
+        ]
+
+        response = self.client.get(path=self.url, data={"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [post["id"] for post in response.json()["data"]], expected_ids[:2]
+        )
+        self.assertIsNotNone(response.json()["next"])
+
+        response = self.client.get(response.json()["next"])
+
+        self.assertEqual(
+            [post["id"] for post in response.json()["data"]], expected_ids[2:]
+        )
+        self.assertIsNone(response.json()["next"])
+
+    def test_list_cluster_posts_oldest_first(self):
+        """Test that the ordering query parameter is kept with cursor pages."""
+
+        self.client.force_authenticate(self.user)
+
+        posts = [
+            PostFactory.create(cluster=self.cluster, created_by=self.user)
+            for _ in range(3)
+        ]
+        expected_ids = [
+            str(post.id)
+            for post in sorted(posts, key=lambda post: (post.created_datetime, post.id))
+        ]
+
+        response = self.client.get(
+            path=self.url, data={"limit": 2, "ordering": "created_datetime"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [post["id"] for post in response.json()["data"]], expected_ids[:2]
+        )
+
+        response = self.client.get(response.json()["next"])
+
+        self.assertEqual(
+            [post["id"] for post in response.json()["data"]], expected_ids[2:]
+        )
+
+
+class PostSearchAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.cluster = ClusterFactory.create()
+        self.other_cluster = ClusterFactory.create()
+        ClusterMembershipFactory(user=self.user, cluster=self.cluster)
+        ClusterMembershipFactory(user=self.user, cluster=self.other_cluster)
+        self.url = reverse("messaging_api_v1:search_posts")
+
+    def test_fails_for_unauthenticated_user(self):
+        response = self.client.get(path=self.url, data={"search": "light"})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_returns_nothing_without_search_term(self):
+        self.client.force_authenticate(self.user)
+        PostFactory.create(cluster=self.cluster, created_by=self.user)
+
+        response = self.client.get(path=self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], [])
+
+    def test_search_posts_in_users_clusters(self):
+        """Test that only posts in clusters the user can view are searched."""
+
+        self.client.force_authenticate(self.user)
+        author = UserModelFactory.create(email="author@example.com")
+
+        posts = [
+            PostFactory.create(
+                cluster=cluster,
+                created_by=author,
+                title="Hostel",
+                content="No light in block B",
+            )
+            for cluster in [self.cluster, self.other_cluster]
+        ]
+        # not matching the search
+        PostFactory.create(
+            cluster=self.cluster,
+            created_by=author,
+            title="Exams",
+            content="Timetable is out",
+        )
+        # in a cluster the user is not a member of
+        PostFactory.create(
+            cluster=ClusterFactory.create(),
+            created_by=author,
+            title="Hostel",
+            content="No light in block C",
+        )
+        # in a cluster the user can no longer view
+        revoked_cluster = ClusterFactory.create()
+        ClusterMembershipFactory(
+            user=self.user, cluster=revoked_cluster, permission_mask=0
+        )
+        PostFactory.create(
+            cluster=revoked_cluster,
+            created_by=author,
+            title="Hostel",
+            content="No light in block D",
+        )
+
+        response = self.client.get(path=self.url, data={"search": "light"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [post["id"] for post in response.json()["data"]],
+            [
+                str(post.id)
+                for post in sorted(
+                    posts,
+                    key=lambda post: (post.created_datetime, post.id),
+                    reverse=True,
+                )
+            ],
+        )
+
 
 class PostDetailsAPIViewTests(APITestCase):
     def setUp(self) -> None:
@@ -340,10 +520,10 @@ class PostDetailsAPIViewTests(APITestCase):
             args=[self.cluster.id, self.post.id],
         )
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_fails_for_unauthenticated_user(self):
@@ -436,10 +616,10 @@ class PostDetailsAPIViewTests(APITestCase):
 
         self.client.force_authenticate(user=user)
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=user,
-            obj=self.cluster,
+            user=user,
+            cluster=self.cluster,
         )
 
         response = self.client.delete(path=self.url)
@@ -459,12 +639,16 @@ class PostDetailsAPIViewTests(APITestCase):
     def test_delete_successful(self):
         self.client.force_authenticate(self.user)
 
-        response = self.client.delete(path=self.url)
+        with patch(
+            "uia_backend.libs.centrifugo.CentrifugoConnector.broadcast_event"
+        ) as mock_publish_centrifugo_event:
+            response = self.client.delete(path=self.url)
 
         self.assertEqual(response.status_code, 204)
         self.assertEqual(response.data, None)
 
         self.assertFalse(Post.objects.all().exists())
+        mock_publish_centrifugo_event.assert_called_once()
 
 
 class LikePostAPIViewTests(APITestCase):
@@ -490,10 +674,10 @@ class LikePostAPIViewTests(APITestCase):
             args=[self.cluster.id, self.post.id],
         )
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_post_fails_for_unauthenticated_user(self):
@@ -564,7 +748,8 @@ class LikePostAPIViewTests(APITestCase):
         self.client.force_authenticate(self.user)
         like = LikeFactory.create(post=self.post, created_by=self.user)
 
-        response = self.client.post(path=self.url, data={})
+        with patch("uia_backend.libs.centrifugo.CentrifugoConnector.broadcast_event"):
+            response = self.client.post(path=self.url, data={})
 
         self.assertEqual(response.status_code, 201)
         self.assertEqual(
@@ -685,10 +870,10 @@ class CommentListAPIViewTests(APITestCase):
             "messaging_api_v1:post_list_comments", args=[self.cluster.id, self.post.id]
         )
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
     def test_fails_for_unauthenticated_user(self):
@@ -876,10 +1061,10 @@ class RepliesListAPIViewTests(APITestCase):
             args=[self.cluster.id, self.post.id, self.comment.id],
         )
 
-        assign_object_permissions(
+        assign_cluster_permissions(
             permissions=[VIEW_CLUSTER_PERMISSION, UPDATE_CLUSTER_PERMISSION],
-            assignee=self.user,
-            obj=self.cluster,
+            user=self.user,
+            cluster=self.cluster,
         )
 
         self.maxDiff = None
@@ -1237,9 +1422,13 @@ class DMCreateAPIViewTests(APITestCase):
             "friendship_id": str(self.friendship_record.id),
         }
 
-        response = self.client.post(data=data, path=self.url)
+        with patch(
+            "uia_backend.libs.centrifugo.CentrifugoConnector.broadcast_event"
+        ) as mock_publish_centrifugo_event:
+            response = self.client.post(data=data, path=self.url)
 
         self.assertEqual(response.status_code, 201)
+        mock_publish_centrifugo_event.assert_called_once()
 
         dm_query = DM.objects.filter(created_by=self.authenticated_user)
         self.assertEqual(dm_query.count(), 1)
@@ -1274,6 +1463,9 @@ class DMCreateAPIViewTests(APITestCase):
 
 class ListDMAPIViewTests(APITestCase):
     def setUp(self) -> None:
+        dm_content_cache.clear()
+        self.addCleanup(dm_content_cache.clear)
+
         self.authenticated_user = UserModelFactory.create()
         self.user = UserModelFactory.create(email="miscope@example.com")
         self.friendship_record = FriendShipFactory.create()
@@ -1390,6 +1582,93 @@ class ListDMAPIViewTests(APITestCase):
             },
         )
 
+    def test_search_dms(self):
+        """Test that DMs are searched by the words of their encrypted content."""
+
+        self.client.force_authenticate(self.authenticated_user)
+
+        dm = DMFactory.create(
+            created_by=self.user,
+            friendship=self.friendship_record,
+            content="Meet me at the library",
+        )
+        DMFactory.create(
+            created_by=self.user,
+            friendship=self.friendship_record,
+            content="Library is closed",
+        )
+        # same words in another friendship (should not be listed)
+        DMFactory.create(
+            created_by=self.user,
+            friendship=FriendShipFactory.create(),
+            content="Meet me at the library",
+        )
+
+        response = self.client.get(path=self.url, data={"search": "library meet"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result["id"] for result in response.json()["data"]], [str(dm.id)]
+        )
+
+    def test_list_dms_decrypts_only_the_page(self):
+        """Test that only the listed DMs are decrypted, once while they are cached."""
+
+        self.client.force_authenticate(self.authenticated_user)
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        DMFactory.create_batch(
+            created_by=self.user, friendship=self.friendship_record, size=page_size + 5
+        )
+
+        with patch.object(
+            encrypted_fields.CRYPTER, "decrypt", wraps=encrypted_fields.CRYPTER.decrypt
+        ) as mock_decrypt:
+            response = self.client.get(path=self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["data"]), page_size)
+            self.assertEqual(mock_decrypt.call_count, page_size)
+
+            mock_decrypt.reset_mock()
+            second_response = self.client.get(path=self.url)
+            mock_decrypt.assert_not_called()
+
+        self.assertEqual(second_response.json(), response.json())
+
+    def test_list_dms_query_plan(self):
+        """
+        Test that listing DMs seeks the DM and friendship settings indexes.
+
+        The plan must not scan a table or sort DMs outside of an index.
+        """
+
+        DMFactory.create_batch(
+            created_by=self.user, friendship=self.friendship_record, size=5
+        )
+
+        view = ListDMAPIView(
+            request=Request(APIRequestFactory().get(self.url)),
+            kwargs={"friendship_id": self.friendship_record.id},
+        )
+        view.request.user = self.authenticated_user
+        queryset = view.get_queryset().order_by("-created_datetime")[:50]
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                # test tables are tiny, make the planner use an index if it can
+                cursor.execute("SET LOCAL enable_seqscan = off;")
+            plan = queryset.explain()
+
+            self.assertNotIn("Seq Scan", plan)
+            self.assertNotRegex(plan, r"Sort\b")
+        else:
+            plan = queryset.explain()
+
+            self.assertNotRegex(plan, r"\bSCAN\b")
+            self.assertNotIn("TEMP B-TREE", plan)
+
+        self.assertIn("dm_friendship_created_idx", plan)
+        self.assertIn("friendship_settings_user_idx", plan)
+
 
 class RetrieveUpdateDMAPIView(APITestCase):
     def setUp(self) -> None:
@@ -1601,3 +1880,165 @@ class RetrieveUpdateDMAPIView(APITestCase):
         self.assertEqual(DM.objects.count(), 0)
         self.assertEqual(response.data, None)
         mock_publish_centrifugo_event.assert_called_once()
+
+
+class DMInboxAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.url = reverse("messaging_api_v1:dm_inbox")
+
+    def create_friendship(self, user, friend):
+        friendship = FriendShipFactory.create()
+        for user, other_user in [(user, friend), (friend, user)]:
+            UserFriendShipSettingsFactory.create(
+                user=user,
+                friendship=friendship,
+                invitation=FriendShipInvitationFactory.create(
+                    user=user, created_by=other_user
+                ),
+            )
+        return friendship
+
+    def test_fails_for_unauthenticated_user(self):
+        response = self.client.get(path=self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_list_conversations(self):
+        """Test that conversations are listed by most recent activity."""
+
+        self.client.force_authenticate(self.user)
+
+        friends = [
+            UserModelFactory.create(email=f"friend{index}@example.com")
+            for index in range(3)
+        ]
+        friendships = [self.create_friendship(self.user, friend) for friend in friends]
+
+        DMFactory.create(created_by=friends[0], friendship=friendships[0])
+        DMFactory.create(created_by=friends[1], friendship=friendships[1])
+        DMFactory.create(created_by=friends[2], friendship=friendships[2])
+        last_dm = DMFactory.create(created_by=friends[0], friendship=friendships[0])
+        # conversations of other users are not listed
+        DMFactory.create(
+            created_by=friends[1],
+            friendship=self.create_friendship(friends[1], friends[2]),
+        )
+
+        with self.assertNumQueries(3):
+            response = self.client.get(path=self.url, data={"limit": 2})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(
+            [conversation["friendship"] for conversation in data],
+            [str(friendships[0].id), str(friendships[2].id)],
+        )
+        self.assertEqual(
+            data[0]["friend"],
+            dict(ProfileSerializer().to_representation(instance=friends[0])),
+        )
+        self.assertEqual(data[0]["unread_count"], 2)
+        self.assertIsNone(data[0]["last_read_datetime"])
+        self.assertEqual(data[0]["last_message"]["id"], str(last_dm.id))
+        self.assertEqual(data[0]["last_message"]["content"], last_dm.content)
+
+        response = self.client.get(response.json()["next"])
+
+        self.assertEqual(
+            [conversation["friendship"] for conversation in response.json()["data"]],
+            [str(friendships[1].id)],
+        )
+
+
+class DMReadAPIViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.friend = UserModelFactory.create(email="friend@example.com")
+        self.friendship = FriendShipFactory.create()
+
+        for user, other_user in [(self.user, self.friend), (self.friend, self.user)]:
+            UserFriendShipSettingsFactory.create(
+                user=user,
+                friendship=self.friendship,
+                invitation=FriendShipInvitationFactory.create(
+                    user=user, created_by=other_user
+                ),
+            )
+
+        self.dms = DMFactory.create_batch(
+            created_by=self.friend, friendship=self.friendship, size=3
+        )
+        self.url = reverse("messaging_api_v1:dm_read", args=[self.friendship.id])
+
+    def test_fails_for_unauthenticated_user(self):
+        response = self.client.post(path=self.url, data={"message_id": self.dms[0].id})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_fails_for_user_outside_friendship(self):
+        self.client.force_authenticate(
+            UserModelFactory.create(email="stranger@example.com")
+        )
+
+        response = self.client.post(path=self.url, data={"message_id": self.dms[0].id})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_fails_for_message_of_another_friendship(self):
+        self.client.force_authenticate(self.user)
+        dm = DMFactory.create(created_by=self.friend, friendship=FriendShipFactory())
+
+        response = self.client.post(path=self.url, data={"message_id": dm.id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "Error",
+                "code": 400,
+                "data": {"message_id": ["Message does not exist."]},
+            },
+        )
+
+    @patch("uia_backend.messaging.utils.CentrifugoConnector")
+    def test_mark_read_successfully(self, mock_centrifugo_connector):
+        self.client.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                path=self.url, data={"message_id": self.dms[1].id}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "Success",
+                "code": 200,
+                "data": {
+                    "last_read_datetime": serializers.DateTimeField().to_representation(
+                        value=self.dms[1].created_datetime
+                    ),
+                    "unread_count": 1,
+                },
+            },
+        )
+        mock_centrifugo_connector.return_value.broadcast_event.assert_called_once()
+
+    @patch("uia_backend.messaging.utils.CentrifugoConnector")
+    def test_mark_read_without_conversation(self, mock_centrifugo_connector):
+        """Test that the conversation is created when no DM created it yet."""
+
+        self.client.force_authenticate(self.user)
+        DMConversation.objects.filter(user=self.user).delete()
+
+        response = self.client.post(path=self.url, data={"message_id": self.dms[1].id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["unread_count"], 1)
+        self.assertTrue(
+            DMConversation.objects.filter(
+                user=self.user, friendship=self.friendship
+            ).exists()
+        )
@@ -0,0 +1,169 @@
+from io import StringIO
+from unittest import mock
+
+from cryptography.fernet import Fernet
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import TextField, Value
+from django.test import TestCase
+from encrypted_model_fields import fields as encrypted_fields
+
+from tests.accounts.test_models import FriendShipFactory, UserModelFactory
+from tests.messaging.test_models import DMFactory
+from uia_backend.accounts.models import CustomUser
+from uia_backend.messaging.models import DM, DMKeyRotation, DMKeyword, Post
+
+
+class BenchmarkPostSearchCommandTests(TestCase):
+    def test_method(self):
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_post_search",
+            "--posts",
+            "30",
+            "--clusters",
+            "4",
+            "--clusters-per-user",
+            "2",
+            "--runs",
+            "1",
+            "--batch-size",
+            "10",
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        self.assertIn("30 posts | cluster search (icontains):", output)
+        self.assertIn("30 posts | global search (icontains):", output)
+        self.assertIn("Benchmark complete.", output)
+
+        # generated data is rolled back
+        self.assertFalse(
+            CustomUser.objects.filter(email__startswith="benchmark-").exists()
+        )
+        self.assertFalse(Post.objects.exists())
+
+
+class BenchmarkDMListCommandTests(TestCase):
+    def test_method(self):
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_dm_list",
+            "--page-sizes",
+            "5",
+            "10",
+            "--dms",
+            "20",
+            "--runs",
+            "1",
+            "--batch-size",
+            "10",
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        for page_size in [5, 10]:
+            self.assertIn(f"20 dms | page of {page_size} | decrypt on load:", output)
+            self.assertIn(
+                f"20 dms | page of {page_size} | decrypt page (cold cache):", output
+            )
+            self.assertIn(
+                f"20 dms | page of {page_size} | decrypt page (warm cache):", output
+            )
+        self.assertIn("Benchmark complete.", output)
+
+        # generated data is rolled back
+        self.assertFalse(
+            CustomUser.objects.filter(email__startswith="benchmark-").exists()
+        )
+        self.assertFalse(DM.objects.exists())
+
+    def test_every_run_decrypts_the_page(self):
+        """Test that runs do not reuse DMs loaded and decrypted by earlier runs."""
+
+        with mock.patch.object(
+            encrypted_fields.CRYPTER, "decrypt", wraps=encrypted_fields.CRYPTER.decrypt
+        ) as mock_decrypt:
+            call_command(
+                "benchmark_dm_list",
+                "--page-sizes",
+                "5",
+                "--dms",
+                "20",
+                "--runs",
+                "3",
+                stdout=StringIO(),
+            )
+
+        # saving a generated DM tries to decrypt it once, then every "decrypt on load"
+        # and "cold cache" run decrypts the page and the warm cache runs decrypt
+        # nothing
+        self.assertEqual(mock_decrypt.call_count, 20 + 3 * 5 + 3 * 5)
+
+
+class BackfillDMKeywordsCommandTests(TestCase):
+    def test_method(self):
+        user = UserModelFactory.create(email="user@example.com")
+        DMFactory.create_batch(
+            created_by=user,
+            friendship=FriendShipFactory.create(),
+            content="Meet me at the library",
+            size=3,
+        )
+        DMKeyword.objects.all().delete()
+        stdout = StringIO()
+
+        call_command("backfill_dm_keywords", "--batch-size", "2", stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn("Indexed 2 DMs, last DM", output)
+        self.assertIn("Indexed 3 DMs with 15 keywords.", output)
+        self.assertEqual(DMKeyword.objects.count(), 15)
+
+
+class RotateDMEncryptionKeyCommandTests(TestCase):
+    def test_method(self):
+        user = UserModelFactory.create(email="user@example.com")
+        DMFactory.create_batch(
+            created_by=user, friendship=FriendShipFactory.create(), size=3
+        )
+        stdout = StringIO()
+
+        call_command(
+            "rotate_dm_encryption_key",
+            "--batch-size",
+            "2",
+            "--throttle",
+            "0",
+            "--restart",
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        self.assertIn("Read 2 DMs, re-encrypted 0, last DM", output)
+        # every DM is already encrypted with the only key
+        self.assertIn("Re-encrypted 0 of 3 DMs.", output)
+        self.assertIsNotNone(DMKeyRotation.objects.get().completed_datetime)
+
+    def test_fails_for_token_of_unknown_key(self):
+        dm = DMFactory.create(
+            created_by=UserModelFactory.create(email="user@example.com"),
+            friendship=FriendShipFactory.create(),
+        )
+        DM.objects.filter(id=dm.id).update(
+            content=Value(
+                Fernet(Fernet.generate_key()).encrypt(b"Old message").decode(),
+                output_field=TextField(),
+            )
+        )
+
+        with self.assertRaisesMessage(
+            CommandError, f"Unable to rotate the key: DM {dm.id} is encrypted"
+        ), self.assertLogs(level="ERROR"):
+            call_command(
+                "rotate_dm_encryption_key", "--throttle", "0", stdout=StringIO()
+            )
+
+        self.assertIsNone(DMKeyRotation.objects.get().completed_datetime)
@@ -0,0 +1,342 @@
+import base64
+from datetime import timedelta
+from unittest import mock
+
+from cryptography.fernet import Fernet, MultiFernet
+from django.conf import settings
+from django.db.models import TextField, Value
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from encrypted_model_fields import fields as encrypted_fields
+
+from tests.accounts.test_models import FriendShipFactory, UserModelFactory
+from tests.messaging.test_models import DMFactory
+from uia_backend.messaging.encryption import (
+    DecryptedContentCache,
+    DMKeyRotationError,
+    decrypt_dm_contents,
+    dm_content_cache,
+    get_key_fingerprint,
+    is_fernet_token,
+    rotate_dm_encryption_key,
+    with_encrypted_content,
+)
+from uia_backend.messaging.models import DM, DMKeyRotation
+
+
+@override_settings(DM_CONTENT_CACHE_SIZE=2, DM_CONTENT_CACHE_TTL=60)
+class DecryptedContentCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.cache = DecryptedContentCache()
+        self.updated_datetime = timezone.now()
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get("dm-1", self.updated_datetime))
+
+        self.cache.set("dm-1", self.updated_datetime, "Hello")
+
+        self.assertEqual(self.cache.get("dm-1", self.updated_datetime), "Hello")
+        # an edited message has a new updated_datetime
+        self.assertIsNone(
+            self.cache.get("dm-1", self.updated_datetime + timedelta(seconds=1))
+        )
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("dm-1", self.updated_datetime, "one")
+        self.cache.set("dm-2", self.updated_datetime, "two")
+        self.cache.get("dm-1", self.updated_datetime)
+
+        self.cache.set("dm-3", self.updated_datetime, "three")
+
+        self.assertEqual(self.cache.get("dm-1", self.updated_datetime), "one")
+        self.assertIsNone(self.cache.get("dm-2", self.updated_datetime))
+        self.assertEqual(self.cache.get("dm-3", self.updated_datetime), "three")
+
+    def test_entries_expire(self):
+        with mock.patch("uia_backend.messaging.encryption.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            self.cache.set("dm-1", self.updated_datetime, "Hello")
+
+            monotonic.return_value = 159.0
+            self.assertEqual(self.cache.get("dm-1", self.updated_datetime), "Hello")
+
+            monotonic.return_value = 160.0
+            self.assertIsNone(self.cache.get("dm-1", self.updated_datetime))
+
+    @override_settings(DM_CONTENT_CACHE_SIZE=0)
+    def test_disabled(self):
+        self.cache.set("dm-1", self.updated_datetime, "Hello")
+
+        self.assertIsNone(self.cache.get("dm-1", self.updated_datetime))
+
+    def test_clear(self):
+        self.cache.set("dm-1", self.updated_datetime, "Hello")
+
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("dm-1", self.updated_datetime))
+
+
+class DecryptDMContentsTests(TestCase):
+    def setUp(self) -> None:
+        dm_content_cache.clear()
+        self.addCleanup(dm_content_cache.clear)
+
+        user = UserModelFactory.create()
+        friendship = FriendShipFactory.create()
+        self.dms = [
+            DMFactory.create(
+                created_by=user, friendship=friendship, content=f"Message {index}"
+            )
+            for index in range(3)
+        ]
+
+    def get_dms(self) -> list[DM]:
+        return list(with_encrypted_content(DM.objects.order_by("created_datetime")))
+
+    def test_content_is_not_decrypted_when_loaded(self):
+        with mock.patch(
+            "uia_backend.messaging.encryption.encrypted_fields.CRYPTER"
+        ) as mock_crypter:
+            dms = self.get_dms()
+
+        mock_crypter.decrypt.assert_not_called()
+        for dm in dms:
+            self.assertIn("content", dm.get_deferred_fields())
+            self.assertNotIn(dm.encrypted_content, [d.content for d in self.dms])
+
+    def test_method(self):
+        dms = self.get_dms()
+
+        with self.assertNumQueries(0):
+            decrypt_dm_contents(dms)
+
+        self.assertEqual([dm.content for dm in dms], [dm.content for dm in self.dms])
+        for dm in dms:
+            self.assertNotIn("content", dm.get_deferred_fields())
+            self.assertFalse(hasattr(dm, "encrypted_content"))
+
+    def test_cached_content_is_not_decrypted_again(self):
+        decrypt_dm_contents(self.get_dms())
+        dms = self.get_dms()
+
+        with mock.patch(
+            "uia_backend.messaging.encryption.encrypted_fields.CRYPTER"
+        ) as mock_crypter:
+            decrypt_dm_contents(dms)
+
+        mock_crypter.decrypt.assert_not_called()
+        self.assertEqual([dm.content for dm in dms], [dm.content for dm in self.dms])
+
+    def test_edited_content_is_not_served_from_cache(self):
+        decrypt_dm_contents(self.get_dms())
+        self.dms[0].content = "Edited"
+        self.dms[0].save()
+
+        dms = self.get_dms()
+        decrypt_dm_contents(dms)
+
+        self.assertEqual(dms[0].content, "Edited")
+
+    def test_unencrypted_content(self):
+        dms = self.get_dms()
+        # e.g content saved before the field was encrypted
+        dms[0].encrypted_content = "Not a token"
+
+        decrypt_dm_contents(dms)
+
+        self.assertEqual(dms[0].content, "Not a token")
+
+    def test_dms_loaded_with_content_are_left_untouched(self):
+        dms = list(DM.objects.order_by("created_datetime"))
+
+        with mock.patch(
+            "uia_backend.messaging.encryption.encrypted_fields.CRYPTER"
+        ) as mock_crypter:
+            decrypt_dm_contents(dms)
+
+        mock_crypter.decrypt.assert_not_called()
+        self.assertEqual([dm.content for dm in dms], [dm.content for dm in self.dms])
+
+
+class IsFernetTokenTests(TestCase):
+    def test_method(self):
+        token = Fernet(Fernet.generate_key()).encrypt(b"Hello")
+
+        self.assertTrue(is_fernet_token(token))
+        for value in [
+            b"Hello",
+            b"",
+            # starts like a token but is too short
+            b"gAAAAABhello",
+            # not base64
+            token[:-4] + b"!!!!",
+            # wrong version byte
+            base64.urlsafe_b64encode(b"\x81" + base64.urlsafe_b64decode(token)[1:]),
+        ]:
+            with self.subTest(value=value):
+                self.assertFalse(is_fernet_token(value))
+
+
+class RotateDMEncryptionKeyTests(TestCase):
+    def setUp(self) -> None:
+        self.old_key = settings.FIELD_ENCRYPTION_KEY[0]
+        self.new_key = Fernet.generate_key().decode()
+
+        user = UserModelFactory.create()
+        friendship = FriendShipFactory.create()
+        self.dms = [
+            DMFactory.create(
+                created_by=user, friendship=friendship, content=f"Message {index}"
+            )
+            for index in range(5)
+        ]
+
+        # the new key encrypts, the old one still decrypts
+        keys = [self.new_key, self.old_key]
+        settings_override = override_settings(FIELD_ENCRYPTION_KEY=keys)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        crypter_patch = mock.patch.object(
+            encrypted_fields,
+            "CRYPTER",
+            MultiFernet([Fernet(key) for key in keys]),
+        )
+        crypter_patch.start()
+        self.addCleanup(crypter_patch.stop)
+
+    def get_encrypted_contents(self) -> dict:
+        return dict(
+            with_encrypted_content(DM.objects.all()).values_list(
+                "id", "encrypted_content"
+            )
+        )
+
+    def assert_encrypted_with_new_key(self) -> None:
+        new_fernet = Fernet(self.new_key)
+        encrypted_contents = self.get_encrypted_contents()
+
+        for dm in self.dms:
+            self.assertEqual(
+                new_fernet.decrypt(encrypted_contents[dm.id].encode()).decode(),
+                dm.content,
+            )
+
+    def test_method(self):
+        updated_datetimes = dict(DM.objects.values_list("id", "updated_datetime"))
+
+        batches = list(rotate_dm_encryption_key(batch_size=2))
+
+        dm_ids = sorted(dm.id for dm in self.dms)
+        self.assertEqual(
+            batches,
+            [(dm_ids[1], 2, 2), (dm_ids[3], 2, 2), (dm_ids[4], 1, 1)],
+        )
+        self.assert_encrypted_with_new_key()
+        self.assertEqual(
+            dict(DM.objects.values_list("id", "content")),
+            {dm.id: dm.content for dm in self.dms},
+        )
+        # the DMs were not edited
+        self.assertEqual(
+            dict(DM.objects.values_list("id", "updated_datetime")), updated_datetimes
+        )
+
+        checkpoint = DMKeyRotation.objects.get()
+        self.assertEqual(checkpoint.key_fingerprint, get_key_fingerprint(self.new_key))
+        self.assertEqual(checkpoint.last_dm_id, dm_ids[4])
+        self.assertEqual(checkpoint.rotated_count, 5)
+        self.assertIsNotNone(checkpoint.completed_datetime)
+
+    def test_completed_rotation_is_not_run_again(self):
+        list(rotate_dm_encryption_key(batch_size=10))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(list(rotate_dm_encryption_key(batch_size=10)), [])
+
+    def test_restart_skips_dms_encrypted_with_the_new_key(self):
+        list(rotate_dm_encryption_key(batch_size=10))
+
+        batches = list(rotate_dm_encryption_key(batch_size=10, restart=True))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0][1:], (5, 0))
+        self.assertEqual(DMKeyRotation.objects.get().rotated_count, 0)
+        self.assert_encrypted_with_new_key()
+
+    def test_interrupted_rotation_resumes_from_checkpoint(self):
+        rotation = rotate_dm_encryption_key(batch_size=2)
+        last_id, _, _ = next(rotation)
+        rotation.close()
+
+        checkpoint = DMKeyRotation.objects.get()
+        self.assertEqual(checkpoint.last_dm_id, last_id)
+        self.assertEqual(checkpoint.rotated_count, 2)
+        self.assertIsNone(checkpoint.completed_datetime)
+
+        batches = list(rotate_dm_encryption_key(batch_size=2))
+
+        self.assertEqual([batch[1:] for batch in batches], [(2, 2), (1, 1)])
+        self.assertEqual(DMKeyRotation.objects.get().rotated_count, 5)
+        self.assert_encrypted_with_new_key()
+
+    def test_unencrypted_content_is_encrypted(self):
+        for dm, content in zip(self.dms, ["Not a token", "gAAAAABNot a token"]):
+            DM.objects.filter(id=dm.id).update(
+                content=Value(content, output_field=TextField())
+            )
+            dm.content = content
+
+        list(rotate_dm_encryption_key(batch_size=10))
+
+        self.assert_encrypted_with_new_key()
+
+    def test_token_of_unknown_key_stops_the_rotation(self):
+        """Test that content of a dropped key is not encrypted as plaintext."""
+
+        dm_ids = sorted(dm.id for dm in self.dms)
+        dropped_key = Fernet.generate_key()
+        dropped_token = Fernet(dropped_key).encrypt(b"Old message").decode()
+        DM.objects.filter(id=dm_ids[2]).update(
+            content=Value(dropped_token, output_field=TextField())
+        )
+        encrypted_contents = self.get_encrypted_contents()
+
+        rotation = rotate_dm_encryption_key(batch_size=2)
+        self.assertEqual(next(rotation), (dm_ids[1], 2, 2))
+        with self.assertRaises(DMKeyRotationError), self.assertLogs(
+            level="ERROR"
+        ) as logs:
+            next(rotation)
+
+        self.assertIn("DM is encrypted with an unknown key.", logs.output[0])
+        # the failing batch is rolled back and the rotation is not completed
+        self.assertEqual(self.get_encrypted_contents()[dm_ids[2]], dropped_token)
+        self.assertEqual(
+            self.get_encrypted_contents()[dm_ids[3]], encrypted_contents[dm_ids[3]]
+        )
+        checkpoint = DMKeyRotation.objects.get()
+        self.assertEqual(checkpoint.last_dm_id, dm_ids[1])
+        self.assertIsNone(checkpoint.completed_datetime)
+
+        # restoring the dropped key resumes the rotation
+        keys = [self.new_key, self.old_key, dropped_key.decode()]
+        with override_settings(FIELD_ENCRYPTION_KEY=keys), mock.patch.object(
+            encrypted_fields, "CRYPTER", MultiFernet([Fernet(key) for key in keys])
+        ):
+            batches = list(rotate_dm_encryption_key(batch_size=2))
+
+        self.assertEqual([batch[1:] for batch in batches], [(2, 2), (1, 1)])
+        self.assertEqual(
+            Fernet(self.new_key).decrypt(
+                self.get_encrypted_contents()[dm_ids[2]].encode()
+            ),
+            b"Old message",
+        )
+        self.assertIsNotNone(DMKeyRotation.objects.get().completed_datetime)
+
+    def test_batches_are_throttled(self):
+        with mock.patch("uia_backend.messaging.encryption.time.sleep") as mock_sleep:
+            list(rotate_dm_encryption_key(batch_size=2, throttle=0.5))
+
+        self.assertEqual(mock_sleep.call_args_list, [mock.call(0.5)] * 3)
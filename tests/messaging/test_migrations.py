@@ -0,0 +1,73 @@
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+
+from tests.accounts.test_models import (
+    FriendShipFactory,
+    FriendShipInvitationFactory,
+    UserFriendShipSettingsFactory,
+    UserModelFactory,
+)
+from tests.messaging.test_models import DMFactory
+from uia_backend.messaging.models import DMConversation
+
+migration = import_module("uia_backend.messaging.migrations.0005_dmconversation")
+
+
+class DMConversationMigrationTests(TestCase):
+    def setUp(self) -> None:
+        self.schema_editor = mock.Mock(connection=connection)
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.friend = UserModelFactory.create(email="friend@example.com")
+
+    def create_friendship(self):
+        friendship = FriendShipFactory.create()
+        for user, other_user in [(self.user, self.friend), (self.friend, self.user)]:
+            UserFriendShipSettingsFactory.create(
+                user=user,
+                friendship=friendship,
+                invitation=FriendShipInvitationFactory.create(
+                    user=user, created_by=other_user
+                ),
+            )
+        return friendship
+
+    def test_backfill_dm_conversations(self):
+        friendship = self.create_friendship()
+        # friendship without DMs
+        self.create_friendship()
+
+        DMFactory.create(created_by=self.user, friendship=friendship)
+        last_dm = DMFactory.create(created_by=self.friend, friendship=friendship)
+        DMConversation.objects.all().delete()
+
+        migration.backfill_dm_conversations(apps, self.schema_editor)
+
+        conversations = DMConversation.objects.order_by("user__email")
+        self.assertEqual(
+            [
+                (
+                    conversation.user,
+                    conversation.friendship,
+                    conversation.last_message,
+                    conversation.last_message_datetime,
+                    conversation.unread_count,
+                    conversation.last_read_datetime,
+                )
+                for conversation in conversations
+            ],
+            [
+                (
+                    user,
+                    friendship,
+                    last_dm,
+                    last_dm.created_datetime,
+                    0,
+                    last_dm.created_datetime,
+                )
+                for user in [self.friend, self.user]
+            ],
+        )
@@ -0,0 +1,115 @@
+from django.test import TestCase, override_settings
+
+from tests.accounts.test_models import FriendShipFactory, UserModelFactory
+from tests.messaging.test_models import DMFactory
+from uia_backend.messaging.models import DM, DMKeyword
+from uia_backend.messaging.search import (
+    backfill_dm_keywords,
+    get_keyword_token,
+    normalize_keywords,
+    search_dms,
+)
+
+
+class KeywordTests(TestCase):
+    def test_normalize_keywords(self):
+        self.assertEqual(
+            normalize_keywords("Meet me at the LIBRARY, the library! a ＡＢ"),
+            {"meet", "me", "at", "the", "library", "ab"},
+        )
+
+    def test_get_keyword_token(self):
+        token = get_keyword_token("library")
+
+        self.assertEqual(len(token), 32)
+        self.assertEqual(token, get_keyword_token("library"))
+        self.assertNotEqual(token, get_keyword_token("hostel"))
+
+        with override_settings(DM_SEARCH_INDEX_KEY="another key"):
+            self.assertNotEqual(token, get_keyword_token("library"))
+
+
+class DMKeywordIndexTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.friendship = FriendShipFactory.create()
+
+    def get_tokens(self, dm):
+        return set(
+            DMKeyword.objects.filter(dm=dm, friendship=self.friendship).values_list(
+                "token", flat=True
+            )
+        )
+
+    def test_index_on_save(self):
+        """Test that DM keywords follow the DM content."""
+
+        dm = DMFactory.create(
+            created_by=self.user, friendship=self.friendship, content="Library at 5"
+        )
+
+        self.assertEqual(
+            self.get_tokens(dm), {get_keyword_token("library"), get_keyword_token("at")}
+        )
+
+        dm.content = "Hostel instead"
+        dm.save()
+
+        self.assertEqual(
+            self.get_tokens(dm),
+            {get_keyword_token("hostel"), get_keyword_token("instead")},
+        )
+
+    def test_search_dms(self):
+        """Test that only DMs with every searched word are returned."""
+
+        dm = DMFactory.create(
+            created_by=self.user,
+            friendship=self.friendship,
+            content="Meet me at the library",
+        )
+        DMFactory.create(
+            created_by=self.user, friendship=self.friendship, content="Library closed"
+        )
+        other_friendship_dm = DMFactory.create(
+            created_by=self.user,
+            friendship=FriendShipFactory.create(),
+            content="Meet at the library",
+        )
+
+        self.assertCountEqual(
+            search_dms(DM.objects.all(), "LIBRARY meet"), [dm, other_friendship_dm]
+        )
+        self.assertEqual(
+            list(
+                search_dms(
+                    DM.objects.all(),
+                    "library meet",
+                    friendship_ids=[self.friendship.id],
+                )
+            ),
+            [dm],
+        )
+        # only whole words match
+        self.assertEqual(list(search_dms(DM.objects.all(), "libr")), [])
+        self.assertEqual(list(search_dms(DM.objects.all(), "!")), [])
+
+    def test_backfill_dm_keywords(self):
+        dms = sorted(
+            DMFactory.create_batch(
+                created_by=self.user,
+                friendship=self.friendship,
+                content="Library",
+                size=5,
+            ),
+            key=lambda dm: dm.id,
+        )
+        DMKeyword.objects.all().delete()
+
+        batches = list(backfill_dm_keywords(batch_size=2, start_after=dms[0].id))
+
+        self.assertEqual(batches, [(dms[2].id, 2, 2), (dms[4].id, 2, 2)])
+        self.assertEqual(
+            set(DMKeyword.objects.values_list("dm_id", flat=True)),
+            {dm.id for dm in dms[1:]},
+        )
@@ -0,0 +1,123 @@
+from django.test import TestCase
+
+from tests.accounts.test_models import (
+    FriendShipFactory,
+    FriendShipInvitationFactory,
+    UserFriendShipSettingsFactory,
+    UserModelFactory,
+)
+from tests.cluster.test_models import ClusterFactory
+from tests.messaging.test_models import DMFactory, PostFactory
+from uia_backend.messaging.models import DMConversation
+
+
+class ClusterPostCountSignalTests(TestCase):
+    def setUp(self) -> None:
+        self.cluster = ClusterFactory.create()
+        self.user = UserModelFactory.create(email="user@example.com")
+
+    def test_post_count(self):
+        post = PostFactory.create(cluster=self.cluster, created_by=self.user)
+        PostFactory.create(cluster=self.cluster, created_by=self.user)
+        # updating a post does not change the count
+        post.save()
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.post_count, 2)
+
+        post.delete()
+
+        self.cluster.refresh_from_db()
+        self.assertEqual(self.cluster.post_count, 1)
+
+
+class DMConversationSignalTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.friend = UserModelFactory.create(email="friend@example.com")
+        self.friendship = FriendShipFactory.create()
+
+        for user, other_user in [(self.user, self.friend), (self.friend, self.user)]:
+            UserFriendShipSettingsFactory.create(
+                user=user,
+                friendship=self.friendship,
+                invitation=FriendShipInvitationFactory.create(
+                    user=user, created_by=other_user
+                ),
+            )
+
+    def get_conversation(self, user):
+        return DMConversation.objects.get(user=user, friendship=self.friendship)
+
+    def test_dm_created(self):
+        """Test that new DMs become the last message and are unread by the friend."""
+
+        DMFactory.create(created_by=self.user, friendship=self.friendship)
+        last_dm = DMFactory.create(created_by=self.user, friendship=self.friendship)
+
+        user_conversation = self.get_conversation(self.user)
+        self.assertEqual(user_conversation.last_message, last_dm)
+        self.assertEqual(
+            user_conversation.last_message_datetime, last_dm.created_datetime
+        )
+        self.assertEqual(user_conversation.unread_count, 0)
+        self.assertEqual(user_conversation.last_read_datetime, last_dm.created_datetime)
+
+        friend_conversation = self.get_conversation(self.friend)
+        self.assertEqual(friend_conversation.last_message, last_dm)
+        self.assertEqual(friend_conversation.unread_count, 2)
+        self.assertIsNone(friend_conversation.last_read_datetime)
+
+        # replying marks the conversation as read for the friend
+        reply = DMFactory.create(created_by=self.friend, friendship=self.friendship)
+
+        friend_conversation.refresh_from_db()
+        self.assertEqual(friend_conversation.last_message, reply)
+        self.assertEqual(friend_conversation.unread_count, 0)
+        self.assertEqual(self.get_conversation(self.user).unread_count, 1)
+
+    def test_dm_edited(self):
+        """Test that editing a DM does not change the conversations."""
+
+        dm = DMFactory.create(created_by=self.user, friendship=self.friendship)
+        dm.content = "edited"
+        dm.edited = True
+        dm.save()
+
+        self.assertEqual(self.get_conversation(self.friend).unread_count, 1)
+
+    def test_dm_deleted(self):
+        """Test that deleting the last DM falls back to the previous one."""
+
+        first_dm = DMFactory.create(created_by=self.user, friendship=self.friendship)
+        last_dm = DMFactory.create(created_by=self.user, friendship=self.friendship)
+
+        last_dm.delete()
+
+        friend_conversation = self.get_conversation(self.friend)
+        self.assertEqual(friend_conversation.last_message, first_dm)
+        self.assertEqual(
+            friend_conversation.last_message_datetime, first_dm.created_datetime
+        )
+        self.assertEqual(friend_conversation.unread_count, 1)
+
+        first_dm.delete()
+
+        # the conversation keeps its place in the inbox
+        friend_conversation.refresh_from_db()
+        self.assertIsNone(friend_conversation.last_message)
+        self.assertEqual(
+            friend_conversation.last_message_datetime, first_dm.created_datetime
+        )
+        self.assertEqual(friend_conversation.unread_count, 0)
+
+    def test_read_dm_deleted(self):
+        """Test that deleting a DM that was read keeps the unread count."""
+
+        read_dm = DMFactory.create(created_by=self.friend, friendship=self.friendship)
+        DMFactory.create(created_by=self.user, friendship=self.friendship)
+        DMFactory.create(created_by=self.friend, friendship=self.friendship)
+
+        read_dm.delete()
+
+        self.assertEqual(self.get_conversation(self.user).unread_count, 1)
@@ -0,0 +1,131 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from tests.accounts.test_models import (
+    FriendShipFactory,
+    FriendShipInvitationFactory,
+    UserFriendShipSettingsFactory,
+    UserModelFactory,
+)
+from tests.messaging.test_models import DMFactory
+from uia_backend.messaging.constants import CENT_EVENT_DM_READ
+from uia_backend.messaging.models import DM, DMConversation
+from uia_backend.messaging.utils import mark_dm_conversation_read
+
+
+@mock.patch("uia_backend.messaging.utils.CentrifugoConnector")
+class MarkDMConversationReadTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModelFactory.create(email="user@example.com")
+        self.friend = UserModelFactory.create(email="friend@example.com")
+        self.friendship = FriendShipFactory.create()
+
+        for user, other_user in [(self.user, self.friend), (self.friend, self.user)]:
+            UserFriendShipSettingsFactory.create(
+                user=user,
+                friendship=self.friendship,
+                invitation=FriendShipInvitationFactory.create(
+                    user=user, created_by=other_user
+                ),
+            )
+
+        self.dms = DMFactory.create_batch(
+            created_by=self.friend, friendship=self.friendship, size=3
+        )
+        # the users own messages are never unread
+        DMFactory.create(created_by=self.user, friendship=self.friendship)
+        DMFactory.create(created_by=self.friend, friendship=self.friendship)
+        # sending a message marks the conversation read, start from nothing read
+        DMConversation.objects.filter(user=self.user).update(
+            last_read_datetime=None, unread_count=4
+        )
+
+    def get_conversation(self):
+        return DMConversation.objects.get(user=self.user, friendship=self.friendship)
+
+    def test_method(self, mock_centrifugo_connector):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                updated = mark_dm_conversation_read(
+                    user_id=self.user.id,
+                    friendship_id=self.friendship.id,
+                    read_datetime=self.dms[1].created_datetime,
+                )
+
+        self.assertEqual(updated, 1)
+        conversation = self.get_conversation()
+        self.assertEqual(conversation.last_read_datetime, self.dms[1].created_datetime)
+        self.assertEqual(conversation.unread_count, 2)
+
+        mock_centrifugo_connector.return_value.broadcast_event.assert_called_once_with(
+            event_name=CENT_EVENT_DM_READ,
+            channels=mock.ANY,
+            event_data={
+                "friendship": str(self.friendship.id),
+                "user": str(self.user.id),
+                "read_datetime": self.dms[1].created_datetime.isoformat(),
+            },
+        )
+        self.assertCountEqual(
+            mock_centrifugo_connector.return_value.broadcast_event.call_args.kwargs[
+                "channels"
+            ],
+            [self.user.channel_name, self.friend.channel_name],
+        )
+
+    def test_marker_does_not_move_back(self, mock_centrifugo_connector):
+        """Test that marking older or the same messages read is a no-op."""
+
+        mark_dm_conversation_read(
+            user_id=self.user.id,
+            friendship_id=self.friendship.id,
+            read_datetime=self.dms[1].created_datetime,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for dm in self.dms[:2]:
+                updated = mark_dm_conversation_read(
+                    user_id=self.user.id,
+                    friendship_id=self.friendship.id,
+                    read_datetime=dm.created_datetime,
+                )
+                self.assertEqual(updated, 0)
+
+        conversation = self.get_conversation()
+        self.assertEqual(conversation.last_read_datetime, self.dms[1].created_datetime)
+        self.assertEqual(conversation.unread_count, 2)
+        mock_centrifugo_connector.return_value.broadcast_event.assert_not_called()
+
+    def test_missing_conversation_is_created(self, mock_centrifugo_connector):
+        """Test that a friendship without a conversation row gets a read marker."""
+
+        DMConversation.objects.filter(user=self.user).delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                updated = mark_dm_conversation_read(
+                    user_id=self.user.id,
+                    friendship_id=self.friendship.id,
+                    read_datetime=self.dms[1].created_datetime,
+                )
+
+        self.assertEqual(updated, 1)
+        conversation = self.get_conversation()
+        self.assertEqual(conversation.last_read_datetime, self.dms[1].created_datetime)
+        self.assertEqual(conversation.unread_count, 2)
+        latest_dm = DM.objects.latest("created_datetime", "id")
+        self.assertEqual(conversation.last_message, latest_dm)
+        self.assertEqual(conversation.last_message_datetime, latest_dm.created_datetime)
+        mock_centrifugo_connector.return_value.broadcast_event.assert_called_once()
+
+        # repeating the call is a no-op
+        self.assertEqual(
+            mark_dm_conversation_read(
+                user_id=self.user.id,
+                friendship_id=self.friendship.id,
+                read_datetime=self.dms[1].created_datetime,
+            ),
+            0,
+        )
+        self.assertEqual(DMConversation.objects.filter(user=self.user).count(), 1)
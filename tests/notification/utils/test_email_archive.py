@@ -0,0 +1,179 @@
+import gzip
+import json
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+
+from tests.notification.test_models import (
+    EmailMessageModelFactory,
+    EmailTrackingModelFactory,
+)
+from uia_backend.notification.models import EmailTrackingModel
+from uia_backend.notification.tasks import archive_email_tracking_payloads_task
+from uia_backend.notification.utils.email_archive import (
+    EmailTrackingArchiver,
+    get_archived_event,
+    stream_archived_events,
+)
+
+
+class EmailTrackingArchiverTests(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = FileSystemStorage(location=self.temp_dir.name)
+        self.archiver = EmailTrackingArchiver(
+            storage=self.storage, location="archives", batch_size=2
+        )
+
+        self.message = EmailMessageModelFactory.create(
+            internal_tracker_id=uuid.uuid4(),
+            message_id="xxxxxxxxxxxxx",
+            recipient_email="user@example.com",
+        )
+
+        with freeze_time(timezone.now() - timedelta(days=40)):
+            self.old_records = EmailTrackingModelFactory.create_batch(
+                message=self.message,
+                event_type="5",
+                metadata={"source": "test"},
+                raw_event_data={"event": "delivered", "email": "user@example.com"},
+                size=3,
+            )
+
+        self.new_record = EmailTrackingModelFactory.create(
+            message=self.message,
+            event_type="6",
+            metadata={"source": "test"},
+            raw_event_data={"event": "opened", "email": "user@example.com"},
+        )
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_archive(self):
+        """Test that only old records are archived and their payloads are emptied."""
+
+        archived_count = self.archiver.archive(older_than_days=30)
+
+        self.assertEqual(archived_count, 3)
+
+        for record in self.old_records:
+            record.refresh_from_db()
+            self.assertTrue(record.is_archived)
+            self.assertEqual(record.metadata, {})
+            self.assertEqual(record.raw_event_data, {})
+            self.assertTrue(self.storage.exists(record.archive_segment))
+
+        # batch_size of 2 means 3 records are split over 2 segments
+        segments = set(record.archive_segment for record in self.old_records)
+        self.assertEqual(len(segments), 2)
+
+        self.new_record.refresh_from_db()
+        self.assertFalse(self.new_record.is_archived)
+        self.assertEqual(self.new_record.raw_event_data["event"], "opened")
+
+    def test_archive_is_idempotent(self):
+        """Test that archived records are not archived again."""
+
+        self.archiver.archive(older_than_days=30)
+        self.assertEqual(self.archiver.archive(older_than_days=30), 0)
+
+    def test_segment_format(self):
+        """Test that segments are gzip compressed NDJSON."""
+
+        self.archiver.archive(older_than_days=30)
+        record = EmailTrackingModel.objects.filter(
+            archive_segment__isnull=False, archive_line=0
+        ).first()
+
+        with self.storage.open(record.archive_segment, "rb") as file:
+            lines = gzip.decompress(file.read()).decode().splitlines()
+
+        self.assertEqual(json.loads(lines[0])["id"], str(record.id))
+
+    def test_stream_archived_events(self):
+        self.archiver.archive(older_than_days=30)
+        record = EmailTrackingModel.objects.filter(archive_line=1).first()
+
+        events = list(
+            stream_archived_events(record.archive_segment, storage=self.storage)
+        )
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[1]["id"], str(record.id))
+        self.assertEqual(events[1]["metadata"], {"source": "test"})
+        self.assertEqual(
+            events[1]["raw_event_data"],
+            {"event": "delivered", "email": "user@example.com"},
+        )
+
+    def test_get_archived_event(self):
+        self.archiver.archive(older_than_days=30)
+
+        for record in self.old_records:
+            record.refresh_from_db()
+            event = get_archived_event(record, storage=self.storage)
+            self.assertEqual(event["id"], str(record.id))
+            self.assertEqual(event["message_id"], str(self.message.id))
+
+        # records that have not been archived have no archived event
+        self.assertIsNone(get_archived_event(self.new_record, storage=self.storage))
+
+    def test_get_archived_event_missing_line(self):
+        self.archiver.archive(older_than_days=30)
+        record = self.old_records[0]
+        record.refresh_from_db()
+        record.archive_line = 10
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.assertIsNone(get_archived_event(record, storage=self.storage))
+
+        self.assertEqual(
+            logs.records[0].message,
+            "uia_backend::notification::utils::email_archive::get_archived_event:: "
+            "Archived event not found in segment.",
+        )
+
+
+class EmailTrackingArchiverStorageTests(TestCase):
+    @override_settings(
+        PRIVATE_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+        PRIVATE_FILE_STORAGE_OPTIONS={"location": "/tmp/private"},
+    )
+    def test_segments_are_written_to_private_storage(self):
+        """Test that payloads holding recipient emails are never public."""
+
+        storage = EmailTrackingArchiver().storage
+
+        self.assertIsNot(storage, default_storage)
+        self.assertIsInstance(storage, FileSystemStorage)
+        self.assertEqual(storage.location, "/tmp/private")
+
+
+class ArchiveEmailTrackingPayloadsTaskTests(TestCase):
+    def test_method(self):
+        message = EmailMessageModelFactory.create(
+            internal_tracker_id=uuid.uuid4(),
+            message_id="xxxxxxxxxxxxx",
+            recipient_email="user@example.com",
+        )
+        record = EmailTrackingModelFactory.create(
+            message=message, event_type="5", raw_event_data={"event": "delivered"}
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir, self.settings(
+            PRIVATE_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+            PRIVATE_FILE_STORAGE_OPTIONS={"location": temp_dir},
+        ):
+            self.assertEqual(archive_email_tracking_payloads_task(older_than_days=0), 1)
+
+            record.refresh_from_db()
+            self.assertTrue(record.is_archived)
+            self.assertEqual(
+                get_archived_event(record)["raw_event_data"], {"event": "delivered"}
+            )
@@ -0,0 +1,158 @@
+import logging
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+from uia_backend.accounts.authentication import invalidate_cached_user
+from uia_backend.accounts.models import CustomUser
+
+Logger = logging.getLogger()
+
+ACTIVITY_FIELDS = ["last_login", "app_version"]
+
+SEQUENCE_CACHE_KEY = "user_activity:sequence"
+CURSOR_CACHE_KEY = "user_activity:cursor"
+FLUSH_LOCK_CACHE_KEY = "user_activity:flush_lock"
+
+
+def _value_cache_key(user_id: Any, field: str) -> str:
+    return f"user_activity:{field}:{user_id}"
+
+
+def _slot_cache_key(slot: int) -> str:
+    return f"user_activity:slot:{slot}"
+
+
+def record_user_activity(
+    user: CustomUser,
+    last_login: datetime | None = None,
+    app_version: str | None = None,
+) -> None:
+    """
+    Buffer a users last_login and/or app_version instead of writing them to the
+    users table. Buffered values are written by `flush_user_activity`.
+
+    Every field is buffered under its own key so concurrent records of the same
+    user never overwrite each others values.
+    """
+
+    values = {
+        _value_cache_key(user.id, field): value
+        for field, value in (("last_login", last_login), ("app_version", app_version))
+        if value is not None
+    }
+
+    if not values:
+        return
+
+    ttl = settings.USER_ACTIVITY_BUFFER_TTL
+    cache.set_many(values, timeout=ttl)
+
+    # every record claims a slot from an atomic counter so a flush can find all
+    # users recorded since the previous flush no matter which process recorded them
+    cache.add(SEQUENCE_CACHE_KEY, 0, timeout=None)
+    slot = cache.incr(SEQUENCE_CACHE_KEY)
+    cache.set(_slot_cache_key(slot), str(user.id), timeout=ttl)
+
+
+def _write_user_activity(users: list[CustomUser]) -> list[CustomUser]:
+    """
+    Write the activity of users and return the users written.
+
+    If the batch fails the users are written one at a time, users that still fail
+    are logged and dropped so a single bad value can not block every later flush.
+    """
+
+    try:
+        with transaction.atomic():
+            CustomUser.objects.bulk_update(users, fields=ACTIVITY_FIELDS)
+        return users
+    except DatabaseError:
+        pass
+
+    written_users = []
+    for user in users:
+        try:
+            with transaction.atomic():
+                user.save(update_fields=ACTIVITY_FIELDS)
+        except DatabaseError as error:
+            Logger.error(
+                "uia_backend::accounts::activity::_write_user_activity:: "
+                "Failed to write user activity.",
+                extra={"user_id": str(user.id), "error": str(error)},
+            )
+            continue
+        written_users.append(user)
+
+    return written_users
+
+
+def flush_user_activity(batch_size: int | None = None) -> int:
+    """
+    Write buffered user activity to the database with batched bulk_update calls.
+
+    Returns the number of users updated.
+    """
+
+    batch_size = batch_size or settings.USER_ACTIVITY_FLUSH_BATCH_SIZE
+
+    # flushing twice at the same time is harmless but wasteful
+    if not cache.add(FLUSH_LOCK_CACHE_KEY, True, timeout=5 * 60):
+        return 0
+
+    updated_count = 0
+
+    try:
+        cursor = cache.get(CURSOR_CACHE_KEY, 0)
+        sequence = cache.get(SEQUENCE_CACHE_KEY, 0)
+
+        if sequence < cursor:
+            # the sequence was evicted and restarted, every slot it handed out
+            # since is unflushed
+            cursor = 0
+            cache.set(CURSOR_CACHE_KEY, cursor, timeout=None)
+
+        for start in range(cursor + 1, sequence + 1, batch_size):
+            end = min(start + batch_size - 1, sequence)
+            slot_keys = [_slot_cache_key(slot) for slot in range(start, end + 1)]
+            user_ids = set(cache.get_many(slot_keys).values())
+
+            buffered_values = cache.get_many(
+                [
+                    _value_cache_key(user_id, field)
+                    for user_id in user_ids
+                    for field in ACTIVITY_FIELDS
+                ]
+            )
+
+            users = []
+            for user in CustomUser.objects.filter(id__in=user_ids).only(
+                "id", *ACTIVITY_FIELDS
+            ):
+                for field in ACTIVITY_FIELDS:
+                    value_key = _value_cache_key(user.id, field)
+                    if value_key in buffered_values:
+                        setattr(user, field, buffered_values[value_key])
+                users.append(user)
+
+            users = _write_user_activity(users)
+            for user in users:
+                invalidate_cached_user(user.id)
+            updated_count += len(users)
+
+            # NOTE: buffered values are left to expire so a value recorded during
+            # the flush is not deleted before its own slot is flushed
+            cache.delete_many(slot_keys)
+            cache.set(CURSOR_CACHE_KEY, end, timeout=None)
+    finally:
+        cache.delete(FLUSH_LOCK_CACHE_KEY)
+
+    Logger.info(
+        "uia_backend::accounts::activity::flush_user_activity:: "
+        "Flushed buffered user activity.",
+        extra={"updated_count": updated_count},
+    )
+    return updated_count
@@ -6,11 +6,13 @@ from django.contrib.auth.password_validation import password_changed, validate_p
 from django.core import signing
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from uia_backend.accounts import constants
+from uia_backend.accounts.activity import record_user_activity
 from uia_backend.accounts.models import (
     CustomUser,
     EmailVerification,
@@ -20,17 +22,16 @@ from uia_backend.accounts.models import (
     PasswordResetAttempt,
     UserFriendShipSettings,
     UserGenericSettings,
+    UserImportJob,
 )
-from uia_backend.accounts.tasks import setup_user_profile_task
+from uia_backend.accounts.tasks import process_user_registration_task
 from uia_backend.accounts.utils import (
     generate_centrifugo_connection_token,
     generate_reset_password_otp,
     send_password_reset_otp_email_notification,
     send_user_password_change_email_notification,
-    send_user_registration_email_verification_mail,
 )
 from uia_backend.cluster.utils import ClusterManager
-from uia_backend.experiments.utils import enroll_user_to_prealpha_testing_experiment
 
 logger = logging.getLogger()
 
@@ -84,18 +85,65 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict[str, Any]) -> CustomUser:
         """Create User."""
-        user = CustomUser.objects.create(**validated_data)
+        user = CustomUser(**validated_data)
         user.set_password(validated_data["password"])
-        user.save(update_fields=["password"])
+        user.save()
         password_changed(user=user, password=validated_data["password"])
-        send_user_registration_email_verification_mail(
-            user, request=self.context["request"]
+
+        # NOTE: verification mail, experiment enrollment and profile setup run in
+        # one task once the user is committed so signup is a single insert
+        base_url = self.context["request"].build_absolute_uri("/")
+        transaction.on_commit(
+            lambda: process_user_registration_task.delay(
+                user_id=str(user.id), base_url=base_url
+            )
         )
-        enroll_user_to_prealpha_testing_experiment(user)
-        setup_user_profile_task.delay(user_id=user.id)
         return user
 
 
+class UserImportRowSerializer(UserRegistrationSerializer):
+    """Validate a single row of a user import, see uia_backend.accounts.bulk_import."""
+
+    class Meta(UserRegistrationSerializer.Meta):
+        extra_kwargs = {
+            "password": {"write_only": True, "required": False, "allow_blank": True},
+            # NOTE: existing emails are checked once per batch instead of once per row
+            "email": {"validators": []},
+        }
+
+    def validate_password(self, value: str) -> str:
+        """Validate password field, imported users without one get no password."""
+        if not value:
+            return value
+        return super().validate_password(value)
+
+    def create(self, validated_data: dict[str, Any]) -> CustomUser:
+        """Overidden method."""
+
+
+class UserImportSerializer(serializers.ModelSerializer[UserImportJob]):
+    class Meta:
+        model = UserImportJob
+        fields = [
+            "id",
+            "file",
+            "status",
+            "report",
+            "error",
+            "created_datetime",
+            "updated_datetime",
+        ]
+        read_only_fields = [
+            "id",
+            "status",
+            "report",
+            "error",
+            "created_datetime",
+            "updated_datetime",
+        ]
+        extra_kwargs = {"file": {"write_only": True}}
+
+
 class EmailVerificationSerializer(serializers.ModelSerializer):
     signature = serializers.CharField(
         max_length=500, required=True, write_only=True, source="id"
@@ -212,8 +260,6 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance: CustomUser) -> dict[str, Any]:
         data = super().to_representation(instance)
-        data["follower_count"] = Follows.objects.filter(user_to=instance).count()
-        data["following_count"] = Follows.objects.filter(user_from=instance).count()
         data["display_name"] = (
             f"@{instance.display_name.lower()}" if instance.display_name else None
         )
@@ -306,6 +352,21 @@ class LoginSerializer(serializers.Serializer[CustomUser]):
         data["refresh_token"] = str(refresh_token)
         data["auth_token"] = str(refresh_token.access_token)
         self.instance = user
+
+        request = self.context.get("request") if self.context else None
+        app_version = (
+            request.headers.get(constants.APP_VERSION_HEADER) if request else None
+        )
+        record_user_activity(
+            user=user,
+            last_login=timezone.now(),
+            # the header is client controlled, keep it within the column
+            app_version=(
+                app_version[: CustomUser._meta.get_field("app_version").max_length]
+                if app_version
+                else None
+            ),
+        )
         return data
 
     def to_representation(self, instance: CustomUser) -> dict[str, Any]:
@@ -9,6 +9,7 @@ from uia_backend.accounts.api.v1.views import (
     LoginAPIView,
     ResetPasswordAPIView,
     ResetPasswordRequestAPIView,
+    UserAutocompleteAPIView,
     UserFeedAPIView,
     UserFollowerListAPIView,
     UserFollowingDetailAPIView,
@@ -16,6 +17,8 @@ from uia_backend.accounts.api.v1.views import (
     UserFriendShipsDetailAPIView,
     UserFriendShipsListAPIView,
     UserGenericSettingsAPIView,
+    UserImportAPIView,
+    UserImportDetailAPIView,
     UserProfileAPIView,
     UserProfileDetailAPIView,
     UserProfileListView,
@@ -43,7 +46,18 @@ urlpatterns = [
         name="verify_password_reset_otp",
     ),
     path("reset-password/", ResetPasswordAPIView.as_view(), name="reset_password"),
+    path("import/", UserImportAPIView.as_view(), name="user_import"),
+    path(
+        "import/<uuid:job_id>/",
+        UserImportDetailAPIView.as_view(),
+        name="user_import_detail",
+    ),
     path("list/", UserProfileListView.as_view(), name="accounts_list"),
+    path(
+        "list/autocomplete/",
+        UserAutocompleteAPIView.as_view(),
+        name="accounts_autocomplete",
+    ),
     path(
         "list/<uuid:user_id>/",
         UserProfileDetailAPIView.as_view(),
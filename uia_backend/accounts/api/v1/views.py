@@ -10,7 +10,7 @@ from django.db.utils import Error
 from django.http import Http404
 from django.shortcuts import get_object_or_404, render
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions, status
+from rest_framework import filters, generics, parsers, permissions, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -22,10 +22,12 @@ from uia_backend.accounts.api.v1.serializers import (
     FollowingSerializer,
     FriendshipInvitationSerializer,
     LoginSerializer,
+    ProfileSerializer,
     ResetPasswordSerializer,
     RestPasswordRequestSerializer,
     UserFriendShipSettingsSerializer,
     UserGenericSettingsSerializer,
+    UserImportSerializer,
     UserProfileSerializer,
     UserRegistrationSerializer,
     VerifyResetPasswordOTPSerializer,
@@ -40,13 +42,18 @@ from uia_backend.accounts.models import (
     FriendShipInvitation,
     UserFriendShipSettings,
     UserGenericSettings,
+    UserImportJob,
 )
-from uia_backend.cluster.constants import VIEW_CLUSTER_PERMISSION
-from uia_backend.experiments.constants import ER_001_PRE_ALPHA_USER_TESTING_TAG
-from uia_backend.experiments.models import (
-    ExperimentConfig,
-    PreAlphaUserTestingExperiment,
+from uia_backend.accounts.tasks import import_users_task
+from uia_backend.accounts.utils import get_user_autocomplete_queryset
+from uia_backend.cluster.constants import (
+    CLUSTER_PERMISSION_BITS,
+    VIEW_CLUSTER_PERMISSION,
 )
+from uia_backend.experiments.constants import ER_001_PRE_ALPHA_USER_TESTING_TAG
+from uia_backend.experiments.engine import experiment_engine
+from uia_backend.experiments.utils import experiment_has_capacity
+from uia_backend.libs.filters import TrigramSearchFilter
 from uia_backend.messaging.api.v1.serializers import PostSerializer
 from uia_backend.messaging.models import Post
 from uia_backend.notification import constants as notification_constants
@@ -63,28 +70,23 @@ class UserRegistrationAPIView(generics.CreateAPIView):
     def post(self, request: Request, *args: Any, **kwargs: dict[str, Any]) -> Response:
         # NOTE: (Joseph) we need to remove this code when done with this experiment
         # before doing any data validation lets check if ER001 is still active
-        try:
-            er_config = ExperimentConfig.objects.get(
-                experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG, is_active=True
-            )
-        except ExperimentConfig.DoesNotExist:
+        er_config = experiment_engine.get_experiment(ER_001_PRE_ALPHA_USER_TESTING_TAG)
+
+        if er_config is None:
             logger.error(
                 "uia_backend::accounts::api::v1::views::UserRegistrationAPIView::"
                 " ExperimentConfig not found | is inactive.",
                 exc_info={"experiment_tag": ER_001_PRE_ALPHA_USER_TESTING_TAG},
             )
-        else:
-            # next we need to check if experiment has reached its capacity
-            enrolled_user_count = PreAlphaUserTestingExperiment.objects.filter(
-                experiment_config=er_config
-            ).count()
-            if er_config.required_user_population <= enrolled_user_count:
-                return Response(
-                    data={
-                        "detail": "Sorry we cant register your account as pre-alpha testing is no longer active"
-                    },
-                    status=status.HTTP_406_NOT_ACCEPTABLE,
-                )
+        # next we need to check if experiment has reached its capacity
+        # NOTE: the slot itself is reserved when the user is enrolled
+        elif not experiment_has_capacity(er_config.id):
+            return Response(
+                data={
+                    "detail": "Sorry we cant register your account as pre-alpha testing is no longer active"
+                },
+                status=status.HTTP_406_NOT_ACCEPTABLE,
+            )
 
         return super().post(request, *args, **kwargs)
 
@@ -188,10 +190,64 @@ class UserProfileListView(generics.ListAPIView):
     queryset = CustomUser.objects.filter(is_active=True)
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
     search_fields = ["first_name", "last_name", "display_name"]
 
 
+class UserAutocompleteAPIView(generics.ListAPIView):
+    """Autocomplete active users by the start of their names e.g for mentions."""
+
+    serializer_class = ProfileSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self) -> QuerySet[CustomUser]:
+        return get_user_autocomplete_queryset(
+            term=self.request.query_params.get("q", "")
+        )
+
+
+class UserImportAPIView(generics.CreateAPIView):
+    """
+    Queue an import of users from an uploaded csv file.
+
+    See `import_users` for the format. The import runs in the background, poll
+    the returned job for its report.
+    """
+
+    serializer_class = UserImportSerializer
+    # only users allowed to add users through the admin can import them
+    permission_classes = [
+        permissions.IsAuthenticated,
+        permissions.DjangoModelPermissions,
+    ]
+    parser_classes = [parsers.MultiPartParser]
+    queryset = CustomUser.objects.none()
+
+    def perform_create(self, serializer: UserImportSerializer) -> None:
+        job = serializer.save(created_by=self.request.user)
+        transaction.on_commit(lambda: import_users_task.delay(job_id=str(job.id)))
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+
+class UserImportDetailAPIView(generics.RetrieveAPIView):
+    """Retrieve the status and report of a user import queued by the user."""
+
+    serializer_class = UserImportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self) -> UserImportJob:
+        return get_object_or_404(
+            UserImportJob,
+            id=self.kwargs["job_id"],
+            created_by=self.request.user,
+        )
+
+
 class UserProfileDetailAPIView(generics.RetrieveAPIView):
     """Retrieve a users profile."""
 
@@ -307,7 +363,7 @@ class UserFeedAPIView(generics.ListAPIView):
                         sql=USER_FEED_QUERY,
                         params=[
                             self.request.user.id,
-                            VIEW_CLUSTER_PERMISSION,
+                            CLUSTER_PERMISSION_BITS[VIEW_CLUSTER_PERMISSION],
                             settings.REST_FRAMEWORK["PAGE_SIZE"],
                         ],
                     )
@@ -354,7 +410,7 @@ class UserFollowerListAPIView(generics.ListAPIView):
         else:
             query = Follows.objects.filter(user_to=self.request.user)
 
-        return query
+        return query.select_related("user_from")
 
 
 class UserFollowingListAPIView(generics.ListCreateAPIView):
@@ -378,7 +434,7 @@ class UserFollowingListAPIView(generics.ListCreateAPIView):
             query = Follows.objects.filter(user_from_id=user_id)
         else:
             query = Follows.objects.filter(user_from=self.request.user)
-        return query
+        return query.select_related("user_to")
 
     def perform_create(self, serializer: FollowingSerializer) -> None:
         follow_record = serializer.save(user_from=self.request.user)
@@ -6,7 +6,5 @@ class AccountsConfig(AppConfig):
     name = "uia_backend.accounts"
     verbose_name = _("Accounts")
 
-    # def ready(self) -> None:
-    #     from uia_backend.accounts.signals import (
-    #         user_create_signal,
-    #     )
+    def ready(self) -> None:
+        from uia_backend.accounts import signals  # noqa F401
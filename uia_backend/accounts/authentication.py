@@ -0,0 +1,130 @@
+import secrets
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from uia_backend.accounts.models import CustomUser
+
+
+def _user_version_cache_key(user_id: Any) -> str:
+    return f"auth_user_version:{user_id}"
+
+
+def _user_cache_key(user_id: Any) -> str:
+    return f"auth_user:{user_id}"
+
+
+def get_user_cache_version(user_id: Any) -> int:
+    """
+    Return the current cache version of a user.
+
+    Versions only ever move forward (see `invalidate_cached_user`). A missing
+    version starts at a random value so a version evicted from the cache can not
+    point back at an entry cached before the eviction.
+    """
+
+    cache_key = _user_version_cache_key(user_id)
+    version = cache.get(cache_key)
+    if version is None:
+        # another request may start the version first, read back the winner
+        cache.add(cache_key, secrets.randbits(48), timeout=None)
+        version = cache.get(cache_key)
+    return version
+
+
+def get_cached_user_and_version(user_id: Any) -> tuple[CustomUser | None, int]:
+    """
+    Return the cached user (or None) and the current cache version of the user.
+
+    Both are read in a single cache round trip, the version is only written when
+    it is missing.
+    """
+
+    version_key = _user_version_cache_key(user_id)
+    user_key = _user_cache_key(user_id)
+    values = cache.get_many([version_key, user_key])
+
+    version = values.get(version_key)
+    if version is None:
+        return None, get_user_cache_version(user_id)
+
+    cached_version, user = values.get(user_key, (None, None))
+    return (user if cached_version == version else None), version
+
+
+def get_cached_user(user_id: Any) -> CustomUser | None:
+    """Return the cached user for the current version of the user or None."""
+
+    user, _ = get_cached_user_and_version(user_id)
+    return user
+
+
+def cache_user(user: CustomUser, version: int) -> None:
+    """
+    Cache a user loaded from the database for AUTH_USER_CACHE_TTL seconds.
+
+    `version` must be read before the user is loaded. If the user changes in the
+    meantime the version moves on, so the stale copy is never read.
+    """
+
+    cache.set(
+        _user_cache_key(user.id), (version, user), timeout=settings.AUTH_USER_CACHE_TTL
+    )
+
+
+def invalidate_cached_user(user_id: Any) -> None:
+    """Move the users cache version on now and again once the transaction commits."""
+
+    def bump_version() -> None:
+        cache_key = _user_version_cache_key(user_id)
+        cache.add(cache_key, secrets.randbits(48), timeout=None)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # evicted between add and incr, a new random version is as good
+            pass
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token user from a short lived cache.
+
+    Cached users are stored with a version that every save or delete of the user
+    (profile, password or `is_active` changes) moves on, a cached copy is only
+    used while its version is current, see `uia_backend.accounts.signals`. Code updating users with `QuerySet.update` or
+    `bulk_update` has to call `invalidate_cached_user` itself.
+    """
+
+    def get_user(self, validated_token: Token) -> CustomUser:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user, version = get_cached_user_and_version(user_id)
+
+        if user is None:
+            # raises for missing and inactive users so those are never cached
+            user = super().get_user(validated_token)
+            cache_user(user, version)
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+
+class CachedJWTAuthenticationScheme(SimpleJWTScheme):
+    """Document CachedJWTAuthentication the same way as JWTAuthentication."""
+
+    target_class = "uia_backend.accounts.authentication.CachedJWTAuthentication"
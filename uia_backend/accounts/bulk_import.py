@@ -0,0 +1,251 @@
+import csv
+import io
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connection, transaction
+
+from uia_backend.accounts.api.v1.serializers import UserImportRowSerializer
+from uia_backend.accounts.constants import DEFAULT_NOTIFICATION_SETTINGS
+from uia_backend.accounts.models import CustomUser, UserGenericSettings
+from uia_backend.cluster.utils import ClusterManager
+
+Logger = logging.getLogger()
+
+REQUIRED_COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "faculty",
+    "department",
+    "year_of_graduation",
+]
+
+# passwords sent to a hashing process at a time
+PASSWORD_HASH_CHUNK_SIZE = 64
+
+
+class UserImportError(Exception):
+    """The import file can not be imported at all."""
+
+
+@dataclass
+class UserImportReport:
+    rows_processed: int = 0
+    rows_imported: int = 0
+    error_count: int = 0
+    duration: float = 0.0  # seconds
+    # NOTE: only the first `max_errors` errors are kept so memory stays constant
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    max_errors: int = 1000
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_processed / self.duration if self.duration else 0.0
+
+    def add_error(self, line: int, email: str | None, errors: Any) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "email": email, "errors": errors})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows_processed": self.rows_processed,
+            "rows_imported": self.rows_imported,
+            "error_count": self.error_count,
+            "duration": round(self.duration, 3),
+            "rows_per_second": round(self.rows_per_second, 2),
+            "errors": self.errors,
+        }
+
+
+def _copy_value(value: Any) -> Any:
+    return r"\N" if value is None else value
+
+
+def _copy_users(users: list[CustomUser]) -> None:
+    """Insert users with a single PostgreSQL COPY."""
+
+    fields = CustomUser._meta.concrete_fields
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for user in users:
+        writer.writerow(
+            [
+                _copy_value(
+                    model_field.get_db_prep_save(
+                        model_field.pre_save(user, add=True), connection
+                    )
+                )
+                for model_field in fields
+            ]
+        )
+    buffer.seek(0)
+
+    columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(CustomUser._meta.db_table)} "
+            f"({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def _insert_users(users: list[CustomUser]) -> None:
+    if connection.vendor == "postgresql":
+        _copy_users(users)
+    else:
+        CustomUser.objects.bulk_create(users)
+
+
+def _hash_passwords(
+    passwords: list[str | None], executor: Executor | None
+) -> list[str]:
+    if executor is None:
+        return [make_password(password) for password in passwords]
+
+    # users without a password get an unusable one, no need to send those to the pool
+    hashed_passwords = iter(
+        executor.map(
+            make_password,
+            [password for password in passwords if password],
+            chunksize=PASSWORD_HASH_CHUNK_SIZE,
+        )
+    )
+    return [
+        next(hashed_passwords) if password else make_password(None)
+        for password in passwords
+    ]
+
+
+def _import_batch(
+    batch: list[tuple[int, dict[str, Any]]],
+    executor: Executor | None,
+    report: UserImportReport,
+) -> None:
+    rows: dict[str, tuple[int, dict[str, Any]]] = {}
+
+    for line, data in batch:
+        if data["email"] in rows:
+            report.add_error(line, data["email"], {"email": ["Duplicate email."]})
+        else:
+            rows[data["email"]] = (line, data)
+
+    for email in CustomUser.objects.filter(email__in=rows.keys()).values_list(
+        "email", flat=True
+    ):
+        line, _ = rows.pop(email)
+        report.add_error(
+            line, email, {"email": ["user with this email address already exists."]}
+        )
+
+    if not rows:
+        return
+
+    passwords = [data.pop("password", None) or None for _, data in rows.values()]
+    users = [
+        CustomUser(
+            **data,
+            password=password,
+            # the university vouches for the email addresses it hands us
+            is_active=True,
+            is_verified=True,
+        )
+        for (_, data), password in zip(
+            rows.values(), _hash_passwords(passwords, executor)
+        )
+    ]
+
+    try:
+        with transaction.atomic():
+            _insert_users(users)
+            ClusterManager.add_users_to_default_clusters(users)
+            UserGenericSettings.objects.bulk_create(
+                [
+                    UserGenericSettings(
+                        user=user, notification=dict(DEFAULT_NOTIFICATION_SETTINGS)
+                    )
+                    for user in users
+                ],
+                ignore_conflicts=True,
+            )
+    except IntegrityError as error:
+        # e.g a user registered with one of the emails while the batch was prepared
+        Logger.error(
+            "uia_backend::accounts::bulk_import::_import_batch:: "
+            "Failed to import batch.",
+            extra={"error": str(error), "size": len(users)},
+        )
+        for email, (line, _) in rows.items():
+            report.add_error(line, email, {"non_field_errors": [str(error)]})
+        return
+
+    report.rows_imported += len(users)
+
+
+def import_users_from_csv(
+    file: TextIO,
+    batch_size: int = 1000,
+    workers: int = 1,
+    max_errors: int = 1000,
+) -> UserImportReport:
+    """
+    Import users from a csv file.
+
+    Rows are streamed and validated one at a time and inserted `batch_size` at a
+    time, with COPY on PostgreSQL. Imported users are added to their default
+    clusters and get their settings created. Passwords are hashed in a pool of
+    `workers` processes when `workers` is more than one, users without a password
+    have to reset it before they can sign in.
+    """
+
+    start_time = time.perf_counter()
+    report = UserImportReport(max_errors=max_errors)
+    reader = csv.DictReader(file)
+
+    missing_columns = set(REQUIRED_COLUMNS) - set(reader.fieldnames or [])
+    if missing_columns:
+        raise UserImportError(f"Missing columns: {', '.join(sorted(missing_columns))}.")
+
+    with (
+        ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()
+    ) as executor:
+        batch: list[tuple[int, dict[str, Any]]] = []
+
+        for row in reader:
+            line = reader.line_num
+            report.rows_processed += 1
+            serializer = UserImportRowSerializer(data=row)
+
+            if not serializer.is_valid():
+                report.add_error(line, row.get("email"), serializer.errors)
+                continue
+
+            batch.append((line, dict(serializer.validated_data)))
+
+            if len(batch) >= batch_size:
+                _import_batch(batch, executor, report)
+                batch = []
+
+        if batch:
+            _import_batch(batch, executor, report)
+
+    report.duration = time.perf_counter() - start_time
+
+    Logger.info(
+        "uia_backend::accounts::bulk_import::import_users_from_csv:: "
+        "Imported users.",
+        extra={
+            "rows_processed": report.rows_processed,
+            "rows_imported": report.rows_imported,
+            "error_count": report.error_count,
+            "duration": report.duration,
+        },
+    )
+    return report
@@ -7,6 +7,18 @@ EMAIL_VERIFICATION_ACTIVE_PERIOD = 24
 PASSWORD_RESET_ACTIVE_PERIOD = 10
 PASSWORD_RESET_OTP_LENGTH = 6
 
+# notification settings of new users
+DEFAULT_NOTIFICATION_SETTINGS = {
+    "like": True,
+    "comment": True,
+    "follow": True,
+    "share": True,
+    "mention": True,
+}
+
+# header clients send their build version in
+APP_VERSION_HEADER = "X-App-Version"
+
 # NOTE :Joseph you need to find a better way to sort email templates for cases where we need to switch ESPs
 EMAIL_VERIFICATION_TEMPLATE_ID = "d-1dda679ebf2846b498b6ab027a4f73b7"
 PASSWORD_CHANGE_TEMPLATE_ID = "d-7cdf816164d64d0791b9b0b6f9a7ffff"
@@ -0,0 +1,112 @@
+import json
+import logging
+import math
+import secrets
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from argon2 import low_level
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+Logger = logging.getLogger()
+
+ARGON2_PARAMETER_NAMES = ["time_cost", "memory_cost", "parallelism"]
+
+
+@lru_cache(maxsize=None)
+def load_argon2_parameters(path: str) -> dict[str, int]:
+    """Load the argon2 parameters written by the calibrate_password_hasher command."""
+
+    try:
+        with open(path) as file:
+            calibration = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        Logger.error(
+            "uia_backend::accounts::hashers::load_argon2_parameters:: "
+            "Invalid argon2 calibration file.",
+            extra={"path": path},
+        )
+        return {}
+
+    return {
+        name: int(calibration[name])
+        for name in ARGON2_PARAMETER_NAMES
+        if name in calibration
+    }
+
+
+class AdaptiveArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 hasher using the parameters calibrated for the deployed hardware.
+
+    Parameters are read once per process from `settings.ARGON2_CALIBRATION_FILE`
+    and fall back to Django's defaults. Hashes made with other parameters are
+    reported by `must_update` so `check_password` rehashes them on the users next
+    login.
+    """
+
+    def _calibrated_parameter(self, name: str) -> int:
+        parameters = load_argon2_parameters(str(settings.ARGON2_CALIBRATION_FILE))
+        return parameters.get(name, getattr(Argon2PasswordHasher, name))
+
+    @property  # type: ignore[override]
+    def time_cost(self) -> int:
+        return self._calibrated_parameter("time_cost")
+
+    @property  # type: ignore[override]
+    def memory_cost(self) -> int:
+        return self._calibrated_parameter("memory_cost")
+
+    @property  # type: ignore[override]
+    def parallelism(self) -> int:
+        return self._calibrated_parameter("parallelism")
+
+
+@dataclass
+class Argon2Measurement:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    p99_seconds: float  # wall clock time of a single hash
+    cpu_seconds: float  # mean cpu time of a single hash across all threads
+
+
+def measure_argon2_cost(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int
+) -> Argon2Measurement:
+    """Hash a random password `samples` times with the given parameters."""
+
+    wall_durations = []
+    cpu_durations = []
+
+    for _ in range(samples):
+        password = secrets.token_bytes(16)
+        salt = secrets.token_bytes(16)
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        low_level.hash_secret(
+            password,
+            salt,
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=32,
+            type=low_level.Type.ID,
+        )
+        wall_durations.append(time.perf_counter() - wall_start)
+        cpu_durations.append(time.process_time() - cpu_start)
+
+    wall_durations.sort()
+    p99_index = max(math.ceil(len(wall_durations) * 0.99) - 1, 0)
+
+    return Argon2Measurement(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        p99_seconds=wall_durations[p99_index],
+        cpu_seconds=sum(cpu_durations) / len(cpu_durations),
+    )
@@ -0,0 +1,155 @@
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+
+from uia_backend.accounts.models import CustomUser
+from uia_backend.accounts.utils import get_user_autocomplete_queryset
+from uia_backend.libs.filters import is_postgresql, trigram_search
+
+FIRST_NAMES = [
+    "adaeze",
+    "babatunde",
+    "chinedu",
+    "damilola",
+    "emeka",
+    "folake",
+    "gbenga",
+    "halima",
+    "ifeoma",
+    "joseph",
+    "kunle",
+    "ladi",
+    "musa",
+    "ngozi",
+    "olumide",
+    "segun",
+    "tolu",
+    "uche",
+    "yetunde",
+    "zainab",
+]
+LAST_NAMES = [
+    "abubakar",
+    "adeyemi",
+    "bello",
+    "chukwu",
+    "eze",
+    "falana",
+    "ibrahim",
+    "nwosu",
+    "okafor",
+    "okonkwo",
+    "oladipo",
+    "olawale",
+    "salami",
+    "usman",
+]
+SEARCH_FIELDS = ["first_name", "last_name", "display_name"]
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the users created for a benchmark run."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark user search and autocomplete queries against a generated user "
+        "table. Generated users are rolled back once the benchmark is done."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            default=[100_000, 1_000_000],
+            help="Number of users to benchmark with.",
+        )
+        parser.add_argument("--search-term", type=str, default="okafor")
+        parser.add_argument("--autocomplete-term", type=str, default="ola")
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def create_users(self, count: int, batch_size: int) -> None:
+        random_generator = random.Random(count)
+
+        for start in range(0, count, batch_size):
+            users = []
+            for index in range(start, min(start + batch_size, count)):
+                first_name = random_generator.choice(FIRST_NAMES)
+                last_name = random_generator.choice(LAST_NAMES)
+                users.append(
+                    CustomUser(
+                        email=f"benchmark-{index}@example.com",
+                        first_name=first_name,
+                        last_name=last_name,
+                        display_name=f"{first_name}{last_name}{index}",
+                        faculty="Science",
+                        department="Computer Science",
+                        year_of_graduation="2024",
+                        password="!",
+                        is_active=True,
+                    )
+                )
+            CustomUser.objects.bulk_create(users, batch_size=batch_size)
+
+    def time_query(self, get_queryset: Callable[[], QuerySet], runs: int) -> float:
+        """Return the median time in milliseconds taken to evaluate the queryset."""
+
+        durations = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            list(get_queryset())
+            durations.append((time.perf_counter() - start_time) * 1000)
+
+        return statistics.median(durations)
+
+    def benchmark(self, user_count: int, options: dict[str, Any]) -> None:
+        search_term = options["search_term"]
+        users = CustomUser.objects.filter(is_active=True)
+
+        self.create_users(user_count, options["batch_size"])
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE accounts_customuser;")
+
+        icontains_condition = Q()
+        for field in SEARCH_FIELDS:
+            icontains_condition |= Q(**{f"{field}__icontains": search_term})
+
+        results = {
+            "search (icontains)": self.time_query(
+                lambda: users.filter(icontains_condition)[:50], options["runs"]
+            ),
+            "autocomplete (prefix)": self.time_query(
+                lambda: get_user_autocomplete_queryset(options["autocomplete_term"]),
+                options["runs"],
+            ),
+        }
+
+        if is_postgresql(users):
+            results["search (trigram)"] = self.time_query(
+                lambda: trigram_search(users, SEARCH_FIELDS, search_term)[:50],
+                options["runs"],
+            )
+
+        for name, duration in results.items():
+            self.stdout.write(f"{user_count} users | {name}: {duration:.2f}ms")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for user_count in options["users"]:
+            try:
+                with transaction.atomic():
+                    self.benchmark(user_count, options)
+                    raise BenchmarkRollback
+            except BenchmarkRollback:
+                pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
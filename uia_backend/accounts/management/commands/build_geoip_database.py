@@ -0,0 +1,40 @@
+import csv
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from uia_backend.libs.geoip import GeoIPDatabaseError, build_ip_range_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the local geoip database from a CSV file with "
+        "`start_ip`, `end_ip` and `region` columns."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("csv_file", type=str)
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Database path. Defaults to settings.GEOIP_DATABASE_PATH.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        output = options["output"] or settings.GEOIP_DATABASE_PATH
+
+        try:
+            with open(options["csv_file"], newline="") as csv_file:
+                rows = (
+                    (row["start_ip"], row["end_ip"], row["region"])
+                    for row in csv.DictReader(csv_file)
+                )
+                range_count = build_ip_range_database(rows, output)
+        except (OSError, KeyError, ValueError, GeoIPDatabaseError) as error:
+            raise CommandError(f"Unable to build geoip database: {error}") from error
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {range_count} ip ranges to {output}.")
+        )
@@ -0,0 +1,152 @@
+import json
+import os
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from uia_backend.accounts.hashers import Argon2Measurement, measure_argon2_cost
+
+# OWASP minimum for argon2id (19 MiB of memory, 2 iterations)
+MIN_MEMORY_COST = 19456
+MIN_TIME_COST = 2
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure argon2 hashing cost on this machine and write the strongest "
+        "parameters that keep password hashing within the latency and cpu budget "
+        "of the target login rate."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--logins-per-second",
+            type=float,
+            default=20,
+            help="Peak logins per second this machine should sustain.",
+        )
+        parser.add_argument(
+            "--cpus",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="CPUs available to the web workers on this machine.",
+        )
+        parser.add_argument(
+            "--utilization",
+            type=float,
+            default=0.5,
+            help="Share of the cpus password hashing may use at the peak login rate.",
+        )
+        parser.add_argument(
+            "--max-latency-ms",
+            type=float,
+            default=250,
+            help="p99 time budget for hashing a single password.",
+        )
+        parser.add_argument(
+            "--memory-costs",
+            type=int,
+            nargs="+",
+            default=[102400, 65536, 47104, MIN_MEMORY_COST],
+            help="Candidate memory costs in KiB.",
+        )
+        parser.add_argument("--max-time-cost", type=int, default=6)
+        parser.add_argument("--parallelism", type=int, default=1)
+        parser.add_argument("--samples", type=int, default=10)
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Calibration file. Defaults to settings.ARGON2_CALIBRATION_FILE.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        latency_budget = options["max_latency_ms"] / 1000
+        # cpu seconds a single hash may use to sustain the login rate
+        cpu_budget = (
+            options["cpus"] * options["utilization"] / options["logins_per_second"]
+        )
+
+        measurements: list[Argon2Measurement] = []
+        recommended: Argon2Measurement | None = None
+
+        for memory_cost in sorted(options["memory_costs"], reverse=True):
+            for time_cost in range(1, options["max_time_cost"] + 1):
+                measurement = measure_argon2_cost(
+                    time_cost=time_cost,
+                    memory_cost=memory_cost,
+                    parallelism=options["parallelism"],
+                    samples=options["samples"],
+                )
+                measurements.append(measurement)
+
+                if (
+                    measurement.p99_seconds > latency_budget
+                    or measurement.cpu_seconds > cpu_budget
+                ):
+                    # higher time costs only get slower
+                    break
+
+                if measurement.memory_cost < MIN_MEMORY_COST or (
+                    measurement.time_cost < MIN_TIME_COST
+                ):
+                    continue
+
+                if recommended is None or (
+                    measurement.memory_cost * measurement.time_cost
+                    > recommended.memory_cost * recommended.time_cost
+                ):
+                    recommended = measurement
+
+        if recommended is None:
+            self.stderr.write(
+                self.style.WARNING(
+                    "No parameters fit the budget, using the minimum recommended "
+                    "parameters. Add cpus or lower the target login rate."
+                )
+            )
+            parameters = {
+                "time_cost": MIN_TIME_COST,
+                "memory_cost": MIN_MEMORY_COST,
+                "parallelism": options["parallelism"],
+            }
+        else:
+            parameters = {
+                "time_cost": recommended.time_cost,
+                "memory_cost": recommended.memory_cost,
+                "parallelism": recommended.parallelism,
+            }
+
+        output = options["output"] or str(settings.ARGON2_CALIBRATION_FILE)
+        with open(output, "w") as file:
+            json.dump(
+                {
+                    **parameters,
+                    "calibrated_datetime": timezone.now().isoformat(),
+                    "logins_per_second": options["logins_per_second"],
+                    "cpus": options["cpus"],
+                    "max_latency_ms": options["max_latency_ms"],
+                    "measurements": [
+                        {
+                            "time_cost": measurement.time_cost,
+                            "memory_cost": measurement.memory_cost,
+                            "parallelism": measurement.parallelism,
+                            "p99_ms": round(measurement.p99_seconds * 1000, 2),
+                            "cpu_ms": round(measurement.cpu_seconds * 1000, 2),
+                        }
+                        for measurement in measurements
+                    ],
+                },
+                file,
+                indent=2,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote time_cost={parameters['time_cost']} "
+                f"memory_cost={parameters['memory_cost']} "
+                f"parallelism={parameters['parallelism']} to {output}."
+            )
+        )
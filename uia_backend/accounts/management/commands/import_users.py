@@ -0,0 +1,59 @@
+import os
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from uia_backend.accounts.bulk_import import UserImportError, import_users_from_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV file with `first_name`, `last_name`, `email`, "
+        "`faculty`, `department`, `year_of_graduation` and optionally `password` "
+        "columns."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("csv_file", type=str)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes used to hash passwords.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=1000,
+            help="Maximum number of row errors to report.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            with open(options["csv_file"], newline="", encoding="utf-8-sig") as file:
+                report = import_users_from_csv(
+                    file,
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    max_errors=options["max_errors"],
+                )
+        except (OSError, UserImportError) as error:
+            raise CommandError(f"Unable to import users: {error}") from error
+
+        for error in report.errors:
+            self.stderr.write(
+                f"line {error['line']} ({error['email']}): {dict(error['errors'])}"
+            )
+
+        if report.error_count > len(report.errors):
+            self.stderr.write(
+                f"{report.error_count - len(report.errors)} more errors not shown."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.rows_imported} of {report.rows_processed} rows "
+                f"in {report.duration:.2f}s ({report.rows_per_second:.2f} rows/s)."
+            )
+        )
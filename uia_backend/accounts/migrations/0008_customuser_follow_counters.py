@@ -0,0 +1,60 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:09
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counters(apps, schema_editor):
+    """Set the stored follow counters from existing Follows records."""
+
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    Follows = apps.get_model("accounts", "Follows")
+    db_alias = schema_editor.connection.alias
+
+    follower_counts = (
+        Follows.objects.using(db_alias)
+        .filter(user_to=OuterRef("pk"))
+        .order_by()
+        .values("user_to")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    following_counts = (
+        Follows.objects.using(db_alias)
+        .filter(user_from=OuterRef("pk"))
+        .order_by()
+        .values("user_from")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+
+    CustomUser.objects.using(db_alias).update(
+        follower_count=Coalesce(Subquery(follower_counts), 0),
+        following_count=Coalesce(Subquery(following_counts), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_usergenericsettings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            code=backfill_follow_counters,
+            reverse_code=migrations.RunPython.noop,
+            atomic=True,
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:12
+
+from django.db import migrations
+
+SEARCH_FIELDS = ["first_name", "last_name", "display_name"]
+
+
+def create_search_indexes(apps, schema_editor):
+    """
+    Create trigram indexes used by user search and lowercase prefix indexes used by
+    user autocomplete.
+
+    NOTE: PostgreSQL only, other databases fall back to unindexed lookups.
+    """
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_{field}_trgm_idx "
+            f"ON accounts_customuser USING gin ({field} gin_trgm_ops);"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_{field}_prefix_idx "
+            f"ON accounts_customuser ((LOWER({field})) text_pattern_ops);"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS accounts_user_{field}_trgm_idx;"
+        )
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS accounts_user_{field}_prefix_idx;"
+        )
+
+
+class Migration(migrations.Migration):
+    # indexes are built concurrently which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0008_customuser_follow_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_search_indexes,
+            reverse_code=drop_search_indexes,
+            atomic=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_customuser_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userfriendshipsettings',
+            index=models.Index(fields=['friendship', 'user'], name='friendship_settings_user_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uia_backend.accounts.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_userfriendshipsettings_friendship_user_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserImportJob',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_datetime', models.DateTimeField(auto_now=True, verbose_name='Last update at')),
+                ('file', models.FileField(storage=uia_backend.accounts.models.private_file_storage, upload_to=uia_backend.accounts.models.user_import_upload_location)),
+                ('status', models.IntegerField(choices=[(0, 'Pending'), (1, 'Running'), (2, 'Completed'), (3, 'Failed')], default=0)),
+                ('report', models.JSONField(null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:45
+
+from django.db import migrations
+
+ORDERING_FIELDS = ["first_name", "last_name"]
+
+
+def create_ordering_indexes(apps, schema_editor):
+    """
+    Create the indexes used to page lists of users ordered by name, e.g cluster
+    members.
+
+    NOTE: PostgreSQL only, other databases sort without an index.
+    """
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in ORDERING_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_user_{field}_idx "
+            f"ON accounts_customuser ({field}, id);"
+        )
+
+
+def drop_ordering_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in ORDERING_FIELDS:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS accounts_user_{field}_idx;"
+        )
+
+
+class Migration(migrations.Migration):
+    # indexes are built concurrently which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0012_counter_fields_not_editable'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_ordering_indexes,
+            reverse_code=drop_ordering_indexes,
+            atomic=False,
+        ),
+    ]
@@ -7,11 +7,12 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.core import signing
+from django.core.files.storage import Storage, get_storage_class
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from uia_backend.libs.base_models import BaseAbstractModel
+from uia_backend.libs.base_models import BaseAbstractModel, CounterFieldsMixin
 from uia_backend.libs.validators import validate_settings_notification
 
 
@@ -25,6 +26,18 @@ def user_cover_profile_upload_location(instance, filename: str) -> str:
     return f"users/{instance.id}/cover/{filename}"
 
 
+def user_import_upload_location(instance, filename: str) -> str:
+    """Get location for user import file upload."""
+    return f"user_imports/{instance.id}/{filename}"
+
+
+def private_file_storage() -> Storage:
+    """Storage of uploads that must never be publicly readable."""
+    return get_storage_class(settings.PRIVATE_FILE_STORAGE)(
+        **settings.PRIVATE_FILE_STORAGE_OPTIONS
+    )
+
+
 class CustomUserManager(BaseUserManager):
     """Custom User Manager for UIA User Model"""
 
@@ -38,7 +51,9 @@ class CustomUserManager(BaseUserManager):
         return user
 
 
-class CustomUser(BaseAbstractModel, AbstractBaseUser, PermissionsMixin):
+class CustomUser(
+    CounterFieldsMixin, BaseAbstractModel, AbstractBaseUser, PermissionsMixin
+):
     """Custom User model for UIA"""
 
     first_name = models.CharField(max_length=150)
@@ -66,6 +81,12 @@ class CustomUser(BaseAbstractModel, AbstractBaseUser, PermissionsMixin):
     follows = models.ManyToManyField(
         "self", symmetrical=False, related_name="followers", through="Follows"
     )
+    # NOTE: maintained by the Follows post_save/post_delete receivers in
+    # uia_backend.accounts.signals so profiles render without counting Follows rows
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("follower_count", "following_count")
 
     objects = CustomUserManager()
 
@@ -177,6 +198,13 @@ class UserFriendShipSettings(BaseAbstractModel):
     )
     is_blocked = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["friendship", "user"], name="friendship_settings_user_idx"
+            )
+        ]
+
 
 class UserGenericSettings(BaseAbstractModel):
     user = models.OneToOneField(
@@ -189,3 +217,30 @@ class UserGenericSettings(BaseAbstractModel):
 
     def __str__(self) -> str:
         return f"{self.user.id}_settings"
+
+
+class UserImportJob(BaseAbstractModel):
+    """A csv import of users run by `uia_backend.accounts.tasks.import_users_task`."""
+
+    STATUS_PENDING = 0  # file is uploaded and the import is queued
+    STATUS_RUNNING = 1
+    STATUS_COMPLETED = 2  # report holds the UserImportReport of the import
+    STATUS_FAILED = 3  # error holds why nothing could be imported
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    created_by = models.ForeignKey(
+        CustomUser, related_name="+", on_delete=models.SET_NULL, null=True
+    )
+    # NOTE: the file holds personal data, it is deleted once the import has run
+    file = models.FileField(
+        upload_to=user_import_upload_location, storage=private_file_storage
+    )
+    status = models.IntegerField(choices=STATUS_CHOICES, default=STATUS_PENDING)
+    report = models.JSONField(null=True)
+    error = models.TextField(blank=True, default="")
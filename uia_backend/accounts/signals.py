@@ -0,0 +1,55 @@
+from typing import Any
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from uia_backend.accounts.authentication import invalidate_cached_user
+from uia_backend.accounts.models import CustomUser, Follows
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid="user_saved")
+@receiver(post_delete, sender=CustomUser, dispatch_uid="user_deleted")
+def invalidate_authentication_cache(
+    sender: type[CustomUser], instance: CustomUser, **kwargs: Any
+) -> None:
+    """Drop the cached user used by CachedJWTAuthentication when a user changes."""
+
+    invalidate_cached_user(instance.id)
+
+
+@receiver(post_save, sender=Follows, dispatch_uid="follows_created")
+def increment_follow_counters(
+    sender: type[Follows], instance: Follows, created: bool, **kwargs: Any
+) -> None:
+    """Increment the stored follow counters of both users when a user is followed."""
+
+    if not created:
+        return
+
+    CustomUser.objects.filter(id=instance.user_to_id).update(
+        follower_count=F("follower_count") + 1
+    )
+    CustomUser.objects.filter(id=instance.user_from_id).update(
+        following_count=F("following_count") + 1
+    )
+
+    invalidate_cached_user(instance.user_to_id)
+    invalidate_cached_user(instance.user_from_id)
+
+
+@receiver(post_delete, sender=Follows, dispatch_uid="follows_deleted")
+def decrement_follow_counters(
+    sender: type[Follows], instance: Follows, **kwargs: Any
+) -> None:
+    """Decrement the stored follow counters of both users when a user is unfollowed."""
+
+    CustomUser.objects.filter(id=instance.user_to_id, follower_count__gt=0).update(
+        follower_count=F("follower_count") - 1
+    )
+    CustomUser.objects.filter(id=instance.user_from_id, following_count__gt=0).update(
+        following_count=F("following_count") - 1
+    )
+
+    invalidate_cached_user(instance.user_to_id)
+    invalidate_cached_user(instance.user_from_id)
@@ -1,14 +1,23 @@
+import io
 import uuid
 from logging import getLogger
 
+from django.db import transaction
 from django.utils import timezone
 
 from config.celery_app import app as CELERY_APP
+from uia_backend.accounts import constants
+from uia_backend.accounts.activity import flush_user_activity
 from uia_backend.accounts.models import (
+    CustomUser,
     EmailVerification,
     PasswordResetAttempt,
     UserGenericSettings,
+    UserImportJob,
 )
+from uia_backend.experiments.utils import enroll_user_to_prealpha_testing_experiment
+from uia_backend.libs.geoip import get_remote_geoip_resolver
+from uia_backend.notification.tasks import send_template_email_task
 
 Logger = getLogger()
 
@@ -64,11 +73,119 @@ def setup_user_profile_task(user_id: uuid.UUID) -> None:
     if not UserGenericSettings.objects.filter(user_id=user_id).exists():
         UserGenericSettings.objects.create(
             user_id=user_id,
-            notification={
-                "like": True,
-                "comment": True,
-                "follow": True,
-                "share": True,
-                "mention": True,
+            notification=dict(constants.DEFAULT_NOTIFICATION_SETTINGS),
+        )
+
+
+@CELERY_APP.task(
+    name="process_user_registration",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def process_user_registration_task(user_id: str, base_url: str) -> None:
+    """
+    Run everything that follows a user signing up.
+
+    Every step is idempotent so the task can be retried safely.
+    """
+
+    # did this to avoid circular imports
+    from uia_backend.accounts.utils import (
+        send_user_registration_email_verification_mail,
+    )
+
+    user = CustomUser.objects.filter(id=user_id).first()
+
+    if user is None:
+        Logger.warning(
+            "uia_backend::accounts::tasks::process_user_registration_task:: "
+            "User not found.",
+            extra={"user_id": user_id},
+        )
+        return
+
+    if not EmailVerification.objects.filter(user=user).exists():
+        with transaction.atomic():
+            send_user_registration_email_verification_mail(user=user, base_url=base_url)
+
+    enroll_user_to_prealpha_testing_experiment(user)
+    setup_user_profile_task(user_id=user.id)
+
+
+@CELERY_APP.task(name="send_password_change_email_with_remote_region")
+def send_password_change_email_with_remote_region_task(
+    email: str, internal_tracker_id: str, ip_address: str, user_agent: str
+) -> None:
+    """Resolve ip region with the remote geoip resolver and send password change mail."""
+
+    region = get_remote_geoip_resolver().resolve(ip_address) or ""
+
+    send_template_email_task(
+        recipients=[email],
+        internal_tracker_ids=[internal_tracker_id],
+        template_id=constants.PASSWORD_CHANGE_TEMPLATE_ID,
+        template_merge_data={
+            email: {
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "region": region,
             },
+        },
+    )
+
+
+@CELERY_APP.task(name="flush_user_activity")
+def flush_user_activity_task() -> int:
+    """Write buffered user last_login and app_version values to the database."""
+
+    return flush_user_activity()
+
+
+@CELERY_APP.task(name="import_users")
+def import_users_task(job_id: str) -> None:
+    """
+    Run a user import job and delete its file.
+
+    NOTE: passwords are hashed in the worker process, celery workers are daemonic
+    and can not start the process pool used by the import_users command.
+    """
+
+    # did this to avoid circular imports
+    from uia_backend.accounts.bulk_import import UserImportError, import_users_from_csv
+
+    job = UserImportJob.objects.filter(
+        id=job_id, status=UserImportJob.STATUS_PENDING
+    ).first()
+
+    if job is None:
+        Logger.warning(
+            "uia_backend::accounts::tasks::import_users_task:: "
+            "Pending user import job not found.",
+            extra={"job_id": job_id},
+        )
+        return
+
+    job.status = UserImportJob.STATUS_RUNNING
+    job.save(update_fields=["status", "updated_datetime"])
+
+    try:
+        with job.file.open("rb") as file:
+            report = import_users_from_csv(
+                io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+            )
+    except (UserImportError, UnicodeDecodeError) as error:
+        job.status = UserImportJob.STATUS_FAILED
+        job.error = str(error)
+    except Exception:
+        job.status = UserImportJob.STATUS_FAILED
+        job.error = "The import failed unexpectedly."
+        raise
+    else:
+        job.status = UserImportJob.STATUS_COMPLETED
+        job.report = report.as_dict()
+    finally:
+        job.file.delete(save=False)
+        job.save(
+            update_fields=["status", "report", "error", "file", "updated_datetime"]
         )
@@ -1,28 +1,38 @@
 import logging
 import secrets
 import time
+from urllib.parse import urljoin
 from uuid import UUID
 
 import jwt
-import requests
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core import signing
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Lower
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.request import Request
 
 from uia_backend.accounts import constants
 from uia_backend.accounts.models import CustomUser, EmailVerification
+from uia_backend.accounts.tasks import (
+    send_password_change_email_with_remote_region_task,
+)
+from uia_backend.libs.geoip import get_geoip_resolver
 from uia_backend.notification.tasks import send_template_email_task
 
 Logger = logging.getLogger()
 
 
 def send_user_registration_email_verification_mail(
-    user: CustomUser, request: Request
+    user: CustomUser, base_url: str
 ) -> None:
-    """Send email to users to verifiy their email address."""
+    """
+    Send email to users to verifiy their email address.
+
+    `base_url` is the absolute url of the site e.g `request.build_absolute_uri("/")`.
+    """
 
     verification_record = EmailVerification.objects.create(
         user=user,
@@ -34,16 +44,18 @@ def send_user_registration_email_verification_mail(
 
     signer = signing.TimestampSigner()
     signature = signer.sign_object(str(verification_record.id))
-    url = reverse("accounts_api_v1:email_verification", args=[signature])
+    url = urljoin(
+        base_url, reverse("accounts_api_v1:email_verification", args=[signature])
+    )
     # NOTE (Joseph): Remove this before deployment
-    Logger.info(msg=request.build_absolute_uri(location=url))
+    Logger.info(msg=url)
     send_template_email_task.delay(
         recipients=[user.email],
         internal_tracker_ids=[str(verification_record.internal_tracker_id)],
         template_id=constants.EMAIL_VERIFICATION_TEMPLATE_ID,
         template_merge_data={
             user.email: {
-                "link": request.build_absolute_uri(location=url),
+                "link": url,
                 "expiration_duration_in_hours": constants.EMAIL_VERIFICATION_ACTIVE_PERIOD,
             },
         },
@@ -51,30 +63,8 @@ def send_user_registration_email_verification_mail(
 
 
 def get_location_from_ip(ip: str) -> str | None:
-    """Get ip region from ipapi.co."""
-
-    try:
-        response = requests.get(url=f"{settings.IP_API_CO_URL}/{ip}/region/")
-    except requests.HTTPError as error:
-        Logger.error(
-            "uia_backend::accounts::utils::get_location_from_ip:: HTTPError occured",
-            extra={"detail": str(error)},
-        )
-        return
-
-    if response.status_code == 200:
-        if response.text != "Undefined":
-            return response.text
-    elif response.status_code == 429:
-        Logger.error(
-            "uia_backend::accounts::utils::get_location_from_ip:: API free quota has been exceeded",
-            extra={"detail": response.text},
-        )
-    else:
-        Logger.error(
-            "uia_backend::accounts::utils::get_location_from_ip:: API error occured",
-            extra={"detail": response.json()},
-        )
+    """Get ip region from the configured local geoip resolver."""
+    return get_geoip_resolver().resolve(ip)
 
 
 def send_user_password_change_email_notification(
@@ -84,7 +74,17 @@ def send_user_password_change_email_notification(
 
     ip_address = request.META["REMOTE_ADDR"]
     user_agent = request.META["HTTP_USER_AGENT"]
-    region = get_location_from_ip(ip_address) or ""
+    region = get_location_from_ip(ip_address)
+
+    if region is None and settings.GEOIP_REMOTE_FALLBACK:
+        # region could not be resolved locally so we let a worker resolve it remotely
+        send_password_change_email_with_remote_region_task.delay(
+            email=user.email,
+            internal_tracker_id=str(user.id),
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        return
 
     send_template_email_task.delay(
         recipients=[user.email],
@@ -94,7 +94,7 @@ def send_user_password_change_email_notification(
             user.email: {
                 "ip_address": ip_address,
                 "user_agent": user_agent,
-                "region": region,
+                "region": region or "",
             },
         },
     )
@@ -120,7 +120,7 @@ def send_password_reset_otp_email_notification(
 ) -> None:
     """Send a password reset otp email notification."""
 
-    send_template_email_task(
+    send_template_email_task.delay(
         recipients=[user.email],
         internal_tracker_ids=[str(internal_tracker_id)],
         template_id=constants.PASSWORD_RESET_TEMPLATE_ID,
@@ -140,3 +140,36 @@ def generate_centrifugo_connection_token(user: CustomUser) -> str:
     }
     token = jwt.encode(claims, settings.CENTRIFUGO_HMAC_KEY, algorithm="HS256")
     return token
+
+
+def get_user_autocomplete_queryset(
+    term: str, limit: int | None = None
+) -> QuerySet[CustomUser]:
+    """
+    Return active users whose first name, last name or display name start with `term`.
+
+    Matching is done on the lowercased names so the lookups are served by the
+    `LOWER(...) text_pattern_ops` indexes on PostgreSQL.
+    """
+
+    term = term.strip().lstrip("@").lower()
+
+    if not term:
+        return CustomUser.objects.none()
+
+    return (
+        CustomUser.objects.filter(is_active=True)
+        .alias(
+            first_name_lower=Lower("first_name"),
+            last_name_lower=Lower("last_name"),
+            display_name_lower=Lower("display_name"),
+        )
+        .filter(
+            Q(display_name_lower__startswith=term)
+            | Q(first_name_lower__startswith=term)
+            | Q(last_name_lower__startswith=term)
+        )
+        .order_by("-follower_count", "display_name", "id")[
+            : limit or settings.USER_AUTOCOMPLETE_LIMIT
+        ]
+    )
@@ -35,6 +35,7 @@ class ClusterMembersObjectPermission(CustomAccessPermission):
         "GET": [VIEW_CLUSTER_PERMISSION],
         "OPTIONS": [],
         "HEAD": [],
+        "POST": [VIEW_CLUSTER_PERMISSION, ADD_CLUSTER_MEMBER_PERMISSION],
         "DELETE": [VIEW_CLUSTER_PERMISSION, REMOVE_CLUSTER_MEMBER_PERMISSION],
     }
 
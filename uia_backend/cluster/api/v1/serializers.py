@@ -1,19 +1,16 @@
 import logging
 from datetime import timedelta
 from typing import Any
+from uuid import UUID
 
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
 from uia_backend.accounts.api.v1.serializers import ProfileSerializer
 from uia_backend.accounts.models import CustomUser
-from uia_backend.cluster.constants import (
-    ADD_CLUSTER_MEMBER_PERMISSION,
-    REMOVE_CLUSTER_MEMBER_PERMISSION,
-    UPDATE_CLUSTER_PERMISSION,
-    VIEW_CLUSTER_PERMISSION,
-)
+from uia_backend.cluster.constants import CLUSTER_CREATOR_PERMISSION_MASK
 from uia_backend.cluster.models import Cluster, ClusterInvitation, ClusterMembership
-from uia_backend.libs.permissions import assign_object_permissions
 
 logger = logging.getLogger()
 
@@ -25,32 +22,37 @@ class ClusterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Cluster
-        fields = ["id", "title", "description", "icon", "created_by", "is_default"]
-        read_only_fields = ["id", "created_by", "is_default"]
+        fields = [
+            "id",
+            "title",
+            "description",
+            "icon",
+            "created_by",
+            "is_default",
+            "member_count",
+            "post_count",
+        ]
+        read_only_fields = [
+            "id",
+            "created_by",
+            "is_default",
+            "member_count",
+            "post_count",
+        ]
 
     def create(self, validated_data: dict[str, Any]) -> Cluster:
         """Create a cluster."""
         cluster = super().create(validated_data)
 
         # we need to add the cluster creatot to the list of cluster members
+        # with all cluster permissions
         ClusterMembership.objects.create(
             cluster=cluster,
             user=cluster.created_by,
             invitation=None,
+            permission_mask=CLUSTER_CREATOR_PERMISSION_MASK,
         )
-
-        # assign all cluster permission to the creator
-        creator_permissions = [
-            VIEW_CLUSTER_PERMISSION,
-            UPDATE_CLUSTER_PERMISSION,
-            ADD_CLUSTER_MEMBER_PERMISSION,
-            REMOVE_CLUSTER_MEMBER_PERMISSION,
-        ]
-        assign_object_permissions(
-            permissions=creator_permissions,
-            assignee=cluster.created_by,
-            obj=cluster,
-        )
+        cluster.refresh_from_db(fields=["member_count"])
 
         return cluster
 
@@ -90,7 +92,11 @@ class ClusterInvitationSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         return_status = ClusterInvitation.INVITATION_STATUS_PENDING
 
-        if instance and instance.status == ClusterInvitation.INVITATION_STATUS_PENDING:
+        if (
+            instance
+            and instance.status == ClusterInvitation.INVITATION_STATUS_PENDING
+            and not instance.is_expired
+        ):
             if user == instance.user and value in [
                 ClusterInvitation.INVITATION_STATUS_ACCEPTED,
                 ClusterInvitation.INVITATION_STATUS_REJECTED,
@@ -112,6 +118,12 @@ class ClusterInvitationSerializer(serializers.ModelSerializer):
 
         return super().validate(attrs)
 
+    def to_representation(self, instance: ClusterInvitation) -> dict[str, Any]:
+        data = super().to_representation(instance)
+        # expired invitations may still be pending until the expiry sweep runs
+        data["status"] = instance.effective_status
+        return data
+
     def update(
         self, instance: ClusterInvitation, validated_data: dict[str, Any]
     ) -> ClusterInvitation:
@@ -136,3 +148,123 @@ class ClusterMembershipSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict[str, Any]) -> ClusterInvitation:
         """Overide method."""
+
+
+class ClusterInvitationBulkCreateSerializer(serializers.Serializer):
+    users = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=settings.CLUSTER_INVITATION_BULK_CREATE_LIMIT,
+        write_only=True,
+    )
+    duration = serializers.IntegerField(
+        min_value=1, max_value=10, required=True, write_only=True
+    )
+
+    def validate_users(self, value: list[UUID]) -> list[CustomUser]:
+        """Validate all invited users with a query per rule."""
+
+        cluster: Cluster = self.context["cluster"]
+        user_ids = list(dict.fromkeys(value))
+        errors: dict[str, list[str]] = {}
+
+        active_users = {
+            user.id: user
+            for user in CustomUser.objects.filter(id__in=user_ids, is_active=True).only(
+                "id"
+            )
+        }
+        member_ids = set(
+            ClusterMembership.objects.filter(
+                cluster=cluster, user_id__in=user_ids
+            ).values_list("user_id", flat=True)
+        )
+        invited_user_ids = set(
+            ClusterInvitation.objects.filter(
+                cluster=cluster,
+                user_id__in=user_ids,
+                status=ClusterInvitation.INVITATION_STATUS_PENDING,
+                expires_at__gt=timezone.now(),
+            ).values_list("user_id", flat=True)
+        )
+
+        for user_id in user_ids:
+            if user_id == self.context["request"].user.id:
+                errors[str(user_id)] = [
+                    "Invalid user. Can not send inivitation to this user."
+                ]
+            elif user_id not in active_users:
+                errors[str(user_id)] = ["User not found."]
+            elif user_id in member_ids:
+                errors[str(user_id)] = ["User is already a member of this cluster."]
+            elif user_id in invited_user_ids:
+                errors[str(user_id)] = [
+                    "User already has a pending invitation to this cluster."
+                ]
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [active_users[user_id] for user_id in user_ids]
+
+    def create(self, validated_data: dict[str, Any]) -> list[ClusterInvitation]:
+        """Create all invitations with a single insert."""
+
+        duration = timedelta(days=validated_data["duration"])
+        # bulk_create skips ClusterInvitation.save which sets expires_at
+        expires_at = timezone.now() + duration
+
+        return ClusterInvitation.objects.bulk_create(
+            [
+                ClusterInvitation(
+                    user=user,
+                    cluster=validated_data["cluster"],
+                    created_by=validated_data["created_by"],
+                    duration=duration,
+                    expires_at=expires_at,
+                )
+                for user in validated_data["users"]
+            ]
+        )
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        """Overidden method."""
+
+
+class ClusterMembersBulkSerializer(serializers.Serializer):
+    users = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=settings.CLUSTER_MEMBERS_BULK_LIMIT,
+        write_only=True,
+    )
+
+    def validate_users(self, value: list[UUID]) -> list[UUID] | list[CustomUser]:
+        """Return the users to add for POST, the user ids to remove otherwise."""
+
+        user_ids = list(dict.fromkeys(value))
+
+        if self.context["request"].method != "POST":
+            return user_ids
+
+        # only active users can be added
+        users = {
+            user.id: user
+            for user in CustomUser.objects.filter(id__in=user_ids, is_active=True)
+        }
+        errors = {
+            str(user_id): ["User not found."]
+            for user_id in user_ids
+            if user_id not in users
+        }
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [users[user_id] for user_id in user_ids]
+
+    def create(self, validated_data: Any) -> Any:
+        """Overidden method."""
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        """Overidden method."""
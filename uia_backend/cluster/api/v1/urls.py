@@ -2,9 +2,11 @@ from django.urls import path
 
 from uia_backend.cluster.api.v1.views import (
     ClusterDetailAPIView,
+    ClusterInvitationBulkCreateAPIView,
     ClusterInvitationDetailAPIView,
     ClusterInvitationListAPIView,
     ClusterListCreateAPIView,
+    ClusterMembersBulkAPIView,
     ClusterMembersDetailAPIView,
     ClusterMembershipListAPIView,
     UserClusterInvitationDetailAPIView,
@@ -23,6 +25,11 @@ urlpatterns = [
         ClusterMembershipListAPIView.as_view(),
         name="list_cluster_members",
     ),
+    path(
+        "<uuid:cluster_id>/members/bulk/",
+        ClusterMembersBulkAPIView.as_view(),
+        name="bulk_add_remove_cluster_members",
+    ),
     path(
         "<uuid:cluster_id>/members/<uuid:membership_id>/",
         ClusterMembersDetailAPIView.as_view(),
@@ -33,6 +40,11 @@ urlpatterns = [
         ClusterInvitationListAPIView.as_view(),
         name="list_create_cluster_invitation",
     ),
+    path(
+        "<uuid:cluster_id>/invitations/bulk/",
+        ClusterInvitationBulkCreateAPIView.as_view(),
+        name="bulk_create_cluster_invitation",
+    ),
     path(
         "<uuid:cluster_id>/invitations/<uuid:invitation_id>/",
         ClusterInvitationDetailAPIView.as_view(),
@@ -1,11 +1,13 @@
 from typing import Any
 
+from django.db import transaction
 from django.db.models.query import QuerySet
 from django.shortcuts import get_object_or_404
-from rest_framework import filters, generics, permissions
+from rest_framework import filters, generics, permissions, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from uia_backend.accounts.api.v1.serializers import ProfileSerializer
 from uia_backend.cluster.api.v1.permissions import (
     ClusterInvitationObjectPermission,
     ClusterMembersObjectPermission,
@@ -13,18 +15,18 @@ from uia_backend.cluster.api.v1.permissions import (
     InternalClusterProtectionPermission,
 )
 from uia_backend.cluster.api.v1.serializers import (
+    ClusterInvitationBulkCreateSerializer,
     ClusterInvitationSerializer,
+    ClusterMembersBulkSerializer,
     ClusterMembershipSerializer,
     ClusterSerializer,
 )
-from uia_backend.cluster.constants import (
-    ADD_CLUSTER_MEMBER_PERMISSION,
-    REMOVE_CLUSTER_MEMBER_PERMISSION,
-    UPDATE_CLUSTER_PERMISSION,
-    VIEW_CLUSTER_PERMISSION,
-)
 from uia_backend.cluster.models import Cluster, ClusterInvitation, ClusterMembership
-from uia_backend.libs.permissions import unassign_object_permissions
+from uia_backend.cluster.utils import add_cluster_members, remove_cluster_members
+from uia_backend.libs.filters import TrigramSearchFilter
+from uia_backend.libs.pagination import KeysetPagination
+from uia_backend.notification import constants as notification_constants
+from uia_backend.notification.utils.notification_senders import Notifier
 
 
 class ClusterListCreateAPIView(generics.ListCreateAPIView):
@@ -32,7 +34,8 @@ class ClusterListCreateAPIView(generics.ListCreateAPIView):
 
     serializer_class = ClusterSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # searching orders clusters by similarity so it has to run after ordering
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
     search_fields = ["title"]
     ordering_fields = ["title", "created_datetime"]
     ordering = ["-created_datetime"]
@@ -64,7 +67,18 @@ class ClusterDetailAPIView(generics.RetrieveUpdateAPIView):
 class ClusterMembershipListAPIView(generics.ListAPIView):
     serializer_class = ClusterMembershipSerializer
     permission_classes = [permissions.IsAuthenticated, ClusterMembersObjectPermission]
-    queryset = ClusterMembership.objects.all()
+    # NOTE: member lists of default clusters have every user in them, pages are
+    # fetched by seeking on cluster_member_list_idx, or on the user name indexes
+    # when ordered by name, instead of offsets. The count is Cluster.member_count
+    # unless a search narrows the list.
+    pagination_class = KeysetPagination
+    queryset = ClusterMembership.objects.select_related("user").only(
+        "id",
+        "created_datetime",
+        "cluster_id",
+        "user",
+        *[f"user__{field}" for field in ProfileSerializer.Meta.fields],
+    )
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ["created_datetime"]
     search_fields = [
@@ -72,12 +86,24 @@ class ClusterMembershipListAPIView(generics.ListAPIView):
         "user__last_name",
     ]
     ordering_fields = ["created_datetime", "user__first_name", "user__last_name"]
-    ordering = ["-created_datetime"]
+    ordering = ["-created_datetime", "-id"]
 
     def get_queryset(self) -> QuerySet:
         # Apply cluster permissions
-        cluster = self.get_object()
-        return super().get_queryset().filter(cluster=cluster)
+        self.cluster = self.get_object()
+        return super().get_queryset().filter(cluster=self.cluster)
+
+    def paginate_queryset(self, queryset: QuerySet) -> list | None:
+        if self.request.query_params.get(filters.SearchFilter.search_param):
+            self.member_count = queryset.count()
+        else:
+            self.member_count = self.cluster.member_count
+        return super().paginate_queryset(queryset)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response = super().get_paginated_response(data)
+        response.data["count"] = self.member_count
+        return response
 
     def get_object(self) -> Any:
         cluster = get_object_or_404(
@@ -122,20 +148,56 @@ class ClusterMembersDetailAPIView(generics.RetrieveDestroyAPIView):
         return membership_record
 
     def perform_destroy(self, instance: ClusterMembership) -> None:
-        # remove all cluster permissions from member before deleting
-        unassign_object_permissions(
-            permissions=[
-                VIEW_CLUSTER_PERMISSION,
-                UPDATE_CLUSTER_PERMISSION,
-                ADD_CLUSTER_MEMBER_PERMISSION,
-                REMOVE_CLUSTER_MEMBER_PERMISSION,
-            ],
-            assignee=instance.user,
-            obj=instance.cluster,
-        )
+        # NOTE: the members cluster permissions are deleted with the membership
         instance.delete()
 
 
+class ClusterMembersBulkAPIView(generics.GenericAPIView):
+    """Add (POST) or remove (DELETE) many cluster members at once."""
+
+    serializer_class = ClusterMembersBulkSerializer
+    permission_classes = [permissions.IsAuthenticated, ClusterMembersObjectPermission]
+
+    def get_object(self) -> Cluster:
+        cluster = get_object_or_404(
+            self.request.user.cluster_member_set, id=self.kwargs["cluster_id"]
+        )
+        self.check_object_permissions(request=self.request, obj=cluster)
+
+        # members of default clusters are managed by ClusterManager
+        if cluster.internal_cluster_id is not None:
+            self.permission_denied(request=self.request)
+
+        return cluster
+
+    def get_validated_users(self, request: Request) -> Any:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["users"]
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        cluster = self.get_object()
+        memberships = add_cluster_members(
+            cluster=cluster, users=self.get_validated_users(request)
+        )
+
+        return Response(
+            data=ClusterMembershipSerializer(instance=memberships, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    def delete(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        cluster = self.get_object()
+        users = remove_cluster_members(
+            cluster=cluster, user_ids=self.get_validated_users(request)
+        )
+
+        return Response(
+            data={"users": [str(user.id) for user in users]},
+            status=status.HTTP_200_OK,
+        )
+
+
 class ClusterInvitationListAPIView(generics.ListCreateAPIView):
     """List/Create Cluster Invitation API View."""
 
@@ -179,6 +241,53 @@ class ClusterInvitationListAPIView(generics.ListCreateAPIView):
         )
 
 
+class ClusterInvitationBulkCreateAPIView(generics.GenericAPIView):
+    """Invite many users to a cluster at once."""
+
+    serializer_class = ClusterInvitationBulkCreateSerializer
+    permission_classes = [
+        permissions.IsAuthenticated,
+        ClusterInvitationObjectPermission,
+    ]
+
+    def get_object(self) -> Cluster:
+        cluster = get_object_or_404(
+            self.request.user.cluster_member_set, id=self.kwargs["cluster_id"]
+        )
+        self.check_object_permissions(request=self.request, obj=cluster)
+        return cluster
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        cluster = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            context={**self.get_serializer_context(), "cluster": cluster},
+        )
+        serializer.is_valid(raise_exception=True)
+        invitations = serializer.save(cluster=cluster, created_by=request.user)
+
+        notifier = Notifier(
+            event=notification_constants.CLUSTER_INVITATION_NOTIFICATION,
+            data={
+                "recipients": [invitation.user for invitation in invitations],
+                "verb": f"invited you to join {cluster.title}",
+                "metadata": {
+                    "cluster": str(cluster.id),
+                    "duration": serializer.validated_data["duration"],
+                },
+                "actor": request.user,
+                "target": cluster,
+            },
+        )
+        # a single notification task for the whole batch
+        transaction.on_commit(notifier.send_notification)
+
+        return Response(
+            data=ClusterInvitationSerializer(instance=invitations, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class ClusterInvitationDetailAPIView(generics.RetrieveUpdateAPIView):
     """Retrieve/Update a Cluster Invitation API View."""
 
@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class ClusterConfig(AppConfig):
     name = "uia_backend.cluster"
     verbose_name = _("Cluster")
+
+    def ready(self) -> None:
+        from uia_backend.cluster import signals  # noqa F401
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.contrib.auth.backends import BaseBackend
+
+from uia_backend.accounts.models import CustomUser
+from uia_backend.cluster.constants import CLUSTER_PERMISSION_BITS
+from uia_backend.cluster.models import Cluster, ClusterMembership
+
+
+class ClusterMembershipPermissionBackend(BaseBackend):
+    """
+    Answer cluster object permission checks from the permission_mask of the users
+    ClusterMembership, a single indexed row per check.
+    """
+
+    def get_all_permissions(self, user_obj: CustomUser, obj: Any = None) -> set[str]:
+        if (
+            not isinstance(obj, Cluster)
+            or not user_obj.is_active
+            or user_obj.is_anonymous
+        ):
+            return set()
+
+        permission_mask = (
+            ClusterMembership.objects.filter(user=user_obj, cluster=obj)
+            .values_list("permission_mask", flat=True)
+            .first()
+        )
+
+        if not permission_mask:
+            return set()
+
+        return {
+            permission
+            for permission, bit in CLUSTER_PERMISSION_BITS.items()
+            if permission_mask & bit
+        }
+
+    def has_perm(self, user_obj: CustomUser, perm: str, obj: Any = None) -> bool:
+        # accept both "cluster.<codename>" and "<codename>"
+        app_label, _, codename = perm.rpartition(".")
+
+        if app_label and app_label != Cluster._meta.app_label:
+            return False
+
+        return codename in self.get_all_permissions(user_obj, obj)
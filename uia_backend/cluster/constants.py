@@ -11,3 +11,24 @@ CLUSTER_PERMISSIONS = {
     (ADD_CLUSTER_MEMBER_PERMISSION, "Add a member to a cluster"),
     (REMOVE_CLUSTER_MEMBER_PERMISSION, "Remove member from cluster"),
 }
+
+# bit of each cluster permission in ClusterMembership.permission_mask
+CLUSTER_PERMISSION_BITS = {
+    VIEW_CLUSTER_PERMISSION: 1 << 0,
+    UPDATE_CLUSTER_PERMISSION: 1 << 1,
+    ADD_CLUSTER_MEMBER_PERMISSION: 1 << 2,
+    REMOVE_CLUSTER_MEMBER_PERMISSION: 1 << 3,
+}
+
+# CLUSTER ROLES
+CLUSTER_MEMBER_PERMISSION_MASK = CLUSTER_PERMISSION_BITS[VIEW_CLUSTER_PERMISSION]
+CLUSTER_CREATOR_PERMISSION_MASK = (
+    CLUSTER_PERMISSION_BITS[VIEW_CLUSTER_PERMISSION]
+    | CLUSTER_PERMISSION_BITS[UPDATE_CLUSTER_PERMISSION]
+    | CLUSTER_PERMISSION_BITS[ADD_CLUSTER_MEMBER_PERMISSION]
+    | CLUSTER_PERMISSION_BITS[REMOVE_CLUSTER_MEMBER_PERMISSION]
+)
+
+# centrifugo events
+CENT_EVENT_CLUSTER_MEMBERS_ADDED = "cluster_members_added"
+CENT_EVENT_CLUSTER_MEMBERS_REMOVED = "cluster_members_removed"
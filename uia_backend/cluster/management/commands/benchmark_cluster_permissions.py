@@ -0,0 +1,236 @@
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from guardian.backends import ObjectPermissionBackend
+from guardian.models import UserObjectPermission
+
+from uia_backend.accounts.api.v1.queries import USER_FEED_QUERY
+from uia_backend.accounts.models import CustomUser
+from uia_backend.cluster.backends import ClusterMembershipPermissionBackend
+from uia_backend.cluster.constants import (
+    CLUSTER_PERMISSION_BITS,
+    VIEW_CLUSTER_PERMISSION,
+)
+from uia_backend.cluster.models import Cluster, ClusterMembership
+from uia_backend.messaging.models import Post
+
+# USER_FEED_QUERY before cluster permissions moved to ClusterMembership.permission_mask
+GUARDIAN_USER_FEED_QUERY = """
+    SELECT mp.id as id
+    FROM messaging_post mp
+    INNER JOIN cluster_cluster cc
+    ON	(
+        cc.id = mp.cluster_id and cc.id::text IN (
+            SELECT gu.object_pk
+            FROM auth_permission ap
+            INNER JOIN guardian_userobjectpermission gu ON (
+                gu.content_type_id=ap.content_type_id
+                AND gu.permission_id=ap.id
+                AND gu.user_id=%s
+            ) WHERE ap.codename=%s )
+        )
+    LIMIT %s
+"""
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the data created for a benchmark run."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark cluster permission checks and the user feed query with guardian "
+        "object permissions and with membership permission masks. Generated data is "
+        "rolled back once the benchmark is done."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Number of users to benchmark with.",
+        )
+        parser.add_argument("--clusters", type=int, default=1_000)
+        parser.add_argument(
+            "--clusters-per-user",
+            type=int,
+            default=5,
+            help="Number of clusters each user is a member of.",
+        )
+        parser.add_argument("--posts-per-cluster", type=int, default=10)
+        parser.add_argument("--runs", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def create_data(
+        self, user_count: int, options: dict[str, Any]
+    ) -> list[tuple[CustomUser, Cluster]]:
+        """Create users, clusters, memberships, guardian rows and posts."""
+
+        random_generator = random.Random(user_count)
+        batch_size = options["batch_size"]
+        permission = Permission.objects.get(
+            content_type=ContentType.objects.get_for_model(Cluster),
+            codename=VIEW_CLUSTER_PERMISSION,
+        )
+
+        users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(
+                    email=f"benchmark-{index}@example.com",
+                    first_name="Benchmark",
+                    last_name="User",
+                    display_name=f"benchmark{index}",
+                    faculty="Science",
+                    department="Computer Science",
+                    year_of_graduation="2024",
+                    password="!",
+                    is_active=True,
+                )
+                for index in range(user_count)
+            ],
+            batch_size=batch_size,
+        )
+        clusters = Cluster.objects.bulk_create(
+            [
+                Cluster(title=f"Benchmark cluster {index}", created_by=users[0])
+                for index in range(options["clusters"])
+            ],
+            batch_size=batch_size,
+        )
+
+        memberships = []
+        user_object_permissions = []
+        for user in users:
+            for cluster in random_generator.sample(
+                clusters, min(options["clusters_per_user"], len(clusters))
+            ):
+                memberships.append((user, cluster))
+                user_object_permissions.append(
+                    UserObjectPermission(
+                        user=user,
+                        permission=permission,
+                        content_type=permission.content_type,
+                        object_pk=str(cluster.id),
+                    )
+                )
+
+        ClusterMembership.objects.bulk_create(
+            [
+                ClusterMembership(user=user, cluster=cluster)
+                for user, cluster in memberships
+            ],
+            batch_size=batch_size,
+        )
+        UserObjectPermission.objects.bulk_create(
+            user_object_permissions, batch_size=batch_size
+        )
+        Post.objects.bulk_create(
+            [
+                Post(
+                    title=f"Benchmark post {index}",
+                    content="Benchmark",
+                    cluster=cluster,
+                    created_by=users[0],
+                )
+                for cluster in clusters
+                for index in range(options["posts_per_cluster"])
+            ],
+            batch_size=batch_size,
+        )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE;")
+
+        return memberships
+
+    def time_calls(self, calls: list[Callable[[], Any]]) -> float:
+        """Return the median time in milliseconds taken by a call."""
+
+        durations = []
+        for call in calls:
+            start_time = time.perf_counter()
+            call()
+            durations.append((time.perf_counter() - start_time) * 1000)
+
+        return statistics.median(durations)
+
+    def benchmark(self, user_count: int, options: dict[str, Any]) -> None:
+        memberships = self.create_data(user_count, options)
+        samples = random.Random(user_count).sample(
+            memberships, min(options["runs"], len(memberships))
+        )
+
+        guardian_backend = ObjectPermissionBackend()
+        membership_backend = ClusterMembershipPermissionBackend()
+        feed_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+        def feed(query: str, user: CustomUser, permission: Any) -> Callable[[], Any]:
+            return lambda: list(
+                Post.objects.filter(
+                    id__in=RawSQL(sql=query, params=[user.id, permission, feed_size])
+                )
+            )
+
+        results = {
+            "permission check (guardian)": self.time_calls(
+                [
+                    lambda user=user, cluster=cluster: guardian_backend.has_perm(
+                        user, VIEW_CLUSTER_PERMISSION, cluster
+                    )
+                    for user, cluster in samples
+                ]
+            ),
+            "permission check (membership mask)": self.time_calls(
+                [
+                    lambda user=user, cluster=cluster: membership_backend.has_perm(
+                        user, VIEW_CLUSTER_PERMISSION, cluster
+                    )
+                    for user, cluster in samples
+                ]
+            ),
+        }
+
+        if connection.vendor == "postgresql":
+            # the guardian feed query casts cluster ids with a postgres only `::text`
+            results["feed query (guardian)"] = self.time_calls(
+                [
+                    feed(GUARDIAN_USER_FEED_QUERY, user, VIEW_CLUSTER_PERMISSION)
+                    for user, _ in samples
+                ]
+            )
+            results["feed query (membership mask)"] = self.time_calls(
+                [
+                    feed(
+                        USER_FEED_QUERY,
+                        user,
+                        CLUSTER_PERMISSION_BITS[VIEW_CLUSTER_PERMISSION],
+                    )
+                    for user, _ in samples
+                ]
+            )
+
+        for name, duration in results.items():
+            self.stdout.write(f"{user_count} users | {name}: {duration:.3f}ms")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for user_count in options["users"]:
+            try:
+                with transaction.atomic():
+                    self.benchmark(user_count, options)
+                    raise BenchmarkRollback
+            except BenchmarkRollback:
+                pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
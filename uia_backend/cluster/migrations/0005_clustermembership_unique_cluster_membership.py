@@ -0,0 +1,47 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:26
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_memberships(apps, schema_editor):
+    """Keep the oldest membership of users who are members of a cluster twice."""
+
+    ClusterMembership = apps.get_model("cluster", "ClusterMembership")
+    db_alias = schema_editor.connection.alias
+
+    duplicates = (
+        ClusterMembership.objects.using(db_alias)
+        .values("cluster", "user")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        membership_ids = (
+            ClusterMembership.objects.using(db_alias)
+            .filter(cluster=duplicate["cluster"], user=duplicate["user"])
+            .order_by("created_datetime")
+            .values_list("id", flat=True)
+        )
+        ClusterMembership.objects.using(db_alias).filter(
+            id__in=list(membership_ids[1:])
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cluster', '0004_remove_cluster_channel'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=delete_duplicate_memberships,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='clustermembership',
+            constraint=models.UniqueConstraint(fields=('cluster', 'user'), name='unique_cluster_membership'),
+        ),
+    ]
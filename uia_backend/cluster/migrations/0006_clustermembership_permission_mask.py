@@ -0,0 +1,138 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:31
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# uia_backend.cluster.constants.CLUSTER_PERMISSION_BITS at the time of this migration
+CLUSTER_PERMISSION_BITS = {
+    "view_cluster_permission": 1 << 0,
+    "change_cluster_permission": 1 << 1,
+    "add_cluster_member_permission": 1 << 2,
+    "remove_cluster_member_permission": 1 << 3,
+}
+BATCH_SIZE = 1000
+
+
+def move_guardian_permissions_to_memberships(apps, schema_editor):
+    """Store the guardian cluster permissions of members on their memberships."""
+
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    UserObjectPermission = apps.get_model("guardian", "UserObjectPermission")
+    ClusterMembership = apps.get_model("cluster", "ClusterMembership")
+    db_alias = schema_editor.connection.alias
+
+    content_type = (
+        ContentType.objects.using(db_alias)
+        .filter(app_label="cluster", model="cluster")
+        .first()
+    )
+    if content_type is None:
+        return
+
+    cluster_permissions = UserObjectPermission.objects.using(db_alias).filter(
+        content_type=content_type,
+        permission__codename__in=CLUSTER_PERMISSION_BITS.keys(),
+    )
+
+    permission_masks = defaultdict(int)
+    for user_id, object_pk, codename in cluster_permissions.values_list(
+        "user_id", "object_pk", "permission__codename"
+    ).iterator():
+        permission_masks[(user_id, object_pk)] |= CLUSTER_PERMISSION_BITS[codename]
+
+    memberships = []
+    for membership in (
+        ClusterMembership.objects.using(db_alias)
+        .only("id", "user_id", "cluster_id", "permission_mask")
+        .iterator()
+    ):
+        membership.permission_mask = permission_masks.get(
+            (membership.user_id, str(membership.cluster_id)), 0
+        )
+        memberships.append(membership)
+
+        if len(memberships) >= BATCH_SIZE:
+            ClusterMembership.objects.using(db_alias).bulk_update(
+                memberships, ["permission_mask"]
+            )
+            memberships = []
+
+    ClusterMembership.objects.using(db_alias).bulk_update(
+        memberships, ["permission_mask"]
+    )
+    cluster_permissions.delete()
+
+
+def move_membership_permissions_to_guardian(apps, schema_editor):
+    """Recreate guardian cluster permissions from the memberships."""
+
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Permission = apps.get_model("auth", "Permission")
+    UserObjectPermission = apps.get_model("guardian", "UserObjectPermission")
+    ClusterMembership = apps.get_model("cluster", "ClusterMembership")
+    db_alias = schema_editor.connection.alias
+
+    content_type = (
+        ContentType.objects.using(db_alias)
+        .filter(app_label="cluster", model="cluster")
+        .first()
+    )
+    if content_type is None:
+        return
+
+    permissions = {
+        permission.codename: permission
+        for permission in Permission.objects.using(db_alias).filter(
+            content_type=content_type,
+            codename__in=CLUSTER_PERMISSION_BITS.keys(),
+        )
+    }
+
+    user_object_permissions = []
+    for membership in (
+        ClusterMembership.objects.using(db_alias)
+        .only("user_id", "cluster_id", "permission_mask")
+        .iterator()
+    ):
+        for codename, permission in permissions.items():
+            if membership.permission_mask & CLUSTER_PERMISSION_BITS[codename]:
+                user_object_permissions.append(
+                    UserObjectPermission(
+                        user_id=membership.user_id,
+                        permission=permission,
+                        content_type=content_type,
+                        object_pk=str(membership.cluster_id),
+                    )
+                )
+
+        if len(user_object_permissions) >= BATCH_SIZE:
+            UserObjectPermission.objects.using(db_alias).bulk_create(
+                user_object_permissions, ignore_conflicts=True
+            )
+            user_object_permissions = []
+
+    UserObjectPermission.objects.using(db_alias).bulk_create(
+        user_object_permissions, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('guardian', '0002_generic_permissions_index'),
+        ('cluster', '0005_clustermembership_unique_cluster_membership'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clustermembership',
+            name='permission_mask',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.RunPython(
+            code=move_guardian_permissions_to_memberships,
+            reverse_code=move_membership_permissions_to_guardian,
+        ),
+    ]
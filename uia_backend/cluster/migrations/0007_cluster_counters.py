@@ -0,0 +1,66 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_cluster_counters(apps, schema_editor):
+    """Set the stored cluster counters from existing memberships and posts."""
+
+    Cluster = apps.get_model("cluster", "Cluster")
+    ClusterMembership = apps.get_model("cluster", "ClusterMembership")
+    Post = apps.get_model("messaging", "Post")
+    db_alias = schema_editor.connection.alias
+
+    member_counts = (
+        ClusterMembership.objects.using(db_alias)
+        .filter(cluster=OuterRef("pk"))
+        .order_by()
+        .values("cluster")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    post_counts = (
+        Post.objects.using(db_alias)
+        .filter(cluster=OuterRef("pk"))
+        .order_by()
+        .values("cluster")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+
+    Cluster.objects.using(db_alias).update(
+        member_count=Coalesce(Subquery(member_counts), 0),
+        post_count=Coalesce(Subquery(post_counts), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cluster', '0006_clustermembership_permission_mask'),
+        ('messaging', '0002_dm_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cluster',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='clustermembership',
+            index=models.Index(fields=['cluster', '-created_datetime', '-id'], name='cluster_member_list_idx'),
+        ),
+        migrations.RunPython(
+            code=backfill_cluster_counters,
+            reverse_code=migrations.RunPython.noop,
+            atomic=True,
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:52
+
+from django.db import migrations, models
+from django.db.models import DateTimeField, ExpressionWrapper, F
+
+
+def backfill_invitation_expires_at(apps, schema_editor):
+    """Set expires_at of existing invitations from created_datetime and duration."""
+
+    ClusterInvitation = apps.get_model("cluster", "ClusterInvitation")
+    db_alias = schema_editor.connection.alias
+
+    ClusterInvitation.objects.using(db_alias).update(
+        expires_at=ExpressionWrapper(
+            F("created_datetime") + F("duration"),
+            output_field=DateTimeField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cluster', '0007_cluster_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clusterinvitation',
+            name='expires_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(
+            code=backfill_invitation_expires_at,
+            reverse_code=migrations.RunPython.noop,
+            atomic=True,
+        ),
+        migrations.AlterField(
+            model_name='clusterinvitation',
+            name='expires_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='clusterinvitation',
+            index=models.Index(condition=models.Q(('status', 0)), fields=['expires_at'], name='pending_invitation_expiry_idx'),
+        ),
+    ]
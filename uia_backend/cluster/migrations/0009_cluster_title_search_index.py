@@ -0,0 +1,46 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:02
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the trigram index used by cluster search.
+
+    NOTE: PostgreSQL only, other databases fall back to unindexed lookups.
+    """
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS cluster_cluster_title_trgm_idx "
+        "ON cluster_cluster USING gin (title gin_trgm_ops);"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS cluster_cluster_title_trgm_idx;"
+    )
+
+
+class Migration(migrations.Migration):
+    # indexes are built concurrently which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('cluster', '0008_clusterinvitation_expires_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_search_index,
+            reverse_code=drop_search_index,
+            atomic=False,
+        ),
+    ]
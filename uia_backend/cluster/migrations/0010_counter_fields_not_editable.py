@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cluster', '0009_cluster_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cluster',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='cluster',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
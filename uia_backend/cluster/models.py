@@ -1,11 +1,16 @@
 from datetime import timedelta
+from typing import Any
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from uia_backend.accounts.models import CustomUser
-from uia_backend.cluster.constants import CLUSTER_PERMISSIONS
-from uia_backend.libs.base_models import BaseAbstractModel
+from uia_backend.cluster.constants import (
+    CLUSTER_MEMBER_PERMISSION_MASK,
+    CLUSTER_PERMISSIONS,
+)
+from uia_backend.libs.base_models import BaseAbstractModel, CounterFieldsMixin
 
 
 class InternalCluster(BaseAbstractModel):
@@ -21,7 +26,7 @@ def cluster_icon_upload_location(instance, filename: str) -> str:
     return f"clusters/{instance.id}/icon/{filename}"
 
 
-class Cluster(BaseAbstractModel):
+class Cluster(CounterFieldsMixin, BaseAbstractModel):
     internal_cluster = models.OneToOneField(
         InternalCluster, null=True, db_index=True, on_delete=models.PROTECT
     )
@@ -35,6 +40,12 @@ class Cluster(BaseAbstractModel):
         related_name="cluster_member_set",
     )
     created_by = models.ForeignKey(CustomUser, on_delete=models.PROTECT, null=True)
+    # maintained by uia_backend.cluster.signals and uia_backend.messaging.signals
+    # so clusters render their counts without counting memberships or posts
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("member_count", "post_count")
 
     class Meta:
         permissions = CLUSTER_PERMISSIONS
@@ -79,6 +90,43 @@ class ClusterInvitation(BaseAbstractModel):
     created_by = models.ForeignKey(
         CustomUser, on_delete=models.PROTECT, related_name="cluster_invitation_set"
     )
+    # created_datetime + duration, stored so expired invitations are found by index
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # expiry sweep of uia_backend.cluster.tasks
+            models.Index(
+                fields=["expires_at"],
+                name="pending_invitation_expiry_idx",
+                condition=models.Q(status=0),  # INVITATION_STATUS_PENDING
+            ),
+        ]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # created_datetime is only set by the first save
+        self.expires_at = (self.created_datetime or timezone.now()) + self.duration
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "duration" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "expires_at"}
+
+        super().save(*args, **kwargs)
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if the invitation expired, even before the expiry sweep marks it."""
+        return self.status == self.INVITATION_STATUS_EXPIRED or (
+            self.status == self.INVITATION_STATUS_PENDING
+            and self.expires_at <= timezone.now()
+        )
+
+    @property
+    def effective_status(self) -> int:
+        """Return the status, pending invitations past expires_at are expired."""
+        if self.is_expired:
+            return self.INVITATION_STATUS_EXPIRED
+        return self.status
 
 
 class ClusterMembership(BaseAbstractModel):
@@ -87,3 +135,22 @@ class ClusterMembership(BaseAbstractModel):
     invitation = models.ForeignKey(
         ClusterInvitation, on_delete=models.CASCADE, null=True
     )
+    # cluster permissions of the member, see constants.CLUSTER_PERMISSION_BITS
+    # checked by uia_backend.cluster.backends.ClusterMembershipPermissionBackend
+    permission_mask = models.PositiveSmallIntegerField(
+        default=CLUSTER_MEMBER_PERMISSION_MASK
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cluster", "user"], name="unique_cluster_membership"
+            ),
+        ]
+        indexes = [
+            # keyset pagination of cluster member lists
+            models.Index(
+                fields=["cluster", "-created_datetime", "-id"],
+                name="cluster_member_list_idx",
+            ),
+        ]
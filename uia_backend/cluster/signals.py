@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from uia_backend.cluster.models import Cluster, ClusterMembership
+
+_member_count_updated_in_bulk: ContextVar[bool] = ContextVar(
+    "member_count_updated_in_bulk", default=False
+)
+
+
+@contextmanager
+def member_count_updated_in_bulk() -> Iterator[None]:
+    """
+    Skip the per membership member count updates inside the block.
+
+    The caller updates Cluster.member_count itself, once for all the memberships.
+    """
+
+    token = _member_count_updated_in_bulk.set(True)
+    try:
+        yield
+    finally:
+        _member_count_updated_in_bulk.reset(token)
+
+
+@receiver(post_save, sender=ClusterMembership, dispatch_uid="membership_created")
+def increment_cluster_member_count(
+    sender: type[ClusterMembership],
+    instance: ClusterMembership,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Increment the stored member count of a cluster when a member joins."""
+
+    if not created or _member_count_updated_in_bulk.get():
+        return
+
+    Cluster.objects.filter(id=instance.cluster_id).update(
+        member_count=F("member_count") + 1
+    )
+
+
+@receiver(post_delete, sender=ClusterMembership, dispatch_uid="membership_deleted")
+def decrement_cluster_member_count(
+    sender: type[ClusterMembership], instance: ClusterMembership, **kwargs: Any
+) -> None:
+    """Decrement the stored member count of a cluster when a member leaves."""
+
+    if _member_count_updated_in_bulk.get():
+        return
+
+    Cluster.objects.filter(id=instance.cluster_id, member_count__gt=0).update(
+        member_count=F("member_count") - 1
+    )
@@ -1,22 +1,52 @@
-from django.db.models import DateTimeField, ExpressionWrapper, F, Q
+from logging import getLogger
+
+from django.conf import settings
 from django.utils import timezone
 
 from config.celery_app import app as CELERY_APP
 from uia_backend.cluster.models import ClusterInvitation
 
+Logger = getLogger()
+
 
 @CELERY_APP.task(name="deactivate_expired_cluster_invitation")
-def deactivate_expired_cluster_invitation() -> None:
-    """Deactivate user invitation records that have expired."""
+def deactivate_expired_cluster_invitation(batch_size: int | None = None) -> int:
+    """
+    Deactivate user invitation records that have expired.
+
+    Expired invitations are updated `batch_size` at a time, oldest first, each
+    batch is found through the partial index on pending invitations. Invitations
+    already read as expired once past expires_at so this only tidies the status.
+    """
+
+    batch_size = batch_size or settings.CLUSTER_INVITATION_EXPIRY_BATCH_SIZE
+    now = timezone.now()
+    expired_count = 0
 
-    ClusterInvitation.objects.annotate(
-        expected_expiration_datetime=ExpressionWrapper(
-            F("created_datetime") + F("duration"),
-            output_field=DateTimeField(),
+    while True:
+        invitation_ids = list(
+            ClusterInvitation.objects.filter(
+                status=ClusterInvitation.INVITATION_STATUS_PENDING,
+                expires_at__lte=now,
+            )
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
         )
-    ).filter(
-        Q(status=ClusterInvitation.INVITATION_STATUS_PENDING)
-        & Q(expected_expiration_datetime__lte=timezone.now())
-    ).update(
-        status=ClusterInvitation.INVITATION_STATUS_EXPIRED
+
+        if not invitation_ids:
+            break
+
+        expired_count += ClusterInvitation.objects.filter(
+            id__in=invitation_ids,
+            status=ClusterInvitation.INVITATION_STATUS_PENDING,
+        ).update(status=ClusterInvitation.INVITATION_STATUS_EXPIRED)
+
+        if len(invitation_ids) < batch_size:
+            break
+
+    Logger.info(
+        "uia_backend::cluster::tasks::deactivate_expired_cluster_invitation:: "
+        "Deactivated expired cluster invitations.",
+        extra={"expired_count": expired_count},
     )
+    return expired_count
@@ -1,129 +1,307 @@
+from collections import Counter
+from collections.abc import Sequence
+from uuid import UUID
+
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
 
 from uia_backend.accounts.models import CustomUser
-from uia_backend.cluster.constants import VIEW_CLUSTER_PERMISSION
+from uia_backend.cluster.constants import (
+    CENT_EVENT_CLUSTER_MEMBERS_ADDED,
+    CENT_EVENT_CLUSTER_MEMBERS_REMOVED,
+    CLUSTER_MEMBER_PERMISSION_MASK,
+    CLUSTER_PERMISSION_BITS,
+)
 from uia_backend.cluster.models import Cluster, ClusterMembership, InternalCluster
-from uia_backend.libs.permissions import assign_object_permissions
+from uia_backend.cluster.signals import member_count_updated_in_bulk
+from uia_backend.libs.centrifugo import CentrifugoConnector
 
 
-class ClusterManager:
+def get_cluster_permission_mask(permissions: Sequence[str]) -> int:
+    """Return the ClusterMembership.permission_mask bits of cluster permissions."""
+    permission_mask = 0
+    for permission in permissions:
+        permission_mask |= CLUSTER_PERMISSION_BITS[permission]
+    return permission_mask
+
+
+def assign_cluster_permissions(
+    permissions: Sequence[str], user: CustomUser, cluster: Cluster
+) -> None:
+    """Give a cluster member cluster permissions."""
+    ClusterMembership.objects.filter(user=user, cluster=cluster).update(
+        permission_mask=F("permission_mask").bitor(
+            get_cluster_permission_mask(permissions)
+        )
+    )
+
+
+def unassign_cluster_permissions(
+    permissions: Sequence[str], user: CustomUser, cluster: Cluster
+) -> None:
+    """Take cluster permissions away from a cluster member."""
+    ClusterMembership.objects.filter(user=user, cluster=cluster).update(
+        permission_mask=F("permission_mask").bitand(
+            ~get_cluster_permission_mask(permissions)
+        )
+    )
+
 
+def get_inserted_memberships(
+    memberships: Sequence[ClusterMembership], batch_size: int = 1000
+) -> list[ClusterMembership]:
     """
-    The ClusterManager class is responsible for managing the creation and membership of clusters for a given user.
-    It adds a user to default clusters for the user based on their faculty, department, and year of graduation.
+    Return the memberships `bulk_create(ignore_conflicts=True)` actually inserted.
+
+    A membership skipped because of a conflict, e.g a concurrent join, keeps the
+    id generated for it which no row has.
     """
 
-    def __init__(self, user: CustomUser):
-        """
-        Initializes the ClusterManager object with a user and sets up the default
-        cluster query and memberships to create.
-        """
-        self.user = user
-        self.default_cluster_query = InternalCluster.objects.select_related(
-            "cluster"
-        ).filter(is_active=True)
-        self.memberships_to_create: list[ClusterMembership] = []
+    membership_ids = [membership.id for membership in memberships]
+    inserted_ids = set()
+    for start in range(0, len(membership_ids), batch_size):
+        end = start + batch_size
+        inserted_ids.update(
+            ClusterMembership.objects.filter(
+                id__in=membership_ids[start:end]
+            ).values_list("id", flat=True)
+        )
 
-    def _create_default_cluster(self, name: str, description: str) -> InternalCluster:
-        """creates a default cluster with the given name and description."""
+    return [membership for membership in memberships if membership.id in inserted_ids]
 
-        internal_cluster, created = InternalCluster.objects.get_or_create(
-            name=name, defaults={"description": description, "is_active": True}
-        )
 
-        if created or (getattr(internal_cluster, "cluster", None) is None):
-            Cluster.objects.create(
-                internal_cluster=internal_cluster,
-                title=name.capitalize(),
-            )
+def broadcast_cluster_members_event(
+    event_name: str, cluster: Cluster, users: Sequence[CustomUser]
+) -> None:
+    """Broadcast a change of many cluster members as a single event."""
 
-        return internal_cluster
+    CentrifugoConnector().broadcast_event(
+        event_name=event_name,
+        channels=[cluster.channel_name, *[user.channel_name for user in users]],
+        event_data={
+            "cluster": str(cluster.id),
+            "users": [str(user.id) for user in users],
+        },
+    )
 
-    def _create_membership(self, cluster: Cluster) -> None:
-        """Creates a membership for the user in the given cluster."""
-        if not ClusterMembership.objects.filter(
-            user=self.user, cluster=cluster
-        ).exists():
-            cluster = ClusterMembership(
-                user=self.user, cluster=cluster, invitation=None
-            )
-            self.memberships_to_create.append(cluster)
 
-    def _add_user_to_global_cluster(self) -> None:
-        """Adds the user to the global default cluster."""
-        global_cluster_name = settings.DEFUALT_CLUSTER_NAMES[0]
+@transaction.atomic()
+def add_cluster_members(
+    cluster: Cluster, users: Sequence[CustomUser], batch_size: int = 1000
+) -> list[ClusterMembership]:
+    """
+    Add many users to a cluster, users who are already members are skipped.
 
-        try:
-            global_cluster = self.default_cluster_query.get(name=global_cluster_name)
-        except InternalCluster.DoesNotExist:
-            global_cluster = self._create_default_cluster(
-                name=global_cluster_name, description=""
-            )
-        self._create_membership(cluster=global_cluster.cluster)
+    Memberships are inserted in batches and the member count updated with a
+    single query. Members get the member permissions.
+    """
 
-    def _add_user_to_faculty_cluster(self) -> None:
-        """Adds the user to the default cluster for their faculty."""
-        faculty_cluster_name = str(settings.DEFUALT_CLUSTER_NAMES[1]).format(
-            faculty_name=self.user.faculty
+    member_ids = set(
+        ClusterMembership.objects.filter(
+            cluster=cluster, user__in=[user.id for user in users]
+        ).values_list("user_id", flat=True)
+    )
+    memberships = [
+        ClusterMembership(
+            cluster=cluster,
+            user=user,
+            invitation=None,
+            permission_mask=CLUSTER_MEMBER_PERMISSION_MASK,
         )
+        for user in {user.id: user for user in users}.values()
+        if user.id not in member_ids
+    ]
 
-        try:
-            faculty_cluster = self.default_cluster_query.get(name=faculty_cluster_name)
-        except InternalCluster.DoesNotExist:
-            faculty_cluster = self._create_default_cluster(
-                name=faculty_cluster_name, description=""
-            )
+    if not memberships:
+        return []
+
+    ClusterMembership.objects.bulk_create(
+        memberships, batch_size=batch_size, ignore_conflicts=True
+    )
+    memberships = get_inserted_memberships(memberships, batch_size=batch_size)
+
+    if not memberships:
+        return []
 
-        self._create_membership(cluster=faculty_cluster.cluster)
+    # bulk_create skips the signals maintaining Cluster.member_count
+    Cluster.objects.filter(id=cluster.id).update(
+        member_count=F("member_count") + len(memberships)
+    )
 
-    def _add_user_to_department_cluster(self) -> None:
-        """Adds the user to the default cluster for their department."""
-        department_cluster_name = str(settings.DEFUALT_CLUSTER_NAMES[3]).format(
-            department_name=self.user.department
+    transaction.on_commit(
+        lambda: broadcast_cluster_members_event(
+            event_name=CENT_EVENT_CLUSTER_MEMBERS_ADDED,
+            cluster=cluster,
+            users=[membership.user for membership in memberships],
         )
-        try:
-            department_cluster = self.default_cluster_query.get(
-                name=department_cluster_name
-            )
-        except InternalCluster.DoesNotExist:
-            department_cluster = self._create_default_cluster(
-                name=department_cluster_name, description=""
-            )
+    )
+    return memberships
+
+
+@transaction.atomic()
+def remove_cluster_members(
+    cluster: Cluster, user_ids: Sequence[UUID]
+) -> list[CustomUser]:
+    """
+    Remove many members from a cluster.
+
+    Their permissions are stored on the memberships and go with them. Returns
+    the removed members, user ids of non members are ignored.
+    """
+
+    users = list(
+        CustomUser.objects.filter(
+            clustermembership__cluster=cluster, id__in=user_ids
+        ).only("id")
+    )
 
-        self._create_membership(cluster=department_cluster.cluster)
+    if not users:
+        return []
 
-    def _add_user_to_graduation_set_cluster(self) -> None:
-        """Adds the user to the default cluster for their year of graduation."""
-        graduation_set_cluster_name = str(settings.DEFUALT_CLUSTER_NAMES[4]).format(
-            year_of_graduation=self.user.year_of_graduation
+    with member_count_updated_in_bulk():
+        _, deleted_counts = ClusterMembership.objects.filter(
+            cluster=cluster, user__in=users
+        ).delete()
+
+    removed_count = deleted_counts.get(ClusterMembership._meta.label, 0)
+    Cluster.objects.filter(id=cluster.id).update(
+        member_count=Greatest(F("member_count") - removed_count, 0)
+    )
+
+    transaction.on_commit(
+        lambda: broadcast_cluster_members_event(
+            event_name=CENT_EVENT_CLUSTER_MEMBERS_REMOVED,
+            cluster=cluster,
+            users=users,
         )
+    )
+    return users
 
-        try:
-            graduation_set_cluster_name = self.default_cluster_query.get(
-                name=graduation_set_cluster_name
-            )
-        except InternalCluster.DoesNotExist:
-            graduation_set_cluster_name = self._create_default_cluster(
-                name=graduation_set_cluster_name, description=""
-            )
-        self._create_membership(cluster=graduation_set_cluster_name.cluster)
+
+class ClusterManager:
+
+    """
+    The ClusterManager class is responsible for managing the creation and membership of clusters for a given user.
+    It adds a user to default clusters for the user based on their faculty, department, and year of graduation.
+    """
+
+    def __init__(self, user: CustomUser):
+        """Initializes the ClusterManager object with a user."""
+        self.user = user
 
     @transaction.atomic()
     def add_user_to_defualt_clusters(self) -> None:
         """Adds the user to all default clusters."""
-        self._add_user_to_global_cluster()
-        self._add_user_to_faculty_cluster()
-        self._add_user_to_department_cluster()
-        self._add_user_to_graduation_set_cluster()
+        self.add_users_to_default_clusters([self.user])
+
+    @staticmethod
+    def get_default_cluster_names(user: CustomUser) -> list[str]:
+        """Return the names of the default clusters of a user."""
+        return [
+            settings.DEFUALT_CLUSTER_NAMES[0],
+            str(settings.DEFUALT_CLUSTER_NAMES[1]).format(faculty_name=user.faculty),
+            str(settings.DEFUALT_CLUSTER_NAMES[3]).format(
+                department_name=user.department
+            ),
+            str(settings.DEFUALT_CLUSTER_NAMES[4]).format(
+                year_of_graduation=user.year_of_graduation
+            ),
+        ]
+
+    @staticmethod
+    def _get_or_create_default_clusters(names: set[str]) -> dict[str, Cluster]:
+        """Return the cluster of each default cluster name, creating missing ones."""
+
+        clusters = {
+            cluster.internal_cluster.name: cluster
+            for cluster in Cluster.objects.select_related("internal_cluster").filter(
+                internal_cluster__name__in=names
+            )
+        }
+        missing_names = names - clusters.keys()
+
+        if missing_names:
+            InternalCluster.objects.bulk_create(
+                [
+                    InternalCluster(name=name, description="", is_active=True)
+                    for name in missing_names
+                ],
+                ignore_conflicts=True,
+            )
+            Cluster.objects.bulk_create(
+                [
+                    Cluster(
+                        internal_cluster_id=internal_cluster_id, title=name.capitalize()
+                    )
+                    for name, internal_cluster_id in InternalCluster.objects.filter(
+                        name__in=missing_names, cluster__isnull=True
+                    ).values_list("name", "id")
+                ],
+                ignore_conflicts=True,
+            )
+            clusters.update(
+                (cluster.internal_cluster.name, cluster)
+                for cluster in Cluster.objects.select_related(
+                    "internal_cluster"
+                ).filter(internal_cluster__name__in=missing_names)
+            )
+
+        return clusters
+
+    @classmethod
+    @transaction.atomic()
+    def add_users_to_default_clusters(
+        cls, users: Sequence[CustomUser], batch_size: int = 1000
+    ) -> None:
+        """
+        Adds many users to their default clusters.
 
-        memberships = ClusterMembership.objects.bulk_create(
-            objs=self.memberships_to_create,
+        Default clusters are resolved with a single query and memberships, which
+        carry the members permissions, are inserted in batches. Users who are
+        already members are skipped and member counts are updated in one query.
+        """
+
+        user_cluster_names = [
+            (user, cls.get_default_cluster_names(user)) for user in users
+        ]
+        clusters = cls._get_or_create_default_clusters(
+            {name for _, names in user_cluster_names for name in names}
+        )
+        existing_memberships = set(
+            ClusterMembership.objects.filter(
+                user__in=[user.id for user in users],
+                cluster__in=[cluster.id for cluster in clusters.values()],
+            ).values_list("user_id", "cluster_id")
+        )
+        memberships = [
+            ClusterMembership(user=user, cluster=cluster, invitation=None)
+            for user, names in user_cluster_names
+            for cluster in {clusters[name] for name in names}
+            if (user.id, cluster.id) not in existing_memberships
+        ]
+
+        if not memberships:
+            return
+
+        ClusterMembership.objects.bulk_create(
+            memberships, batch_size=batch_size, ignore_conflicts=True
         )
+        memberships = get_inserted_memberships(memberships, batch_size=batch_size)
 
-        # assign membership permissions
-        permissions = [VIEW_CLUSTER_PERMISSION]
-        for record in memberships:
-            assign_object_permissions(
-                permissions=permissions, assignee=self.user, obj=record.cluster
+        if not memberships:
+            return
+
+        # bulk_create skips the signals maintaining Cluster.member_count
+        new_member_counts = Counter(membership.cluster_id for membership in memberships)
+        Cluster.objects.filter(id__in=new_member_counts.keys()).update(
+            member_count=F("member_count")
+            + Case(
+                *[
+                    When(id=cluster_id, then=Value(count))
+                    for cluster_id, count in new_member_counts.items()
+                ],
+                default=Value(0),
             )
+        )
@@ -1,11 +1,10 @@
 from logging import getLogger
 from typing import Any
 
-from django.db.models import F
 from rest_framework import serializers
 
 from uia_backend.experiments.constants import ER_001_PRE_ALPHA_USER_TESTING_TAG
-from uia_backend.experiments.models import PreAlphaUserTestingExperiment
+from uia_backend.experiments.models import ExperimentConfig
 
 logger = getLogger()
 
@@ -21,20 +20,20 @@ class PreAplhaTestingPopulationSerializer(serializers.Serializer):
         """Overidden method"""
 
     def to_representation(self, instance: Any) -> Any:
-        exprriment_population = PreAlphaUserTestingExperiment.objects.filter(
-            experiment_config__experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
-            experiment_config__is_active=True,
-        ).annotate(
-            max_allowed_user_population=F(
-                "experiment_config__required_user_population"
-            ),
+        experiment_config = (
+            ExperimentConfig.objects.filter(
+                experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG, is_active=True
+            )
+            .values("enrolled_user_population", "required_user_population")
+            .first()
         )
 
+        if experiment_config is None:
+            return {"enrolled_user_population": 0, "max_allowed_user_population": 0}
+
         return {
-            "enrolled_user_population": exprriment_population.count(),
-            "max_allowed_user_population": exprriment_population[
-                0
-            ].max_allowed_user_population
-            if exprriment_population
-            else 0,
+            "enrolled_user_population": experiment_config["enrolled_user_population"],
+            "max_allowed_user_population": experiment_config[
+                "required_user_population"
+            ],
         }
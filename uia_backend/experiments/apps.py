@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class ExperimentsConfig(AppConfig):
     name = "uia_backend.experiments"
     verbose_name = _("Experiments")
+
+    def ready(self) -> None:
+        from uia_backend.experiments import signals  # noqa F401
@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from uia_backend.experiments.constants import EXPERIMENT_SELECTION_TYPE_URD
+from uia_backend.experiments.models import ExperimentConfig
+
+VERSION_CACHE_KEY = "experiments:config_version"
+
+# users are spread over this many buckets, so rollouts have a 0.01% granularity
+EXPERIMENT_BUCKET_COUNT = 10_000
+
+
+@dataclass(frozen=True)
+class Experiment:
+    """Read only copy of an active ExperimentConfig."""
+
+    id: UUID
+    experiment_tag: str
+    required_user_population: int
+    selection_type: int
+    experiment_duration: timedelta | None
+    meta_data: dict[str, Any]
+
+    @property
+    def rollout_percentage(self) -> float:
+        """
+        Share of users the experiment applies to.
+
+        Uniform random distribution experiments read it from
+        `meta_data["rollout_percentage"]`, all other experiments apply to everyone.
+        """
+
+        if self.selection_type != EXPERIMENT_SELECTION_TYPE_URD:
+            return 100.0
+        return float(self.meta_data.get("rollout_percentage", 0))
+
+
+def get_experiment_bucket(user_id: UUID | str, experiment_tag: str) -> int:
+    """
+    Return the bucket of a user in an experiment.
+
+    The bucket only depends on the user id and experiment tag so a user always
+    lands in the same bucket, on every process, while different experiments
+    split users independently.
+    """
+
+    digest = hashlib.sha256(f"{experiment_tag}:{user_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % EXPERIMENT_BUCKET_COUNT
+
+
+def invalidate_experiments() -> None:
+    """Make every process reload its experiments now and once this transaction commits."""
+
+    def bump_version() -> None:
+        cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+        cache.incr(VERSION_CACHE_KEY)
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+class ExperimentEngine:
+    """
+    Per-process snapshot of all active experiments.
+
+    The snapshot is reloaded when the shared version in the cache changes (see
+    `invalidate_experiments`). The version is checked at most once every
+    `settings.EXPERIMENT_ENGINE_VERSION_CHECK_INTERVAL` seconds, so evaluating an
+    experiment normally needs neither a query nor a cache lookup.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._experiments: dict[str, Experiment] = {}
+        self._version: int | None = None
+        self._checked_at: float | None = None
+
+    def _load(self) -> dict[str, Experiment]:
+        return {
+            experiment_tag: Experiment(
+                id=id,
+                experiment_tag=experiment_tag,
+                required_user_population=required_user_population,
+                selection_type=selection_type,
+                experiment_duration=experiment_duration,
+                meta_data=meta_data or {},
+            )
+            for (
+                id,
+                experiment_tag,
+                required_user_population,
+                selection_type,
+                experiment_duration,
+                meta_data,
+            ) in ExperimentConfig.objects.filter(is_active=True).values_list(
+                "id",
+                "experiment_tag",
+                "required_user_population",
+                "selection_type",
+                "experiment_duration",
+                "meta_data",
+            )
+        }
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at
+            < settings.EXPERIMENT_ENGINE_VERSION_CHECK_INTERVAL
+        ):
+            return
+
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            version = cache.get(VERSION_CACHE_KEY)
+
+            if self._checked_at is None or version != self._version:
+                self._experiments = self._load()
+                self._version = version
+
+            self._checked_at = now
+
+    def clear(self) -> None:
+        """Drop the snapshot, it is reloaded on the next evaluation."""
+
+        with self._lock:
+            self._experiments = {}
+            self._version = None
+            self._checked_at = None
+
+    def get_experiment(self, experiment_tag: str) -> Experiment | None:
+        """Return the experiment if it is active."""
+
+        self._refresh()
+        return self._experiments.get(experiment_tag)
+
+    def is_active(self, experiment_tag: str) -> bool:
+        return self.get_experiment(experiment_tag) is not None
+
+    def is_user_in_experiment(self, user_id: UUID | str, experiment_tag: str) -> bool:
+        """
+        Check if an experiment applies to a user.
+
+        For first-come first-serve experiments this tells if the user may be
+        enrolled, the enrollment itself is bounded by `reserve_experiment_slot`.
+        """
+
+        experiment = self.get_experiment(experiment_tag)
+
+        if experiment is None:
+            return False
+
+        return get_experiment_bucket(user_id, experiment_tag) < (
+            experiment.rollout_percentage * EXPERIMENT_BUCKET_COUNT / 100
+        )
+
+
+experiment_engine = ExperimentEngine()
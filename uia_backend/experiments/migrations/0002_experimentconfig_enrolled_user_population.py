@@ -0,0 +1,48 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrolled_user_population(apps, schema_editor):
+    """Set the enrollment counters from existing enrollment records."""
+
+    ExperimentConfig = apps.get_model("experiments", "ExperimentConfig")
+    PreAlphaUserTestingExperiment = apps.get_model(
+        "experiments", "PreAlphaUserTestingExperiment"
+    )
+    db_alias = schema_editor.connection.alias
+
+    enrolled_counts = (
+        PreAlphaUserTestingExperiment.objects.using(db_alias)
+        .filter(experiment_config=OuterRef("pk"))
+        .order_by()
+        .values("experiment_config")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+
+    ExperimentConfig.objects.using(db_alias).update(
+        enrolled_user_population=Coalesce(Subquery(enrolled_counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentconfig',
+            name='enrolled_user_population',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            code=backfill_enrolled_user_population,
+            reverse_code=migrations.RunPython.noop,
+            atomic=True,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0002_experimentconfig_enrolled_user_population'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='experimentconfig',
+            name='enrolled_user_population',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
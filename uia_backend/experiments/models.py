@@ -2,17 +2,21 @@ from django.db import models
 
 from uia_backend.accounts.models import CustomUser
 from uia_backend.experiments.constants import EXPERIMENT_SELECTION_TYPE_CHOICES
-from uia_backend.libs.base_models import BaseAbstractModel
+from uia_backend.libs.base_models import BaseAbstractModel, CounterFieldsMixin
 
 
-class ExperimentConfig(BaseAbstractModel):
+class ExperimentConfig(CounterFieldsMixin, BaseAbstractModel):
     experiment_tag = models.CharField(max_length=100, db_index=True, unique=True)
     required_user_population = models.IntegerField(default=0)
+    # NOTE: only change this through reserve/release_experiment_slot
+    enrolled_user_population = models.PositiveIntegerField(default=0, editable=False)
     selection_type = models.IntegerField(choices=EXPERIMENT_SELECTION_TYPE_CHOICES)
     experiment_duration = models.DurationField(null=True)
     meta_data = models.JSONField(default={})
     is_active = models.BooleanField(default=True)
 
+    counter_fields = ("enrolled_user_population",)
+
 
 class PreAlphaUserTestingExperiment(BaseAbstractModel):
     """Model representing users onboarded on the Pre-aplha testing experiment"""
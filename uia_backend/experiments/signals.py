@@ -0,0 +1,38 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from uia_backend.experiments.engine import invalidate_experiments
+from uia_backend.experiments.models import (
+    ExperimentConfig,
+    PreAlphaUserTestingExperiment,
+)
+from uia_backend.experiments.utils import release_experiment_slot
+
+
+@receiver(post_save, sender=ExperimentConfig, dispatch_uid="experiment_config_saved")
+@receiver(
+    post_delete, sender=ExperimentConfig, dispatch_uid="experiment_config_deleted"
+)
+def invalidate_experiment_engine(
+    sender: type[ExperimentConfig], instance: ExperimentConfig, **kwargs: Any
+) -> None:
+    """Reload the experiments evaluated by `experiment_engine` when a config changes."""
+
+    invalidate_experiments()
+
+
+@receiver(
+    post_delete,
+    sender=PreAlphaUserTestingExperiment,
+    dispatch_uid="prealpha_user_testing_experiment_deleted",
+)
+def release_prealpha_experiment_slot(
+    sender: type[PreAlphaUserTestingExperiment],
+    instance: PreAlphaUserTestingExperiment,
+    **kwargs: Any,
+) -> None:
+    """Give the slot of a user removed from the experiment back to the experiment."""
+
+    release_experiment_slot(instance.experiment_config_id)
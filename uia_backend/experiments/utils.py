@@ -1,10 +1,15 @@
 from logging import getLogger
+from uuid import UUID
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
 
 from uia_backend.accounts.models import CustomUser
 from uia_backend.experiments.constants import (
     ER_001_CONFIG,
     ER_001_PRE_ALPHA_USER_TESTING_TAG,
 )
+from uia_backend.experiments.engine import experiment_engine
 from uia_backend.experiments.models import (
     ExperimentConfig,
     PreAlphaUserTestingExperiment,
@@ -13,44 +18,95 @@ from uia_backend.experiments.models import (
 logger = getLogger()
 
 
+def reserve_experiment_slot(experiment_config_id: UUID) -> bool:
+    """
+    Reserve a slot on an active experiment.
+
+    The counter is incremented with a single conditional UPDATE so concurrent
+    reservations can never take the population past its capacity. Returns False if
+    the experiment is inactive or full.
+    """
+
+    return bool(
+        ExperimentConfig.objects.filter(
+            id=experiment_config_id,
+            is_active=True,
+            enrolled_user_population__lt=F("required_user_population"),
+        ).update(enrolled_user_population=F("enrolled_user_population") + 1)
+    )
+
+
+def release_experiment_slot(experiment_config_id: UUID) -> None:
+    """Give back a slot taken by `reserve_experiment_slot`."""
+
+    ExperimentConfig.objects.filter(
+        id=experiment_config_id, enrolled_user_population__gt=0
+    ).update(enrolled_user_population=F("enrolled_user_population") - 1)
+
+
+def experiment_has_capacity(experiment_config_id: UUID) -> bool:
+    """Check if an experiment can take more users without counting its members."""
+
+    return ExperimentConfig.objects.filter(
+        id=experiment_config_id,
+        enrolled_user_population__lt=F("required_user_population"),
+    ).exists()
+
+
 def enroll_user_to_prealpha_testing_experiment(user: CustomUser):
     """Enroll a user to the preapha tesing experiment."""
 
-    # first we retrieve the experiment config record
-    experiment_model, _ = ExperimentConfig.objects.get_or_create(
-        experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
-        defaults=ER_001_CONFIG,
-    )
+    # first we retrieve the experiment, this only hits the db when it is inactive
+    # or does not exist yet
+    experiment = experiment_engine.get_experiment(ER_001_PRE_ALPHA_USER_TESTING_TAG)
 
-    # next we check that expriment is active
-    if not experiment_model.is_active:
-        logger.warning(
-            "uia_backend::experiments::utils::enroll_user_to_prealpha_testing_experiment:: Experiment is not active.",
-            extra={
-                "experiment_config_id": str(experiment_model.id),
-                "experiment_tag": experiment_model.experiment_tag,
-            },
+    if experiment is None:
+        experiment_model, _ = ExperimentConfig.objects.get_or_create(
+            experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
+            defaults=ER_001_CONFIG,
         )
 
-        return
+        # next we check that expriment is active
+        if not experiment_model.is_active:
+            logger.warning(
+                "uia_backend::experiments::utils::enroll_user_to_prealpha_testing_experiment:: "
+                "Experiment is not active.",
+                extra={
+                    "experiment_config_id": str(experiment_model.id),
+                    "experiment_tag": experiment_model.experiment_tag,
+                },
+            )
 
-    # next we check if experiment has reached its capacity
-    enrolled_user_count = PreAlphaUserTestingExperiment.objects.filter(
-        experiment_config__experiment_tag=ER_001_PRE_ALPHA_USER_TESTING_TAG,
-    ).count()
-    if experiment_model.required_user_population <= enrolled_user_count:
-        logger.warning(
-            "uia_backend::experiments::utils::enroll_user_to_prealpha_testing_experiment:: "
-            "Experiment has reached capacity.",
-            extra={
-                "experiment_config_id": str(experiment_model.id),
-                "experiment_tag": experiment_model.experiment_tag,
-                "capacity": experiment_model.required_user_population,
-            },
-        )
+            return
+
+        experiment_config_id = experiment_model.id
+        capacity = experiment_model.required_user_population
+    else:
+        experiment_config_id = experiment.id
+        capacity = experiment.required_user_population
+
+    if PreAlphaUserTestingExperiment.objects.filter(user=user).exists():
         return
 
-    # enroll the user into the expriement
-    PreAlphaUserTestingExperiment.objects.get_or_create(
-        user=user, defaults={"experiment_config": experiment_model}
-    )
+    # next we reserve a slot, this fails if experiment has reached its capacity
+    try:
+        with transaction.atomic():
+            if not reserve_experiment_slot(experiment_config_id):
+                logger.warning(
+                    "uia_backend::experiments::utils::enroll_user_to_prealpha_testing_experiment:: "
+                    "Experiment has reached capacity.",
+                    extra={
+                        "experiment_config_id": str(experiment_config_id),
+                        "experiment_tag": ER_001_PRE_ALPHA_USER_TESTING_TAG,
+                        "capacity": capacity,
+                    },
+                )
+                return
+
+            # enroll the user into the expriement
+            PreAlphaUserTestingExperiment.objects.create(
+                user=user, experiment_config_id=experiment_config_id
+            )
+    except IntegrityError:
+        # user was enrolled concurrently, the rollback also undid our reservation
+        pass
@@ -17,3 +17,32 @@ class BaseAbstractModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class CounterFieldsMixin(models.Model):
+    """
+    Leave counter fields out of model saves.
+
+    Counters listed in `counter_fields` are only changed with F() updates.
+    Saving an instance would write back the count it was loaded with and lose
+    increments made in the meantime, so saves of existing rows skip them. Pass
+    `update_fields` to write a counter on purpose.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if not self._state.adding and not args and kwargs.get("update_fields") is None:
+            deferred_fields = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred_fields
+            ]
+
+        super().save(*args, **kwargs)
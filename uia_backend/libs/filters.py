@@ -0,0 +1,152 @@
+from django.db import connections
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+# text search configuration used to build and query `search_vector` columns
+SEARCH_CONFIG = "english"
+
+
+def is_postgresql(queryset: QuerySet) -> bool:
+    """Return True if the queryset will be executed on a PostgreSQL database."""
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def trigram_search(
+    queryset: QuerySet, fields: list[str], term: str, rank_name: str = "search_rank"
+) -> QuerySet:
+    """
+    Filter `queryset` to records where any of `fields` contains a word similar to
+    `term` and order them by their best similarity.
+
+    The `%>` operator used here is served by GIN `gin_trgm_ops` indexes on the fields.
+    NOTE: PostgreSQL only.
+    """
+
+    # did this to avoid importing psycopg2 on other databases
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    condition = Q()
+    for field in fields:
+        condition |= Q(TrigramWordSimilar(F(field), Value(term)))
+
+    similarities = [TrigramWordSimilarity(term, field) for field in fields]
+    rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+    return (
+        queryset.filter(condition)
+        .annotate(**{rank_name: rank})
+        .order_by(f"-{rank_name}", "pk")
+    )
+
+
+def full_text_search(
+    queryset: QuerySet,
+    term: str,
+    headline_field: str | None = None,
+    rank_name: str = "search_rank",
+    headline_name: str = "search_headline",
+) -> QuerySet:
+    """
+    Filter `queryset` to records whose `search_vector` column matches `term` and
+    order them by their rank.
+
+    `term` is parsed like a web search (quoted phrases, `or`, `-word`). When
+    `headline_field` is given its matching fragments are annotated with the
+    matched words wrapped in `<mark>` tags.
+
+    The model's table needs a `search_vector` tsvector column with a GIN index,
+    kept current by the database from the searched fields (see
+    messaging/migrations/0004_post_search_vector.py).
+    NOTE: PostgreSQL only.
+    """
+
+    # did this to avoid importing psycopg2 on other databases
+    from django.contrib.postgres.search import (
+        SearchHeadline,
+        SearchQuery,
+        SearchRank,
+        SearchVectorField,
+    )
+
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+    vector = RawSQL(
+        f"{connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)}"
+        '."search_vector"',
+        [],
+        output_field=SearchVectorField(),
+    )
+
+    queryset = (
+        queryset.alias(_search_vector=vector)
+        .filter(_search_vector=query)
+        .annotate(**{rank_name: SearchRank(vector, query)})
+    )
+
+    if headline_field:
+        queryset = queryset.annotate(
+            **{
+                headline_name: SearchHeadline(
+                    headline_field,
+                    query,
+                    config=SEARCH_CONFIG,
+                    start_sel="<mark>",
+                    stop_sel="</mark>",
+                    max_fragments=2,
+                )
+            }
+        )
+
+    return queryset.order_by(f"-{rank_name}", "pk")
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Search filter that ranks results by trigram similarity on PostgreSQL.
+
+    `SearchFilter` turns a search into OR-ed `icontains` lookups which can not use
+    an index, on PostgreSQL the search fields are matched with indexed trigram word
+    similarity instead. Other databases (e.g sqlite in tests) fall back to
+    `SearchFilter`.
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> QuerySet:
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms or not is_postgresql(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        fields = [field.lstrip("^=@$") for field in search_fields]
+        return trigram_search(queryset, fields=fields, term=" ".join(search_terms))
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Search filter that matches the `search_vector` column on PostgreSQL.
+
+    Results are ranked and, when the view sets `search_headline_field`, annotated
+    with a highlighted snippet of that field as `search_headline`. Other
+    databases (e.g sqlite in tests) fall back to `SearchFilter` on the view's
+    `search_fields`.
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> QuerySet:
+        search_terms = self.get_search_terms(request)
+
+        if not search_terms or not is_postgresql(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        return full_text_search(
+            queryset,
+            term=" ".join(search_terms),
+            headline_field=getattr(view, "search_headline_field", None),
+        )
@@ -0,0 +1,264 @@
+import ipaddress
+import logging
+import mmap
+import struct
+import threading
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+Logger = logging.getLogger()
+
+# IP range database layout
+# ------------------------------------------------------------------------------
+# header:  magic (8 bytes) | record count (uint32) | region count (uint32)
+# records: start ip (16 bytes) | end ip (16 bytes) | region index (uint32)
+# regions: length (uint16) | utf-8 encoded region name
+#
+# IPv4 addresses are stored as IPv4-mapped IPv6 addresses so that both address
+# families share one sorted table. All integers are big-endian which means raw
+# record bytes compare in the same order as the addresses they represent.
+DATABASE_MAGIC = b"UIAGEOv1"
+HEADER_STRUCT = struct.Struct(">8sII")
+RECORD_STRUCT = struct.Struct(">16s16sI")
+REGION_LENGTH_STRUCT = struct.Struct(">H")
+START_IP_STRUCT = struct.Struct(">16s")
+
+
+class GeoIPDatabaseError(Exception):
+    """Invalid or corrupt IP range database."""
+
+
+def _pack_ip(ip: str) -> bytes:
+    """Return the 16 byte representation of an IPv4 or IPv6 address."""
+    address = ipaddress.ip_address(ip)
+
+    if isinstance(address, ipaddress.IPv4Address):
+        address = ipaddress.IPv6Address(f"::ffff:{address}")
+
+    return address.packed
+
+
+def build_ip_range_database(
+    ip_ranges: Iterable[tuple[str, str, str]], path: str | Path
+) -> int:
+    """
+    Build an IP range database from (start ip, end ip, region) rows.
+
+    Returns the number of ranges written.
+    """
+
+    regions: dict[str, int] = {}
+    records = []
+
+    for start_ip, end_ip, region in ip_ranges:
+        start, end = _pack_ip(start_ip), _pack_ip(end_ip)
+
+        if start > end:
+            raise GeoIPDatabaseError(f"Invalid ip range {start_ip} - {end_ip}.")
+
+        region_index = regions.setdefault(region, len(regions))
+        records.append((start, end, region_index))
+
+    records.sort()
+
+    for index in range(1, len(records)):
+        if records[index][0] <= records[index - 1][1]:
+            raise GeoIPDatabaseError("IP ranges must not overlap.")
+
+    with open(path, "wb") as file:
+        file.write(HEADER_STRUCT.pack(DATABASE_MAGIC, len(records), len(regions)))
+
+        for record in records:
+            file.write(RECORD_STRUCT.pack(*record))
+
+        for region in regions.keys():
+            encoded_region = region.encode()
+            file.write(REGION_LENGTH_STRUCT.pack(len(encoded_region)))
+            file.write(encoded_region)
+
+    return len(records)
+
+
+class BaseGeoIPResolver:
+    """Resolve the region an ip address is located in."""
+
+    def resolve(self, ip: str) -> str | None:
+        """Return the region of an ip address or None if it can not be resolved."""
+        raise NotImplementedError
+
+
+class MMapIPRangeResolver(BaseGeoIPResolver):
+    """
+    Resolve regions from a local IP range database.
+
+    The database is memory-mapped and searched with a binary search over the sorted
+    ranges, so lookups do not load the file into memory or leave the process.
+    Results are kept in a per-process LRU cache.
+    """
+
+    def __init__(
+        self, database_path: str | Path | None = None, cache_size: int | None = None
+    ) -> None:
+        self.database_path = Path(database_path or settings.GEOIP_DATABASE_PATH)
+        self._lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._record_count = 0
+        self._regions: list[str] = []
+        self._is_loaded = False
+        self.resolve = lru_cache(  # type: ignore[method-assign]
+            maxsize=cache_size or settings.GEOIP_CACHE_SIZE
+        )(self._resolve)
+
+    def _load(self) -> None:
+        """Memory-map the database and read its region table."""
+
+        with self._lock:
+            if self._is_loaded:
+                return
+
+            self._is_loaded = True
+
+            try:
+                with open(self.database_path, "rb") as file:
+                    database = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                Logger.warning(
+                    "uia_backend::libs::geoip::MMapIPRangeResolver::_load:: "
+                    "IP range database could not be opened.",
+                    extra={"database_path": str(self.database_path)},
+                )
+                return
+
+            try:
+                record_count, regions = self._read_header(database)
+            except (struct.error, UnicodeDecodeError, GeoIPDatabaseError) as error:
+                database.close()
+                Logger.error(
+                    "uia_backend::libs::geoip::MMapIPRangeResolver::_load:: "
+                    "IP range database is invalid.",
+                    extra={
+                        "database_path": str(self.database_path),
+                        "error": str(error),
+                    },
+                )
+                return
+
+            self._regions = regions
+            self._record_count = record_count
+            self._mmap = database
+
+    def _read_header(self, database: mmap.mmap) -> tuple[int, list[str]]:
+        """Validate the database and return its record count and regions."""
+
+        magic, record_count, region_count = HEADER_STRUCT.unpack_from(database)
+        if magic != DATABASE_MAGIC:
+            raise GeoIPDatabaseError(f"{self.database_path} is not a database.")
+
+        offset = HEADER_STRUCT.size + (record_count * RECORD_STRUCT.size)
+        if offset > len(database):
+            raise GeoIPDatabaseError(f"{self.database_path} is truncated.")
+
+        regions = []
+        for _ in range(region_count):
+            (length,) = REGION_LENGTH_STRUCT.unpack_from(database, offset)
+            offset += REGION_LENGTH_STRUCT.size
+            region_end = offset + length
+            if region_end > len(database):
+                raise GeoIPDatabaseError(f"{self.database_path} is truncated.")
+            regions.append(database[offset:region_end].decode())
+            offset = region_end
+
+        return record_count, regions
+
+    def _resolve(self, ip: str) -> str | None:
+        """Binary search the range containing the ip."""
+
+        if not self._is_loaded:
+            self._load()
+
+        if self._mmap is None:
+            return None
+
+        try:
+            key = _pack_ip(ip)
+        except ValueError:
+            return None
+
+        low, high = 0, self._record_count - 1
+
+        while low <= high:
+            middle = (low + high) // 2
+            offset = HEADER_STRUCT.size + (middle * RECORD_STRUCT.size)
+            (start,) = START_IP_STRUCT.unpack_from(self._mmap, offset)
+
+            if key < start:
+                high = middle - 1
+                continue
+
+            _, end, region_index = RECORD_STRUCT.unpack_from(self._mmap, offset)
+            if key > end:
+                low = middle + 1
+                continue
+
+            return self._regions[region_index]
+
+        return None
+
+
+class IPApiCoResolver(BaseGeoIPResolver):
+    """
+    Resolve regions from ipapi.co.
+
+    NOTE: This makes a blocking http request so it should never be used on the request path.
+    """
+
+    def __init__(self, timeout: float | None = None) -> None:
+        self.timeout = timeout or settings.GEOIP_REMOTE_TIMEOUT
+
+    def resolve(self, ip: str) -> str | None:
+        try:
+            response = requests.get(
+                url=f"{settings.IP_API_CO_URL}/{ip}/region/", timeout=self.timeout
+            )
+        except requests.RequestException as error:
+            Logger.error(
+                "uia_backend::libs::geoip::IPApiCoResolver::resolve:: HTTPError occured",
+                extra={"detail": str(error)},
+            )
+            return None
+
+        if response.status_code == 200:
+            if response.text != "Undefined":
+                return response.text
+        elif response.status_code == 429:
+            Logger.error(
+                "uia_backend::libs::geoip::IPApiCoResolver::resolve:: API free quota has been exceeded",
+                extra={"detail": response.text},
+            )
+        else:
+            Logger.error(
+                "uia_backend::libs::geoip::IPApiCoResolver::resolve:: API error occured",
+                extra={"detail": response.text},
+            )
+
+        return None
+
+
+@lru_cache(maxsize=None)
+def _load_resolver(resolver_path: str) -> BaseGeoIPResolver:
+    return import_string(resolver_path)()
+
+
+def get_geoip_resolver() -> BaseGeoIPResolver:
+    """Return the configured geoip resolver."""
+    return _load_resolver(settings.GEOIP_RESOLVER)
+
+
+def get_remote_geoip_resolver() -> BaseGeoIPResolver:
+    """Return the configured remote geoip resolver."""
+    return _load_resolver(settings.GEOIP_REMOTE_RESOLVER)
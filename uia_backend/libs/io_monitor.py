@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from anymail.backends.base import AnymailBaseBackend
+from cent import Client as CentClient
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+Logger = logging.getLogger()
+
+OUTBOUND_IO_KIND_REQUESTS = "requests"
+OUTBOUND_IO_KIND_CENT = "cent"
+OUTBOUND_IO_KIND_ANYMAIL = "anymail"
+
+# label of the endpoint currently being handled, None outside the request path
+_current_endpoint: ContextVar[str | None] = ContextVar(
+    "outbound_io_current_endpoint", default=None
+)
+# set while an instrumented call is running so nested calls are not recorded twice
+# e.g cent and anymail both send their payloads through a requests.Session
+_inside_outbound_call: ContextVar[bool] = ContextVar(
+    "outbound_io_inside_outbound_call", default=False
+)
+
+
+class OutboundIOOnRequestPathError(Exception):
+    """Outbound network call made while handling an http request in strict mode."""
+
+
+class OutboundIORegistry:
+    """
+    Per-process record of outbound calls made on the request path.
+
+    Calls are aggregated per endpoint and target, so the registry stays small no
+    matter how many requests are handled.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def record(self, endpoint: str, kind: str, target: str, duration: float) -> None:
+        """Record an outbound call that took `duration` seconds."""
+
+        key = f"{kind}:{target}"
+
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {}).setdefault(
+                key,
+                {"count": 0, "total_duration": 0.0, "max_duration": 0.0},
+            )
+            stats["count"] += 1
+            stats["total_duration"] += duration
+            stats["max_duration"] = max(stats["max_duration"], duration)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return a copy of the recorded calls keyed by endpoint then `kind:target`."""
+
+        with self._lock:
+            return {
+                endpoint: {key: dict(stats) for key, stats in calls.items()}
+                for endpoint, calls in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+
+registry = OutboundIORegistry()
+
+
+@contextmanager
+def request_path(endpoint: str) -> Iterator[None]:
+    """Mark the code running inside the block as handling `endpoint`."""
+
+    token = _current_endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _current_endpoint.reset(token)
+
+
+@contextmanager
+def allow_outbound_io() -> Iterator[None]:
+    """Allow outbound calls inside the block even when on the request path."""
+
+    token = _current_endpoint.set(None)
+    try:
+        yield
+    finally:
+        _current_endpoint.reset(token)
+
+
+@contextmanager
+def outbound_call(kind: str, target: str) -> Iterator[None]:
+    """
+    Track an outbound network call.
+
+    Calls made outside the request path are not tracked. In strict mode calls made
+    on the request path raise OutboundIOOnRequestPathError before any I/O happens.
+    """
+
+    endpoint = _current_endpoint.get()
+
+    if endpoint is None or _inside_outbound_call.get():
+        yield
+        return
+
+    if settings.OUTBOUND_IO_MONITOR_STRICT:
+        raise OutboundIOOnRequestPathError(
+            f"Outbound {kind} call to {target} made while handling {endpoint}."
+        )
+
+    token = _inside_outbound_call.set(True)
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start_time
+        _inside_outbound_call.reset(token)
+        registry.record(endpoint=endpoint, kind=kind, target=target, duration=duration)
+
+        Logger.warning(
+            "uia_backend::libs::io_monitor::outbound_call:: "
+            "Outbound call made on the request path.",
+            extra={
+                "endpoint": endpoint,
+                "kind": kind,
+                "target": target,
+                "duration_ms": round(duration * 1000, 2),
+            },
+        )
+
+
+def _url_host(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+def _instrument(
+    owner: type, attribute: str, kind: str, get_target: Callable[..., str]
+) -> None:
+    """Wrap `owner.attribute` so every call to it is tracked as an outbound call."""
+
+    original = getattr(owner, attribute)
+
+    if getattr(original, "__outbound_io_instrumented__", False):
+        return
+
+    @wraps(original)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with outbound_call(kind=kind, target=get_target(*args, **kwargs)):
+            return original(*args, **kwargs)
+
+    wrapper.__outbound_io_instrumented__ = True  # type: ignore[attr-defined]
+    setattr(owner, attribute, wrapper)
+
+
+_install_lock = threading.Lock()
+
+
+def install_outbound_io_hooks() -> None:
+    """Instrument requests, cent and anymail. Calling this more than once is a no-op."""
+
+    with _install_lock:
+        _instrument(
+            requests.Session,
+            "send",
+            OUTBOUND_IO_KIND_REQUESTS,
+            lambda session, request, **kwargs: _url_host(request.url),
+        )
+        _instrument(
+            CentClient,
+            "_send",
+            OUTBOUND_IO_KIND_CENT,
+            lambda client, url, data: _url_host(url),
+        )
+        _instrument(
+            AnymailBaseBackend,
+            "send_messages",
+            OUTBOUND_IO_KIND_ANYMAIL,
+            lambda backend, email_messages: backend.esp_name,
+        )
+
+
+class OutboundIOMonitorMiddleware:
+    """
+    Detect outbound network calls made while handling a request.
+
+    Calls are recorded per endpoint (http method and url route) together with their
+    latency, see `registry`. With `OUTBOUND_IO_MONITOR_STRICT` enabled the calls
+    raise instead, this is meant for the test suite.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        install_outbound_io_hooks()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with request_path(f"{request.method} {request.path}"):
+            return self.get_response(request)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., HttpResponse],
+        view_args: Any,
+        view_kwargs: Any,
+    ) -> None:
+        # use the url route instead of the path so calls on /users/<id>/ are grouped
+        resolver_match = request.resolver_match
+        if resolver_match is not None and resolver_match.route:
+            _current_endpoint.set(f"{request.method} /{resolver_match.route}")
+        return None
@@ -0,0 +1,141 @@
+import json
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.request import Request
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks to the next page on the ordering fields.
+
+    Unlike LimitOffsetPagination a page costs the same at any depth and no count
+    query is made, views have to order on indexed fields. Querysets ranked by a
+    search (annotated with `search_rank`) are paged by rank. Views with an
+    OrderingFilter are paged by the requested ordering, with `unique_field` added
+    to make it unique.
+
+    CursorPagination only seeks on the first ordering field and skips rows with
+    an equal value by offset, cursors here hold the value of every ordering field
+    so pages stay stable however many rows share a value. Ordering fields can not
+    be null.
+    """
+
+    ordering = ("-created_datetime", "-id")
+    rank_ordering = ("-search_rank", "-created_datetime", "-id")
+    unique_field = "id"
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet, view: Any
+    ) -> tuple[str, ...]:
+        if "search_rank" in queryset.query.annotations:
+            return self.rank_ordering
+
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not any(
+            field.lstrip("-") in ("pk", self.unique_field) for field in ordering
+        ):
+            direction = "-" if ordering[-1].startswith("-") else ""
+            ordering = (*ordering, f"{direction}{self.unique_field}")
+        return ordering
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list | None:
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor else None
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(self.get_seek_condition(ordering))
+            except (ValueError, ValidationError):
+                # e.g a tampered cursor holding a malformed date or id
+                raise NotFound(self.invalid_cursor_message)
+
+        # fetch an extra row to find out if there is a following page
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_seek_condition(self, ordering: tuple[str, ...]) -> Q:
+        """
+        Return the condition matching rows after the cursor position.
+
+        For an ordering (a, b) this is `a >= x AND (a > x OR (a = x AND b > y))`,
+        the leading range on the first field lets the database scan the index.
+        """
+
+        try:
+            values = json.loads(self.cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        lookups = [
+            (field.lstrip("-"), "lt" if field.startswith("-") else "gt")
+            for field in ordering
+        ]
+
+        condition = None
+        for (field, lookup), value in reversed(list(zip(lookups, values))):
+            after = Q(**{f"{field}__{lookup}": value})
+            if condition is not None:
+                after |= Q(**{field: value}) & condition
+            condition = after
+
+        field, lookup = lookups[0]
+        return Q(**{f"{field}__{lookup}e": values[0]}) & condition
+
+    def _get_position_from_instance(
+        self, instance: Any, ordering: tuple[str, ...]
+    ) -> str:
+        values = []
+        for field in ordering:
+            value = instance
+            for attribute in field.lstrip("-").split("__"):
+                value = (
+                    value[attribute]
+                    if isinstance(value, dict)
+                    else getattr(value, attribute)
+                )
+            values.append(str(value))
+
+        return json.dumps(values)
@@ -1,45 +1,24 @@
 from collections.abc import Sequence
 from typing import Any
 
-from django.contrib.auth.models import Group
-from guardian.core import ObjectPermissionChecker
-from guardian.shortcuts import assign_perm, remove_perm
 from rest_framework import exceptions, permissions
 
 from uia_backend.accounts.models import CustomUser as User
 
 
-def assign_object_permissions(
-    permissions: Sequence[str], assignee: User | Group, obj: Any
-) -> None:
-    """Assign object permissions."""
-
-    for permission in permissions:
-        assign_perm(permission, assignee, obj)
-
-
-def unassign_object_permissions(
-    permissions: Sequence[str], assignee: User | Group, obj: Any
-) -> None:
-    """Unassign object permissions."""
-
-    for permission in permissions:
-        remove_perm(permission, assignee, obj)
-
-
 def check_object_permissions(
     permissions: Sequence[str], assignee: User, obj: Any = None
 ) -> bool:
     """Check that an object has a sequence of permissions."""
-    checker = ObjectPermissionChecker(assignee)
+    if obj is None:
+        return all(assignee.has_perm(permission) for permission in permissions)
 
-    for permission in permissions:
-        has_permission = (
-            checker.has_perm(permission, obj) if obj else assignee.has_perm(permission)
-        )
-        if has_permission is False:
-            return False
-    return True
+    if assignee.is_active and assignee.is_superuser:
+        return True
+
+    # NOTE: fetch object permissions once, backends answer them with a query each
+    granted_permissions = assignee.get_all_permissions(obj)
+    return all(permission in granted_permissions for permission in permissions)
 
 
 class CustomAccessPermission(permissions.DjangoObjectPermissions):
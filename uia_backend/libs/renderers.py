@@ -8,18 +8,15 @@ class CustomRenderer(JSONRenderer):
 
         if (
             isinstance(data, dict)
-            and "count" in data.keys()
             and "next" in data.keys()
             and "previous" in data.keys()
             and "results" in data.keys()
         ):
-            # mutate reponses with limit offset pagination
-            count, _next, previous = (
-                data.pop("count"),
-                data.pop("next"),
-                data.pop("previous"),
-            )
-            response = {"count": count, "next": _next, "previous": previous}
+            # mutate reponses with limit offset or cursor pagination
+            if "count" in data.keys():
+                response["count"] = data.pop("count")
+
+            response.update(next=data.pop("next"), previous=data.pop("previous"))
             data = data["results"]
 
         response.update(
@@ -0,0 +1,29 @@
+from django.db.models import QuerySet
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from uia_backend.messaging.search import search_dms
+
+
+class DMKeywordSearchFilter(filters.SearchFilter):
+    """
+    Search DMs of the view's friendship through their blind keyword index.
+
+    DM content is encrypted so `SearchFilter` lookups can not match it, only DMs
+    containing every searched word are returned.
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> QuerySet:
+        search_terms = self.get_search_terms(request)
+
+        if not search_terms:
+            return queryset
+
+        return search_dms(
+            queryset,
+            term=" ".join(search_terms),
+            friendship_ids=[view.kwargs["friendship_id"]],
+        )
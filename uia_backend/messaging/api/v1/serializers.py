@@ -1,15 +1,26 @@
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
 from django.conf import settings
 from django.core.files import File
 from django.db.models import QuerySet
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
 
 from uia_backend.accounts.api.v1.serializers import ProfileSerializer
 from uia_backend.accounts.models import FriendShip
 from uia_backend.libs.serializers import DynamicFieldsModelSerializer
-from uia_backend.messaging.models import DM, Comment, FileModel, Like, Post
+from uia_backend.messaging.encryption import decrypt_dm_contents
+from uia_backend.messaging.models import (
+    DM,
+    Comment,
+    DMConversation,
+    FileModel,
+    Like,
+    Post,
+)
+from uia_backend.messaging.utils import mark_dm_conversation_read
 
 
 class FileModelSerializer(DynamicFieldsModelSerializer[FileModel]):
@@ -129,6 +140,16 @@ class PostSerializer(serializers.ModelSerializer[Post]):
         return data
 
 
+class PostSearchSerializer(PostSerializer):
+    # fragments of the post content matching the search, only set on PostgreSQL
+    headline = serializers.CharField(
+        read_only=True, source="search_headline", default=None
+    )
+
+    class Meta(PostSerializer.Meta):
+        fields = PostSerializer.Meta.fields + ["headline"]
+
+
 class CommentSerializer(serializers.ModelSerializer[Comment]):
     replies = serializers.IntegerField(
         default=0, read_only=True, source="replies_count"
@@ -274,6 +295,15 @@ class CreateDMSerializer(serializers.ModelSerializer[DM]):
         """Overide method."""
 
 
+class DMListSerializer(serializers.ListSerializer):
+    def to_representation(self, data: Any) -> list[dict[str, Any]]:
+        """Decrypt the content of a page of DMs at once before rendering it."""
+
+        dms = list(data.all() if isinstance(data, BaseManager) else data)
+        decrypt_dm_contents(dms)
+        return super().to_representation(dms)
+
+
 class UpdateDMSerializer(serializers.ModelSerializer[DM]):
     created_by = ProfileSerializer(read_only=True)
     files = FileModelSerializer(read_only=True, many=True, allowed_fields=["file"])
@@ -303,6 +333,77 @@ class UpdateDMSerializer(serializers.ModelSerializer[DM]):
             "updated_datetime",
             "edited",
         ]
+        list_serializer_class = DMListSerializer
 
     def create(self, validated_data: dict[str, Any]) -> None:
         """Overide method."""
+
+
+class DMConversationSerializer(serializers.ModelSerializer[DMConversation]):
+    last_message = UpdateDMSerializer(read_only=True)
+
+    class Meta:
+        model = DMConversation
+        fields = [
+            "id",
+            "friendship",
+            "last_message",
+            "last_message_datetime",
+            "unread_count",
+            "last_read_datetime",
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance: DMConversation) -> dict[str, Any]:
+        """Return dict representaion of serializer."""
+        data = super().to_representation(instance)
+
+        # NOTE: friendship users are prefetched by the inbox view
+        friend = next(
+            (
+                user
+                for user in instance.friendship.users.all()
+                if user.id != instance.user_id
+            ),
+            None,
+        )
+        data["friend"] = (
+            ProfileSerializer().to_representation(instance=friend) if friend else None
+        )
+        return data
+
+
+class DMReadSerializer(serializers.ModelSerializer[DMConversation]):
+    # the newest DM of the batch the user viewed
+    message_id = serializers.UUIDField(write_only=True)
+
+    class Meta:
+        model = DMConversation
+        fields = ["message_id", "last_read_datetime", "unread_count"]
+        read_only_fields = ["last_read_datetime", "unread_count"]
+
+    def validate_message_id(self, value: UUID) -> datetime:
+        """Validate message_id and return the time the message was created."""
+
+        read_datetime = (
+            DM.objects.filter(id=value, friendship_id=self.instance.friendship_id)
+            .values_list("created_datetime", flat=True)
+            .first()
+        )
+
+        if read_datetime is None:
+            raise serializers.ValidationError("Message does not exist.")
+
+        return read_datetime
+
+    def update(
+        self, instance: DMConversation, validated_data: dict[str, Any]
+    ) -> DMConversation:
+        mark_dm_conversation_read(
+            user_id=instance.user_id,
+            friendship_id=instance.friendship_id,
+            read_datetime=validated_data["message_id"],
+        )
+        return DMConversation.objects.only("last_read_datetime", "unread_count").get(
+            user_id=instance.user_id, friendship_id=instance.friendship_id
+        )
@@ -3,16 +3,20 @@ from django.urls import path
 from uia_backend.messaging.api.v1.views import (
     CommentListAPIView,
     DMCreateAPIView,
+    DMInboxAPIView,
+    DMReadAPIView,
     FileUploadAPIView,
     LikePostAPIView,
     ListDMAPIView,
     PostDetailsAPIView,
     PostListAPIView,
+    PostSearchAPIView,
     RepliesListAPIView,
     RetrieveUpdateDMAPIView,
 )
 
 urlpatterns = [
+    path("posts/search/", PostSearchAPIView.as_view(), name="search_posts"),
     path(
         "<uuid:cluster_id>/posts/",
         PostListAPIView.as_view(),
@@ -44,7 +48,9 @@ urlpatterns = [
         name="file_upload",
     ),
     path("dm/", DMCreateAPIView.as_view(), name="create_dm"),
+    path("dm/inbox/", DMInboxAPIView.as_view(), name="dm_inbox"),
     path("dm/<uuid:friendship_id>/", ListDMAPIView.as_view(), name="list_dm"),
+    path("dm/<uuid:friendship_id>/read/", DMReadAPIView.as_view(), name="dm_read"),
     path(
         "dm/<uuid:friendship_id>/<uuid:message_id>/",
         RetrieveUpdateDMAPIView.as_view(),
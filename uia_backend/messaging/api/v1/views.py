@@ -1,21 +1,34 @@
 from typing import Any
 
+from django.db.models import F
 from django.db.models.query import QuerySet
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from rest_framework import filters, generics, permissions
+from rest_framework import filters, generics, permissions, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from uia_backend.cluster.models import Cluster
+from uia_backend.accounts.models import UserFriendShipSettings
+from uia_backend.cluster.constants import (
+    CLUSTER_PERMISSION_BITS,
+    VIEW_CLUSTER_PERMISSION,
+)
+from uia_backend.cluster.models import Cluster, ClusterMembership
 from uia_backend.libs.centrifugo import CentrifugoConnector
+from uia_backend.libs.filters import FullTextSearchFilter
+from uia_backend.libs.pagination import KeysetPagination
+from uia_backend.messaging.api.v1.filters import DMKeywordSearchFilter
 from uia_backend.messaging.api.v1.permission import ClusterPostPermission
 from uia_backend.messaging.api.v1.serializers import (
     CommentSerializer,
     CreateDMSerializer,
+    DMConversationSerializer,
+    DMReadSerializer,
     FileModelSerializer,
     LikeSerializer,
+    PostSearchSerializer,
     PostSerializer,
     UpdateDMSerializer,
 )
@@ -27,7 +40,9 @@ from uia_backend.messaging.constants import (
     CENT_EVENT_POST_LIKE_CREATED,
     CENT_EVENT_POST_LIKE_DELETED,
 )
-from uia_backend.messaging.models import DM, Comment, Like, Post
+from uia_backend.messaging.encryption import decrypt_dm_contents, with_encrypted_content
+from uia_backend.messaging.models import DM, Comment, DMConversation, Like, Post
+from uia_backend.messaging.utils import user_in_friendship
 
 
 class PostListAPIView(generics.ListCreateAPIView):
@@ -35,11 +50,22 @@ class PostListAPIView(generics.ListCreateAPIView):
 
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated, ClusterPostPermission]
+    pagination_class = KeysetPagination
 
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ["created_datetime"]
+    # NOTE: search results are always paged by rank, the requested ordering only
+    # applies to plain post lists
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
     search_fields = ["content", "title"]
-    ordering = ["-created_datetime"]
+    search_headline_field = "content"
+    ordering_fields = ["created_datetime"]
+    ordering = ["-created_datetime", "-id"]
+
+    def get_serializer_class(self) -> type[PostSerializer]:
+        if self.request.method == "GET" and self.request.query_params.get(
+            FullTextSearchFilter.search_param
+        ):
+            return PostSearchSerializer
+        return super().get_serializer_class()
 
     def get_object(self) -> Cluster:
         cluster = get_object_or_404(Cluster, id=self.kwargs["cluster_id"])
@@ -65,6 +91,38 @@ class PostListAPIView(generics.ListCreateAPIView):
         )
 
 
+class PostSearchAPIView(generics.ListAPIView):
+    """Search posts in all clusters the user can view."""
+
+    serializer_class = PostSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ["content", "title"]
+    search_headline_field = "content"
+
+    def get_queryset(self) -> QuerySet[Post]:
+        if not self.request.query_params.get(FullTextSearchFilter.search_param):
+            return Post.objects.none()
+
+        cluster_ids = (
+            ClusterMembership.objects.filter(user_id=self.request.user.id)
+            .alias(
+                can_view=F("permission_mask").bitand(
+                    CLUSTER_PERMISSION_BITS[VIEW_CLUSTER_PERMISSION]
+                )
+            )
+            .filter(can_view__gt=0)
+            .values("cluster_id")
+        )
+        return (
+            Post.objects.select_related("created_by")
+            .prefetch_related("files", "likes", "shares")
+            .filter(cluster_id__in=cluster_ids)
+        )
+
+
 class PostDetailsAPIView(generics.RetrieveDestroyAPIView):
     """Retrieve/Delete post."""
 
@@ -316,18 +374,68 @@ class ListDMAPIView(generics.ListAPIView):
     serializer_class = UpdateDMSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, DMKeywordSearchFilter]
     ordering_fields = ["created_datetime"]
-    search_fields = ["content"]
     ordering = ["-created_datetime"]
 
     def get_queryset(self) -> QuerySet[DM]:
-        return DM.objects.prefetch_related("created_by", "friendship", "files").filter(
-            friendship_id=self.kwargs["friendship_id"],
-            friendship__users__id=self.request.user.id,
+        # NOTE: friendship is rendered from friendship_id, no need to join it
+        # content is decrypted a page at a time by UpdateDMSerializer
+        return with_encrypted_content(
+            DM.objects.select_related("created_by")
+            .prefetch_related("files")
+            .filter(
+                user_in_friendship(self.kwargs["friendship_id"], self.request.user.id),
+                friendship_id=self.kwargs["friendship_id"],
+            )
         )
 
 
+class DMInboxPagination(KeysetPagination):
+    ordering = ("-last_message_datetime", "-id")
+
+
+class DMInboxAPIView(generics.ListAPIView):
+    """List the users DM conversations, most recently active first."""
+
+    serializer_class = DMConversationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DMInboxPagination
+
+    def get_queryset(self) -> QuerySet[DMConversation]:
+        return (
+            DMConversation.objects.select_related(
+                "friendship", "last_message", "last_message__created_by"
+            )
+            .prefetch_related("friendship__users", "last_message__files")
+            .filter(user_id=self.request.user.id)
+        )
+
+
+class DMReadAPIView(generics.GenericAPIView):
+    """Mark the DMs of a friendship read up to a message."""
+
+    serializer_class = DMReadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self) -> DMConversation:
+        if not UserFriendShipSettings.objects.filter(
+            user_id=self.request.user.id, friendship_id=self.kwargs["friendship_id"]
+        ).exists():
+            raise Http404
+
+        # NOTE: marking DMs read creates the conversation when no DM created it yet
+        return DMConversation(
+            user_id=self.request.user.id, friendship_id=self.kwargs["friendship_id"]
+        )
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(self.get_object(), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
 class RetrieveUpdateDMAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve update or delete DM."""
 
@@ -339,16 +447,26 @@ class RetrieveUpdateDMAPIView(generics.RetrieveUpdateDestroyAPIView):
         query = {
             "id": self.kwargs["message_id"],
             "friendship_id": self.kwargs["friendship_id"],
-            "friendship__users__id": self.request.user.id,
         }
 
         # ensure that only dm creator can delete or update dm.
         if self.request.method.upper() in ["DELETE", "PUT"]:
             query["created_by"] = self.request.user
 
-        return get_object_or_404(
-            DM.objects.prefetch_related("created_by", "friendship", "files"), **query
+        dm = get_object_or_404(
+            with_encrypted_content(
+                DM.objects.select_related("created_by", "friendship")
+                .prefetch_related("files")
+                .filter(
+                    user_in_friendship(
+                        self.kwargs["friendship_id"], self.request.user.id
+                    )
+                )
+            ),
+            **query,
         )
+        decrypt_dm_contents([dm])
+        return dm
 
     def perform_update(self, serializer: UpdateDMSerializer) -> None:
         dm = serializer.save(edited=True)
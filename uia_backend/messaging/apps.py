@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class MessagingConfig(AppConfig):
     name = "uia_backend.messaging"
     verbose_name = _("Messaging")
+
+    def ready(self) -> None:
+        from uia_backend.messaging import signals  # noqa F401
@@ -7,5 +7,6 @@ CENT_EVENT_POST_DELETED = "post_deleted"
 CENT_EVENT_DM_CREATED = "dm_created"
 CENT_EVENT_DM_EDITED = "dm_edited"
 CENT_EVENT_DM_DELETED = "dm_deleted"
+CENT_EVENT_DM_READ = "dm_read"
 
 CENT_EVENT_USER_NOTIFICATION = "user_notification_received"
@@ -0,0 +1,263 @@
+import base64
+import binascii
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from cryptography.fernet import InvalidToken
+from django.conf import settings
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, QuerySet, TextField, Value
+from django.utils import timezone
+from encrypted_model_fields import fields as encrypted_fields
+
+from uia_backend.messaging.models import DM, DMKeyRotation
+
+Logger = logging.getLogger()
+
+# version byte, timestamp and IV, a block of ciphertext and the HMAC of a token
+FERNET_TOKEN_MIN_LENGTH = 1 + 8 + 16 + 16 + 32
+FERNET_TOKEN_VERSION = 0x80
+
+
+class DMKeyRotationError(Exception):
+    """A DM is encrypted with a key missing from FIELD_ENCRYPTION_KEY."""
+
+
+class DecryptedContentCache:
+    """
+    Per-process LRU of decrypted DM content.
+
+    Entries are keyed by DM id and `updated_datetime`, so an edited DM is never
+    served stale, and expire after `settings.DM_CONTENT_CACHE_TTL` seconds so
+    plaintext does not linger in memory. At most `settings.DM_CONTENT_CACHE_SIZE`
+    entries are kept, a size of 0 disables the cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            tuple[UUID, datetime], tuple[float, str]
+        ] = OrderedDict()
+
+    def get(self, dm_id: UUID, updated_datetime: datetime) -> str | None:
+        key = (dm_id, updated_datetime)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, content = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return content
+
+    def set(self, dm_id: UUID, updated_datetime: datetime, content: str) -> None:
+        max_size = settings.DM_CONTENT_CACHE_SIZE
+        if max_size <= 0:
+            return
+
+        key = (dm_id, updated_datetime)
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + settings.DM_CONTENT_CACHE_TTL,
+                content,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+dm_content_cache = DecryptedContentCache()
+
+
+def with_encrypted_content(queryset: QuerySet[DM]) -> QuerySet[DM]:
+    """
+    Load DMs without decrypting their content.
+
+    The ciphertext is read into `encrypted_content` instead, call
+    `decrypt_dm_contents` on the DMs that are actually rendered.
+    """
+
+    return queryset.defer("content").annotate(
+        encrypted_content=ExpressionWrapper(F("content"), output_field=TextField())
+    )
+
+
+def decrypt_dm_contents(dms: Sequence[DM]) -> None:
+    """
+    Set the content of DMs loaded with `with_encrypted_content`.
+
+    Content is served from `dm_content_cache` when possible, the rest is decrypted
+    in one pass with the crypter shared by every EncryptedTextField. DMs loaded
+    with their content are left untouched.
+    """
+
+    crypter = encrypted_fields.CRYPTER
+
+    for dm in dms:
+        encrypted_content = dm.__dict__.pop("encrypted_content", None)
+        if encrypted_content is None:
+            continue
+
+        content = dm_content_cache.get(dm.id, dm.updated_datetime)
+
+        if content is None:
+            try:
+                content = crypter.decrypt(encrypted_content.encode()).decode()
+            except InvalidToken:
+                # same as EncryptedTextField, content saved before it was encrypted
+                content = encrypted_content
+            dm_content_cache.set(dm.id, dm.updated_datetime, content)
+
+        dm.content = content
+
+
+def is_fernet_token(value: bytes) -> bool:
+    """Return True if `value` is shaped like a Fernet token, whatever its key."""
+
+    try:
+        token = base64.b64decode(value, altchars=b"-_", validate=True)
+    except (binascii.Error, ValueError):
+        return False
+
+    return (
+        len(token) >= FERNET_TOKEN_MIN_LENGTH
+        # the ciphertext is padded to whole AES blocks
+        and (len(token) - FERNET_TOKEN_MIN_LENGTH) % 16 == 0
+        and token[0] == FERNET_TOKEN_VERSION
+    )
+
+
+def get_key_fingerprint(key: str) -> str:
+    """Return a short fingerprint identifying a field encryption key."""
+
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def rotate_dm_encryption_key(
+    batch_size: int, throttle: float = 0.0, restart: bool = False
+) -> Iterator[tuple[UUID, int, int]]:
+    """
+    Re-encrypt the content of every DM with the first FIELD_ENCRYPTION_KEY.
+
+    DMs are read in primary key order with keyset pagination. Each batch is
+    locked, re-encrypted and checkpointed in its own short transaction, then the
+    job sleeps `throttle` seconds so DM traffic is not starved. Content already
+    encrypted with the first key is skipped and content saved before it was
+    encrypted gets encrypted. Plaintext is never written, ciphertext is moved
+    between keys with MultiFernet.rotate.
+
+    A token no configured key decrypts, e.g an old key was dropped too early,
+    is never mistaken for unencrypted content: the batch is rolled back and
+    DMKeyRotationError raised. Restore the key and run again to resume.
+
+    Progress is kept in a DMKeyRotation row per key, so an interrupted rotation
+    resumes after the last committed batch and a finished one is not run again
+    unless `restart` is set. Yields the last DM id, the number of DMs read and
+    the number of DMs re-encrypted of every batch.
+    """
+
+    keys = settings.FIELD_ENCRYPTION_KEY
+    if not isinstance(keys, (list, tuple)):
+        keys = [keys]
+
+    primary_key = encrypted_fields.parse_key(keys[0])
+    crypter = encrypted_fields.get_crypter()
+
+    checkpoint, _ = DMKeyRotation.objects.get_or_create(
+        key_fingerprint=get_key_fingerprint(keys[0])
+    )
+    if restart:
+        checkpoint.last_dm_id = None
+        checkpoint.rotated_count = 0
+        checkpoint.completed_datetime = None
+        checkpoint.save()
+    elif checkpoint.completed_datetime is not None:
+        return
+
+    last_id = checkpoint.last_dm_id
+
+    while True:
+        with transaction.atomic():
+            # lock the batch so concurrent edits are not overwritten with stale content
+            dms = with_encrypted_content(
+                DM.objects.select_for_update().order_by("id").only("id")
+            )
+            if last_id is not None:
+                dms = dms.filter(id__gt=last_id)
+
+            batch = list(dms[:batch_size])
+            if not batch:
+                break
+
+            rotated_dms = []
+            for dm in batch:
+                token = dm.encrypted_content.encode()
+
+                try:
+                    primary_key.decrypt(token)
+                    continue
+                except InvalidToken:
+                    pass
+
+                if not is_fernet_token(token):
+                    # content saved before the field was encrypted
+                    new_token = crypter.encrypt(token)
+                else:
+                    try:
+                        new_token = crypter.rotate(token)
+                    except InvalidToken as error:
+                        Logger.error(
+                            "uia_backend::messaging::encryption::"
+                            "rotate_dm_encryption_key:: "
+                            "DM is encrypted with an unknown key.",
+                            extra={
+                                "dm_id": str(dm.id),
+                                "key_fingerprint": checkpoint.key_fingerprint,
+                            },
+                        )
+                        raise DMKeyRotationError(
+                            f"DM {dm.id} is encrypted with a key missing from "
+                            "FIELD_ENCRYPTION_KEY."
+                        ) from error
+
+                # wrapped in a Value so the field does not encrypt it a second time
+                dm.content = Value(new_token.decode(), output_field=TextField())
+                rotated_dms.append(dm)
+
+            DM.objects.bulk_update(rotated_dms, ["content"])
+
+            last_id = batch[-1].id
+            DMKeyRotation.objects.filter(id=checkpoint.id).update(
+                last_dm_id=last_id,
+                rotated_count=F("rotated_count") + len(rotated_dms),
+            )
+
+        yield last_id, len(batch), len(rotated_dms)
+
+        if throttle:
+            time.sleep(throttle)
+
+    DMKeyRotation.objects.filter(id=checkpoint.id).update(
+        completed_datetime=timezone.now()
+    )
+    Logger.info(
+        "uia_backend::messaging::encryption::rotate_dm_encryption_key:: "
+        "Rotated DM encryption key.",
+        extra={"key_fingerprint": checkpoint.key_fingerprint},
+    )
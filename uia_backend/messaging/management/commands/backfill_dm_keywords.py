@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from uia_backend.messaging.search import backfill_dm_keywords
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the blind keyword index used by DM search for existing DMs. Run it "
+        "again after changing DM_SEARCH_INDEX_KEY."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.DM_SEARCH_INDEX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--start-after",
+            type=str,
+            default=None,
+            help="Resume after this DM id, as reported by an interrupted run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        dm_count = 0
+        token_count = 0
+
+        for last_id, batch_dm_count, batch_token_count in backfill_dm_keywords(
+            batch_size=options["batch_size"], start_after=options["start_after"]
+        ):
+            dm_count += batch_dm_count
+            token_count += batch_token_count
+            self.stdout.write(f"Indexed {dm_count} DMs, last DM {last_id}.")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {dm_count} DMs with {token_count} keywords.")
+        )
@@ -0,0 +1,162 @@
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+
+from uia_backend.accounts.models import CustomUser, FriendShip
+from uia_backend.messaging.api.v1.serializers import UpdateDMSerializer
+from uia_backend.messaging.encryption import dm_content_cache, with_encrypted_content
+from uia_backend.messaging.models import DM
+
+WORDS = [
+    "assignment",
+    "campus",
+    "hostel",
+    "lecture",
+    "library",
+    "project",
+    "semester",
+    "tomorrow",
+    "tonight",
+    "tutorial",
+]
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the DMs created for a benchmark run."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark rendering pages of DMs when every row is decrypted as it is "
+        "loaded and when only the rendered page is decrypted, with a cold and a warm "
+        "decrypted content cache. Generated DMs are rolled back once the benchmark "
+        "is done."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--page-sizes",
+            type=int,
+            nargs="+",
+            default=[10, 50, 100],
+            help="Number of DMs in a page.",
+        )
+        parser.add_argument("--dms", type=int, default=10_000)
+        parser.add_argument(
+            "--content-length",
+            type=int,
+            default=40,
+            help="Number of words in a DM.",
+        )
+        parser.add_argument("--runs", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=1_000)
+
+    def create_data(self, options: dict[str, Any]) -> FriendShip:
+        """Create a friendship and DMs sent through it."""
+
+        random_generator = random.Random(options["dms"])
+        batch_size = options["batch_size"]
+
+        user = CustomUser.objects.create(
+            email="benchmark-dm@example.com",
+            first_name="Benchmark",
+            last_name="User",
+            display_name="benchmarkdm",
+            faculty="Science",
+            department="Computer Science",
+            year_of_graduation="2024",
+            password="!",
+            is_active=True,
+        )
+        friendship = FriendShip.objects.create()
+
+        for start in range(0, options["dms"], batch_size):
+            DM.objects.bulk_create(
+                [
+                    DM(
+                        created_by=user,
+                        friendship=friendship,
+                        content=" ".join(
+                            random_generator.choices(WORDS, k=options["content_length"])
+                        ),
+                    )
+                    for _ in range(start, min(start + batch_size, options["dms"]))
+                ],
+                batch_size=batch_size,
+            )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE messaging_dm;")
+
+        return friendship
+
+    def time_calls(self, call: Callable[[], Any], runs: int) -> float:
+        """Return the median time in milliseconds taken by a call."""
+
+        durations = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            call()
+            durations.append((time.perf_counter() - start_time) * 1000)
+
+        return statistics.median(durations)
+
+    def benchmark(self, options: dict[str, Any]) -> None:
+        friendship = self.create_data(options)
+        dms = (
+            DM.objects.select_related("created_by")
+            .prefetch_related("files")
+            .filter(friendship=friendship)
+            .order_by("-created_datetime")
+        )
+
+        # NOTE: every call renders a fresh copy of the queryset, a queryset keeps
+        # the DMs it loaded (already decrypted) and later runs would not hit the
+        # database or decrypt anything
+        def render(queryset: Any) -> Callable[[], Any]:
+            return lambda: UpdateDMSerializer(queryset.all(), many=True).data
+
+        def render_cold(queryset: Any) -> Callable[[], Any]:
+            def call() -> Any:
+                dm_content_cache.clear()
+                return UpdateDMSerializer(queryset.all(), many=True).data
+
+            return call
+
+        for page_size in options["page_sizes"]:
+            page = dms[:page_size]
+            deferred_page = with_encrypted_content(dms)[:page_size]
+
+            results = {
+                "decrypt on load": self.time_calls(render(page), options["runs"]),
+                "decrypt page (cold cache)": self.time_calls(
+                    render_cold(deferred_page), options["runs"]
+                ),
+                "decrypt page (warm cache)": self.time_calls(
+                    render(deferred_page), options["runs"]
+                ),
+            }
+
+            for name, duration in results.items():
+                self.stdout.write(
+                    f"{options['dms']} dms | page of {page_size} | {name}: "
+                    f"{duration:.2f}ms"
+                )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            with transaction.atomic():
+                self.benchmark(options)
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+        finally:
+            dm_content_cache.clear()
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
@@ -0,0 +1,189 @@
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+
+from uia_backend.accounts.models import CustomUser
+from uia_backend.cluster.models import Cluster, ClusterMembership
+from uia_backend.libs.filters import full_text_search, is_postgresql
+from uia_backend.messaging.models import Post
+
+WORDS = [
+    "assignment",
+    "campus",
+    "cafeteria",
+    "convocation",
+    "department",
+    "electricity",
+    "examination",
+    "faculty",
+    "hostel",
+    "laboratory",
+    "lecture",
+    "library",
+    "matriculation",
+    "project",
+    "registration",
+    "semester",
+    "seminar",
+    "shuttle",
+    "timetable",
+    "tutorial",
+]
+SEARCH_FIELDS = ["title", "content"]
+
+
+class BenchmarkRollback(Exception):
+    """Raised to roll back the posts created for a benchmark run."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark post search in a cluster and across a users clusters with "
+        "icontains lookups and with full text search. Generated posts are rolled "
+        "back once the benchmark is done."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--posts",
+            type=int,
+            nargs="+",
+            default=[1_000_000, 10_000_000],
+            help="Number of posts to benchmark with.",
+        )
+        parser.add_argument("--clusters", type=int, default=1_000)
+        parser.add_argument(
+            "--clusters-per-user",
+            type=int,
+            default=20,
+            help="Number of clusters the searching user is a member of.",
+        )
+        parser.add_argument("--search-term", type=str, default="hostel electricity")
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def create_data(
+        self, post_count: int, options: dict[str, Any]
+    ) -> tuple[CustomUser, list[Cluster]]:
+        """Create a user, clusters, the users memberships and posts."""
+
+        random_generator = random.Random(post_count)
+        batch_size = options["batch_size"]
+
+        user = CustomUser.objects.create(
+            email="benchmark-search@example.com",
+            first_name="Benchmark",
+            last_name="User",
+            display_name="benchmarksearch",
+            faculty="Science",
+            department="Computer Science",
+            year_of_graduation="2024",
+            password="!",
+            is_active=True,
+        )
+        clusters = Cluster.objects.bulk_create(
+            [
+                Cluster(title=f"Benchmark cluster {index}", created_by=user)
+                for index in range(options["clusters"])
+            ],
+            batch_size=batch_size,
+        )
+        user_clusters = clusters[: options["clusters_per_user"]]
+        ClusterMembership.objects.bulk_create(
+            [ClusterMembership(user=user, cluster=cluster) for cluster in user_clusters]
+        )
+
+        for start in range(0, post_count, batch_size):
+            Post.objects.bulk_create(
+                [
+                    Post(
+                        title=" ".join(random_generator.sample(WORDS, 3)),
+                        content=" ".join(random_generator.choices(WORDS, k=40)),
+                        cluster=random_generator.choice(clusters),
+                        created_by=user,
+                    )
+                    for _ in range(start, min(start + batch_size, post_count))
+                ],
+                batch_size=batch_size,
+            )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE messaging_post;")
+
+        return user, user_clusters
+
+    def time_query(self, get_queryset: Callable[[], QuerySet], runs: int) -> float:
+        """Return the median time in milliseconds taken to evaluate the queryset."""
+
+        durations = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            list(get_queryset())
+            durations.append((time.perf_counter() - start_time) * 1000)
+
+        return statistics.median(durations)
+
+    def benchmark(self, post_count: int, options: dict[str, Any]) -> None:
+        search_term = options["search_term"]
+        user, user_clusters = self.create_data(post_count, options)
+
+        cluster_posts = Post.objects.filter(cluster=user_clusters[0])
+        user_posts = Post.objects.filter(
+            cluster_id__in=ClusterMembership.objects.filter(user=user).values(
+                "cluster_id"
+            )
+        )
+
+        icontains_condition = Q()
+        for field in SEARCH_FIELDS:
+            icontains_condition |= Q(**{f"{field}__icontains": search_term})
+
+        results = {
+            "cluster search (icontains)": self.time_query(
+                lambda: cluster_posts.filter(icontains_condition).order_by(
+                    "-created_datetime"
+                )[:50],
+                options["runs"],
+            ),
+            "global search (icontains)": self.time_query(
+                lambda: user_posts.filter(icontains_condition).order_by(
+                    "-created_datetime"
+                )[:50],
+                options["runs"],
+            ),
+        }
+
+        if is_postgresql(cluster_posts):
+            results["cluster search (full text)"] = self.time_query(
+                lambda: full_text_search(
+                    cluster_posts, search_term, headline_field="content"
+                )[:50],
+                options["runs"],
+            )
+            results["global search (full text)"] = self.time_query(
+                lambda: full_text_search(
+                    user_posts, search_term, headline_field="content"
+                )[:50],
+                options["runs"],
+            )
+
+        for name, duration in results.items():
+            self.stdout.write(f"{post_count} posts | {name}: {duration:.2f}ms")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for post_count in options["posts"]:
+            try:
+                with transaction.atomic():
+                    self.benchmark(post_count, options)
+                    raise BenchmarkRollback
+            except BenchmarkRollback:
+                pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
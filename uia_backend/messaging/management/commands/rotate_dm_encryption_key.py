@@ -0,0 +1,56 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from uia_backend.messaging.encryption import (
+    DMKeyRotationError,
+    rotate_dm_encryption_key,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt the content of every DM with the first FIELD_ENCRYPTION_KEY. "
+        "Resumes an interrupted rotation, old keys can be dropped once it completes."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.DM_KEY_ROTATION_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--throttle",
+            type=float,
+            default=settings.DM_KEY_ROTATION_THROTTLE,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Start over instead of resuming, e.g. after restoring old DMs.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        dm_count = 0
+        rotated_count = 0
+
+        rotation = rotate_dm_encryption_key(
+            batch_size=options["batch_size"],
+            throttle=options["throttle"],
+            restart=options["restart"],
+        )
+        try:
+            for last_id, batch_dm_count, batch_rotated_count in rotation:
+                dm_count += batch_dm_count
+                rotated_count += batch_rotated_count
+                self.stdout.write(
+                    f"Read {dm_count} DMs, re-encrypted {rotated_count}, "
+                    f"last DM {last_id}."
+                )
+        except DMKeyRotationError as error:
+            raise CommandError(f"Unable to rotate the key: {error}") from error
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Re-encrypted {rotated_count} of {dm_count} DMs.")
+        )
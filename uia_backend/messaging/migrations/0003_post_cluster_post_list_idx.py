@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_dm_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['cluster', '-created_datetime', '-id'], name='cluster_post_list_idx'),
+        ),
+    ]
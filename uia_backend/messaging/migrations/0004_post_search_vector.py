@@ -0,0 +1,113 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:02
+
+from django.db import migrations
+
+# uia_backend.libs.filters.SEARCH_CONFIG at the time of this migration
+SEARCH_CONFIG = "english"
+
+# posts updated per statement when filling the column of existing posts
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({{table}}.title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({{table}}.content, '')), 'B')"
+)
+
+
+def create_search_vector(apps, schema_editor):
+    """
+    Add a `search_vector` column built from the post title and content and a
+    GIN index used by post search. Titles weigh more than content when ranking.
+
+    The column is kept current by a trigger on every insert and on updates of the
+    title or content so it is not declared on the model. Each step avoids holding
+    a long lock on the table: the column is nullable without a default (no table
+    rewrite), existing posts are filled in small batches committed one by one,
+    and the index is built concurrently.
+    NOTE: PostgreSQL only, other databases fall back to unindexed lookups.
+    """
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "ALTER TABLE messaging_post ADD COLUMN IF NOT EXISTS search_vector tsvector;"
+    )
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION messaging_post_search_vector_update() "
+        "RETURNS trigger AS $$ BEGIN "
+        f"NEW.search_vector := {SEARCH_VECTOR_SQL.format(table='NEW')}; "
+        "RETURN NEW; "
+        "END $$ LANGUAGE plpgsql;"
+    )
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS messaging_post_search_vector_trigger "
+        "ON messaging_post;"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER messaging_post_search_vector_trigger "
+        "BEFORE INSERT OR UPDATE OF title, content ON messaging_post "
+        "FOR EACH ROW EXECUTE FUNCTION messaging_post_search_vector_update();"
+    )
+
+    # posts written from now on are handled by the trigger, fill in the others
+    # walking the primary key so every batch is an index range scan
+    with schema_editor.connection.cursor() as cursor:
+        last_id = None
+        while True:
+            cursor.execute(
+                "UPDATE messaging_post "
+                f"SET search_vector = {SEARCH_VECTOR_SQL.format(table='messaging_post')} "
+                "WHERE id IN ("
+                "SELECT id FROM messaging_post "
+                "WHERE %s::uuid IS NULL OR id > %s::uuid "
+                "ORDER BY id LIMIT %s"
+                ") RETURNING id;",
+                [last_id, last_id, BACKFILL_BATCH_SIZE],
+            )
+            updated_ids = [row[0] for row in cursor.fetchall()]
+            if not updated_ids:
+                break
+            last_id = max(updated_ids)
+
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS messaging_post_search_vector_idx "
+        "ON messaging_post USING gin (search_vector);"
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS messaging_post_search_vector_idx;"
+    )
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS messaging_post_search_vector_trigger "
+        "ON messaging_post;"
+    )
+    schema_editor.execute(
+        "DROP FUNCTION IF EXISTS messaging_post_search_vector_update();"
+    )
+    schema_editor.execute(
+        "ALTER TABLE messaging_post DROP COLUMN IF EXISTS search_vector;"
+    )
+
+
+class Migration(migrations.Migration):
+    # indexes are built concurrently which can not run inside a transaction, this
+    # also commits every backfill batch on its own
+    atomic = False
+
+    dependencies = [
+        ('messaging', '0003_post_cluster_post_list_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=create_search_vector,
+            reverse_code=drop_search_vector,
+            atomic=False,
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+import uuid
+
+BATCH_SIZE = 1000
+
+
+def backfill_dm_conversations(apps, schema_editor):
+    """
+    Create the conversations of friendships that already have DMs.
+
+    There was no read state before, existing messages are treated as read.
+    """
+
+    DM = apps.get_model("messaging", "DM")
+    DMConversation = apps.get_model("messaging", "DMConversation")
+    UserFriendShipSettings = apps.get_model("accounts", "UserFriendShipSettings")
+    db_alias = schema_editor.connection.alias
+
+    last_messages = DM.objects.using(db_alias).filter(
+        friendship_id=OuterRef("friendship_id")
+    ).order_by("-created_datetime", "-id")
+
+    conversations = []
+    for user_id, friendship_id, message_id, created_datetime in (
+        UserFriendShipSettings.objects.using(db_alias)
+        .annotate(
+            last_message_id=Subquery(last_messages.values("id")[:1]),
+            last_message_datetime=Subquery(
+                last_messages.values("created_datetime")[:1]
+            ),
+        )
+        .filter(last_message_id__isnull=False)
+        .values_list(
+            "user_id", "friendship_id", "last_message_id", "last_message_datetime"
+        )
+        .iterator()
+    ):
+        conversations.append(
+            DMConversation(
+                user_id=user_id,
+                friendship_id=friendship_id,
+                last_message_id=message_id,
+                last_message_datetime=created_datetime,
+                last_read_datetime=created_datetime,
+            )
+        )
+
+    DMConversation.objects.using(db_alias).bulk_create(
+        conversations, batch_size=BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0009_customuser_search_indexes'),
+        ('messaging', '0004_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DMConversation',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_datetime', models.DateTimeField(auto_now=True, verbose_name='Last update at')),
+                ('last_message_datetime', models.DateTimeField()),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_read_datetime', models.DateTimeField(null=True)),
+                ('friendship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dm_conversations', to='accounts.friendship')),
+                ('last_message', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.dm')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dm_conversations', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dmconversation',
+            index=models.Index(fields=['user', '-last_message_datetime', '-id'], name='dm_inbox_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dmconversation',
+            constraint=models.UniqueConstraint(fields=('user', 'friendship'), name='unique_dm_conversation'),
+        ),
+        migrations.RunPython(
+            code=backfill_dm_conversations,
+            reverse_code=migrations.RunPython.noop,
+            atomic=True,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_dmconversation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dm',
+            index=models.Index(fields=['friendship', 'created_datetime'], name='dm_friendship_created_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_userfriendshipsettings_friendship_user_idx'),
+        ('messaging', '0006_dm_friendship_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DMKeyword',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_datetime', models.DateTimeField(auto_now=True, verbose_name='Last update at')),
+                ('token', models.CharField(max_length=32)),
+                ('dm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keywords', to='messaging.dm')),
+                ('friendship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.friendship')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dmkeyword',
+            index=models.Index(fields=['friendship', 'token'], name='dm_keyword_token_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dmkeyword',
+            constraint=models.UniqueConstraint(fields=('dm', 'token'), name='unique_dm_keyword'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.10 on 2026-10-19 10:05
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0007_dmkeyword'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DMKeyRotation',
+            fields=[
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_datetime', models.DateTimeField(auto_now=True, verbose_name='Last update at')),
+                ('key_fingerprint', models.CharField(max_length=16, unique=True)),
+                ('last_dm_id', models.UUIDField(null=True)),
+                ('rotated_count', models.PositiveBigIntegerField(default=0)),
+                ('completed_datetime', models.DateTimeField(null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
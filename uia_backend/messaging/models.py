@@ -111,6 +111,16 @@ class Post(BaseAbstractModel):
     created_by = models.ForeignKey(
         CustomUser, related_name="posts", on_delete=models.PROTECT
     )
+    # NOTE: on PostgreSQL the table also has a `search_vector` column kept current
+    # by a trigger (see migrations/0004_post_search_vector.py) used by post search
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["cluster", "-created_datetime", "-id"],
+                name="cluster_post_list_idx",
+            )
+        ]
 
     @property
     def channel_name(self) -> str:
@@ -191,3 +201,90 @@ class DM(BaseAbstractModel):
         "messaging.DM", related_name="replies", on_delete=models.CASCADE, null=True
     )
     edited = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # unread counts are range counts after a read marker
+            models.Index(
+                fields=["friendship", "created_datetime"],
+                name="dm_friendship_created_idx",
+            )
+        ]
+
+
+class DMConversation(BaseAbstractModel):
+    """
+    A users summary of the DMs sent through one of their friendships.
+
+    Maintained by uia_backend.messaging.signals so the inbox is served from this
+    table alone, without scanning or decrypting DMs. Content is not copied here,
+    edits show up through `last_message`.
+    """
+
+    user = models.ForeignKey(
+        CustomUser, related_name="dm_conversations", on_delete=models.CASCADE
+    )
+    friendship = models.ForeignKey(
+        FriendShip, related_name="dm_conversations", on_delete=models.CASCADE
+    )
+    last_message = models.ForeignKey(
+        DM, related_name="+", on_delete=models.SET_NULL, null=True
+    )
+    # kept when the last message is deleted so the conversation keeps its place
+    last_message_datetime = models.DateTimeField()
+    unread_count = models.PositiveIntegerField(default=0)
+    # DMs created after this are unread, NULL when nothing was read yet
+    last_read_datetime = models.DateTimeField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "friendship"], name="unique_dm_conversation"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-last_message_datetime", "-id"],
+                name="dm_inbox_idx",
+            )
+        ]
+
+
+class DMKeyword(BaseAbstractModel):
+    """
+    Blind index token of a word in a DMs content.
+
+    Tokens are keyed hashes of normalized words (see uia_backend.messaging.search)
+    so DMs can be searched with an index lookup without storing plaintext.
+    """
+
+    dm = models.ForeignKey(DM, related_name="keywords", on_delete=models.CASCADE)
+    # copied from the DM so searches seek a single friendship's tokens
+    friendship = models.ForeignKey(
+        FriendShip, related_name="+", on_delete=models.CASCADE
+    )
+    token = models.CharField(max_length=32)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dm", "token"], name="unique_dm_keyword")
+        ]
+        indexes = [
+            models.Index(fields=["friendship", "token"], name="dm_keyword_token_idx")
+        ]
+
+
+class DMKeyRotation(BaseAbstractModel):
+    """
+    Checkpoint of the re-encryption of DM content with a field encryption key.
+
+    Written in the same transaction as every re-encrypted batch (see
+    uia_backend.messaging.encryption.rotate_dm_encryption_key) so an interrupted
+    rotation resumes right after the last batch it committed.
+    """
+
+    # identifies the key DMs are re-encrypted with, never the key itself
+    key_fingerprint = models.CharField(max_length=16, unique=True)
+    last_dm_id = models.UUIDField(null=True)
+    rotated_count = models.PositiveBigIntegerField(default=0)
+    completed_datetime = models.DateTimeField(null=True)
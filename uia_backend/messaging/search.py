@@ -0,0 +1,120 @@
+import hashlib
+import hmac
+import re
+import unicodedata
+from collections.abc import Iterable, Iterator, Sequence
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from uia_backend.messaging.models import DM, DMKeyword
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# shorter words match too many messages to be worth indexing
+MIN_KEYWORD_LENGTH = 2
+
+
+def normalize_keywords(text: str) -> set[str]:
+    """Return the distinct searchable words of a text, case and width folded."""
+
+    return {
+        word
+        for word in WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold())
+        if len(word) >= MIN_KEYWORD_LENGTH
+    }
+
+
+def get_keyword_token(keyword: str) -> str:
+    """Return the blind index token of a normalized word."""
+
+    return hmac.new(
+        settings.DM_SEARCH_INDEX_KEY.encode(), keyword.encode(), hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def build_dm_keywords(dms: Sequence[DM]) -> list[DMKeyword]:
+    """Return unsaved keyword tokens of the content of DMs."""
+
+    return [
+        DMKeyword(dm=dm, friendship_id=dm.friendship_id, token=get_keyword_token(word))
+        for dm in dms
+        for word in normalize_keywords(dm.content)
+    ]
+
+
+def index_dm_keywords(dms: Sequence[DM]) -> int:
+    """
+    Replace the keyword tokens of DMs with tokens of their current content.
+
+    Returns the number of tokens created.
+    """
+
+    if not dms:
+        return 0
+
+    keywords = build_dm_keywords(dms)
+    DMKeyword.objects.filter(dm_id__in=[dm.id for dm in dms]).delete()
+    DMKeyword.objects.bulk_create(keywords)
+    return len(keywords)
+
+
+def backfill_dm_keywords(
+    batch_size: int, start_after: UUID | None = None
+) -> Iterator[tuple[UUID, int, int]]:
+    """
+    Index the keywords of every DM, `batch_size` DMs at a time.
+
+    DMs are read in primary key order with keyset pagination so memory stays
+    constant, each batch is indexed in its own transaction. Yields the last DM id,
+    the number of DMs and the number of tokens of every batch, an interrupted
+    backfill can be resumed after the last id it yielded.
+    """
+
+    last_id = start_after
+
+    while True:
+        dms = DM.objects.order_by("id").only("id", "friendship_id", "content")
+        if last_id is not None:
+            dms = dms.filter(id__gt=last_id)
+
+        batch = list(dms[:batch_size])
+        if not batch:
+            return
+
+        with transaction.atomic():
+            token_count = index_dm_keywords(batch)
+
+        last_id = batch[-1].id
+        yield last_id, len(batch), token_count
+
+
+def search_dms(
+    queryset: QuerySet[DM], term: str, friendship_ids: Iterable[UUID] | None = None
+) -> QuerySet[DM]:
+    """
+    Filter `queryset` to DMs containing every word of `term`.
+
+    Words are matched through their tokens, so only whole words match. Passing
+    the friendships searched lets the lookup seek the (friendship, token) index.
+    """
+
+    tokens = {get_keyword_token(word) for word in normalize_keywords(term)}
+
+    if not tokens:
+        return queryset.none()
+
+    keywords = DMKeyword.objects.filter(token__in=tokens)
+    if friendship_ids is not None:
+        keywords = keywords.filter(friendship_id__in=friendship_ids)
+
+    matching_dm_ids = (
+        keywords.order_by()
+        .values("dm_id")
+        .annotate(matched=Count("token", distinct=True))
+        .filter(matched=len(tokens))
+        .values("dm_id")
+    )
+    return queryset.filter(id__in=matching_dm_ids)
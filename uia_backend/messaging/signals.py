@@ -0,0 +1,122 @@
+from typing import Any
+
+from django.db.models import Case, F, PositiveIntegerField, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from uia_backend.accounts.models import UserFriendShipSettings
+from uia_backend.cluster.models import Cluster
+from uia_backend.messaging.models import DM, DMConversation, DMKeyword, Post
+from uia_backend.messaging.search import build_dm_keywords, index_dm_keywords
+
+
+@receiver(post_save, sender=Post, dispatch_uid="post_created")
+def increment_cluster_post_count(
+    sender: type[Post], instance: Post, created: bool, **kwargs: Any
+) -> None:
+    """Increment the stored post count of a cluster when a post is created."""
+
+    if not created:
+        return
+
+    Cluster.objects.filter(id=instance.cluster_id).update(
+        post_count=F("post_count") + 1
+    )
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="post_deleted")
+def decrement_cluster_post_count(
+    sender: type[Post], instance: Post, **kwargs: Any
+) -> None:
+    """Decrement the stored post count of a cluster when a post is deleted."""
+
+    Cluster.objects.filter(id=instance.cluster_id, post_count__gt=0).update(
+        post_count=F("post_count") - 1
+    )
+
+
+@receiver(post_save, sender=DM, dispatch_uid="dm_created")
+def update_dm_conversations(
+    sender: type[DM], instance: DM, created: bool, **kwargs: Any
+) -> None:
+    """
+    Make a new DM the last message of the friendship's conversations, unread by
+    everyone but its sender.
+    """
+
+    # edited content is served through DMConversation.last_message
+    if not created:
+        return
+
+    DMConversation.objects.bulk_create(
+        [
+            DMConversation(
+                user_id=user_id,
+                friendship_id=instance.friendship_id,
+                last_message=instance,
+                last_message_datetime=instance.created_datetime,
+            )
+            for user_id in UserFriendShipSettings.objects.filter(
+                friendship_id=instance.friendship_id
+            ).values_list("user_id", flat=True)
+        ],
+        ignore_conflicts=True,
+    )
+
+    # the sender has seen the conversation up to their own message
+    DMConversation.objects.filter(friendship_id=instance.friendship_id).update(
+        last_message=instance,
+        last_message_datetime=instance.created_datetime,
+        unread_count=Case(
+            When(user_id=instance.created_by_id, then=Value(0)),
+            default=F("unread_count") + 1,
+            output_field=PositiveIntegerField(),
+        ),
+        last_read_datetime=Case(
+            When(user_id=instance.created_by_id, then=Value(instance.created_datetime)),
+            default=F("last_read_datetime"),
+        ),
+    )
+
+
+@receiver(post_delete, sender=DM, dispatch_uid="dm_deleted")
+def update_dm_conversations_on_delete(
+    sender: type[DM], instance: DM, **kwargs: Any
+) -> None:
+    """
+    Drop a deleted DM from the unread counts and replace it when it was the last
+    message of the friendship's conversations.
+    """
+
+    conversations = DMConversation.objects.filter(friendship_id=instance.friendship_id)
+
+    conversations.exclude(user_id=instance.created_by_id).filter(
+        Q(last_read_datetime__isnull=True)
+        | Q(last_read_datetime__lt=instance.created_datetime),
+        unread_count__gt=0,
+    ).update(unread_count=F("unread_count") - 1)
+
+    # deleting the DM set last_message to NULL where it was the last message
+    latest_messages = DM.objects.filter(friendship_id=instance.friendship_id).order_by(
+        "-created_datetime", "-id"
+    )
+    conversations.filter(last_message__isnull=True).update(
+        last_message=Subquery(latest_messages.values("id")[:1]),
+        last_message_datetime=Coalesce(
+            Subquery(latest_messages.values("created_datetime")[:1]),
+            F("last_message_datetime"),
+        ),
+    )
+
+
+@receiver(post_save, sender=DM, dispatch_uid="dm_keywords_indexed")
+def update_dm_keywords(
+    sender: type[DM], instance: DM, created: bool, **kwargs: Any
+) -> None:
+    """Keep the blind keyword index of a DM in line with its content."""
+
+    if created:
+        DMKeyword.objects.bulk_create(build_dm_keywords([instance]))
+    else:
+        index_dm_keywords([instance])
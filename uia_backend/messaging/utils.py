@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import Exists, Model
+from django.utils import timezone
+
+from uia_backend.accounts.models import CustomUser, UserFriendShipSettings
+from uia_backend.libs.centrifugo import CentrifugoConnector
+from uia_backend.messaging.constants import CENT_EVENT_DM_READ
+from uia_backend.messaging.models import DMConversation
+
+# Insert a conversation with its read marker, or move the marker of an existing one
+# forward, recounting the DMs left unread. `WHERE TRUE` keeps sqlite from reading
+# ON CONFLICT as part of the SELECT.
+MARK_DM_CONVERSATION_READ_SQL = """
+INSERT INTO messaging_dmconversation (
+    id, created_datetime, updated_datetime, user_id, friendship_id,
+    last_message_id, last_message_datetime, unread_count, last_read_datetime
+)
+SELECT
+    %s, %s, %s, %s, %s,
+    (
+        SELECT id FROM messaging_dm WHERE friendship_id = %s
+        ORDER BY created_datetime DESC, id DESC LIMIT 1
+    ),
+    COALESCE(
+        (
+            SELECT MAX(created_datetime) FROM messaging_dm
+            WHERE friendship_id = %s
+        ),
+        %s
+    ),
+    (
+        SELECT COUNT(*) FROM messaging_dm
+        WHERE friendship_id = %s
+        AND created_datetime > %s
+        AND created_by_id <> %s
+    ),
+    %s
+WHERE TRUE
+ON CONFLICT (user_id, friendship_id) DO UPDATE SET
+    last_read_datetime = EXCLUDED.last_read_datetime,
+    unread_count = EXCLUDED.unread_count
+WHERE messaging_dmconversation.last_read_datetime IS NULL
+OR messaging_dmconversation.last_read_datetime < EXCLUDED.last_read_datetime
+RETURNING id
+"""
+
+
+def user_in_friendship(friendship_id: UUID, user_id: UUID) -> Exists:
+    """
+    Return a condition that holds when the user is part of the friendship.
+
+    It does not depend on the filtered rows so the database checks it once per
+    query, with a lookup on the friendship settings (friendship, user) index,
+    instead of joining the settings into every DM row.
+    """
+
+    return Exists(
+        UserFriendShipSettings.objects.filter(
+            friendship_id=friendship_id, user_id=user_id
+        )
+    )
+
+
+def broadcast_dm_read_event(
+    friendship_id: UUID, user_id: UUID, read_datetime: datetime
+) -> None:
+    """Tell both sides of a friendship how far a user has read the conversation."""
+
+    CentrifugoConnector().broadcast_event(
+        event_name=CENT_EVENT_DM_READ,
+        channels=[
+            user.channel_name
+            for user in CustomUser.objects.filter(
+                userfriendshipsettings__friendship_id=friendship_id
+            ).only("id")
+        ],
+        event_data={
+            "friendship": str(friendship_id),
+            "user": str(user_id),
+            "read_datetime": read_datetime.isoformat(),
+        },
+    )
+
+
+def mark_dm_conversation_read(
+    user_id: UUID, friendship_id: UUID, read_datetime: datetime
+) -> int:
+    """
+    Move a users read marker of a conversation forward to `read_datetime`.
+
+    A whole batch of viewed DMs is marked read with a single upsert that also
+    recounts the DMs left unread after the marker, the conversation is created
+    when no DM created it yet. Markers never move back, so repeating a call is a
+    no-op. A read receipt is broadcast once the marker has moved. Returns the
+    number of conversations created or updated (0 or 1).
+    """
+
+    def prep(model: type[Model], field_name: str, value: Any) -> Any:
+        return model._meta.get_field(field_name).get_db_prep_value(
+            value, connection=connection
+        )
+
+    now = prep(DMConversation, "created_datetime", timezone.now())
+    user = prep(DMConversation, "user", user_id)
+    friendship = prep(DMConversation, "friendship", friendship_id)
+    read_marker = prep(DMConversation, "last_read_datetime", read_datetime)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            MARK_DM_CONVERSATION_READ_SQL,
+            [
+                prep(DMConversation, "id", uuid.uuid4()),
+                now,
+                now,
+                user,
+                friendship,
+                friendship,
+                friendship,
+                read_marker,
+                friendship,
+                read_marker,
+                user,
+                read_marker,
+            ],
+        )
+        updated = len(cursor.fetchall())
+
+    if updated:
+        transaction.on_commit(
+            lambda: broadcast_dm_read_event(friendship_id, user_id, read_datetime)
+        )
+
+    return updated
@@ -23,8 +23,12 @@ EMAIL_EVENT_TYPE_CHOICES = (
 FOLLOW_USER_NOTIFICATION = "new_follower_event"
 UNFOLLOW_USER_NOTIFICATION = "unfollow_event"
 
+# cluster notification events
+CLUSTER_INVITATION_NOTIFICATION = "cluster_invitation_event"
+
 # NOTIFICATION TYPES
 NOTIFICATION_TYPE_CHOICES = (
     (FOLLOW_USER_NOTIFICATION, "New follower event"),
     (UNFOLLOW_USER_NOTIFICATION, "Unfollow event"),
+    (CLUSTER_INVITATION_NOTIFICATION, "Cluster invitation event"),
 )
@@ -0,0 +1,27 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0004_alter_notificationmodel_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailtrackingmodel',
+            name='archive_line',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='emailtrackingmodel',
+            name='archive_segment',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='emailtrackingmodel',
+            index=models.Index(condition=models.Q(('archive_segment__isnull', True)), fields=['created_datetime'], name='notif_tracking_unarchived_idx'),
+        ),
+    ]
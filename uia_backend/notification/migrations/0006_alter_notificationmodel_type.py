@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0005_emailtrackingmodel_archive_pointer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationmodel',
+            name='type',
+            field=models.CharField(choices=[('new_follower_event', 'New follower event'), ('unfollow_event', 'Unfollow event'), ('cluster_invitation_event', 'Cluster invitation event')], max_length=50),
+        ),
+    ]
@@ -65,6 +65,24 @@ class EmailTrackingModel(BaseAbstractModel):
     rejection_reason = models.CharField(null=True, max_length=100)
     raw_event_data = models.JSONField(default=dict)
 
+    # pointer to the archived copy of metadata and raw_event_data
+    # (see uia_backend.notification.utils.email_archive)
+    archive_segment = models.CharField(max_length=255, null=True, blank=True)
+    archive_line = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_datetime"],
+                condition=models.Q(archive_segment__isnull=True),
+                name="notif_tracking_unarchived_idx",
+            )
+        ]
+
+    @property
+    def is_archived(self) -> bool:
+        return self.archive_segment is not None
+
 
 class NotificationModel(AbstractNotification, BaseAbstractModel):
     type = models.CharField(choices=NOTIFICATION_TYPE_CHOICES, max_length=50)
@@ -12,6 +12,7 @@ from uia_backend.accounts.models import CustomUser
 from uia_backend.libs.centrifugo import CentrifugoConnector
 from uia_backend.messaging.constants import CENT_EVENT_USER_NOTIFICATION
 from uia_backend.notification.models import NotificationModel
+from uia_backend.notification.utils.email_archive import EmailTrackingArchiver
 from uia_backend.notification.utils.email_senders import (
     get_configured_email_service_provider_sender,
 )
@@ -42,6 +43,13 @@ def send_template_email_task(
     )
 
 
+@CELERY_APP.task(name="archive_email_tracking_payloads")
+def archive_email_tracking_payloads_task(older_than_days: int | None = None) -> int:
+    """Move raw payloads of old email tracking records to cold storage."""
+
+    return EmailTrackingArchiver().archive(older_than_days=older_than_days)
+
+
 def get_record_from_model_name(
     app_name: str, model_name: str, **kwargs
 ) -> Model | None:
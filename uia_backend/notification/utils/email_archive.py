@@ -0,0 +1,183 @@
+import gzip
+import io
+import json
+import logging
+import uuid
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from uia_backend.accounts.models import private_file_storage
+from uia_backend.notification.models import EmailTrackingModel
+
+Logger = logging.getLogger()
+
+
+class EmailTrackingArchiver:
+    """
+    Move raw ESP payloads of old EmailTrackingModel records into gzip-compressed
+    NDJSON segments on the private file storage, payloads hold recipient emails.
+
+    Segments are append-only: every batch is written to a new segment file and existing
+    segments are never rewritten. Archived records keep a pointer to their payload
+    (segment name and line number) while `metadata` and `raw_event_data` are emptied.
+    """
+
+    def __init__(
+        self,
+        storage: Storage | None = None,
+        location: str | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.storage = storage or private_file_storage()
+        self.location = location or settings.EMAIL_TRACKING_ARCHIVE_LOCATION
+        self.batch_size = batch_size or settings.EMAIL_TRACKING_ARCHIVE_BATCH_SIZE
+
+    def _new_segment_name(self) -> str:
+        """Return a unique name for a new archive segment."""
+        date_path = timezone.now().strftime("%Y/%m/%d")
+        return f"{self.location}/{date_path}/{uuid.uuid4().hex}.ndjson.gz"
+
+    @staticmethod
+    def _serialize_record(record: dict[str, Any]) -> bytes:
+        """Serialize a tracking record to a single NDJSON line."""
+        line = json.dumps(
+            {
+                "id": str(record["id"]),
+                "message_id": str(record["message_id"]),
+                "event_timestamp": record["event_timestamp"],
+                "event_type": record["event_type"],
+                "metadata": record["metadata"],
+                "raw_event_data": record["raw_event_data"],
+            },
+            cls=DjangoJSONEncoder,
+        )
+        return f"{line}\n".encode()
+
+    def _write_segment(self, records: list[dict[str, Any]]) -> str:
+        """Compress records into a new segment and return the saved segment name."""
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as segment:
+            for record in records:
+                segment.write(self._serialize_record(record))
+
+        return self.storage.save(
+            self._new_segment_name(), ContentFile(buffer.getvalue())
+        )
+
+    def _archive_batch(self, records: list[dict[str, Any]]) -> None:
+        """Write a batch of records to a segment and swap their payloads for a pointer."""
+
+        # NOTE: the segment is written before the rows are updated, if the update fails
+        # we only leave an orphaned segment behind and the rows are archived on the next run.
+        segment_name = self._write_segment(records)
+
+        to_update = [
+            EmailTrackingModel(
+                id=record["id"],
+                metadata={},
+                raw_event_data={},
+                archive_segment=segment_name,
+                archive_line=line_number,
+            )
+            for line_number, record in enumerate(records)
+        ]
+
+        with transaction.atomic():
+            EmailTrackingModel.objects.bulk_update(
+                objs=to_update,
+                fields=[
+                    "metadata",
+                    "raw_event_data",
+                    "archive_segment",
+                    "archive_line",
+                ],
+            )
+
+    def archive(self, older_than_days: int | None = None) -> int:
+        """Archive payloads of records older than `older_than_days` days."""
+
+        if older_than_days is None:
+            older_than_days = settings.EMAIL_TRACKING_ARCHIVE_AFTER_DAYS
+
+        cut_off_datetime = timezone.now() - timedelta(days=older_than_days)
+        archived_count = 0
+
+        while True:
+            records = list(
+                EmailTrackingModel.objects.filter(
+                    archive_segment__isnull=True,
+                    created_datetime__lte=cut_off_datetime,
+                )
+                .order_by("created_datetime")
+                .values(
+                    "id",
+                    "message_id",
+                    "event_timestamp",
+                    "event_type",
+                    "metadata",
+                    "raw_event_data",
+                )[: self.batch_size]
+            )
+
+            if not records:
+                break
+
+            self._archive_batch(records)
+            archived_count += len(records)
+
+        Logger.info(
+            "uia_backend::notification::utils::email_archive::EmailTrackingArchiver::archive:: "
+            "Archived email tracking payloads.",
+            extra={
+                "archived_count": archived_count,
+                "older_than_days": older_than_days,
+            },
+        )
+        return archived_count
+
+
+def stream_archived_events(
+    segment_name: str, storage: Storage | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream the events stored in an archive segment one line at a time."""
+
+    storage = storage or private_file_storage()
+
+    with storage.open(segment_name, "rb") as file:
+        with gzip.GzipFile(fileobj=file, mode="rb") as segment:
+            for line in segment:
+                yield json.loads(line)
+
+
+def get_archived_event(
+    record: EmailTrackingModel, storage: Storage | None = None
+) -> dict[str, Any] | None:
+    """Return the archived payload of a tracking record."""
+
+    if not record.is_archived:
+        return None
+
+    for line_number, event in enumerate(
+        stream_archived_events(record.archive_segment, storage=storage)
+    ):
+        if line_number == record.archive_line:
+            return event
+
+    Logger.error(
+        "uia_backend::notification::utils::email_archive::get_archived_event:: "
+        "Archived event not found in segment.",
+        extra={
+            "record_id": str(record.id),
+            "segment": record.archive_segment,
+            "line": record.archive_line,
+        },
+    )
+    return None
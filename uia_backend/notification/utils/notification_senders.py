@@ -52,6 +52,10 @@ class Notifier:
             "send_in_app_notification": True,
             "send_push_notification": False,
         },
+        notification_constants.CLUSTER_INVITATION_NOTIFICATION: {
+            "send_in_app_notification": True,
+            "send_push_notification": False,
+        },
     }
 
     def __init__(self, event: str, data: EventData):
@@ -9,3 +9,10 @@ class StaticRootS3Boto3Storage(S3Boto3Storage):  # pragma: no cover
 class MediaRootS3Boto3Storage(S3Boto3Storage):  # pragma: no cover
     location = "media"
     file_overwrite = False
+
+
+class PrivateMediaRootS3Boto3Storage(S3Boto3Storage):  # pragma: no cover
+    location = "private"
+    default_acl = "private"
+    file_overwrite = False
+    querystring_auth = True